@@ -1,7 +1,9 @@
-from typing import Any, Callable, Union
+from array import array
+from typing import Any, Callable, Iterator, Optional, Union
 from typing_extensions import final
 
 from aerospike_helpers.batch.records import BatchRecords
+from aerospike_helpers.job import Job
 AS_BOOL: int
 AS_BYTES_BLOB: int
 AS_BYTES_BOOL: int
@@ -323,8 +325,9 @@ class Client:
     def admin_set_password(self, username: str, password: str, policy: dict = ...) -> None: ...
     def admin_set_quotas(self, role: str, read_quota: int = ..., write_quota: int = ..., policy: dict = ...) -> None: ...
     def admin_set_whitelist(self, role: str, whitelist: list, policy: dict = ...) -> None: ...
-    def append(self, key: tuple, bin: str, val: str, meta: dict = ..., policy: dict = ...) -> None: ...
-    def apply(self, key: tuple, module: str, function: str, args: list, policy: dict = ...) -> Union[str, int, float, bytearray, list, dict]: ...
+    def admin_sync(self, desired_state: dict, policy: dict = ..., *, drop: bool = ..., dry_run: bool = ..., max_concurrent: int = ..., current_user: Optional[str] = ...) -> dict: ...
+    def append(self, key: Union[tuple, Key], bin: str, val: str, meta: dict = ..., policy: dict = ...) -> None: ...
+    def apply(self, key: Union[tuple, Key], module: str, function: str, args: list, policy: dict = ...) -> Union[str, int, float, bytearray, list, dict]: ...
     def batch_apply(self, keys: list, module: str, function: str, args: list, policy_batch: dict = ..., policy_batch_apply: dict = ...) -> BatchRecords: ...
     def batch_get_ops(self, keys: list, ops: list, policy: dict) -> list: ...
     def batch_operate(self, keys: list, ops: list, policy_batch: dict = ..., policy_batch_write: dict = ...) -> BatchRecords: ...
@@ -332,26 +335,33 @@ class Client:
     def batch_write(self, batch_records: BatchRecords, policy_batch: dict = ...) -> BatchRecords: ...
     def close(self) -> None: ...
     def connect(self, username: str = ..., password: str = ...) -> Client: ...
-    def exists(self, key: tuple, policy: dict = ...) -> tuple: ...
-    def exists_many(self, keys: list, policy: dict = ...) -> list: ...
-    def get(self, key: tuple, policy: dict = ...) -> tuple: ...
+    def exists(self, key: Union[tuple, Key], policy: dict = ...) -> tuple: ...
+    def exists_many(self, keys: list, policy: dict = ..., compact: bool = ...) -> Union[list, tuple]: ...
+    def exists_many_digests(self, ns: str, set: Optional[str], digests: Union[bytes, bytearray, memoryview], policy: dict = ..., generations: bool = ...) -> Union[bytearray, array]: ...
+    def get(self, key: Union[tuple, Key], policy: dict = ..., missing_ok: bool = ...) -> Optional[tuple]: ...
     # def get_async(self, *args, **kwargs) -> Any: ...
     def get_cdtctx_base64(self, ctx: list) -> str: ...
     def get_expression_base64(self, expression) -> str: ...
     def get_key_digest(self, ns: str, set: str, key) -> bytearray: ...
     def get_key_partition_id(self, ns, set, key) -> int: ...
     def get_many(self, keys: list, policy: dict = ...) -> list: ...
+    def get_many_digests(self, ns: str, set: Optional[str], digests: Union[bytes, bytearray, memoryview], bins: list = ..., policy: dict = ...) -> list: ...
     def get_node_names(self) -> list: ...
     def get_nodes(self) -> list: ...
-    def increment(self, key: tuple, bin: str, offset: int, meta: dict = ..., policy: dict = ...) -> None: ...
+    def get_partition_map(self, ns: str, since: Optional[int] = ...) -> Optional[dict]: ...
+    def get_slow_commands(self, clear: bool = ...) -> list: ...
+    def get_stats(self) -> dict: ...
+    def increment(self, key: Union[tuple, Key], bin: str, offset: int, meta: dict = ..., policy: dict = ...) -> None: ...
     def index_cdt_create(self, *args, **kwargs) -> Any: ...
-    def index_geo2dsphere_create(self, ns: str, set: str, bin: str, name: str, policy: dict = ...) -> None: ...
-    def index_integer_create(self, ns: str, set: str, bin: str, name: str, policy: dict = ...) -> None: ...
-    def index_list_create(self, ns: str, set: str, bin: str, index_datatype, name: str, policy: dict = ...) -> None: ...
-    def index_map_keys_create(self, ns: str, set: str, bin: str, index_datatype, name: str, policy: dict = ...) -> None: ...
-    def index_map_values_create(self, ns: str, set: str, bin: str, index_datatype, name: str, policy: dict = ...) -> None: ...
+    def index_create_many(self, specs: list, policy: dict = ..., *, wait: bool = ..., timeout: Optional[float] = ..., max_concurrent: int = ...) -> list: ...
+    def index_geo2dsphere_create(self, ns: str, set: str, bin: str, name: str, policy: dict = ..., *, wait: bool = ...) -> Any: ...
+    def index_integer_create(self, ns: str, set: str, bin: str, name: str, policy: dict = ..., *, wait: bool = ...) -> Any: ...
+    def index_list_create(self, ns: str, set: str, bin: str, index_datatype, name: str, policy: dict = ..., *, wait: bool = ...) -> Any: ...
+    def index_map_keys_create(self, ns: str, set: str, bin: str, index_datatype, name: str, policy: dict = ..., *, wait: bool = ...) -> Any: ...
+    def index_map_values_create(self, ns: str, set: str, bin: str, index_datatype, name: str, policy: dict = ..., *, wait: bool = ...) -> Any: ...
     def index_remove(self, ns, name: str, policy: dict = ...) -> None: ...
-    def index_string_create(self, ns: str, set: str, bin: str, name: str, policy: dict = ...) -> None: ...
+    def index_remove_many(self, ns: str, names: list, policy: dict = ..., *, max_concurrent: int = ...) -> list: ...
+    def index_string_create(self, ns: str, set: str, bin: str, name: str, policy: dict = ..., *, wait: bool = ...) -> Any: ...
     def info(self, command, hosts = ..., policy: dict = ...) -> dict: ...
     def info_all(self, command: str, policy: dict = ...) -> dict: ...
     def info_node(self, command: str, host: tuple, policy: dict = ...) -> str: ...
@@ -401,27 +411,28 @@ class Client:
     # def map_remove_by_value_range(self, *args, **kwargs) -> Any: ...
     # def map_set_policy(self, key, bin, map_policy) -> Any: ...
     # def map_size(self, *args, **kwargs) -> Any: ...
-    def operate(self, key: tuple, list: list, meta: dict = ..., policy: dict = ...) -> tuple: ...
-    def operate_ordered(self, key: tuple, list: list, meta: dict = ..., policy: dict = ...) -> list: ...
-    def prepend(self, key: tuple, bin: str, val: str, meta: dict = ..., policy: dict = ...) -> None: ...
-    def put(self, key: tuple, bins: dict, meta: dict = ..., policy: dict = ..., serializer = ...) -> None: ...
+    def operate(self, key: Union[tuple, Key], list: list, meta: dict = ..., policy: dict = ...) -> tuple: ...
+    def operate_ordered(self, key: Union[tuple, Key], list: list, meta: dict = ..., policy: dict = ...) -> list: ...
+    def prepend(self, key: Union[tuple, Key], bin: str, val: str, meta: dict = ..., policy: dict = ...) -> None: ...
+    def put(self, key: Union[tuple, Key], bins: dict, meta: dict = ..., policy: dict = ..., serializer = ...) -> None: ...
     # def put_async(self, *args, **kwargs) -> Any: ...
     def query(self, namespace: str, set: str = ...) -> Query: ...
-    def query_apply(self, ns: str, set: str, predicate: tuple, module: str, function: str, args: list = ..., policy: dict = ...) -> int: ...
-    def remove(self, key: tuple, meta: dict = ..., policy: dict = ...) -> None: ...
-    def remove_bin(self, key: tuple, list: list, meta: dict = ..., policy: dict = ...) -> None: ...
+    def query_apply(self, ns: str, set: str, predicate: tuple, module: str, function: str, args: list = ..., policy: dict = ...) -> Job: ...
+    def remove(self, key: Union[tuple, Key], meta: dict = ..., policy: dict = ...) -> None: ...
+    def remove_bin(self, key: Union[tuple, Key], list: list, meta: dict = ..., policy: dict = ...) -> None: ...
     def scan(self, namespace: str, set: str = ...) -> Scan: ...
-    def scan_apply(self, ns: str, set: str, module: str, function: str, args: list = ..., policy: dict = ..., options: dict = ...) -> int: ...
+    def scan_apply(self, ns: str, set: str, module: str, function: str, args: list = ..., policy: dict = ..., options: dict = ...) -> Job: ...
     def scan_info(self, scan_id: int) -> dict: ...
     def select(self, *args, **kwargs) -> tuple: ...
     def select_many(self, keys: list, bins: list, policy: dict = ...) -> list: ...
     def set_xdr_filter(self, data_center: str, namespace: str, expression_filter, policy: dict = ...) -> str: ...
     def shm_key(self) -> Union[int, None]: ...
-    def touch(self, key: tuple, val: int = ..., meta: dict = ..., policy: dict = ...) -> None: ...
+    def touch(self, key: Union[tuple, Key], val: int = ..., meta: dict = ..., policy: dict = ...) -> None: ...
     def truncate(self, namespace: str, set: str, nanos: int, policy: dict = ...) -> int: ...
     def udf_get(self, module: str, language: int = ..., policy: dict = ...) -> str: ...
     def udf_list(self, policy: dict = ...) -> list: ...
-    def udf_put(self, filename: str, udf_type = ..., policy: dict = ...) -> None: ...
+    def udf_put(self, filename: str, udf_type = ..., policy: dict = ..., *, if_changed: bool = ...) -> None: ...
+    def udf_sync(self, directory: str, policy: dict = ...) -> list: ...
     def udf_remove(self, module: str, policy: dict = ...) -> None: ...
 
 class GeoJSON:
@@ -432,6 +443,18 @@ class GeoJSON:
     def unwrap(self) -> dict: ...
     def wrap(self, geo_data: dict) -> None: ...
 
+@final
+class Key:
+    namespace: str
+    set: Optional[str]
+    key: Union[str, int, bytes, bytearray, None]
+    digest: bytearray
+    partition_id: int
+    def __init__(self, namespace: str, set: Optional[str], key: Union[str, int, bytes, bytearray, None] = ..., digest: Optional[bytearray] = ...) -> None: ...
+    def __getitem__(self, index: int) -> Any: ...
+    def __hash__(self) -> int: ...
+    def __len__(self) -> int: ...
+
 class KeyOrderedDict(dict):
     def __init__(self, *args, **kwargs) -> None: ...
 
@@ -442,10 +465,11 @@ class Query:
     def __init__(self, *args, **kwargs) -> None: ...
     def add_ops(self, ops: list) -> None: ...
     def apply(self, module: str, function: str, arguments: list = ...) -> Any: ...
-    def execute_background(self, policy: dict = ...) -> int: ...
+    def execute_background(self, policy: dict = ...) -> Job: ...
     def foreach(self, callback: Callable, policy: dict = ..., options: dict = ...) -> None: ...
     def get_partitions_status(self) -> tuple: ...
     def is_done(self) -> bool: ...
+    def pages(self, page_size: int, policy: dict = ..., options: dict = ..., columnar: bool = ..., prefetch: int = ..., max_buffered_records: Optional[int] = ...) -> Iterator[Union[list, dict]]: ...
     def paginate(self) -> None: ...
     def results(self, policy: dict = ..., options: dict = ...) -> list: ...
     # TODO: this isn't an infinite list of bins
@@ -457,9 +481,10 @@ class Scan:
     def add_ops(self, ops: list) -> None: ...
     def apply(self, module: str, function: str, arguments: list = ...) -> Any: ...
     def foreach(self, callback: Callable, policy: dict = ..., options: dict = ..., nodename: str = ...) -> None: ...
-    def execute_background(self, policy: dict = ...) -> int: ...
+    def execute_background(self, policy: dict = ...) -> Job: ...
     def get_partitions_status(self) -> tuple: ...
     def is_done(self) -> bool: ...
+    def pages(self, page_size: int, policy: dict = ..., columnar: bool = ..., prefetch: int = ..., max_buffered_records: Optional[int] = ...) -> Iterator[Union[list, dict]]: ...
     def paginate(self) -> None: ...
     def results(self, policy: dict = ..., nodename: str = ...) -> list: ...
     # TODO: this isn't an infinite list of bins
@@ -481,5 +506,7 @@ def get_partition_id(*args, **kwargs) -> Any: ...
 def set_deserializer(callback: Callable) -> None: ...
 def set_log_handler(callback: Callable = ...) -> None: ...
 def set_log_level(log_level: int) -> None: ...
+def set_profile_hook(hook: Union[Callable, None]) -> Union[Callable, None]: ...
 def set_serializer(callback: Callable) -> None: ...
+def set_trace_hook(hook: Union[Callable, None], sample_rate: float = ...) -> Union[Callable, None]: ...
 def unset_serializers() -> None: ...
@@ -0,0 +1,252 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Bring the users and roles of a cluster in line with a desired state, with as few admin commands as possible.
+
+The current users and roles are read with one :meth:`~aerospike.Client.admin_query_users_info` and one
+:meth:`~aerospike.Client.admin_get_roles`. Only the commands needed to reach the desired state are then sent,
+concurrently, so a sync with nothing to change costs those two reads.
+"""
+
+import typing as ty
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from aerospike import exception
+
+#: Most admin commands to have in flight at once, by default.
+MAX_CONCURRENT = 16
+
+#: The roles every cluster has. They cannot be created, changed or dropped.
+PREDEFINED_ROLES = frozenset(
+    (
+        "data-admin",
+        "read",
+        "read-write",
+        "read-write-udf",
+        "sindex-admin",
+        "sys-admin",
+        "truncate",
+        "udf-admin",
+        "user-admin",
+        "write",
+    )
+)
+
+#: The built-in users. They are never dropped by :func:`admin_sync`, only by :meth:`~aerospike.Client.admin_drop_user`.
+BUILTIN_USERS = frozenset(("admin",))
+
+#: The keys of the :class:`dict` returned by :func:`admin_sync`.
+CHANGE_KINDS = ("roles_created", "roles_updated", "roles_dropped", "users_created", "users_updated", "users_dropped")
+
+
+def _privilege(privilege: dict) -> tuple:
+    # A privilege as the server reports it, with an empty namespace and set for global privileges.
+    return (privilege["code"], privilege.get("ns") or "", privilege.get("set") or "")
+
+
+def _privilege_dicts(privileges) -> ty.List[dict]:
+    return [{"code": code, "ns": ns, "set": set_name} for code, ns, set_name in sorted(privileges)]
+
+
+def _check_state(desired_state):
+    def fail(message):
+        raise exception.ParamError(exception.ParamError.code, message)
+
+    if not isinstance(desired_state, dict) or set(desired_state) - {"roles", "users"}:
+        fail('The desired state must be a dict with "roles" and "users"')
+    roles = desired_state.get("roles", {})
+    users = desired_state.get("users", {})
+    if not isinstance(roles, dict) or not isinstance(users, dict):
+        fail('The desired "roles" and "users" must be dicts keyed by name')
+    for name, role in roles.items():
+        if name in PREDEFINED_ROLES:
+            fail("Role %r is predefined" % name)
+        if not isinstance(role, dict) or set(role) - {"privileges", "whitelist", "read_quota", "write_quota"}:
+            fail("Role %r must be a dict of privileges, whitelist, read_quota and write_quota" % name)
+        for privilege in role.get("privileges", []):
+            if not isinstance(privilege, dict) or "code" not in privilege:
+                fail("The privileges of role %r must be dicts with a code" % name)
+    for name, user in users.items():
+        if not isinstance(user, dict) or set(user) - {"password", "roles"}:
+            fail("User %r must be a dict of password and roles" % name)
+        if not isinstance(user.get("roles", []), (list, tuple)):
+            fail("The roles of user %r must be a list" % name)
+
+
+def _role_commands(client, name: str, role: dict, current: Optional[dict], policy: dict) -> list:
+    # The admin commands that make the role as desired. Settings the desired role leaves out are not changed.
+    if current is None:
+        settings = {key: role[key] for key in ("read_quota", "write_quota") if key in role}
+        if role.get("whitelist"):
+            settings["whitelist"] = list(role["whitelist"])
+        privileges = _privilege_dicts({_privilege(p) for p in role.get("privileges", [])})
+        return [lambda: client.admin_create_role(name, privileges, **settings, **policy)]
+
+    commands = []
+    if "privileges" in role:
+        desired = {_privilege(p) for p in role["privileges"]}
+        existing = {_privilege(p) for p in current.get("privileges", [])}
+        grant = _privilege_dicts(desired - existing)
+        revoke = _privilege_dicts(existing - desired)
+        if grant:
+            commands.append(lambda: client.admin_grant_privileges(name, grant, **policy))
+        if revoke:
+            commands.append(lambda: client.admin_revoke_privileges(name, revoke, **policy))
+    if "whitelist" in role and set(role["whitelist"]) != set(current.get("whitelist", [])):
+        commands.append(lambda: client.admin_set_whitelist(name, list(role["whitelist"]) or None, **policy))
+    quotas = (
+        role.get("read_quota", current.get("read_quota", 0)),
+        role.get("write_quota", current.get("write_quota", 0)),
+    )
+    if quotas != (current.get("read_quota", 0), current.get("write_quota", 0)):
+        commands.append(lambda: client.admin_set_quotas(name, *quotas, **policy))
+    return commands
+
+
+def _user_commands(client, name: str, user: dict, current: Optional[dict], policy: dict) -> list:
+    # The admin commands that make the user as desired. The password of an existing user is never changed.
+    desired = set(user.get("roles", []))
+    if current is None:
+        return [lambda: client.admin_create_user(name, user["password"], sorted(desired), **policy)]
+
+    commands = []
+    existing = set(current.get("roles", []))
+    grant = sorted(desired - existing)
+    revoke = sorted(existing - desired)
+    if grant:
+        commands.append(lambda: client.admin_grant_roles(name, grant, **policy))
+    if revoke:
+        commands.append(lambda: client.admin_revoke_roles(name, revoke, **policy))
+    return commands
+
+
+def _run_concurrently(commands: list, max_concurrent: int):
+    # Run all the commands, then raise the first error.
+    if not commands:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_concurrent, len(commands))) as executor:
+        futures = [executor.submit(command) for command in commands]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        raise errors[0]
+
+
+def admin_sync(
+    client,
+    desired_state: dict,
+    policy: Optional[dict] = None,
+    *,
+    drop: bool = False,
+    dry_run: bool = False,
+    max_concurrent: int = MAX_CONCURRENT,
+    current_user: Optional[str] = None,
+) -> ty.Dict[str, ty.List[str]]:
+    """Create, change and optionally drop users and roles so the cluster has the desired ones.
+
+    The desired state is a :class:`dict` with:
+
+    * ``"roles"``: a :class:`dict` of roles keyed by role name. Each role is a :class:`dict` with the \
+        ``"privileges"`` (:class:`list` of :ref:`aerospike_privilege_dict`), ``"whitelist"`` (:class:`list` of \
+        :class:`str`), ``"read_quota"`` and ``"write_quota"`` (:class:`int`) of :ref:`aerospike_role_dict`. \
+        Settings that are left out are not changed on existing roles, and are empty on new ones.
+    * ``"users"``: a :class:`dict` of users keyed by user name. Each user is a :class:`dict` with its \
+        ``"roles"`` (:class:`list` of role names) and, to create the user, its ``"password"``. The passwords of \
+        existing users are not changed.
+
+    Roles are created and changed first, then users, then roles are dropped. The commands of each step are
+    sent concurrently, each from its own thread.
+
+    Args:
+        client (aerospike.Client): The client to sync the users and roles with.
+        desired_state (dict): The users and roles the cluster should have.
+        policy (dict): Optional :ref:`aerospike_admin_policies` for every admin command.
+        drop (bool): Also drop the users, other than :data:`BUILTIN_USERS` and *current_user*, and the roles,
+            other than :data:`PREDEFINED_ROLES`, that are not in *desired_state*. Default ``False``.
+        dry_run (bool): Only return the changes that would be made. Default ``False``.
+        max_concurrent (int): Most admin commands to have in flight at once. Default ``16``.
+        current_user (str): The user the client is logged in as. It is never dropped, so the client is not
+            locked out during the sync. :meth:`aerospike.Client.admin_sync` passes the user of the client.
+
+    Returns:
+        A :class:`dict` of the names of the users and roles that were changed, keyed by each of
+        :data:`CHANGE_KINDS`.
+
+    Raises:
+        :exc:`~aerospike.exception.ParamError` if *desired_state* is not valid, or a new user has no password.
+        Nothing is changed then.
+        The first error of the admin commands of a step, once they have all completed. The later steps are
+        not run.
+
+    Example::
+
+        import aerospike
+
+        client = aerospike.client({"hosts": [("127.0.0.1", 3000)], "user": "admin", "password": "admin"})
+        client.connect()
+        changes = client.admin_sync(
+            {
+                "roles": {
+                    "reporting": {"privileges": [{"code": aerospike.PRIV_READ, "ns": "test"}], "read_quota": 1000},
+                },
+                "users": {
+                    "report-job": {"password": "secret", "roles": ["reporting"]},
+                    "dashboard": {"password": "secret", "roles": ["reporting", "read"]},
+                },
+            }
+        )
+        print(changes["users_created"])
+        # ['dashboard', 'report-job']
+    """
+    _check_state(desired_state)
+    roles = desired_state.get("roles", {})
+    users = desired_state.get("users", {})
+    policy = {} if policy is None else {"policy": policy}
+
+    current_users = client.admin_query_users_info(**policy)
+    current_roles = client.admin_get_roles(**policy)
+    for name, user in sorted(users.items()):
+        if name not in current_users and "password" not in user:
+            raise exception.ParamError(exception.ParamError.code, "New user %r needs a password" % name)
+
+    changes = {kind: [] for kind in CHANGE_KINDS}
+    role_commands = []
+    for name, role in sorted(roles.items()):
+        commands = _role_commands(client, name, role, current_roles.get(name), policy)
+        if commands:
+            changes["roles_updated" if name in current_roles else "roles_created"].append(name)
+            role_commands.extend(commands)
+
+    user_commands = []
+    for name, user in sorted(users.items()):
+        commands = _user_commands(client, name, user, current_users.get(name), policy)
+        if commands:
+            changes["users_updated" if name in current_users else "users_created"].append(name)
+            user_commands.extend(commands)
+
+    drop_commands = []
+    if drop:
+        for name in sorted(set(current_users) - set(users) - BUILTIN_USERS - {current_user}):
+            changes["users_dropped"].append(name)
+            user_commands.append(lambda name=name: client.admin_drop_user(name, **policy))
+        for name in sorted(set(current_roles) - set(roles) - PREDEFINED_ROLES):
+            changes["roles_dropped"].append(name)
+            drop_commands.append(lambda name=name: client.admin_drop_role(name, **policy))
+
+    if not dry_run:
+        for commands in (role_commands, user_commands, drop_commands):
+            _run_concurrently(commands, max_concurrent)
+    return changes
@@ -0,0 +1,312 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Helper for loading a stream of records through pipelined :meth:`~aerospike.Client.batch_write` calls.
+"""
+
+import time
+import typing as ty
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.batch.records import BatchRecords, Write
+from aerospike_helpers.operations import operations as op
+
+TypeKeyBins = ty.Tuple[ty.Any, ty.Dict[str, ty.Any]]
+TypeReportCallback = ty.Callable[["LoaderStats"], None]
+
+AEROSPIKE_OK = 0
+
+#: Sub-record result codes that are retried by default: timeout, key busy and device overload.
+DEFAULT_RETRY_RESULT_CODES = frozenset(
+    (
+        e.TimeoutError.code,
+        e.RecordBusy.code,
+        e.DeviceOverload.code,
+    )
+)
+
+
+class LoaderStats:
+    """Counters describing the progress of a :class:`BulkLoader` run.
+
+    Attributes:
+        submitted (int): Number of records read from the input iterator.
+        written (int): Number of records written successfully.
+        failed (int): Number of records that failed after all retries were used.
+        retried (int): Number of sub-record retries sent to the server.
+        errors (dict): Mapping of result code to the number of sub-records that returned it,
+            including failures that were later retried.
+        elapsed (float): Seconds since the load started.
+        records_per_second (float): Written records per second, over the last report interval
+            when passed to ``on_report`` and over the whole run otherwise.
+    """
+
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.retried = 0
+        self.errors = {}
+        self.elapsed = 0.0
+        self.records_per_second = 0.0
+
+    def _copy(self) -> "LoaderStats":
+        stats = LoaderStats()
+        stats.submitted = self.submitted
+        stats.written = self.written
+        stats.failed = self.failed
+        stats.retried = self.retried
+        stats.errors = dict(self.errors)
+        stats.elapsed = self.elapsed
+        stats.records_per_second = self.records_per_second
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            "LoaderStats(submitted={}, written={}, failed={}, retried={}, errors={}, elapsed={:.3f}, "
+            "records_per_second={:.1f})".format(
+                self.submitted,
+                self.written,
+                self.failed,
+                self.retried,
+                self.errors,
+                self.elapsed,
+                self.records_per_second,
+            )
+        )
+
+
+class BulkLoader:
+    """Load an iterator of ``(key, bins)`` pairs into one set using pipelined batch writes.
+
+    Records are grouped into batches of ``batch_size`` and sent with :meth:`~aerospike.Client.batch_write`.
+    The C client splits each batch into one sub-command per node and the GIL is released while the
+    batch is on the wire, so up to ``max_in_flight`` batches are kept running on worker threads.
+
+    The input iterator is only consumed when a batch slot frees up, and not while ``max_in_flight * batch_size``
+    or more records wait for a retry. At most ``(2 * max_in_flight + 1) * batch_size`` records are held in
+    memory at any time, regardless of how many records the iterator produces or how many are retried.
+
+    Sub-records that fail with a result code in ``retry_result_codes`` are sent again in a later batch,
+    up to ``max_retries`` times. A retry waits ``retry_delay`` seconds, doubled on each further attempt
+    and capped at ``max_retry_delay``, so a busy key or an overloaded device gets time to recover.
+    New input keeps flowing while a few retries wait. Other failures are counted in :attr:`LoaderStats.errors` and
+    :attr:`LoaderStats.failed`. If a whole ``batch_write`` call raises an exception, every record in it
+    is treated as having failed with the exception's code.
+
+    Args:
+        client (aerospike.Client): A connected client.
+        namespace (str): Namespace to write to.
+        set_name (str): Set to write to.
+        policy (dict, optional): :ref:`aerospike_batch_policies` passed to each ``batch_write`` call.
+        batch_size (int, optional): Number of records per batch. Default ``1000``.
+        max_in_flight (int, optional): Number of batches kept in flight. Default ``4``.
+        max_retries (int, optional): Maximum number of retries per record. Default ``3``.
+        retry_result_codes (set, optional): Result codes that trigger a retry.
+            Default :data:`DEFAULT_RETRY_RESULT_CODES`.
+        retry_delay (float, optional): Seconds to wait before the first retry of a record. Default ``0.01``.
+        max_retry_delay (float, optional): Maximum seconds to wait before a retry. Default ``1.0``.
+        meta (dict, optional): Record metadata, such as ``ttl``, applied to every record.
+        write_policy (dict, optional): :ref:`aerospike_batch_write_policies` applied to every record.
+        report_interval (float, optional): Seconds between ``on_report`` calls. Default ``1.0``.
+        on_report (callable, optional): Called with a :class:`LoaderStats` snapshot every
+            ``report_interval`` seconds and once more when the load finishes.
+
+    Example::
+
+        import aerospike
+        from aerospike_helpers.batch.bulk_loader import BulkLoader
+
+        config = {"hosts": [("127.0.0.1", 3000)]}
+        client = aerospike.client(config)
+
+        def records():
+            for i in range(500_000_000):
+                yield i, {"id": i, "name": "name" + str(i)}
+
+        loader = BulkLoader(client, "test", "demo", batch_size=5000, max_in_flight=8, on_report=print)
+        stats = loader.load(records())
+        print(stats.written, stats.failed, stats.errors)
+    """
+
+    def __init__(
+        self,
+        client,
+        namespace: str,
+        set_name: str,
+        policy: Optional[dict] = None,
+        batch_size: int = 1000,
+        max_in_flight: int = 4,
+        max_retries: int = 3,
+        retry_result_codes: ty.Optional[ty.Iterable[int]] = None,
+        retry_delay: float = 0.01,
+        max_retry_delay: float = 1.0,
+        meta: Optional[dict] = None,
+        write_policy: Optional[dict] = None,
+        report_interval: float = 1.0,
+        on_report: Optional[TypeReportCallback] = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+        if retry_delay < 0 or max_retry_delay < 0:
+            raise ValueError("retry delays must not be negative")
+
+        self.client = client
+        self.namespace = namespace
+        self.set_name = set_name
+        self.policy = policy
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        if retry_result_codes is None:
+            retry_result_codes = DEFAULT_RETRY_RESULT_CODES
+        self.retry_result_codes = frozenset(retry_result_codes)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.meta = meta
+        self.write_policy = write_policy
+        self.report_interval = report_interval
+        self.on_report = on_report
+
+        self.stats = LoaderStats()
+
+    def _make_key(self, key) -> tuple:
+        if isinstance(key, (tuple, aerospike.Key)):
+            return key
+        return (self.namespace, self.set_name, key)
+
+    def _make_record(self, key: tuple, bins: dict) -> Write:
+        ops = [op.write(bin_name, value) for bin_name, value in bins.items()]
+        return Write(key, ops, meta=self.meta, policy=self.write_policy)
+
+    def _send(self, batch: ty.List[ty.Tuple[Write, int]]):
+        batch_records = BatchRecords([record for record, _ in batch])
+        try:
+            self.client.batch_write(batch_records, self.policy)
+        except e.AerospikeError as exc:
+            # The whole command failed, so no sub-record result is trustworthy.
+            code = exc.code if exc.code is not None else e.ClientError.code
+            for record, _ in batch:
+                record.result = code
+        return batch
+
+    def _retry_at(self, attempt: int) -> float:
+        delay = min(self.retry_delay * 2 ** (attempt - 1), self.max_retry_delay)
+        return time.monotonic() + delay
+
+    def _collect(self, batch: ty.List[ty.Tuple[Write, int]], retries: ty.List[ty.Tuple[float, Write, int]]) -> None:
+        for record, attempt in batch:
+            if record.result == AEROSPIKE_OK:
+                self.stats.written += 1
+                continue
+
+            self.stats.errors[record.result] = self.stats.errors.get(record.result, 0) + 1
+            if record.result in self.retry_result_codes and attempt < self.max_retries:
+                self.stats.retried += 1
+                retry = Write(record.key, record.ops, meta=record.meta, policy=record.policy)
+                retries.append((self._retry_at(attempt + 1), retry, attempt + 1))
+            else:
+                self.stats.failed += 1
+
+    def _take_retries(self, retries: ty.List[ty.Tuple[float, Write, int]]) -> ty.List[ty.Tuple[Write, int]]:
+        # Take up to a batch of the retries whose delay has passed, leaving the others waiting.
+        now = time.monotonic()
+        batch = []
+        waiting = []
+        for retry in retries:
+            if retry[0] <= now and len(batch) < self.batch_size:
+                batch.append(retry[1:])
+            else:
+                waiting.append(retry)
+        retries[:] = waiting
+        return batch
+
+    def _report(self, start: float, last: ty.List[float]) -> None:
+        now = time.monotonic()
+        interval = now - last[0]
+        if self.on_report is None or interval < self.report_interval:
+            return
+
+        self.stats.elapsed = now - start
+        self.stats.records_per_second = (self.stats.written - last[1]) / interval
+        snapshot = self.stats._copy()
+        last[0] = now
+        last[1] = snapshot.written
+        self.on_report(snapshot)
+
+    def load(self, records: ty.Iterable[TypeKeyBins]) -> LoaderStats:
+        """Write every ``(key, bins)`` pair from ``records`` and return the final :class:`LoaderStats`.
+
+        ``key`` may be a full key tuple ``(namespace, set, primary_key)``, an :class:`aerospike.Key`,
+        or just the primary key, in which case the loader's namespace and set are used.
+        """
+        self.stats = LoaderStats()
+        start = time.monotonic()
+        last = [start, 0]
+        retries = []
+        # Past this many waiting retries, new input waits too, so a busy cluster can't grow the retries unbounded.
+        max_waiting_retries = self.max_in_flight * self.batch_size
+        in_flight = set()
+        records = iter(records)
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            while True:
+                # Fill the free slots, putting the retries that are due ahead of new input.
+                while len(in_flight) < self.max_in_flight:
+                    batch = self._take_retries(retries)
+                    while not exhausted and len(batch) < self.batch_size and len(retries) < max_waiting_retries:
+                        try:
+                            key, bins = next(records)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        batch.append((self._make_record(self._make_key(key), bins), 0))
+                        self.stats.submitted += 1
+                    if not batch:
+                        break
+                    in_flight.add(executor.submit(self._send, batch))
+
+                timeout = self.report_interval
+                if retries:
+                    retry_in = max(min(retry[0] for retry in retries) - time.monotonic(), 0)
+                    if not in_flight:
+                        # Only retries are left, and none of them is due yet.
+                        time.sleep(retry_in)
+                        self._report(start, last)
+                        continue
+                    timeout = min(timeout, retry_in)
+                elif not in_flight:
+                    break
+
+                done, in_flight = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._collect(future.result(), retries)
+                self._report(start, last)
+
+        elapsed = time.monotonic() - start
+        self.stats.elapsed = elapsed
+        self.stats.records_per_second = self.stats.written / elapsed if elapsed > 0 else 0.0
+        if self.on_report is not None:
+            self.on_report(self.stats._copy())
+        return self.stats
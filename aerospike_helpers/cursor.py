@@ -0,0 +1,196 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Helpers for saving the partition status of a scan or query as a compact binary cursor and resuming from it.
+
+A cursor holds the same information as :meth:`~aerospike.Query.get_partitions_status`, packed as bytes so
+it can be written to a file or a database and passed to a new scan or query after a restart.
+
+Example::
+
+    import aerospike
+    from aerospike_helpers import cursor
+
+    config = {"hosts": [("127.0.0.1", 3000)]}
+    client = aerospike.client(config)
+
+    query = client.query("test", "demo")
+    query.max_records = 1000
+    query.paginate()
+    page = query.results()
+    saved = cursor.save_cursor(query)
+
+    # Later, possibly in another process.
+    query = client.query("test", "demo")
+    query.max_records = 1000
+    query.paginate()
+    page = query.results({"partition_filter": cursor.load_cursor(saved)})
+
+    # Or fan the remaining work out to four workers.
+    for sub_cursor in cursor.split_cursor(saved, 4):
+        ...
+"""
+
+import struct
+import typing as ty
+import zlib
+
+from aerospike_helpers.parallel import PARTITION_COUNT, partition_ranges
+
+#: Version of the cursor encoding written by :func:`encode_cursor`.
+CURSOR_VERSION = 1
+
+DIGEST_SIZE = 20
+
+_MAGIC = b"ASPC"
+# magic, version, flags, begin, count
+_HEADER = struct.Struct("<4sBBHH")
+# digest, bval
+_PART_DIGEST = struct.Struct("<20sQ")
+_CRC = struct.Struct("<I")
+
+_DONE = 0x01
+_RETRY = 0x02
+_PART_INIT = 0x01
+_PART_RETRY = 0x02
+
+TypePartitionStatus = ty.Dict[ty.Union[str, int], ty.Any]
+
+
+def _partition_ids(partition_status: TypePartitionStatus) -> ty.List[int]:
+    return sorted(part_id for part_id in partition_status if isinstance(part_id, int))
+
+
+def encode_cursor(partition_status: TypePartitionStatus) -> bytes:
+    """Pack a :ref:`partition_status <aerospike_partition_objects>` dict into a cursor.
+
+    Args:
+        partition_status (dict): The value returned by :meth:`~aerospike.Query.get_partitions_status`
+            or :meth:`~aerospike.Scan.get_partitions_status`.
+
+    Returns:
+        :class:`bytes` holding the cursor.
+    """
+    part_ids = _partition_ids(partition_status)
+    if not part_ids:
+        raise ValueError("partition_status does not track any partitions")
+
+    begin = part_ids[0]
+    count = len(part_ids)
+    if part_ids[-1] != begin + count - 1 or begin + count > PARTITION_COUNT:
+        raise ValueError("partition_status must hold a contiguous range of partition IDs")
+
+    flags = 0
+    if partition_status.get("done"):
+        flags |= _DONE
+    if partition_status.get("retry"):
+        flags |= _RETRY
+
+    chunks = [_HEADER.pack(_MAGIC, CURSOR_VERSION, flags, begin, count)]
+    for part_id in part_ids:
+        _, init, retry, digest, bval = partition_status[part_id]
+        part_flags = (_PART_INIT if init else 0) | (_PART_RETRY if retry else 0)
+        chunks.append(bytes((part_flags,)))
+        # Only partitions that have started carry a resume point.
+        if init:
+            chunks.append(_PART_DIGEST.pack(bytes(digest), bval))
+
+    data = b"".join(chunks)
+    return data + _CRC.pack(zlib.crc32(data))
+
+
+def decode_cursor(data: bytes) -> TypePartitionStatus:
+    """Unpack a cursor created by :func:`encode_cursor` into a partition_status dict.
+
+    Raises:
+        :exc:`ValueError` if the cursor is corrupt or was written by an unsupported version.
+    """
+    data = bytes(data)
+    if len(data) < _HEADER.size + _CRC.size:
+        raise ValueError("cursor is too short")
+
+    body, (crc,) = data[: -_CRC.size], _CRC.unpack(data[-_CRC.size :])
+    if zlib.crc32(body) != crc:
+        raise ValueError("cursor checksum does not match")
+
+    magic, version, flags, begin, count = _HEADER.unpack_from(body)
+    if magic != _MAGIC:
+        raise ValueError("data is not a partition cursor")
+    if version != CURSOR_VERSION:
+        raise ValueError("unsupported cursor version {}".format(version))
+
+    partition_status = {"done": bool(flags & _DONE), "retry": bool(flags & _RETRY)}
+    offset = _HEADER.size
+    empty_digest = bytes(DIGEST_SIZE)
+    for part_id in range(begin, begin + count):
+        part_flags = body[offset]
+        offset += 1
+        init = bool(part_flags & _PART_INIT)
+        digest, bval = empty_digest, 0
+        if init:
+            digest, bval = _PART_DIGEST.unpack_from(body, offset)
+            offset += _PART_DIGEST.size
+        partition_status[part_id] = (part_id, init, bool(part_flags & _PART_RETRY), bytearray(digest), bval)
+
+    if offset != len(body):
+        raise ValueError("cursor has trailing data")
+    return partition_status
+
+
+def save_cursor(command) -> bytes:
+    """Return a cursor for the current partition status of a :class:`~aerospike.Query` or :class:`~aerospike.Scan`.
+
+    The scan or query must be tracking partitions, i.e. it was paginated or run with a ``partition_filter``.
+    """
+    return encode_cursor(command.get_partitions_status())
+
+
+def load_cursor(data: bytes) -> dict:
+    """Return a :ref:`partition_filter <aerospike_partition_objects>` that resumes from a cursor.
+
+    Pass the result as the ``"partition_filter"`` policy of :meth:`~aerospike.Query.results`,
+    :meth:`~aerospike.Query.foreach` or the matching :class:`~aerospike.Scan` methods.
+    """
+    partition_status = decode_cursor(data)
+    part_ids = _partition_ids(partition_status)
+    return {"begin": part_ids[0], "count": len(part_ids), "partition_status": partition_status}
+
+
+def is_done(data: bytes) -> bool:
+    """Return whether every partition tracked by the cursor has been read."""
+    partition_status = decode_cursor(data)
+    return partition_status["done"] or not any(
+        partition_status[part_id][2] for part_id in _partition_ids(partition_status)
+    )
+
+
+def split_cursor(data: bytes, parts: int) -> ty.List[bytes]:
+    """Split a cursor into up to ``parts`` cursors covering contiguous partition ranges.
+
+    Each sub-cursor keeps the resume point of its partitions, so the workers that receive them
+    together read exactly the records the original cursor had left to read.
+    """
+    partition_status = decode_cursor(data)
+    part_ids = _partition_ids(partition_status)
+
+    cursors = []
+    for begin, count in partition_ranges(parts, part_ids[0], len(part_ids)):
+        sub_status = {part_id: partition_status[part_id] for part_id in range(begin, begin + count)}
+        done = partition_status["done"] or not any(status[2] for status in sub_status.values())
+        sub_status["done"] = done
+        sub_status["retry"] = partition_status["retry"]
+        cursors.append(encode_cursor(sub_status))
+    return cursors
@@ -0,0 +1,468 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Tasks for secondary indexes that are still being built.
+
+The index create methods of :class:`aerospike.Client` return an :class:`IndexTask` when called with
+``wait=False``. Each node builds its own part of the index, and reports how much of it is loaded in the
+``load_pct`` statistic of the ``sindex/<namespace>/<index name>`` info command. An index is ready when every
+node reports ``100``. Right after the create, a node may not have received the index yet. Like the waits of the
+create methods, the task then counts the node as ``0`` percent loaded.
+
+:func:`index_create_many` and :func:`index_remove_many` create or remove many indexes at once. They are also
+available as :meth:`aerospike.Client.index_create_many` and :meth:`aerospike.Client.index_remove_many`.
+"""
+
+import asyncio
+import time
+import typing as ty
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import aerospike
+from aerospike import exception
+from aerospike_helpers.cdt_ctx import index_datatype_string, index_type_string
+
+#: Seconds between polls of the nodes, by default.
+POLL_INTERVAL = 0.5
+
+#: Seconds after the create that a node without the index is taken to not have received it yet, by default.
+MISSING_GRACE = 5.0
+
+#: Most info commands :func:`index_create_many` and :func:`index_remove_many` have in flight at once, by default.
+MAX_CONCURRENT = 16
+
+
+def parse_sindex_stats(response: str) -> ty.Dict[str, ty.Union[int, float, str]]:
+    """Parse the response of a ``sindex/<namespace>/<index name>`` info command.
+
+    Args:
+        response (str): The response, with or without the command in front of it.
+
+    Returns:
+        A :class:`dict` of the statistics. Integer and float values are converted.
+
+    Example::
+
+        from aerospike_helpers.index_task import parse_sindex_stats
+
+        print(parse_sindex_stats("sindex/test/demo_i\\tload_pct=42;keys=10;entries=10\\n"))
+        # {'load_pct': 42, 'keys': 10, 'entries': 10}
+    """
+    response = response.split("\t", 1)[-1].strip()
+    stats = {}
+    for pair in response.split(";"):
+        name, sep, value = pair.partition("=")
+        if not sep:
+            continue
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                pass
+        stats[name] = value
+    return stats
+
+
+class IndexTask:
+    """A secondary index that was created and may still be building.
+
+    Args:
+        client (aerospike.Client): The client the index was created with.
+        namespace (str): The namespace of the index.
+        name (str): The name of the index.
+        policy (dict): The :ref:`aerospike_info_policies` for polling the nodes.
+
+    Attributes:
+        missing_grace (float): Seconds after the task was made that a node without the index counts as ``0``
+            percent loaded, rather than raising :exc:`~aerospike.exception.IndexNotFound`. Default ``5.0``.
+
+    Example::
+
+        import aerospike
+
+        client = aerospike.client({"hosts": [("127.0.0.1", 3000)]}).connect()
+
+        task = client.index_integer_create("test", "demo", "age", "demo_age", wait=False)
+        print(task.progress())
+        # 42
+        task.wait(timeout=60)
+    """
+
+    def __init__(self, client, namespace: str, name: str, policy: Optional[dict] = None):
+        self.client = client
+        self.namespace = namespace
+        self.name = name
+        self.policy = policy
+        self.missing_grace = MISSING_GRACE
+        self._created = time.monotonic()
+        self._done = False
+
+    def __repr__(self):
+        return "IndexTask(%r, %r)" % (self.namespace, self.name)
+
+    @property
+    def command(self) -> str:
+        """The info command that returns the statistics of the index."""
+        return "sindex/%s/%s" % (self.namespace, self.name)
+
+    def stats(self) -> ty.Dict[str, dict]:
+        """Return the statistics of the index on each node.
+
+        The nodes are queried one at a time.
+
+        Returns:
+            A :class:`dict` of node name to the :class:`dict` returned by :func:`parse_sindex_stats`. The
+            statistics of a node that has not received the index yet are empty.
+
+        Raises:
+            :exc:`~aerospike.exception.IndexNotFound` if a node does not have the index *missing_grace* seconds
+            after the task was made.
+        """
+        return {node["node_name"]: self._node_stats(node["node_name"]) for node in self.client.get_node_names()}
+
+    def progress(self) -> int:
+        """Return the percentage of the index that is loaded on the node which has loaded the least."""
+        if self._done:
+            return 100
+        return self._progress(self.stats().values())
+
+    def done(self) -> bool:
+        """Return whether the index is loaded on every node."""
+        return self.progress() == 100
+
+    def wait(self, timeout: Optional[float] = None, interval: float = POLL_INTERVAL):
+        """Wait for the index to be loaded on every node.
+
+        Args:
+            timeout (float): Seconds to wait for. Default no limit.
+            interval (float): Seconds between polls of the nodes. Default ``0.5``.
+
+        Raises:
+            :exc:`~aerospike.exception.TimeoutError` if the index is still loading after *timeout* seconds.
+            :exc:`~aerospike.exception.IndexNotFound` if a node does not have the index *missing_grace* seconds
+            after the task was made.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done():
+            self._check_deadline(deadline, interval)
+            time.sleep(interval)
+
+    async def wait_async(self, timeout: Optional[float] = None, interval: float = POLL_INTERVAL):
+        """Wait for the index to be loaded on every node, without blocking the event loop.
+
+        The nodes are polled at the same time, each in a thread of the loop's default executor.
+
+        Args:
+            timeout (float): Seconds to wait for. Default no limit.
+            interval (float): Seconds between polls of the nodes. Default ``0.5``.
+
+        Raises:
+            :exc:`~aerospike.exception.TimeoutError` if the index is still loading after *timeout* seconds.
+            :exc:`~aerospike.exception.IndexNotFound` if a node does not have the index *missing_grace* seconds
+            after the task was made.
+
+        Example::
+
+            async def create_indexes(client):
+                tasks = [
+                    client.index_integer_create("test", "demo", "age", "demo_age", wait=False),
+                    client.index_string_create("test", "demo", "name", "demo_name", wait=False),
+                ]
+                await asyncio.gather(*(task.wait_async(timeout=60) for task in tasks))
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._done:
+            nodes = await loop.run_in_executor(None, self.client.get_node_names)
+            stats = await asyncio.gather(
+                *(loop.run_in_executor(None, self._node_stats, node["node_name"]) for node in nodes)
+            )
+            if self._progress(stats) == 100:
+                return
+            self._check_deadline(deadline, interval)
+            await asyncio.sleep(interval)
+
+    def _node_stats(self, node_name: str) -> dict:
+        try:
+            if self.policy is None:
+                response = self.client.info_single_node(self.command, node_name)
+            else:
+                response = self.client.info_single_node(self.command, node_name, self.policy)
+        except exception.IndexNotFound:
+            # The node may not have received the index yet, so it has loaded none of it.
+            if time.monotonic() - self._created > self.missing_grace:
+                raise
+            return {}
+        return parse_sindex_stats(response)
+
+    def _progress(self, stats: ty.Iterable[dict]) -> int:
+        progress = min((node_stats.get("load_pct", 0) for node_stats in stats), default=100)
+        if progress >= 100:
+            self._done = True
+            return 100
+        return progress
+
+    def _check_deadline(self, deadline: Optional[float], interval: float):
+        if deadline is not None and time.monotonic() + interval > deadline:
+            raise exception.TimeoutError(exception.TimeoutError.code, "Index %s is still loading" % self.command)
+
+
+def parse_sindex_list(response: str) -> ty.List[ty.Dict[str, str]]:
+    """Parse the response of a ``sindex-list`` info command.
+
+    Args:
+        response (str): The response, with or without the command in front of it.
+
+    Returns:
+        A :class:`list` with a :class:`dict` of the fields of each index.
+
+    Example::
+
+        from aerospike_helpers.index_task import parse_sindex_list
+
+        print(parse_sindex_list("ns=test:indexname=demo_i:set=demo:bin=i:type=numeric:indextype=default;"))
+        # [{'ns': 'test', 'indexname': 'demo_i', 'set': 'demo', 'bin': 'i', 'type': 'numeric', 'indextype': 'default'}]
+    """
+    response = response.split("\t", 1)[-1].strip()
+    indexes = []
+    for entry in response.split(";"):
+        fields = dict(field.split("=", 1) for field in entry.split(":") if "=" in field)
+        if fields:
+            indexes.append(fields)
+    return indexes
+
+
+def _index_definition(client, spec: dict) -> tuple:
+    # The fields of an index that make it the same index, as sindex-list reports them.
+    ctx = spec.get("ctx")
+    return (
+        spec["ns"],
+        spec.get("set") or None,
+        spec["bin"],
+        index_datatype_string(spec["index_datatype"]),
+        index_type_string(spec.get("index_type", aerospike.INDEX_TYPE_DEFAULT)),
+        client.get_cdtctx_base64(ctx) if ctx else None,
+    )
+
+
+def _listed_definition(fields: dict) -> tuple:
+    def field(name):
+        value = fields.get(name)
+        return None if value in (None, "NULL") else value
+
+    index_type = (field("indextype") or "default").lower()
+    # Older servers report the default index type as NONE.
+    if index_type == "none":
+        index_type = "default"
+    return (
+        field("ns"),
+        field("set"),
+        field("bin") or field("bins"),
+        (field("type") or "").lower(),
+        index_type,
+        field("context"),
+    )
+
+
+def _check_spec(spec):
+    if not isinstance(spec, dict):
+        raise exception.ParamError(exception.ParamError.code, "Index specs must be dicts")
+    for name in ("ns", "bin", "name", "index_datatype"):
+        if name not in spec:
+            raise exception.ParamError(exception.ParamError.code, "Index spec is missing %r" % name)
+    if index_datatype_string(spec["index_datatype"]) == "invalid":
+        raise exception.ParamError(exception.ParamError.code, "Invalid index_datatype %r" % spec["index_datatype"])
+    if index_type_string(spec.get("index_type", aerospike.INDEX_TYPE_DEFAULT)) == "invalid":
+        raise exception.ParamError(exception.ParamError.code, "Invalid index_type %r" % spec["index_type"])
+
+
+def _create_index(client, spec: dict, policy: Optional[dict]) -> IndexTask:
+    args = (spec["ns"], spec.get("set"), spec["bin"])
+    index_type = spec.get("index_type", aerospike.INDEX_TYPE_DEFAULT)
+    datatype = spec["index_datatype"]
+    policy = policy or {}
+    if spec.get("ctx"):
+        ctx = {"ctx": spec["ctx"]}
+        return client.index_cdt_create(*args, index_type, datatype, spec["name"], ctx, policy, wait=False)
+    if index_type == aerospike.INDEX_TYPE_DEFAULT:
+        create = {
+            aerospike.INDEX_NUMERIC: client.index_integer_create,
+            aerospike.INDEX_STRING: client.index_string_create,
+            aerospike.INDEX_GEO2DSPHERE: client.index_geo2dsphere_create,
+        }[datatype]
+        return create(*args, spec["name"], policy, wait=False)
+    create = {
+        aerospike.INDEX_TYPE_LIST: client.index_list_create,
+        aerospike.INDEX_TYPE_MAPKEYS: client.index_map_keys_create,
+        aerospike.INDEX_TYPE_MAPVALUES: client.index_map_values_create,
+    }[index_type]
+    return create(*args, datatype, spec["name"], policy, wait=False)
+
+
+def _run_concurrently(call, items, max_concurrent: int) -> list:
+    # Run call on each item and return the results in order. All the calls are made even if some raise, then
+    # the first error is raised.
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_concurrent, len(items))) as executor:
+        futures = [executor.submit(call, item) for item in items]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        raise errors[0]
+    return [future.result() for future in futures]
+
+
+def index_create_many(
+    client,
+    specs: ty.List[dict],
+    policy: Optional[dict] = None,
+    *,
+    wait: bool = True,
+    timeout: Optional[float] = None,
+    max_concurrent: int = MAX_CONCURRENT,
+) -> ty.List[IndexTask]:
+    """Create many secondary indexes at once, and wait for all of them to be built.
+
+    The create commands are sent concurrently, each from its own thread. Indexes that the cluster already has
+    with the same definition are left as they are, whatever their name, as are repeated specs.
+
+    Each spec is a :class:`dict` with the arguments of the index create method for the index:
+
+    * ``ns`` (:class:`str`), ``set`` (:class:`str` or :py:obj:`None`, optional), ``bin`` (:class:`str`) \
+        and ``name`` (:class:`str`).
+    * ``index_datatype``: ``aerospike.INDEX_NUMERIC``, ``aerospike.INDEX_STRING`` or \
+        ``aerospike.INDEX_GEO2DSPHERE``.
+    * ``index_type`` (optional): ``aerospike.INDEX_TYPE_DEFAULT``, ``aerospike.INDEX_TYPE_LIST``, \
+        ``aerospike.INDEX_TYPE_MAPKEYS`` or ``aerospike.INDEX_TYPE_MAPVALUES``. Default \
+        ``aerospike.INDEX_TYPE_DEFAULT``.
+    * ``ctx`` (optional): a :class:`list` of :mod:`~aerospike_helpers.cdt_ctx` objects, to index a value \
+        nested in the bin.
+
+    Args:
+        client (aerospike.Client): The client to create the indexes with.
+        specs (list): The indexes to create.
+        policy (dict): The :ref:`aerospike_info_policies` for the info commands.
+        wait (bool): Wait for all the indexes to be built. Default ``True``.
+        timeout (float): Seconds to wait for the indexes to be built. Default no limit.
+        max_concurrent (int): Most create commands to have in flight at once. Default ``16``.
+
+    Returns:
+        A :class:`list` with an :class:`IndexTask` for each index that was created, in the order of *specs*.
+
+    Raises:
+        :exc:`~aerospike.exception.ParamError` if a spec is not valid. Nothing is created then.
+        The first error of the create commands, once they have all completed. The other indexes are still
+        created.
+
+    Example::
+
+        import aerospike
+
+        client = aerospike.client({"hosts": [("127.0.0.1", 3000)]}).connect()
+        tasks = client.index_create_many(
+            [
+                {
+                    "ns": "test",
+                    "set": "demo",
+                    "bin": "age",
+                    "name": "demo_age",
+                    "index_datatype": aerospike.INDEX_NUMERIC,
+                },
+                {
+                    "ns": "test",
+                    "set": "demo",
+                    "bin": "tags",
+                    "name": "demo_tags",
+                    "index_datatype": aerospike.INDEX_STRING,
+                    "index_type": aerospike.INDEX_TYPE_LIST,
+                },
+            ],
+            timeout=60,
+        )
+        print([task.name for task in tasks])
+        # ['demo_age', 'demo_tags']
+    """
+    if not isinstance(specs, (list, tuple)):
+        raise exception.ParamError(exception.ParamError.code, "Index specs must be a list")
+    for spec in specs:
+        _check_spec(spec)
+
+    existing = set()
+    for ns in sorted({spec["ns"] for spec in specs}):
+        command = "sindex-list:ns=%s" % ns
+        response = client.info_random_node(command) if policy is None else client.info_random_node(command, policy)
+        existing.update(_listed_definition(fields) for fields in parse_sindex_list(response) if fields.get("ns") == ns)
+
+    to_create = []
+    for spec in specs:
+        definition = _index_definition(client, spec)
+        if definition not in existing:
+            existing.add(definition)
+            to_create.append(spec)
+
+    tasks = _run_concurrently(lambda spec: _create_index(client, spec, policy), to_create, max_concurrent)
+    if wait:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for task in tasks:
+            task.wait(None if deadline is None else max(deadline - time.monotonic(), 0))
+    return tasks
+
+
+def index_remove_many(
+    client,
+    ns: str,
+    names: ty.List[str],
+    policy: Optional[dict] = None,
+    *,
+    max_concurrent: int = MAX_CONCURRENT,
+) -> ty.List[str]:
+    """Remove many secondary indexes at once.
+
+    The remove commands are sent concurrently, each from its own thread. Indexes that do not exist are
+    skipped.
+
+    Args:
+        client (aerospike.Client): The client to remove the indexes with.
+        ns (str): The namespace of the indexes.
+        names (list): The names of the indexes.
+        policy (dict): The :ref:`aerospike_info_policies` for the info commands.
+        max_concurrent (int): Most remove commands to have in flight at once. Default ``16``.
+
+    Returns:
+        A :class:`list` of the names of the indexes that were removed.
+
+    Raises:
+        The first error of the remove commands, once they have all completed.
+
+    Example::
+
+        print(client.index_remove_many("test", ["demo_age", "demo_tags", "demo_missing"]))
+        # ['demo_age', 'demo_tags']
+    """
+    if not isinstance(names, (list, tuple)) or not all(isinstance(name, str) for name in names):
+        raise exception.ParamError(exception.ParamError.code, "Index names must be a list of str")
+
+    def remove(name):
+        try:
+            client.index_remove(ns, name, policy or {})
+        except exception.IndexNotFound:
+            return None
+        return name
+
+    names = list(dict.fromkeys(names))
+    return [name for name in _run_concurrently(remove, names, max_concurrent) if name is not None]
@@ -0,0 +1,241 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Handles for scans and queries running in the background.
+
+:meth:`aerospike.Query.execute_background`, :meth:`aerospike.Scan.execute_background`,
+:meth:`aerospike.Client.query_apply` and :meth:`aerospike.Client.scan_apply` return a :class:`Job`. A job is
+still the :class:`int` job ID, so it can be passed to :meth:`aerospike.Client.job_info` as before.
+
+Each node runs its own part of a job. A job is done when every node has finished its part, or does not know
+the job.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import aerospike
+from aerospike import exception
+
+#: Seconds between polls of the nodes, by default.
+POLL_INTERVAL = 0.5
+
+
+def parse_job_response(response: str) -> dict:
+    """Parse the response of a node to a ``query-show``, ``scan-show`` or ``jobs`` info command.
+
+    Args:
+        response (str): The response, with or without the command in front of it.
+
+    Returns:
+        A :class:`dict` with the ``"status"``, ``"progress_pct"`` and ``"records_read"`` of the job on the
+        node, like :meth:`aerospike.Client.job_info` returns for the cluster.
+
+    Example::
+
+        from aerospike_helpers.job import parse_job_response
+
+        print(parse_job_response("trid=1:job-type=basic:status=active(ok):job-progress=42:recs-read=10"))
+        # {'status': 1, 'progress_pct': 42, 'records_read': 10}
+    """
+    response = response.split("\t", 1)[-1].strip()
+    fields = dict(field.split("=", 1) for field in response.split(":") if "=" in field)
+    status = fields.get("status", "")
+    if status.startswith("active") or status.startswith("IN_PROGRESS"):
+        status = aerospike.JOB_STATUS_INPROGRESS
+    elif status.lower().startswith("done"):
+        status = aerospike.JOB_STATUS_COMPLETED
+    else:
+        status = aerospike.JOB_STATUS_UNDEF
+    # Newer servers use dashes while older servers use underscores.
+    records_read = fields.get("recs-read", fields.get("recs_read", "0"))
+    return {
+        "status": status,
+        "progress_pct": int(fields.get("job-progress", 0)),
+        "records_read": int(records_read),
+    }
+
+
+class Job(int):
+    """A scan or query running in the background. It is also its job ID.
+
+    Args:
+        job_id (int): The job ID.
+        client (aerospike.Client): The client that started the job.
+        module (str): ``aerospike.JOB_SCAN`` or ``aerospike.JOB_QUERY``.
+
+    Example::
+
+        import aerospike
+        from aerospike_helpers.operations import operations as op
+
+        client = aerospike.client({"hosts": [("127.0.0.1", 3000)]}).connect()
+
+        query = client.query("test", "demo")
+        query.add_ops([op.write("processed", True)])
+        job = query.execute_background()
+        print(job.progress_pct)
+        # 42
+        job.wait(timeout=600)
+    """
+
+    def __new__(cls, job_id: int, client=None, module: str = aerospike.JOB_QUERY):
+        job = super().__new__(cls, job_id)
+        job.client = client
+        job.module = module
+        # The command that shows the job on each node, by node name.
+        job._show_commands = {}
+        return job
+
+    def __reduce__(self):
+        # A job is pickled as its job ID, as the client cannot be pickled.
+        return int, (int(self),)
+
+    @property
+    def job_id(self) -> int:
+        """The job ID, as a plain :class:`int`."""
+        return int(self)
+
+    def status(self, policy: Optional[dict] = None) -> dict:
+        """Return the status of the job in the cluster.
+
+        Args:
+            policy (dict): Optional :ref:`aerospike_info_policies`.
+
+        Returns:
+            The :class:`dict` returned by :meth:`aerospike.Client.job_info`.
+        """
+        if policy is None:
+            return self.client.job_info(int(self), self.module)
+        return self.client.job_info(int(self), self.module, policy)
+
+    @property
+    def progress_pct(self) -> int:
+        """The progress of the job on the node which has made the least, from ``0`` to ``100``."""
+        info = self.status()
+        if info["status"] == aerospike.JOB_STATUS_COMPLETED:
+            return 100
+        return info["progress_pct"]
+
+    def done(self, policy: Optional[dict] = None) -> bool:
+        """Return whether the job has finished on every node."""
+        return self.status(policy)["status"] != aerospike.JOB_STATUS_INPROGRESS
+
+    def wait(
+        self, poll_interval: float = POLL_INTERVAL, timeout: Optional[float] = None, policy: Optional[dict] = None
+    ):
+        """Wait for the job to finish on every node.
+
+        Args:
+            poll_interval (float): Seconds between polls of the nodes. Default ``0.5``.
+            timeout (float): Seconds to wait for. Default no limit.
+            policy (dict): Optional :ref:`aerospike_info_policies`.
+
+        Raises:
+            :exc:`~aerospike.exception.TimeoutError` if the job is still running after *timeout* seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done(policy):
+            self._check_deadline(deadline, poll_interval)
+            time.sleep(poll_interval)
+
+    async def wait_async(
+        self, poll_interval: float = POLL_INTERVAL, timeout: Optional[float] = None, policy: Optional[dict] = None
+    ):
+        """Wait for the job to finish on every node, without blocking the event loop.
+
+        The nodes are polled at the same time, each in a thread of the loop's default executor.
+
+        Args:
+            poll_interval (float): Seconds between polls of the nodes. Default ``0.5``.
+            timeout (float): Seconds to wait for. Default no limit.
+            policy (dict): Optional :ref:`aerospike_info_policies`.
+
+        Raises:
+            :exc:`~aerospike.exception.TimeoutError` if the job is still running after *timeout* seconds.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            nodes = await loop.run_in_executor(None, self.client.get_node_names)
+            statuses = await asyncio.gather(
+                *(loop.run_in_executor(None, self._node_status, node["node_name"], policy) for node in nodes)
+            )
+            if aerospike.JOB_STATUS_INPROGRESS not in statuses:
+                return
+            self._check_deadline(deadline, poll_interval)
+            await asyncio.sleep(poll_interval)
+
+    def __await__(self):
+        return self.wait_async().__await__()
+
+    def cancel(self, policy: Optional[dict] = None) -> bool:
+        """Stop the job on every node that is still running it.
+
+        Args:
+            policy (dict): Optional :ref:`aerospike_info_policies`.
+
+        Returns:
+            :py:obj:`True` if a node was still running the job.
+        """
+        cancelled = False
+        for node in self.client.get_node_names():
+            node_name = node["node_name"]
+            command = self._show_command(node_name, policy)
+            if command.startswith("jobs:"):
+                command = "jobs:module=%s;cmd=kill-job;trid=%d" % (self.module, self)
+            else:
+                command = "%s-abort:trid=%d" % (command.split("-", 1)[0], self)
+            try:
+                response = self._info(command, node_name, policy)
+            except exception.AerospikeError:
+                # The node has no such job, or it has already finished.
+                continue
+            if "ok" in response.split("\t", 1)[-1].lower():
+                cancelled = True
+        return cancelled
+
+    def _info(self, command: str, node_name: str, policy: Optional[dict]) -> str:
+        if policy is None:
+            return self.client.info_single_node(command, node_name)
+        return self.client.info_single_node(command, node_name, policy)
+
+    def _show_command(self, node_name: str, policy: Optional[dict]) -> str:
+        # Like job_info, pick the command the node supports.
+        if node_name not in self._show_commands:
+            features = self._info("features", node_name, policy).split("\t", 1)[-1].strip().split(";")
+            if "pquery" in features:
+                # query-show shows both scans and queries.
+                command = "query-show:trid=%d" % self
+            elif "query-show" in features:
+                command = "%s-show:trid=%d" % (self.module, self)
+            else:
+                command = "jobs:module=%s;cmd=get-job;trid=%d" % (self.module, self)
+            self._show_commands[node_name] = command
+        return self._show_commands[node_name]
+
+    def _node_status(self, node_name: str, policy: Optional[dict]) -> int:
+        try:
+            response = self._info(self._show_command(node_name, policy), node_name, policy)
+        except exception.RecordNotFound:
+            # The node does not know the job, as it has none of the records.
+            return aerospike.JOB_STATUS_COMPLETED
+        return parse_job_response(response)["status"]
+
+    def _check_deadline(self, deadline: Optional[float], poll_interval: float):
+        if deadline is not None and time.monotonic() + poll_interval > deadline:
+            raise exception.TimeoutError(exception.TimeoutError.code, "Job %d is still running" % self)
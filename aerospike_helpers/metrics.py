@@ -0,0 +1,312 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Client side metrics in the OpenMetrics text format, for Prometheus to scrape.
+
+:class:`MetricsCollector` counts a client's commands by method, namespace, set and result code, with a latency
+histogram and the time spent in each part of the command. The counters are kept in C, per client, and updated with
+atomic operations, so counting runs no Python code, sets no profile hook and never waits on a scrape. The connection
+pool metrics are read from :meth:`~aerospike.Client.get_stats` when the metrics are rendered.
+
+The methods counted are the ones timed by :func:`aerospike.set_profile_hook`: ``get``, ``put``, ``remove``,
+``exists``, ``apply``, ``operate``, ``get_many``, ``batch_write``, ``batch_operate``, and the ``results``,
+``foreach`` and ``pages`` of queries and scans, as ``query.results``, ``scan.foreach`` and so on. The client does
+not report retries, the node a command was sent to, or the bytes sent and received, so there are no metrics for
+those; the ``node`` label is only on the connection pool metrics.
+
+No dependencies are needed beyond the standard library.
+"""
+
+import threading
+import typing as ty
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aerospike
+from aerospike import exception
+
+#: Upper bounds, in seconds, of the command latency histogram buckets.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+#: Content type of :meth:`MetricsCollector.render`'s output.
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+SEGMENTS = ("args", "policy", "expressions", "network", "result")
+
+
+def _label_value(value):
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join('%s="%s"' % (name, _label_value(value)) for name, value in labels.items()) + "}"
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+class MetricsCollector:
+    """Count client commands and render them, and the connection pool statistics, as OpenMetrics.
+
+    Counting starts with :meth:`start`, or when used as a context manager. A client has one set of counters, so
+    only one collector should count a client at a time.
+
+    Args:
+        client (aerospike.Client): The client whose commands are counted, and whose connection pool statistics are
+            rendered.
+        buckets: Upper bounds of the latency histogram buckets, in seconds, in increasing order.
+            Default :data:`DEFAULT_BUCKETS`.
+        prefix (str): Prefix of the metric names. Default ``"aerospike_client"``.
+
+    Example::
+
+        import aerospike
+        from aerospike_helpers.metrics import MetricsCollector
+
+        client = aerospike.client({"hosts": [("127.0.0.1", 3000)]}).connect()
+        collector = MetricsCollector(client)
+        collector.start()
+        server = collector.serve(9145)
+
+        # ... run the application, Prometheus scrapes http://host:9145/metrics ...
+
+        server.shutdown()
+        collector.stop()
+    """
+
+    def __init__(
+        self,
+        client: aerospike.Client,
+        buckets: ty.Sequence[float] = DEFAULT_BUCKETS,
+        prefix: str = "aerospike_client",
+    ):
+        self.client = client
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._started = False
+
+    def start(self):
+        """Start counting the client's commands from zero."""
+        if self._started:
+            return
+        self.client._enable_metrics(self.buckets)
+        self._started = True
+
+    def stop(self):
+        """Stop counting the client's commands. The counts so far are still rendered."""
+        if not self._started:
+            return
+        self.client._disable_metrics()
+        self._started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def snapshot(self) -> ty.Dict[str, ty.Any]:
+        """Return the counts so far.
+
+        Returns:
+            A :class:`dict` with:
+
+            * ``commands``: ``(method, namespace, set, result_code)`` to the number of commands.
+            * ``latencies``: ``(method, namespace, set)`` to a list of the number of commands per bucket, then
+              the number over the last bucket, then the sum of the latencies in seconds.
+            * ``segments``: method to a list of the seconds spent in each of ``args``, ``policy``,
+              ``expressions``, ``network`` and ``result``.
+            * ``dropped``: the number of commands not counted, because the client already has too many different
+              ``(method, namespace, set, result_code)``.
+            * ``stats``: the client's :meth:`~aerospike.Client.get_stats`.
+        """
+        metrics = self.client._get_metrics()
+        commands = {}
+        latencies = {}
+        segments = {}
+        for method, ns, set_name, code, count, buckets, total, seconds in metrics["series"]:
+            commands[(method, ns, set_name, code)] = count
+            latency = buckets + [total]
+            series = (method, ns, set_name)
+            previous = latencies.get(series)
+            latencies[series] = latency if previous is None else [a + b for a, b in zip(previous, latency)]
+            previous = segments.get(method)
+            segments[method] = list(seconds) if previous is None else [a + b for a, b in zip(previous, seconds)]
+
+        return {
+            "commands": commands,
+            "latencies": latencies,
+            "segments": segments,
+            "dropped": metrics["dropped"],
+            "stats": self.client.get_stats(),
+        }
+
+    def render(self) -> str:
+        """Return the metrics in the OpenMetrics text format.
+
+        Returns:
+            A :class:`str`, to be served with :data:`CONTENT_TYPE`.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, metric_type, help_text, samples):
+            name = self.prefix + "_" + name
+            lines.append("# HELP %s %s" % (name, help_text))
+            lines.append("# TYPE %s %s" % (name, metric_type))
+            for suffix, labels, value in samples:
+                lines.append("%s%s%s %s" % (name, suffix, labels, _number(value)))
+
+        commands = sorted(snapshot["commands"].items(), key=lambda item: tuple(map(_label_value, item[0])))
+        family(
+            "commands",
+            "counter",
+            "Commands completed, by result code.",
+            [
+                ("_total", _labels(method=method, namespace=ns, set=set_name, result_code=code), count)
+                for (method, ns, set_name, code), count in commands
+            ],
+        )
+        family(
+            "timeouts",
+            "counter",
+            "Commands that timed out.",
+            [
+                ("_total", _labels(method=method, namespace=ns, set=set_name), count)
+                for (method, ns, set_name, code), count in commands
+                if code == exception.TimeoutError.code
+            ],
+        )
+
+        samples = []
+        for (method, ns, set_name), latency in sorted(
+            snapshot["latencies"].items(), key=lambda item: tuple(map(_label_value, item[0]))
+        ):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), latency):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                samples.append(("_bucket", _labels(method=method, namespace=ns, set=set_name, le=le), cumulative))
+            samples.append(("_count", _labels(method=method, namespace=ns, set=set_name), cumulative))
+            samples.append(("_sum", _labels(method=method, namespace=ns, set=set_name), latency[-1]))
+        family("command_duration_seconds", "histogram", "Command latency.", samples)
+
+        family(
+            "command_segment_seconds",
+            "counter",
+            "Time spent converting arguments, policies, expressions and results, and on the network.",
+            [
+                ("_total", _labels(method=method, segment=segment), seconds[i])
+                for method, seconds in sorted(snapshot["segments"].items())
+                for i, segment in enumerate(SEGMENTS)
+            ],
+        )
+
+        family(
+            "commands_dropped",
+            "counter",
+            "Commands not counted, because the client has too many label combinations.",
+            [("_total", "", snapshot["dropped"])],
+        )
+
+        stats = snapshot["stats"]
+        nodes = stats["nodes"]
+        pools = ("sync", "async", "pipeline")
+        family(
+            "connections",
+            "gauge",
+            "Open connections to a node.",
+            [
+                ("", _labels(node=node["node_name"], pool=pool, state=state), node[pool][state])
+                for node in nodes
+                for pool in pools
+                for state in ("in_use", "idle")
+            ],
+        )
+        for counter in ("opened", "closed"):
+            family(
+                "connections_" + counter,
+                "counter",
+                "Connections %s to a node." % counter,
+                [
+                    ("_total", _labels(node=node["node_name"], pool=pool), node[pool][counter])
+                    for node in nodes
+                    for pool in pools
+                ],
+            )
+        family(
+            "node_errors",
+            "gauge",
+            "Errors counted for a node in the current error rate window.",
+            [("", _labels(node=node["node_name"]), node["error_count"]) for node in nodes],
+        )
+        family(
+            "node_error_rate_exceeded",
+            "gauge",
+            "1 while commands to a node are rejected for exceeding max_error_rate.",
+            [("", _labels(node=node["node_name"]), int(node["error_rate_exceeded"])) for node in nodes],
+        )
+        family(
+            "event_loop_queued_commands",
+            "gauge",
+            "Commands waiting to start on an async event loop.",
+            [("", _labels(event_loop=i), loop["queued"]) for i, loop in enumerate(stats["event_loops"])],
+        )
+        family(
+            "thread_pool_queued_tasks",
+            "gauge",
+            "Batch, scan and query tasks waiting for a thread.",
+            [("", "", stats["thread_pool_queued_tasks"])],
+        )
+        family("tends", "counter", "Cluster tends.", [("_total", "", stats["tend_count"])])
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, addr: str = "") -> ThreadingHTTPServer:
+        """Serve the metrics over HTTP from a daemon thread, on any path.
+
+        Args:
+            port (int): Port to listen on. ``0`` picks a free port, available as ``server.server_port``.
+            addr (str): Address to listen on. Default all addresses.
+
+        Returns:
+            The :class:`http.server.ThreadingHTTPServer`. Call its ``shutdown()`` method to stop serving.
+        """
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = collector.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((addr, port), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name="aerospike-metrics", daemon=True)
+        thread.start()
+        return server
@@ -0,0 +1,246 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Helpers for reading a paginated :class:`~aerospike.Query` or :class:`~aerospike.Scan` one page at a time.
+
+Example::
+
+    import aerospike
+    from aerospike_helpers.pagination import pages
+
+    config = {"hosts": [("127.0.0.1", 3000)]}
+    client = aerospike.client(config)
+
+    query = client.query("test", "demo")
+    query.where(aerospike.predicates.between("age", 20, 30))
+    for page in pages(query, 1000):
+        for key, meta, bins in page:
+            ...
+"""
+
+import threading
+import typing as ty
+from typing import Optional
+
+import aerospike
+
+TypeColumnarPage = ty.Dict[str, ty.Any]
+
+
+def to_columns(records: ty.List[tuple]) -> TypeColumnarPage:
+    """Convert a list of :ref:`aerospike_record_tuple` into a columnar page.
+
+    Returns:
+        A :class:`dict` with ``"keys"`` and ``"metadata"`` lists and a ``"bins"`` dict mapping each bin name
+        to a list of values, all in record order. A record that does not have a bin holds ``None`` in
+        that bin's list.
+
+    Example::
+
+        from aerospike_helpers.pagination import to_columns
+
+        records = [
+            (("test", "demo", 1, bytearray(20)), {"ttl": 100, "gen": 1}, {"a": 1, "b": 2}),
+            (("test", "demo", 2, bytearray(20)), {"ttl": 100, "gen": 1}, {"a": 3}),
+        ]
+        print(to_columns(records)["bins"])
+        # {'a': [1, 3], 'b': [2, None]}
+    """
+    keys = []
+    metadata = []
+    bins = {}
+    for index, (key, meta, record_bins) in enumerate(records):
+        keys.append(key)
+        metadata.append(meta)
+        for bin_name, value in (record_bins or {}).items():
+            column = bins.get(bin_name)
+            if column is None:
+                column = bins[bin_name] = [None] * index
+            column.append(value)
+        for column in bins.values():
+            if len(column) <= index:
+                column.append(None)
+    return {"keys": keys, "metadata": metadata, "bins": bins}
+
+
+def pages(
+    command,
+    page_size: int,
+    policy: Optional[dict] = None,
+    options: Optional[dict] = None,
+    columnar: bool = False,
+    prefetch: int = 0,
+    max_buffered_records: Optional[int] = None,
+) -> ty.Iterator[ty.Union[ty.List[tuple], TypeColumnarPage]]:
+    """Yield the records of a :class:`~aerospike.Query` or :class:`~aerospike.Scan` one page at a time.
+
+    Same as :meth:`aerospike.Query.pages` and :meth:`aerospike.Scan.pages`.
+
+    The same query or scan instance is reused for every page. It is paginated, so its partition status
+    is kept between pages and each page resumes where the previous one stopped. The policy, its expressions
+    and its partition filter are converted once, and kept by the query or scan for every page.
+
+    Iteration stops when :meth:`~aerospike.Query.is_done` returns ``True``. Empty pages, which can be
+    returned while the remaining partitions are drained, are skipped.
+
+    Args:
+        command (aerospike.Query or aerospike.Scan): The query or scan to page through.
+        page_size (int): Maximum number of records per page. For a query this sets
+            :attr:`~aerospike.Query.max_records`, for a scan the ``max_records`` policy.
+        policy (dict, optional): :ref:`aerospike_query_policies` or :ref:`aerospike_scan_policies`.
+            A ``partition_filter`` in it is only applied to the first page, so a saved partition status
+            can be used to resume.
+        options (dict, optional): :ref:`aerospike_query_options`. Only valid for a query.
+        columnar (bool, optional): Yield each page as a :func:`to_columns` dict instead of a list
+            of :ref:`aerospike_record_tuple`. Default ``False``.
+        prefetch (int, optional): Number of upcoming pages fetched on a background thread while the
+            caller processes the current page. ``0`` fetches each page only when it is requested.
+            Default ``0``.
+        max_buffered_records (int, optional): When prefetching, stop fetching ahead once this many
+            records are buffered, even if fewer than ``prefetch`` pages are. At least one page is always
+            fetched ahead. Default is no limit beyond ``prefetch * page_size``. The next page is only fetched
+            once there is room for it.
+
+    Returns:
+        A generator of pages.
+
+    .. note:: The number of records in a page may be less than ``page_size`` if record counts are small
+        or unbalanced across nodes.
+
+    .. note:: With ``prefetch`` the query or scan is used by the background thread until the generator is
+        exhausted or closed, so it must not be used by the caller in the meantime. Calling ``pages()`` on it
+        again while a page is being fetched raises :exc:`~aerospike.exception.ClientError`. The GIL is released while
+        a page is on the wire, so the next page's network time overlaps the caller's processing. An error
+        raised while fetching ahead is raised by the generator when the caller reaches that page.
+
+    Example::
+
+        import aerospike
+        from aerospike_helpers.pagination import pages
+
+        config = {"hosts": [("127.0.0.1", 3000)]}
+        client = aerospike.client(config)
+
+        scan = client.scan("test", "demo")
+        scan.select("name", "age")
+        for page in pages(scan, 5000, columnar=True):
+            print(len(page["keys"]), sum(age for age in page["bins"]["age"] if age is not None))
+
+        # Keep up to two pages, and at most 8000 records, fetched ahead.
+        query = client.query("test", "demo")
+        for page in pages(query, 5000, prefetch=2, max_buffered_records=8000):
+            ...
+    """
+    settings = {"columnar": columnar, "prefetch": prefetch, "max_buffered_records": max_buffered_records}
+    if isinstance(command, aerospike.Query):
+        return command.pages(page_size, policy, options, **settings)
+    if options is not None:
+        raise ValueError("options are only supported for queries")
+    return command.pages(page_size, policy, **settings)
+
+
+def _pages(command, columnar: bool, prefetch: int, max_buffered_records: Optional[int]):
+    # Called by the pages() method of a query or scan, once it has converted its policy for every page.
+    fetch_pages = _fetch_pages(command)
+    if prefetch:
+        fetch_pages = _prefetch_pages(fetch_pages, prefetch, max_buffered_records)
+    if columnar:
+        return (to_columns(records) for records in fetch_pages)
+    return fetch_pages
+
+
+def _fetch_pages(command):
+    while True:
+        records = command._next_page()
+        if records:
+            yield records
+        if command.is_done():
+            return
+
+
+class _PageBuffer:
+    """Pages fetched ahead by a background thread, bounded by a page count and a record count."""
+
+    def __init__(self, max_pages: int, max_records: Optional[int]) -> None:
+        self.max_pages = max_pages
+        self.max_records = max_records
+        self.pages = []
+        self.records = 0
+        self.finished = False
+        self.error = None
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def _full(self) -> bool:
+        if len(self.pages) >= self.max_pages:
+            return True
+        return self.max_records is not None and bool(self.pages) and self.records >= self.max_records
+
+    def fill(self, fetch_pages: ty.Iterator[list]) -> None:
+        try:
+            while True:
+                # Wait for room before fetching, so no page is held beyond the bounds.
+                with self.cond:
+                    while self._full() and not self.closed:
+                        self.cond.wait()
+                    if self.closed:
+                        return
+                records = next(fetch_pages, None)
+                if records is None:
+                    return
+                with self.cond:
+                    self.pages.append(records)
+                    self.records += len(records)
+                    self.cond.notify_all()
+        except Exception as exc:
+            # Raised again in the consuming thread once the buffered pages are used up.
+            with self.cond:
+                self.error = exc
+        finally:
+            close = getattr(fetch_pages, "close", None)
+            if close is not None:
+                close()
+            with self.cond:
+                self.finished = True
+                self.cond.notify_all()
+
+    def drain(self) -> ty.Iterator[list]:
+        try:
+            while True:
+                with self.cond:
+                    while not self.pages and not self.finished:
+                        self.cond.wait()
+                    if not self.pages:
+                        if self.error is not None:
+                            raise self.error
+                        return
+                    records = self.pages.pop(0)
+                    self.records -= len(records)
+                    self.cond.notify_all()
+                yield records
+        finally:
+            with self.cond:
+                self.closed = True
+                self.cond.notify_all()
+
+
+def _prefetch_pages(fetch_pages: ty.Iterator[list], prefetch: int, max_buffered_records: Optional[int]):
+    # A generator, so the thread only starts on the first next(). A generator that is never iterated
+    # then leaves no thread behind.
+    buffer = _PageBuffer(prefetch, max_buffered_records)
+    thread = threading.Thread(target=buffer.fill, args=(fetch_pages,), daemon=True)
+    thread.start()
+    yield from buffer.drain()
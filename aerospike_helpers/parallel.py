@@ -0,0 +1,197 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Helpers for splitting a scan or query across partition ranges and running the ranges on a pool of workers.
+
+Each worker runs its own partition-filtered :meth:`~aerospike.Scan.results` or :meth:`~aerospike.Query.results`
+call. With ``mode="thread"`` the workers share one client and overlap their network waits. With
+``mode="process"`` each worker process opens its own client, so record conversion runs under a separate
+GIL per process and scales with the number of cores.
+"""
+
+import multiprocessing
+import typing as ty
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+import aerospike
+
+#: Number of partitions in an Aerospike namespace.
+PARTITION_COUNT = 4096
+
+MODE_THREAD = "thread"
+MODE_PROCESS = "process"
+
+TypePartitionRange = ty.Tuple[int, int]
+
+
+def partition_ranges(workers: int, begin: int = 0, count: int = PARTITION_COUNT) -> ty.List[TypePartitionRange]:
+    """Split ``count`` partitions starting at ``begin`` into at most ``workers`` contiguous ranges.
+
+    The ranges differ in size by at most one partition.
+
+    Args:
+        workers (int): Number of ranges to produce.
+        begin (int): First partition ID. Default ``0``.
+        count (int): Number of partitions to split. Default ``4096``.
+
+    Returns:
+        A :class:`list` of ``(begin, count)`` tuples that can be used as a ``partition_filter``.
+
+    Example::
+
+        from aerospike_helpers.parallel import partition_ranges
+
+        print(partition_ranges(3))
+        # [(0, 1366), (1366, 1365), (2731, 1365)]
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if begin < 0 or count < 1 or begin + count > PARTITION_COUNT:
+        raise ValueError("begin and count must describe a range within 0 and {}".format(PARTITION_COUNT))
+
+    workers = min(workers, count)
+    size, extra = divmod(count, workers)
+    ranges = []
+    start = begin
+    for i in range(workers):
+        part_count = size + 1 if i < extra else size
+        ranges.append((start, part_count))
+        start += part_count
+    return ranges
+
+
+class _Spec(ty.NamedTuple):
+    namespace: str
+    set_name: Optional[str]
+    bins: Optional[ty.Sequence[str]]
+    predicate: Optional[tuple]
+    policy: Optional[dict]
+    map_fn: Optional[ty.Callable[[list], ty.Any]]
+
+
+def _run_range(client, spec: _Spec, part_range: TypePartitionRange):
+    begin, count = part_range
+    if spec.predicate is None:
+        command = client.scan(spec.namespace, spec.set_name)
+    else:
+        command = client.query(spec.namespace, spec.set_name)
+        command.where(spec.predicate)
+    if spec.bins:
+        command.select(*spec.bins)
+
+    policy = dict(spec.policy) if spec.policy else {}
+    policy["partition_filter"] = {"begin": begin, "count": count}
+    records = command.results(policy)
+    if spec.map_fn is not None:
+        return spec.map_fn(records)
+    return records
+
+
+def _run_range_in_process(config: dict, spec: _Spec, part_range: TypePartitionRange):
+    client = aerospike.client(config)
+    try:
+        return _run_range(client, spec, part_range)
+    finally:
+        client.close()
+
+
+def parallel_results(
+    client,
+    namespace: str,
+    set_name: Optional[str] = None,
+    workers: int = 4,
+    mode: str = MODE_THREAD,
+    bins: Optional[ty.Sequence[str]] = None,
+    predicate: Optional[tuple] = None,
+    policy: Optional[dict] = None,
+    config: Optional[dict] = None,
+    map_fn: Optional[ty.Callable[[list], ty.Any]] = None,
+    mp_context=None,
+) -> list:
+    """Scan or query all partitions of a set with ``workers`` concurrent partition-filtered commands.
+
+    A scan is run when ``predicate`` is ``None`` and a query otherwise. Results are merged in partition
+    order, so records from lower partition IDs come first.
+
+    Args:
+        client (aerospike.Client): A connected client. Used directly in thread mode and ignored in process mode.
+        namespace (str): Namespace to read.
+        set_name (str, optional): Set to read. ``None`` reads the whole namespace.
+        workers (int): Number of partition ranges run concurrently. Default ``4``.
+        mode (str): ``"thread"`` or ``"process"``. Default ``"thread"``.
+        bins (list, optional): Bin names to select.
+        predicate (tuple, optional): A predicate from :mod:`aerospike.predicates`. Turns the scan into a query.
+        policy (dict, optional): :ref:`aerospike_scan_policies` or :ref:`aerospike_query_policies`.
+            Any ``partition_filter`` in it is replaced for each worker.
+        config (dict, optional): Client config used to open one client per worker process.
+            Required in process mode.
+        map_fn (callable, optional): Called with each worker's list of records, in the worker.
+            Its return values are returned instead of the records. In process mode it must be picklable,
+            i.e. a module level function. Use it to reduce records before they are sent back to the
+            parent process.
+        mp_context (optional): :mod:`multiprocessing` context for process mode. Default is the ``"spawn"``
+            context, which does not inherit the parent's client threads.
+
+    Returns:
+        A :class:`list` of :ref:`aerospike_record_tuple`, or a :class:`list` of ``map_fn`` return
+        values (one per worker) if ``map_fn`` is given.
+
+    .. note:: In process mode records are pickled to be sent back to the parent process. Bins holding
+        types that cannot be pickled should be reduced with ``map_fn`` first.
+
+    Example::
+
+        import aerospike
+        from aerospike_helpers.parallel import parallel_results
+
+        config = {"hosts": [("127.0.0.1", 3000)]}
+        client = aerospike.client(config)
+
+        # Four threads sharing one client.
+        records = parallel_results(client, "test", "demo", workers=4)
+
+        # Eight processes, each with its own client, returning only record counts.
+        def count(records):
+            return len(records)
+
+        if __name__ == "__main__":
+            counts = parallel_results(client, "test", "demo", workers=8, mode="process", config=config, map_fn=count)
+            print(sum(counts))
+    """
+    ranges = partition_ranges(workers)
+    spec = _Spec(namespace, set_name, bins, predicate, policy, map_fn)
+
+    if mode == MODE_THREAD:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            parts = list(executor.map(lambda part_range: _run_range(client, spec, part_range), ranges))
+    elif mode == MODE_PROCESS:
+        if config is None:
+            raise ValueError("config is required in process mode")
+        if mp_context is None:
+            mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=mp_context) as executor:
+            parts = list(executor.map(_run_range_in_process, [config] * len(ranges), [spec] * len(ranges), ranges))
+    else:
+        raise ValueError("mode must be '{}' or '{}'".format(MODE_THREAD, MODE_PROCESS))
+
+    if map_fn is not None:
+        return parts
+
+    results = []
+    for records in parts:
+        results.extend(records)
+    return results
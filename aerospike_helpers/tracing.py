@@ -0,0 +1,126 @@
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+OpenTelemetry spans for client commands.
+
+:class:`CommandTracer` turns the commands timed by :func:`aerospike.set_trace_hook` into client spans. The client
+decides which commands are sampled before timing them, so the commands that are not sampled cost no more than
+with tracing off.
+
+A span is made when its command completes, in the thread that made the command, so it is a child of the span
+that was current when the command was made. It starts when the command started. Its attributes follow the
+OpenTelemetry database conventions, plus the seconds spent in each part of the command and, for ``get``, ``put``
+and ``operate``, the size of the bin values sent and received.
+
+There is one span per command. Retries are not traced: a retried command is one span, covering all its attempts.
+Batches, queries and scans are not split by node either: the sub-batches sent to each node have no spans of their
+own. The node a command was sent to is not known, so spans have no attribute for it.
+
+The ``opentelemetry-api`` package is needed, and an OpenTelemetry SDK to export the spans.
+"""
+
+import typing as ty
+
+import aerospike
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+SEGMENTS = ("args", "policy", "expressions", "network", "result")
+
+
+class CommandTracer:
+    """Make an OpenTelemetry span for each sampled client command.
+
+    Tracing starts with :meth:`start`, or when used as a context manager. There is one trace hook for all
+    clients, so only one tracer can be started at a time.
+
+    Args:
+        tracer_provider: The OpenTelemetry tracer provider to make spans with. Default the global one.
+        sample_rate (float): The fraction of commands to trace, from ``0.0`` to ``1.0``. Default ``1.0``.
+
+    Raises:
+        :exc:`ImportError` if ``opentelemetry-api`` is not installed.
+
+    Example::
+
+        import aerospike
+        from aerospike_helpers.tracing import CommandTracer
+
+        client = aerospike.client({"hosts": [("127.0.0.1", 3000)]}).connect()
+
+        with CommandTracer(sample_rate=0.01):
+            # ... one command in a hundred is traced ...
+            client.get(("test", "demo", 1))
+    """
+
+    def __init__(self, tracer_provider: ty.Any = None, sample_rate: float = 1.0):
+        if trace is None:
+            raise ImportError("aerospike_helpers.tracing needs the opentelemetry-api package")
+        self.tracer = trace.get_tracer(__name__, tracer_provider=tracer_provider)
+        self.sample_rate = sample_rate
+        self._started = False
+
+    def start(self):
+        """Start tracing commands, by setting the trace hook."""
+        if self._started:
+            return
+        aerospike.set_trace_hook(self._hook, self.sample_rate)
+        self._started = True
+
+    def stop(self):
+        """Stop tracing commands, by unsetting the trace hook."""
+        if not self._started:
+            return
+        aerospike.set_trace_hook(None)
+        self._started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _hook(self, timings):
+        start_time = timings["start_time_ns"]
+        method = timings["method"]
+        attributes = {"db.system.name": "aerospike", "db.operation.name": method}
+        if timings["namespace"] is not None:
+            attributes["db.namespace"] = timings["namespace"]
+        if timings["set"] is not None:
+            attributes["db.collection.name"] = timings["set"]
+        code = timings["result_code"]
+        if code is not None:
+            attributes["db.response.status_code"] = str(code)
+        for segment in SEGMENTS:
+            attributes["aerospike.%s_seconds" % segment] = timings[segment]
+        for size in ("request_bytes", "response_bytes"):
+            if timings[size] is not None:
+                attributes["aerospike.%s" % size] = timings[size]
+
+        span = self.tracer.start_span(
+            method,
+            kind=trace.SpanKind.CLIENT,
+            attributes=attributes,
+            start_time=start_time,
+        )
+        # A call that returned normally, like a get of a missing record with missing_ok, is not an error.
+        if timings["raised"]:
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.end(end_time=start_time + int(timings["total"] * 1e9))
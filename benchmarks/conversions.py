@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Micro-benchmarks for the client's Python <-> C conversions.
+
+No server is needed. Each case calls the test only aerospike._convert_roundtrip()
+entry point, which runs one conversion in a loop inside the extension, and
+reports the time and the number of Python allocations per conversion.
+
+The allocations are those of the Python objects a conversion returns, counted
+with tracemalloc. Python cannot count the blocks a conversion allocates and
+frees again before it returns; the peak bytes traced include those.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import aerospike
+from aerospike_helpers.expressions import base as exp
+
+##########################################################################
+# Value shapes
+##########################################################################
+
+
+def expressions():
+    return exp.And(
+        exp.GE(exp.IntBin("age"), 18),
+        exp.Eq(exp.StrBin("country"), "NL"),
+        exp.Or(exp.BinExists("email"), exp.BinExists("phone")),
+    ).compile()
+
+
+def cases():
+    compiled = expressions()
+    return [
+        ("key", "str key", ("test", "demo", "user-00001")),
+        ("key", "int key", ("test", "demo", 123456789)),
+        ("record", "10 int bins", {"bin%d" % i: i for i in range(10)}),
+        ("record", "10 str bins", {"bin%d" % i: "value-%d" % i for i in range(10)}),
+        ("record", "nested map", {"profile": {"name": "a", "tags": ["x", "y", "z"], "scores": {"a": 1, "b": 2.5}}}),
+        ("record", "1 MiB blob", {"blob": bytearray(1024 * 1024)}),
+        ("val", "list of 1000 ints", list(range(1000))),
+        ("val", "map of 1000 ints", {i: i for i in range(1000)}),
+        ("val", "nested lists", [[i, [i, str(i)]] for i in range(100)]),
+        ("serializer", "tuple", (1, "two", 3.0)),
+        ("expressions", "3 clause filter", compiled),
+        ("policy_read", "timeouts", {"total_timeout": 1000, "socket_timeout": 500, "max_retries": 2}),
+        ("policy_write", "with expressions", {"total_timeout": 1000, "expressions": compiled}),
+        ("policy_query", "with expressions", {"total_timeout": 1000, "expressions": compiled}),
+    ]
+
+
+##########################################################################
+# Measurement
+##########################################################################
+
+
+def measure(kind, value, iterations, repeat):
+    # Warm up, so one time imports and caches are not counted.
+    aerospike._convert_roundtrip(kind, value, 10)
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        aerospike._convert_roundtrip(kind, value, iterations)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    blocks_before = sys.getallocatedblocks()
+    aerospike._convert_roundtrip(kind, value, iterations)
+    blocks_after = sys.getallocatedblocks()
+
+    tracemalloc.start()
+    result = aerospike._convert_roundtrip(kind, value, 1)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The blocks still traced to this file are the ones held by the result.
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, __file__)])
+    allocations = sum(stat.count for stat in snapshot.statistics("filename"))
+    del result
+
+    return {
+        "ns_per_op": best / iterations * 1e9,
+        "ops_per_sec": iterations / best,
+        "allocations_per_op": allocations,
+        "leaked_blocks_per_op": (blocks_after - blocks_before) / iterations,
+        "peak_bytes_per_op": peak,
+    }
+
+
+##########################################################################
+# Main
+##########################################################################
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the client's value conversions without a server.")
+    parser.add_argument("-i", "--iterations", type=int, default=10000, help="Conversions per timed run.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Timed runs per case. The fastest is reported.")
+    parser.add_argument("-k", "--kind", action="append", help="Only run cases of this kind. Can be repeated.")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = []
+    for kind, shape, value in cases():
+        if args.kind and kind not in args.kind:
+            continue
+        iterations = args.iterations
+        # Keep the large value cases short.
+        if shape == "1 MiB blob":
+            iterations = max(1, iterations // 100)
+        result = measure(kind, value, iterations, args.repeat)
+        result.update({"kind": kind, "shape": shape, "iterations": iterations})
+        results.append(result)
+
+    try:
+        from tabulate import tabulate
+    except ImportError:
+        tabulate = None
+
+    headers = ["kind", "shape", "ns/op", "ops/sec", "allocs/op", "leaked blocks/op", "peak bytes/op"]
+    rows = [
+        [
+            r["kind"],
+            r["shape"],
+            "%.0f" % r["ns_per_op"],
+            "%.0f" % r["ops_per_sec"],
+            r["allocations_per_op"],
+            "%.3f" % r["leaked_blocks_per_op"],
+            r["peak_bytes_per_op"],
+        ]
+        for r in results
+    ]
+    if tabulate:
+        print(tabulate(rows, headers=headers))
+    else:
+        for row in [headers] + rows:
+            print("\t".join(str(col) for col in row))
+
+    if args.json_path:
+        with open(args.json_path, "w") as json_file:
+            json.dump({"client_version": aerospike.__version__, "results": results}, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,6 @@ import signal
 import sys
 import time
 
-# from guppy import hpy
 from optparse import OptionParser
 
 ##########################################################################
@@ -105,8 +104,6 @@ def total_summary():
     print("     {0} seconds for {1} operations".format(elapse, count))
     print("     {0} operations per second".format(count / elapse))
     print()
-    # print("Heap: ")
-    # print(heapy.heap())
 
     sys.exit(0)
 
@@ -18,23 +18,22 @@
 from __future__ import print_function
 
 import aerospike
+import multiprocessing
 import random
+import resource
 import signal
 import sys
 import string
+import threading
 import time
 
 
 from optparse import OptionParser
-import copy
 from tabulate import tabulate
 
-# Guppy is only available in python 2.7, try to load it
-try:
-    from guppy import hpy
-    HAVE_HEAPY = True
-except ImportError:
-    HAVE_HEAPY = False
+from aerospike_helpers.batch.records import BatchRecords, Write
+from aerospike_helpers.operations import operations
+
 # set maximum integer value compatible in python2 and 3
 try:
     MAX_INT = sys.maxint
@@ -109,14 +108,6 @@ optparser.add_option(
     "--int-max", dest="int_max", type="int", default=MAX_INT,
     help="Maximum value for generated integere.")
 
-optparser.add_option(
-    "--heap", dest="heap", action="store_true",
-    help="Check the heap. Produce a heap report at the end of the run.")
-
-optparser.add_option(
-    "--heap-interval", dest="heap_interval", type="int", default=0,
-    help="Display heap report after every n operations.")
-
 optparser.add_option(
     "--reads", dest="reads", type="int", default=80,
     help="Read ratio, as an integer between 0 and 100")
@@ -130,16 +121,33 @@ optparser.add_option(
     help="Number of unique keys")
 
 optparser.add_option(
-    "-l", "--latency", dest="latency", type="string", default="4,1",
-    help="<number of latency columns>,<range shift increment> Show transaction latency percentages using elapsed time ranges.\
-    <number of latency columns>: Number of elapsed time ranges. <range shift increment>: Power of 2 multiple between each range starting at column 3.\
-    A latency definition of '-latency 7,1' results in this layout:\
-        <=1ms >1ms >2ms >4ms >8ms >16ms >32ms\
-           x%   x%   x%   x%   x%    x%    x%\
-    A latency definition of '-latency 4,3' results in this layout:\
-        <=1ms >1ms >8ms >64ms\
-           x%   x%   x%    x%\
-    Latency columns are cumulative. If a transaction takes 9ms, it will be included in both the >1ms and >8ms columns.")
+    "-d", "--duration", dest="duration", type="float", default=0,
+    help="Seconds to run for. By default the benchmark runs until it is interrupted.")
+
+optparser.add_option(
+    "--threads", dest="threads", type="int", default=1,
+    help="Number of threads sending commands in each process. The threads of a process share one client.")
+
+optparser.add_option(
+    "--processes", dest="processes", type="int", default=1,
+    help="Number of processes, each with its own client and --threads threads.")
+
+optparser.add_option(
+    "--batch-size", dest="batch_size", type="int", default=0,
+    help="Read and write batches of this many keys with exists_many() and batch_write(), instead of one key\
+    per command.")
+
+optparser.add_option(
+    "--async", dest="use_async", action="store_true",
+    help="Send commands with get_async() and put_async(). Needs a client built with an event library.")
+
+optparser.add_option(
+    "--async-commands", dest="async_commands", type="int", default=100,
+    help="Maximum number of async commands in flight in each process.")
+
+optparser.add_option(
+    "--max-conns", dest="max_conns", type="int", default=0,
+    help="Maximum connections per node in each client (max_conns_per_node). Default is the client's default.")
 
 (options, args) = optparser.parse_args()
 
@@ -148,6 +156,12 @@ if options.help:
     print()
     sys.exit(1)
 
+if options.threads < 1 or options.processes < 1 or options.batch_size < 0 or options.async_commands < 1:
+    optparser.error("--threads, --processes and --async-commands must be at least 1, --batch-size at least 0")
+
+if options.use_async and (options.batch_size or options.threads > 1):
+    optparser.error("--async can not be combined with --batch-size or --threads")
+
 ##########################################################################
 # Client Configuration
 ##########################################################################
@@ -156,6 +170,9 @@ config = {
     'hosts': [(options.host, options.port)]
 }
 
+if options.max_conns:
+    config['max_conns_per_node'] = options.max_conns
+
 ##########################################################################
 # Generators
 ##########################################################################
@@ -209,94 +226,270 @@ def genint():
 
 
 ##########################################################################
-# Application
+# Latency
 ##########################################################################
 
-exitCode = 0
-
-k = options.keys
-r = options.reads
-w = options.writes
-
-total_count = 0
-read_count = 0
-write_count = 0
-start = 0
-intervals = []
-if HAVE_HEAPY:
-    heapy = hpy()
-
-no_of_buckets, range_increment = [
-    int(elem.strip()) for elem in options.latency.split(',')]
 
-__buckets = [0, 1] + [elem << i for i in [0]
-                      for elem in [1] * (no_of_buckets - 2) for i in [i + range_increment]]
-
-# Separate buckets for read / write latency data
-read_bucket = dict.fromkeys(__buckets, 0)
-write_bucket = copy.deepcopy(read_bucket)
-
-# return current time in ms
-current_milliseconds_time = lambda: int(round(time.time() * 1000))
-
-# returns latency table headers
-
-
-def get_latency_table_headers():
-    headers = ["", "<=1ms", ">1ms"] + \
-        [">{0}ms".format(i) for i in __buckets[2:]]
-    return headers
-
-# manages the read / write operations counter in latency dictionaries
+class LatencyHistogram(object):
+    """
+    Latencies in microseconds, counted in log-linear buckets like HdrHistogram: exact below 128us and
+    within 1/64 (about 1.6%) above. Histograms of several threads or processes can be merged.
+    """
+
+    def __init__(self):
+        # (shift, value >> shift) to count
+        self.counts = {}
+        self.total = 0
+        self.max = 0
+
+    def record(self, micros):
+        micros = int(micros)
+        shift = max(micros.bit_length() - 7, 0)
+        bucket = (shift, micros >> shift)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        if micros > self.max:
+            self.max = micros
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        # Highest latency in the bucket holding the given percentile.
+        target = self.total * percent / 100.0
+        seen = 0
+        for shift, value in sorted(self.counts):
+            seen += self.counts[(shift, value)]
+            if seen >= target:
+                return min(((value + 1) << shift) - 1, self.max)
+        return self.max
+
+
+class Stats(object):
+
+    def __init__(self):
+        self.reads = LatencyHistogram()
+        self.writes = LatencyHistogram()
+        self.records = 0
+        self.errors = 0
+        # Largest maximum resident set size of the processes, in KiB.
+        self.max_rss = 0
+
+    @property
+    def commands(self):
+        return self.reads.total + self.writes.total
+
+    def merge(self, other):
+        self.reads.merge(other.reads)
+        self.writes.merge(other.writes)
+        self.records += other.records
+        self.errors += other.errors
+        self.max_rss = max(self.max_rss, other.max_rss)
+
+
+def elapsed_micros(start):
+    return (time.perf_counter() - start) * 1000000
 
+##########################################################################
+# Application
+##########################################################################
 
-def increment_counters(bucket, time_in_millisecond):
-    if time_in_millisecond <= 0:
-        bucket[0] += 1
-    for key in bucket.keys():
-        if time_in_millisecond >= key > 0:
-            bucket[key] += 1
+def random_key(keys):
+    return (options.namespace, options.set, keys[random.randint(0, len(keys) - 1)])
 
-# format the output as per tabulate standard and calculate percentages as well
 
+def run_sync(client, keys, stats, stopping):
+    for op in operation(options.reads, options.writes):
+        if stopping.is_set():
+            return
 
-def interprete_summary():
-    global total_count, read_count, write_count, read_bucket, write_bucket
+        key = random_key(keys)
+        print('[READ] ' if op == READ_OP else '[WRITE]', key) if options.verbose else 0
+        start = time.perf_counter()
+        try:
+            if op == READ_OP:
+                client.exists(key)
+            else:
+                client.put(key, {'key': key[2]})
+        except aerospike.exception.AerospikeError as eargs:
+            print("error: {0}".format(eargs), file=sys.stderr) if options.verbose else 0
+            stats.errors += 1
+            continue
+
+        elapsed = elapsed_micros(start)
+        print('[ELAPSED] {0}us'.format(int(elapsed))) if options.verbose else 0
+        (stats.reads if op == READ_OP else stats.writes).record(elapsed)
+        stats.records += 1
+
+
+def run_batch(client, keys, stats, stopping):
+    for op in operation(options.reads, options.writes):
+        if stopping.is_set():
+            return
+
+        batch_keys = [random_key(keys) for _ in range(options.batch_size)]
+        start = time.perf_counter()
+        try:
+            if op == READ_OP:
+                client.exists_many(batch_keys)
+            else:
+                client.batch_write(BatchRecords(
+                    [Write(key, [operations.write('key', key[2])]) for key in batch_keys]))
+        except aerospike.exception.AerospikeError as eargs:
+            print("error: {0}".format(eargs), file=sys.stderr) if options.verbose else 0
+            stats.errors += 1
+            continue
+
+        (stats.reads if op == READ_OP else stats.writes).record(elapsed_micros(start))
+        stats.records += options.batch_size
+
+
+def run_async(client, keys, stats, stopping):
+    # The callbacks all run on the client's event loop thread, so they can update stats without a lock.
+    in_flight = threading.Semaphore(options.async_commands)
+
+    def finished(histogram, start, err):
+        # A read of a key that was not written yet is not an error.
+        if err[0] in (0, aerospike.exception.RecordNotFound.code):
+            histogram.record(elapsed_micros(start))
+            stats.records += 1
+        else:
+            stats.errors += 1
+        in_flight.release()
+
+    # Whether this thread holds a permit that no command was sent with.
+    held = False
+    for op in operation(options.reads, options.writes):
+        while not in_flight.acquire(timeout=0.1):
+            if stopping.is_set():
+                break
+        else:
+            held = True
+        if stopping.is_set():
+            break
+
+        held = False
+        key = random_key(keys)
+        start = time.perf_counter()
+        if op == READ_OP:
+            client.get_async(
+                lambda key, record, err, exception, start=start: finished(stats.reads, start, err), key)
+        else:
+            client.put_async(
+                lambda key, err, exception, start=start: finished(stats.writes, start, err), key, {'key': key[2]})
+
+    # Wait for the commands still in flight, which hold all the permits but the one held here.
+    for _ in range(options.async_commands - held):
+        in_flight.acquire(timeout=10)
+
+
+def run_worker(keys, stopping):
+    """
+    Send commands with one client, from --threads threads or from the async loop, until stopping is set.
+    Returns the Stats of all of them.
+    """
+    client = aerospike.client(config).connect(options.username, options.password)
+    stats = Stats()
+    try:
+        if options.use_async:
+            run_async(client, keys, stats, stopping)
+        else:
+            target = run_batch if options.batch_size else run_sync
+            thread_stats = [Stats() for _ in range(options.threads)]
+            threads = [threading.Thread(target=target, args=(client, keys, s, stopping)) for s in thread_stats]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for s in thread_stats:
+                stats.merge(s)
+    finally:
+        client.close()
+
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    stats.max_rss = max_rss // 1024 if sys.platform == "darwin" else max_rss
+    return stats
+
+
+def run_process(keys, stopping, results):
+    # Only the parent process handles CTRL+C. It stops the workers with the stopping event.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Checking a multiprocessing.Event takes a lock, so the worker threads check a local one. It is polled rather
+    # than waited on: a process that exits while waiting leaves the parent's set() blocked.
+    local_stopping = threading.Event()
+
+    def watch():
+        while not stopping.is_set():
+            time.sleep(0.05)
+        local_stopping.set()
+
+    threading.Thread(target=watch, daemon=True).start()
 
-    read_summary = ['read'] + ['{0}%'.format(
-        int(round(read_bucket[key] * 100 / read_count))) for key in read_bucket.keys()]
-    write_summary = ['write'] + ['{0}%'.format(
-        int(round(write_bucket[key] * 100 / write_count))) for key in write_bucket.keys()]
+    try:
+        if options.use_async:
+            aerospike.init_async()
+        results.put(run_worker(keys, local_stopping))
+    except Exception as eargs:
+        # Client exceptions do not survive pickling, so only the message is sent back.
+        results.put(str(eargs))
 
-    return read_summary, write_summary
 
+def wait_for(workers):
+    deadline = time.time() + options.duration if options.duration > 0 else None
+    try:
+        while any(worker.is_alive() for worker in workers):
+            if deadline is not None and time.time() >= deadline:
+                return
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
 
-def total_summary():
 
-    # stop time
-    stop = time.time()
+def describe_mode():
+    if options.use_async:
+        mode = "async, up to {0} commands in flight per process".format(options.async_commands)
+    elif options.batch_size:
+        mode = "batches of {0} keys, {1} threads per process".format(options.batch_size, options.threads)
+    else:
+        mode = "sync, {0} threads per process".format(options.threads)
+    return "{0} processes, {1}".format(options.processes, mode)
 
-    # elapse time
-    elapse = (stop - start)
 
+def total_summary(stats, elapse):
     print()
     print("Summary:")
-    print("     {0} keys generated".format(k))
-    print("     {0} seconds for {1} operations".format(elapse, total_count))
-    print("     {0} operations per second".format(total_count / elapse))
+    print("     {0} keys generated".format(options.keys))
+    print("     {0}".format(describe_mode()))
+    print("     {0} seconds for {1} operations".format(elapse, stats.commands))
+    print("     {0} operations per second".format(stats.commands / elapse))
+    if options.batch_size:
+        print("     {0} records per second".format(stats.records / elapse))
+    if stats.errors:
+        print("     {0} errors".format(stats.errors))
     print()
-    print("Latency stats:")
-    table = [info for info in interprete_summary()]
-    print(tabulate(table, headers=get_latency_table_headers()))
+    print("Latency stats (ms):")
+    table = [
+        [name, histogram.total]
+        + ["{0:.3f}".format(histogram.percentile(p) / 1000.0) for p in (50, 90, 99, 99.9)]
+        + ["{0:.3f}".format(histogram.max / 1000.0)]
+        for name, histogram in (("read", stats.reads), ("write", stats.writes))
+        if histogram.total
+    ]
+    print(tabulate(table, headers=["", "count", "p50", "p90", "p99", "p99.9", "max"]))
     print()
-    if HAVE_HEAPY:
-        print("Heap: ")
-        print(heapy.heap())
+    print("Max RSS per process: {0:.1f} MiB".format(stats.max_rss / 1024.0))
 
-    sys.exit(0)
 
-try:
+def stop_on_sigterm(signum, frame):
+    raise KeyboardInterrupt()
+
 
+def main():
     # ----------------------------------------------------------------------------
     # Generate Keys
     # ----------------------------------------------------------------------------
@@ -306,82 +499,68 @@ try:
     else:
         gen = genint
 
-    print("Generating keys: ", k)
-    keys = [gen() for _ in range(k)]
+    print("Generating keys: ", options.keys)
+    keys = [gen() for _ in range(options.keys)]
     print("done.")
     print()
 
     # ----------------------------------------------------------------------------
-    # Connect to Cluster
+    # Perform Operations
     # ----------------------------------------------------------------------------
 
-    client = aerospike.client(config).connect(
-        options.username, options.password)
-
-    # ----------------------------------------------------------------------------
-    # Perform Operation
-    # ----------------------------------------------------------------------------
-
-    try:
-
-        signal.signal(signal.SIGTERM, total_summary)
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
 
+    if options.duration <= 0:
         print()
         print("Press CTRL+C to quit.")
         print()
 
-        start = time.time()
-
-        if HAVE_HEAPY:
-            print("HEAP@{0}: {1}".format(0, heapy.heap()))
-
-        # run the operatons
-        for op in operation(r, w):
-
-            key = (options.namespace, options.set,
-                   keys[random.randint(0, k - 1)])
-
-            if op == READ_OP:
-                print('[READ] ', key) if options.verbose else 0
-                now = current_milliseconds_time()
-                result = client.exists(key)
-                elapsed = current_milliseconds_time() - now
-                print('[READ ELAPSED] {0}ms'.format(
-                    elapsed)) if options.verbose else 0
-                increment_counters(read_bucket, elapsed)
-                total_count += 1
-                read_count += 1
-
-            elif op == WRITE_OP:
-                print('[WRITE]', key) if options.verbose else 0
-                rec = {
-                    'key': key[2]
-                }
-                now = current_milliseconds_time()
-                client.put(key, rec)
-                elapsed = current_milliseconds_time() - now
-                print('[WRITE ELAPSED] {0}ms'.format(
-                    elapsed)) if options.verbose else 0
-                increment_counters(write_bucket, elapsed)
-                total_count += 1
-                write_count += 1
-
-            if options.heap_interval > 0 and (total_count % options.heap_interval) == 0:
-                if HAVE_HEAPY:
-                    print("HEAP@{0}: {1}".format(total_count, heapy.heap()))
-
-    except KeyboardInterrupt:
-        total_summary()
-    except Exception as eargs:
-        print("error: {0}".format(eargs), file=sys.stderr)
-        sys.exit(2)
-
-except Exception as eargs:
-    print("error: {0}".format(eargs), file=sys.stderr)
-    sys.exit(3)
-
-##########################################################################
-# Exit
-##########################################################################
-
-sys.exit(0)
+    results = []
+    start = time.time()
+
+    if options.processes == 1:
+        stopping = threading.Event()
+        if options.use_async:
+            try:
+                aerospike.init_async()
+            except aerospike.exception.ClientError as eargs:
+                print("error: {0}".format(eargs.msg), file=sys.stderr)
+                sys.exit(2)
+
+        def run():
+            try:
+                results.append(run_worker(keys, stopping))
+            except Exception as eargs:
+                results.append(str(eargs))
+
+        workers = [threading.Thread(target=run)]
+        workers[0].start()
+        wait_for(workers)
+        stopping.set()
+        workers[0].join()
+    else:
+        stopping = multiprocessing.Event()
+        queue = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=run_process, args=(keys, stopping, queue))
+                   for _ in range(options.processes)]
+        for worker in workers:
+            worker.start()
+        wait_for(workers)
+        stopping.set()
+        results = [queue.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+
+    elapse = time.time() - start
+
+    stats = Stats()
+    for result in results:
+        if not isinstance(result, Stats):
+            print("error: {0}".format(result), file=sys.stderr)
+            sys.exit(2)
+        stats.merge(result)
+    total_summary(stats, elapse)
+
+
+if __name__ == "__main__":
+    main()
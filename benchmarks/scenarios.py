@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Scenario benchmarks for batch, query, scan and operate workloads.
+
+Each scenario calls one client method in a loop for a fixed time against a set of
+records written at the start, and reports calls and records per second, call
+latencies, and the Python memory used per call. Results can be saved as JSON to
+compare client releases.
+"""
+
+from __future__ import print_function
+
+import argparse
+import array
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.expressions import base as exp
+from aerospike_helpers.operations import list_operations as lop
+from aerospike_helpers.operations import map_operations as mop
+from aerospike_helpers.operations import operations as op
+
+##########################################################################
+# Scenarios
+##########################################################################
+
+
+def write_records(client, args):
+    for i in range(args.records):
+        client.put(
+            (args.namespace, args.set, i),
+            {
+                "id": i,
+                "name": "user-%d" % i,
+                "scores": list(range(10)),
+                "attrs": {"a%d" % j: j for j in range(10)},
+            },
+        )
+
+
+def remove_records(client, args):
+    keys = [(args.namespace, args.set, i) for i in range(args.records)]
+    for start in range(0, len(keys), 1000):
+        client.batch_remove(keys[start:start + 1000])
+
+
+def scenarios(client, args):
+    """
+    Returns (group, name, records per call, function) tuples. The function makes one call and is
+    passed the number of calls made so far, to spread the keys it uses.
+    """
+
+    def keys(count, offset):
+        return [(args.namespace, args.set, (offset * count + i) % args.records) for i in range(count)]
+
+    half = exp.GE(exp.IntBin("id"), args.records // 2).compile()
+    result = []
+
+    for size in args.batch_sizes:
+        result.append(("batch", "get_many %d keys" % size, size, lambda n, size=size: client.get_many(keys(size, n))))
+    for size in args.batch_sizes:
+        result.append(
+            (
+                "batch",
+                "batch_operate %d keys" % size,
+                size,
+                lambda n, size=size: client.batch_operate(keys(size, n), [op.increment("id", 0), op.read("id")]),
+            )
+        )
+
+    def query_results(n):
+        return client.query(args.namespace, args.set).results()
+
+    def query_results_expressions(n):
+        return client.query(args.namespace, args.set).results({"expressions": half})
+
+    def query_foreach(n):
+        client.query(args.namespace, args.set).foreach(lambda record: None)
+
+    result.append(("query", "results", args.records, query_results))
+    result.append(("query", "results with expressions", args.records // 2, query_results_expressions))
+    result.append(("query", "foreach", args.records, query_foreach))
+    result.append(
+        ("scan", "results", args.records, lambda n: client.scan(args.namespace, args.set).results())
+    )
+
+    list_ops = [lop.list_append("scores", 1), lop.list_get_by_rank_range("scores", -3, 3), lop.list_pop("scores", -1)]
+    map_ops = [
+        mop.map_put("attrs", "x", 1),
+        mop.map_get_by_key_list("attrs", ["a1", "a2", "x"], aerospike.MAP_RETURN_KEY_VALUE),
+        mop.map_remove_by_key("attrs", "x", aerospike.MAP_RETURN_NONE),
+    ]
+    result.append(("operate", "list ops", 1, lambda n: client.operate(keys(1, n)[0], list_ops)))
+    result.append(("operate", "map ops", 1, lambda n: client.operate(keys(1, n)[0], map_ops)))
+    return result
+
+
+##########################################################################
+# Measurement
+##########################################################################
+
+
+def percentile(sorted_values, percent):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100.0))]
+
+
+def measure(call, records_per_call, duration):
+    # Warm up, so one time costs such as opening connections are not counted.
+    call(0)
+
+    # An array, so the latencies kept are not counted as Python objects allocated by the calls.
+    latencies = array.array("d")
+    blocks_before = sys.getallocatedblocks()
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        call_start = time.perf_counter()
+        call(len(latencies))
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    blocks_after = sys.getallocatedblocks()
+
+    tracemalloc.start()
+    call(0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = sorted(latencies)
+    return {
+        "calls": len(latencies),
+        "calls_per_sec": len(latencies) / elapsed,
+        "records_per_sec": len(latencies) * records_per_call / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "leaked_blocks_per_call": (blocks_after - blocks_before) / len(latencies),
+        "peak_bytes_per_call": peak,
+        # Kilobytes on Linux, bytes on macOS.
+        "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+##########################################################################
+# Main
+##########################################################################
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark batch, query, scan and operate workloads.", add_help=False
+    )
+    parser.add_argument("--help", action="help", help="Show this help message and exit.")
+    parser.add_argument("-h", "--host", default="127.0.0.1", help="Address of Aerospike server.")
+    parser.add_argument("-p", "--port", type=int, default=3000, help="Port of the Aerospike server.")
+    parser.add_argument("-U", "--username", help="Username to connect to database.")
+    parser.add_argument("-P", "--password", help="Password to connect to database.")
+    parser.add_argument("-n", "--namespace", default="test", help="Namespace to write the records to.")
+    parser.add_argument("-s", "--set", default="scenarios", help="Set to write the records to.")
+    parser.add_argument("--records", type=int, default=10000, help="Number of records to write and read.")
+    parser.add_argument(
+        "--batch-sizes", default="10,100,1000", help="Comma separated batch sizes for the batch scenarios."
+    )
+    parser.add_argument("-d", "--duration", type=float, default=2.0, help="Seconds to run each scenario for.")
+    parser.add_argument("-g", "--group", action="append", help="Only run scenarios of this group. Can be repeated.")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON to this file.")
+    args = parser.parse_args()
+    args.batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    config = {"hosts": [(args.host, args.port)]}
+    try:
+        client = aerospike.client(config).connect(args.username, args.password)
+    except e.AerospikeError as eargs:
+        print("error: {0}".format(eargs), file=sys.stderr)
+        sys.exit(1)
+
+    write_records(client, args)
+    results = []
+    try:
+        for group, name, records_per_call, call in scenarios(client, args):
+            if args.group and group not in args.group:
+                continue
+            result = {"group": group, "scenario": name, "records_per_call": records_per_call}
+            try:
+                result.update(measure(call, records_per_call, args.duration))
+            except e.AerospikeError as eargs:
+                # For example, a server without the feature.
+                result["error"] = str(eargs.msg)
+            results.append(result)
+    finally:
+        remove_records(client, args)
+        client.close()
+
+    try:
+        from tabulate import tabulate
+    except ImportError:
+        tabulate = None
+
+    headers = [
+        "group",
+        "scenario",
+        "calls/sec",
+        "records/sec",
+        "p50 ms",
+        "p99 ms",
+        "leaked blocks/call",
+        "peak bytes/call",
+    ]
+    rows = [
+        [r["group"], r["scenario"], "error: " + r["error"]]
+        if "error" in r
+        else [
+            r["group"],
+            r["scenario"],
+            "%.0f" % r["calls_per_sec"],
+            "%.0f" % r["records_per_sec"],
+            "%.3f" % r["p50_ms"],
+            "%.3f" % r["p99_ms"],
+            "%.3f" % r["leaked_blocks_per_call"],
+            r["peak_bytes_per_call"],
+        ]
+        for r in results
+    ]
+    if tabulate:
+        print(tabulate(rows, headers=headers))
+    else:
+        for row in [headers] + rows:
+            print("\t".join(str(col) for col in row))
+
+    if args.json_path:
+        with open(args.json_path, "w") as json_file:
+            json.dump(
+                {
+                    "client_version": aerospike.__version__,
+                    "python_version": platform.python_version(),
+                    "records": args.records,
+                    "duration": args.duration,
+                    "results": results,
+                },
+                json_file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -242,6 +242,7 @@ setup(
                 'src/main/aerospike.c',
                 'src/main/exception.c',
                 'src/main/log.c',
+                'src/main/profile.c',
                 'src/main/client/type.c',
                 'src/main/client/apply.c',
                 'src/main/client/bit_operate.c',
@@ -309,16 +310,22 @@ setup(
                 'src/main/convert_expressions.c',
                 'src/main/policy_config.c',
                 'src/main/calc_digest.c',
+                'src/main/convert_roundtrip.c',
                 'src/main/predicates.c',
                 'src/main/tls_config.c',
                 'src/main/global_hosts/type.c',
                 'src/main/nullobject/type.c',
+                'src/main/key/type.c',
                 'src/main/cdt_types/type.c',
                 'src/main/key_ordered_dict/type.c',
                 'src/main/client/set_xdr_filter.c',
                 'src/main/client/get_expression_base64.c',
                 'src/main/client/get_cdtctx_base64.c',
                 'src/main/client/get_nodes.c',
+                'src/main/client/get_stats.c',
+                'src/main/client/get_partition_map.c',
+                'src/main/client/get_slow_commands.c',
+                'src/main/client/metrics.c',
                 'src/main/convert_partition_filter.c',
                 'src/main/client/get_key_partition_id.c',
                 'src/main/client/batch_write.c',
@@ -200,3 +200,11 @@ PyObject *AerospikeClient_Admin_Set_Quotas(AerospikeClient *self,
  */
 PyObject *AerospikeClient_Admin_Set_Whitelist(AerospikeClient *self,
                                               PyObject *args, PyObject *kwds);
+/**
+ * Create, change and drop users and roles to match a desired state.
+ *
+ *		client.admin_sync(desired_state, policy, drop=False, dry_run=False)
+ *
+ */
+PyObject *AerospikeClient_Admin_Sync(AerospikeClient *self, PyObject *args,
+                                     PyObject *kwds);
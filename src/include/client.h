@@ -20,6 +20,7 @@
 #include <stdbool.h>
 #include "types.h"
 #include "macros.h"
+#include "profile.h"
 
 #define TRACE() printf("%s:%d\n", __FILE__, __LINE__)
 
@@ -90,7 +91,7 @@ PyObject *AerospikeClient_Apply_Invoke(AerospikeClient *self, PyObject *py_key,
                                        PyObject *py_module,
                                        PyObject *py_function,
                                        PyObject *py_arglist,
-                                       PyObject *py_policy);
+                                       PyObject *py_policy, profile_call *call);
 /**
  * Check existence of a record in the database.
  *
@@ -101,7 +102,8 @@ PyObject *AerospikeClient_Exists(AerospikeClient *self, PyObject *args,
                                  PyObject *kwds);
 
 PyObject *AerospikeClient_Exists_Invoke(AerospikeClient *self, PyObject *py_key,
-                                        PyObject *py_policy);
+                                        PyObject *py_policy,
+                                        profile_call *call);
 
 /**
  * Read a record from the database.
@@ -113,7 +115,8 @@ PyObject *AerospikeClient_Get(AerospikeClient *self, PyObject *args,
                               PyObject *kwds);
 
 PyObject *AerospikeClient_Get_Invoke(AerospikeClient *self, PyObject *py_key,
-                                     PyObject *py_policy);
+                                     PyObject *py_policy, bool missing_ok,
+                                     profile_call *call);
 
 /**
  * Async Read a record from the database.
@@ -145,7 +148,8 @@ PyObject *AerospikeClient_Put(AerospikeClient *self, PyObject *args,
 PyObject *AerospikeClient_Put_Invoke(AerospikeClient *self, PyObject *py_key,
                                      PyObject *py_bins, PyObject *py_meta,
                                      PyObject *py_policy,
-                                     long serializer_option);
+                                     long serializer_option,
+                                     profile_call *call);
 
 /**
  * Write a record async in the database.
@@ -166,7 +170,8 @@ PyObject *AerospikeClient_Remove(AerospikeClient *self, PyObject *args,
                                  PyObject *kwds);
 
 PyObject *AerospikeClient_Remove_Invoke(AerospikeClient *self, PyObject *py_key,
-                                        PyObject *py_meta, PyObject *py_policy);
+                                        PyObject *py_meta, PyObject *py_policy,
+                                        profile_call *call);
 
 /**
  * Remove bin from the database.
@@ -548,6 +553,15 @@ PyObject *AerospikeClient_InfoNode(AerospikeClient *self, PyObject *args,
 PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
                                   PyObject *kwds);
 
+/**
+ * Registers the changed UDFs in a directory.
+ *
+ *		client.udf_sync(directory, policy)
+ *
+ */
+PyObject *AerospikeClient_UDF_Sync(AerospikeClient *self, PyObject *args,
+                                   PyObject *kwds);
+
 /**
  * De-registers a UDF.
  *
@@ -622,6 +636,25 @@ PyObject *AerospikeClient_Index_2dsphere_Create(AerospikeClient *self,
  */
 PyObject *AerospikeClient_Index_Remove(AerospikeClient *self, PyObject *args,
                                        PyObject *kwds);
+
+/**
+ * Create many secondary indexes at once.
+ *
+ *		client.index_create_many(specs, policy, wait, timeout)
+ *
+ */
+PyObject *AerospikeClient_Index_Create_Many(AerospikeClient *self,
+                                            PyObject *args, PyObject *kwds);
+
+/**
+ * Remove many secondary indexes at once.
+ *
+ *		client.index_remove_many(ns, names, policy)
+ *
+ */
+PyObject *AerospikeClient_Index_Remove_Many(AerospikeClient *self,
+                                            PyObject *args, PyObject *kwds);
+
 /**
  * Create secondary list index
  *
@@ -687,6 +720,15 @@ PyObject *AerospikeClient_Set_Log_Handler(AerospikeClient *self, PyObject *args,
 PyObject *AerospikeClient_Get_Many(AerospikeClient *self, PyObject *args,
                                    PyObject *kwds);
 
+/**
+ * Get records in a batch by their digests
+ *
+ *		client.get_many_digests(ns, set, digests, bins, policies)
+ *
+ */
+PyObject *AerospikeClient_Get_Many_Digests(AerospikeClient *self,
+                                           PyObject *args, PyObject *kwds);
+
 /**
  * Get records in a batch
  *
@@ -756,6 +798,15 @@ PyObject *AerospikeClient_Select_Many(AerospikeClient *self, PyObject *args,
 PyObject *AerospikeClient_Exists_Many(AerospikeClient *self, PyObject *args,
                                       PyObject *kwds);
 
+/**
+ * Check existence of records by their digests
+ *
+ *		client.exists_many_digests(ns, set, digests, policies, generations)
+ *
+ */
+PyObject *AerospikeClient_Exists_Many_Digests(AerospikeClient *self,
+                                              PyObject *args, PyObject *kwds);
+
 /**
 * Perform xdr-set-filter info operation on the database.
 *
@@ -807,6 +858,43 @@ PyObject *AerospikeClient_GetNodes(AerospikeClient *self, PyObject *args,
 PyObject *AerospikeClient_GetNodeNames(AerospikeClient *self, PyObject *args,
                                        PyObject *kwds);
 /**
+* Get the partition map the client keeps for a namespace.
+*
+* client.get_partition_map(ns)
+*
+*/
+PyObject *AerospikeClient_GetPartitionMap(AerospikeClient *self, PyObject *args,
+                                          PyObject *kwds);
+/**
+* Get the connection pool, error rate and tend statistics of the cluster.
+*
+* client.get_stats()
+*
+*/
+PyObject *AerospikeClient_GetStats(AerospikeClient *self, PyObject *args,
+                                   PyObject *kwds);
+/**
+* Get the calls slower than the client's slow_command_threshold_ms.
+*
+* client.get_slow_commands()
+*
+*/
+PyObject *AerospikeClient_GetSlowCommands(AerospikeClient *self, PyObject *args,
+                                          PyObject *kwds);
+/**
+* Start and stop counting the client's calls, and read the counts, for
+* aerospike_helpers.metrics.
+*
+* client._enable_metrics(buckets)
+* client._disable_metrics()
+* client._get_metrics()
+*
+*/
+PyObject *AerospikeClient_EnableMetrics(AerospikeClient *self, PyObject *args,
+                                        PyObject *kwds);
+PyObject *AerospikeClient_DisableMetrics(AerospikeClient *self);
+PyObject *AerospikeClient_GetMetrics(AerospikeClient *self);
+/**
 * Perforrm get key digest operation on the database.
 *
 * client.get_key_digest((x,y,z))
@@ -99,6 +99,13 @@ as_status pyobject_to_list(AerospikeClient *self, as_error *err,
 
 as_status pyobject_to_key(as_error *err, PyObject *py_key, as_key *key);
 
+/*
+ * Gets a buffer of packed digests from a bytes-like object, and the number of
+ * digests in it. The buffer must be released with PyBuffer_Release().
+ */
+as_status pyobject_to_digests(as_error *err, PyObject *py_digests,
+                              Py_buffer *digests, uint32_t *n_digests);
+
 as_status pyobject_to_index(AerospikeClient *self, as_error *err,
                             PyObject *py_value, long *long_val);
 
@@ -226,3 +233,13 @@ as_status as_partition_status_to_pyobject(
 as_status as_batch_result_to_BatchRecord(AerospikeClient *self, as_error *err,
                                          as_batch_result *bres,
                                          PyObject *py_batch_record);
+
+PyObject *job_id_to_pyobject(AerospikeClient *self, uint64_t job_id,
+                             const char *module);
+
+bool pages_args_valid(Py_ssize_t page_size, Py_ssize_t prefetch,
+                      PyObject *py_max_buffered_records);
+
+PyObject *call_helper_function(PyObject *py_self, const char *module_name,
+                               const char *function_name, PyObject *args,
+                               PyObject *kwds);
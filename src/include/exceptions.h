@@ -20,5 +20,25 @@
 
 PyObject *AerospikeException_New(void);
 void raise_exception(as_error *err);
+/**
+ * Returns a new instance of the exception of the error's code, with the given
+ * key, bin, module, func and name attributes, if the exception class has them.
+ * Any of them may be NULL to leave the class default. Returns NULL with an
+ * exception set on failure.
+ */
+PyObject *create_exception(as_error *err, PyObject *py_key, PyObject *py_bin,
+                           PyObject *py_module, PyObject *py_func,
+                           PyObject *py_name);
+/**
+ * Raise the exception of the error's code, with the given key, bin, module,
+ * func and name attributes, if the exception class has them. Any of them
+ * may be NULL to leave the class default.
+ */
+void raise_exception_base(as_error *err, PyObject *py_key, PyObject *py_bin,
+                          PyObject *py_module, PyObject *py_func,
+                          PyObject *py_name);
+/**
+ * Returns the exception class of the error's code, borrowed.
+ */
 PyObject *raise_exception_old(as_error *err);
 void remove_exception(as_error *err);
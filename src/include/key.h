@@ -0,0 +1,37 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include <aerospike/as_key.h>
+
+#include "types.h"
+
+PyTypeObject *AerospikeKey_Ready(void);
+
+/**
+ * Returns true if py_obj is an aerospike.Key.
+ */
+bool AerospikeKey_Check(PyObject *py_obj);
+
+/**
+ * Initializes key from an aerospike.Key, with its digest already set.
+ * The key does not own its value, so the aerospike.Key must outlive it.
+ */
+void AerospikeKey_Borrow(PyObject *py_obj, as_key *key);
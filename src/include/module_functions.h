@@ -34,6 +34,15 @@ PyObject *Aerospike_Calc_Digest(PyObject *self, PyObject *args, PyObject *kwds);
  */
 PyObject *Aerospike_Get_Partition_Id(PyObject *self, PyObject *args);
 
+/**
+ * Run a Python <-> C conversion in a loop without any I/O. Test only.
+ *
+ *		aerospike._convert_roundtrip("record", {"a": 1}, 1000)
+ *
+ */
+PyObject *Aerospike_Convert_Roundtrip(PyObject *self, PyObject *args,
+                                      PyObject *kwds);
+
 /**
  * check whether async supported or not
  *
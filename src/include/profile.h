@@ -0,0 +1,229 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+#pragma once
+
+#include <Python.h>
+#include <pthread.h>
+#include <stdbool.h>
+#include <stdint.h>
+
+#include <aerospike/as_key.h>
+#include <aerospike/as_status.h>
+#include <aerospike/as_operations.h>
+#include <aerospike/as_record.h>
+
+/*
+ * The parts of a client call that are timed separately.
+ */
+typedef enum Aerospike_profile_segment_e {
+
+    PROFILE_ARGS,
+    PROFILE_POLICY,
+    PROFILE_EXPRESSIONS,
+    PROFILE_NETWORK,
+    PROFILE_RESULT,
+    PROFILE_SEGMENTS
+
+} profile_segment;
+
+/*
+ * A client's log of its slowest calls, a ring of at most max_entries dicts.
+ * Calls are not logged while threshold_ns is 0.
+ */
+typedef struct Aerospike_profile_slow_log {
+    uint64_t threshold_ns;
+    uint32_t max_entries;
+    uint32_t next;
+    // Also write each slow call to the client's log.
+    bool log;
+    PyObject *py_entries;
+} profile_slow_log;
+
+#define PROFILE_METRICS_MAX_BUCKETS 32
+#define PROFILE_METRICS_MAX_SERIES 1024
+
+/*
+ * Counts of the calls of one method to one namespace and set, with one
+ * result code. Only changed with atomic operations, so calls are counted
+ * without a lock.
+ */
+typedef struct Aerospike_profile_series {
+    char method[32];
+    as_namespace ns;
+    as_set set;
+    // False for calls that raised an exception other than an AerospikeError.
+    bool has_result_code;
+    as_status result_code;
+    uint64_t count;
+    uint64_t total_ns;
+    uint64_t segment_ns[PROFILE_SEGMENTS];
+    // Calls per latency bucket, then the calls over the last bucket.
+    uint64_t buckets[PROFILE_METRICS_MAX_BUCKETS + 1];
+} profile_series;
+
+/*
+ * A client's call counters, read by aerospike_helpers.metrics. Series are
+ * only added, under the lock, and published by storing n_series. They are
+ * freed with the client.
+ */
+typedef struct Aerospike_profile_metrics {
+    uint32_t enabled;
+    uint32_t n_buckets;
+    // Upper bounds of the latency buckets.
+    uint64_t bucket_ns[PROFILE_METRICS_MAX_BUCKETS];
+    pthread_mutex_t lock;
+    uint32_t n_series;
+    profile_series *series[PROFILE_METRICS_MAX_SERIES];
+    // Calls not counted, because there were already too many series.
+    uint64_t dropped;
+} profile_metrics;
+
+/*
+ * Timings of a single client call. Everything is a no-op unless a profile
+ * hook was set, the call was sampled for the trace hook, or the client logs
+ * slow calls or counts its calls, when it started.
+ */
+typedef struct Aerospike_profile_call {
+    const char *method;
+    bool enabled;
+    // Which hooks the timings are passed to.
+    bool profiled;
+    bool traced;
+    profile_slow_log *slow_log;
+    // The client's counters, if they are enabled.
+    profile_metrics *metrics;
+    // Namespace and set of the record, for single record calls.
+    as_namespace ns;
+    as_set set;
+    // Result code of a call that failed without raising an exception.
+    as_status status;
+    uint64_t start_ns;
+    uint64_t last_ns;
+    // Wall clock time the call started, in nanoseconds since the epoch, for
+    // the hooks and the slow log.
+    uint64_t start_time_ns;
+    uint64_t segment_ns[PROFILE_SEGMENTS];
+    // Time spent in a segment while another one was being timed, such as
+    // expressions converted as part of a policy.
+    uint64_t nested_ns[PROFILE_SEGMENTS];
+    Py_ssize_t allocated_blocks;
+    // Details only collected for profiled, traced and slow calls. The sizes
+    // are -1 if unknown.
+    bool has_digest;
+    uint8_t digest[AS_DIGEST_VALUE_SIZE];
+    int64_t request_bytes;
+    int64_t response_bytes;
+    struct Aerospike_profile_call *previous;
+} profile_call;
+
+/**
+ * Start timing a call. The time until the first mark is counted as
+ * argument parsing. slow_log and metrics are the client's, or NULL.
+ */
+void profile_start(profile_call *call, const char *method,
+                   profile_slow_log *slow_log, profile_metrics *metrics);
+
+/**
+ * Record the namespace and set of the record the call is for.
+ */
+void profile_set_key(profile_call *call, as_key *key);
+
+/**
+ * Record the namespace and set a query or scan is for.
+ */
+void profile_set_namespace(profile_call *call, const char *ns, const char *set);
+
+/**
+ * Record the result code of a call that returns instead of raising an
+ * exception for it.
+ */
+void profile_set_status(profile_call *call, as_status status);
+
+/**
+ * Record the digest of the key and the size of the bins sent and received,
+ * if the call is profiled, traced, or already slower than the slow log's
+ * threshold. Any of the arguments after call may be NULL.
+ */
+void profile_set_payload(profile_call *call, as_key *key, as_record *request,
+                         as_operations *ops, as_record *response);
+
+/**
+ * Count the time since the last mark, minus any nested time, as segment.
+ */
+void profile_mark(profile_call *call, profile_segment segment);
+
+/**
+ * Time a segment that runs inside another one, e.g. result conversion done
+ * in a batch callback while waiting on the network.
+ * Returns 0 if the call is not profiled.
+ */
+uint64_t profile_nested_start(profile_call *call);
+void profile_nested_end(profile_call *call, profile_segment segment,
+                        uint64_t start_ns);
+
+/**
+ * Count the remaining time as result conversion and pass the timings to
+ * the profile and trace hooks, and the slow log. Safe to call with an exception set, whose code is
+ * passed as the result code.
+ */
+void profile_end(profile_call *call);
+
+/**
+ * The call being profiled by the current thread, or NULL.
+ */
+profile_call *profile_current();
+
+/**
+ * Set the profile hook
+ *          aerospike.set_profile_hook(callback)
+ */
+PyObject *Aerospike_Set_Profile_Hook(PyObject *parent, PyObject *args,
+                                     PyObject *kwds);
+
+/**
+ * Set the trace hook
+ *          aerospike.set_trace_hook(callback, sample_rate)
+ */
+PyObject *Aerospike_Set_Trace_Hook(PyObject *parent, PyObject *args,
+                                   PyObject *kwds);
+
+/**
+ * Parse the slow log settings of a client config. Returns false if they
+ * are invalid.
+ */
+bool profile_slow_log_init(profile_slow_log *slow_log, PyObject *py_config);
+void profile_slow_log_destroy(profile_slow_log *slow_log);
+
+/**
+ * The logged calls, oldest first. If clear is set, they are removed from
+ * the log.
+ */
+PyObject *profile_slow_log_entries(profile_slow_log *slow_log, bool clear);
+
+/**
+ * Start counting the client's calls, from zero, with py_buckets as the upper
+ * bounds of the latency buckets in seconds. The counters are allocated on
+ * first use. Returns false with an exception set if the buckets are invalid.
+ */
+bool profile_metrics_enable(profile_metrics **metrics, PyObject *py_buckets);
+void profile_metrics_disable(profile_metrics *metrics);
+void profile_metrics_destroy(profile_metrics *metrics);
+
+/**
+ * The counters as a dict of the bucket bounds, the series and the calls
+ * that were not counted.
+ */
+PyObject *profile_metrics_snapshot(profile_metrics *metrics);
@@ -136,6 +136,29 @@ PyObject *AerospikeQuery_Is_Done(AerospikeQuery *self);
  */
 PyObject *AerospikeQuery_Get_Partitions_status(AerospikeQuery *self);
 
+/**
+ * Paginate the query and return a generator of its pages. The policy,
+ * expressions and partition filter are converted once, for every page.
+ *
+ *    for page in query.pages(1000):
+ *        ...
+ *
+ */
+PyObject *AerospikeQuery_Pages(AerospikeQuery *self, PyObject *args,
+                               PyObject *kwds);
+
+/**
+ * Fetch the next page of the query with what pages() converted.
+ *
+ */
+PyObject *AerospikeQuery_Next_Page(AerospikeQuery *self);
+
+/**
+ * Free what pages() converted.
+ *
+ */
+void AerospikeQuery_Clear_Pages(AerospikeQuery *self);
+
 /**
  * Store the Unicode -> UTF8 string converted PyObject into 
  * a pool of PyObjects. So that, they will be decref'ed at later stages
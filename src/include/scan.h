@@ -132,3 +132,26 @@ PyObject *AerospikeScan_Is_Done(AerospikeScan *self, PyObject *args,
  *
  */
 PyObject *AerospikeScan_Get_Partitions_status(AerospikeScan *self);
+
+/**
+ * Paginate the scan and return a generator of its pages. The policy,
+ * expressions and partition filter are converted once, for every page.
+ *
+ *    for page in scan.pages(1000):
+ *        ...
+ *
+ */
+PyObject *AerospikeScan_Pages(AerospikeScan *self, PyObject *args,
+                              PyObject *kwds);
+
+/**
+ * Fetch the next page of the scan with what pages() converted.
+ *
+ */
+PyObject *AerospikeScan_Next_Page(AerospikeScan *self);
+
+/**
+ * Free what pages() converted.
+ *
+ */
+void AerospikeScan_Clear_Pages(AerospikeScan *self);
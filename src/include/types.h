@@ -23,9 +23,12 @@
 #include <aerospike/as_key.h>
 #include <aerospike/as_query.h>
 #include <aerospike/as_scan.h>
+#include <aerospike/as_exp.h>
+#include <aerospike/as_partition_filter.h>
 #include <aerospike/as_bin.h>
 #include <aerospike/as_operations.h>
 #include "pool.h"
+#include "profile.h"
 
 // Bin names can be of type Unicode in Python
 // DB supports 32767 maximum number of bins
@@ -73,6 +76,9 @@ typedef struct {
     bool has_connected;
     bool use_shared_connection;
     uint8_t send_bool_as;
+    profile_slow_log slow_log;
+    // NULL until aerospike_helpers.metrics counts the client's calls.
+    profile_metrics *metrics;
 } AerospikeClient;
 
 typedef struct {
@@ -81,6 +87,15 @@ typedef struct {
     UnicodePyObjects u_objs;
     as_vector *unicodeStrVector;
     as_static_pool *static_pool;
+    // The policy and partition filter converted by pages(), used for every page.
+    as_policy_query page_policy;
+    as_policy_query *page_policy_p;
+    as_exp *page_exp_p;
+    as_partition_filter page_filter;
+    as_partitions_status *page_ps;
+    bool page_filter_pending;
+    // Set while _next_page() uses the page state without the GIL.
+    bool page_busy;
 } AerospikeQuery;
 
 typedef struct {
@@ -88,12 +103,27 @@ typedef struct {
     as_scan scan;
     as_vector *unicodeStrVector;
     as_static_pool *static_pool;
+    // The policy and partition filter converted by pages(), used for every page.
+    as_policy_scan page_policy;
+    as_policy_scan *page_policy_p;
+    as_exp *page_exp_p;
+    as_partition_filter page_filter;
+    as_partitions_status *page_ps;
+    bool page_filter_pending;
+    // Set while _next_page() uses the page state without the GIL.
+    bool page_busy;
 } AerospikeScan;
 
 typedef struct {
     PyObject_HEAD PyObject *geo_data;
 } AerospikeGeospatial;
 
+typedef struct {
+    PyObject_HEAD as_key key;
+    uint32_t partition_id;
+    PyObject *py_key;
+} AerospikeKey;
+
 typedef struct {
     PyDictObject dict;
 } AerospikeKeyOrderedDict;
@@ -28,11 +28,13 @@
 #include "exceptions.h"
 #include "policy.h"
 #include "log.h"
+#include "profile.h"
 #include <aerospike/as_operations.h>
 #include "serializer.h"
 #include "module_functions.h"
 #include "nullobject.h"
 #include "cdt_types.h"
+#include "key.h"
 #include <aerospike/as_log_macros.h>
 
 PyObject *py_global_hosts;
@@ -80,6 +82,14 @@ static PyMethodDef Aerospike_Methods[] = {
      METH_VARARGS | METH_KEYWORDS,
      "Creates a GeoJSON object from a raw GeoJSON string."},
 
+    //Profiling
+    {"set_profile_hook", (PyCFunction)Aerospike_Set_Profile_Hook,
+     METH_VARARGS | METH_KEYWORDS,
+     "Sets a function to be called with the timings of client calls"},
+    {"set_trace_hook", (PyCFunction)Aerospike_Set_Trace_Hook,
+     METH_VARARGS | METH_KEYWORDS,
+     "Sets a function to be called with the timings of sampled client calls"},
+
     //Calculate the digest of a key
     {"calc_digest", (PyCFunction)Aerospike_Calc_Digest,
      METH_VARARGS | METH_KEYWORDS, "Calculate the digest of a key"},
@@ -88,6 +98,11 @@ static PyMethodDef Aerospike_Methods[] = {
     {"get_partition_id", (PyCFunction)Aerospike_Get_Partition_Id, METH_VARARGS,
      "Get partition ID for given digest"},
 
+    //Test only entry point for the conversion benchmarks
+    {"_convert_roundtrip", (PyCFunction)Aerospike_Convert_Roundtrip,
+     METH_VARARGS | METH_KEYWORDS,
+     "Run a Python to C conversion in a loop without any I/O. Test only."},
+
     //Is async supported
     {"is_async_supoorted", (PyCFunction)Aerospike_Is_AsyncSupported,
      METH_NOARGS, "check whether async supported or not"},
@@ -126,6 +141,7 @@ struct Aerospike_State {
     PyTypeObject *null_object;
     PyTypeObject *wildcard_object;
     PyTypeObject *infinite_object;
+    PyTypeObject *key;
 };
 
 #define Aerospike_State(o) ((struct Aerospike_State *)PyModule_GetState(o))
@@ -146,6 +162,7 @@ static int Aerospike_Clear(PyObject *aerospike)
     Py_CLEAR(Aerospike_State(aerospike)->null_object);
     Py_CLEAR(Aerospike_State(aerospike)->wildcard_object);
     Py_CLEAR(Aerospike_State(aerospike)->infinite_object);
+    Py_CLEAR(Aerospike_State(aerospike)->key);
 
     return 0;
 }
@@ -271,6 +288,14 @@ MOD_INIT(aerospike)
     }
     Aerospike_State(aerospike)->infinite_object = infinite_object;
 
+    PyTypeObject *key = AerospikeKey_Ready();
+    Py_INCREF(key);
+    retval = PyModule_AddObject(aerospike, "Key", (PyObject *)key);
+    if (retval == -1) {
+        goto CLEANUP;
+    }
+    Aerospike_State(aerospike)->key = key;
+
     return MOD_SUCCESS_VAL(aerospike);
 
 CLEANUP:
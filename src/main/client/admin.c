@@ -2066,3 +2066,45 @@ CLEANUP:
 
     return py_ret_role;
 }
+
+/**
+ *******************************************************************************************************
+ * Creates, changes and optionally drops users and roles to match a desired state.
+ * See aerospike_helpers.admin_sync.admin_sync.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a dict of the names of the users and roles that were changed.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_Admin_Sync(AerospikeClient *self, PyObject *args,
+                                     PyObject *kwds)
+{
+    PyObject *py_kwds = kwds ? PyDict_Copy(kwds) : PyDict_New();
+    if (!py_kwds) {
+        return NULL;
+    }
+
+    // The user the client is logged in as must not be dropped.
+    if (self->as && self->as->config.user[0] &&
+        !PyDict_GetItemString(py_kwds, "current_user")) {
+        PyObject *py_user = PyUnicode_FromString(self->as->config.user);
+        if (!py_user ||
+            PyDict_SetItemString(py_kwds, "current_user", py_user) != 0) {
+            Py_XDECREF(py_user);
+            Py_DECREF(py_kwds);
+            return NULL;
+        }
+        Py_DECREF(py_user);
+    }
+
+    PyObject *py_result =
+        call_helper_function((PyObject *)self, "aerospike_helpers.admin_sync",
+                             "admin_sync", args, py_kwds);
+    Py_DECREF(py_kwds);
+    return py_result;
+}
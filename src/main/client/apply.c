@@ -26,6 +26,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
 
 /**
  *******************************************************************************************************
@@ -37,6 +38,7 @@
  * @param py_function           The UDF function to be applied on a record.
  * @param py_arglist            The arguments to the UDF function
  * @param py_policy             The optional policy parameters
+ * @param call                  The timings of the call, if profiled.
  *
  * Returns the result of UDF function.
  *******************************************************************************************************
@@ -45,7 +47,7 @@ PyObject *AerospikeClient_Apply_Invoke(AerospikeClient *self, PyObject *py_key,
                                        PyObject *py_module,
                                        PyObject *py_function,
                                        PyObject *py_arglist,
-                                       PyObject *py_policy)
+                                       PyObject *py_policy, profile_call *call)
 {
     // Python Return Value
     PyObject *py_result = NULL;
@@ -100,6 +102,7 @@ PyObject *AerospikeClient_Apply_Invoke(AerospikeClient *self, PyObject *py_key,
     }
     // Key is initialiased successfully
     key_initialised = true;
+    profile_set_key(call, &key);
 
     // Convert python list to as_list
     pyobject_to_list(self, &err, py_arglist, &arglist, &static_pool,
@@ -107,6 +110,7 @@ PyObject *AerospikeClient_Apply_Invoke(AerospikeClient *self, PyObject *py_key,
     if (err.code != AEROSPIKE_OK) {
         goto CLEANUP;
     }
+    profile_mark(call, PROFILE_ARGS);
 
     // Convert python policy object to as_policy_apply
     pyobject_to_policy_apply(self, &err, py_policy, &apply_policy,
@@ -142,12 +146,14 @@ PyObject *AerospikeClient_Apply_Invoke(AerospikeClient *self, PyObject *py_key,
                         "function name must be a string or unicode string");
         goto CLEANUP;
     }
+    profile_mark(call, PROFILE_POLICY);
 
     // Invoke operation
     Py_BEGIN_ALLOW_THREADS
     aerospike_key_apply(self->as, &err, apply_policy_p, &key, module, function,
                         arglist, &result);
     Py_END_ALLOW_THREADS
+    profile_mark(call, PROFILE_NETWORK);
 
     if (err.code == AEROSPIKE_OK) {
         val_to_pyobject(self, &err, result, &py_result);
@@ -177,23 +183,8 @@ CLEANUP:
     as_val_destroy(result);
 
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "key")) {
-            PyObject_SetAttrString(exception_type, "key", py_key);
-        }
-        if (PyObject_HasAttrString(exception_type, "bin")) {
-            PyObject_SetAttrString(exception_type, "bin", Py_None);
-        }
-        if (PyObject_HasAttrString(exception_type, "module")) {
-            PyObject_SetAttrString(exception_type, "module", py_module);
-        }
-        if (PyObject_HasAttrString(exception_type, "func")) {
-            PyObject_SetAttrString(exception_type, "func", py_function);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, py_key, Py_None, py_module, py_function,
+                             NULL);
         return NULL;
     }
 
@@ -222,6 +213,10 @@ PyObject *AerospikeClient_Apply(AerospikeClient *self, PyObject *args,
     PyObject *py_function = NULL;
     PyObject *py_arglist = NULL;
     PyObject *py_policy = NULL;
+    PyObject *py_result = NULL;
+
+    profile_call call;
+    profile_start(&call, "apply", &self->slow_log, self->metrics);
 
     // Python Function Keyword Arguments
     static char *kwlist[] = {"key",  "module", "function",
@@ -231,10 +226,14 @@ PyObject *AerospikeClient_Apply(AerospikeClient *self, PyObject *args,
     if (PyArg_ParseTupleAndKeywords(args, kwds, "OOOO|O:apply", kwlist, &py_key,
                                     &py_module, &py_function, &py_arglist,
                                     &py_policy) == false) {
+        profile_end(&call);
         return NULL;
     }
 
     // Invoke Operation
-    return AerospikeClient_Apply_Invoke(self, py_key, py_module, py_function,
-                                        py_arglist, py_policy);
+    py_result = AerospikeClient_Apply_Invoke(
+        self, py_key, py_module, py_function, py_arglist, py_policy, &call);
+
+    profile_end(&call);
+    return py_result;
 }
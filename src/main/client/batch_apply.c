@@ -30,6 +30,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "key.h"
 
 // Struct for Python User-Data for the Callback
 typedef struct {
@@ -158,7 +159,7 @@ static PyObject *AerospikeClient_Batch_Apply_Invoke(
         PyObject *py_key = PyList_GetItem(py_keys, i);
         as_key *tmp_key = (as_key *)as_vector_get(&tmp_keys, i);
 
-        if (!PyTuple_Check(py_key)) {
+        if (!PyTuple_Check(py_key) && !AerospikeKey_Check(py_key)) {
             as_error_update(err, AEROSPIKE_ERR_PARAM,
                             "key should be an aerospike key tuple");
             goto CLEANUP;
@@ -29,6 +29,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "key.h"
 
 #include <aerospike/as_double.h>
 #include <aerospike/as_integer.h>
@@ -81,16 +82,20 @@ static bool batch_read_operate_cb(const as_batch_read *results, uint32_t n,
         }
         else {
             py_rec_meta = raise_exception_old(&err);
+            Py_INCREF(py_rec_meta);
             Py_INCREF(Py_None);
             py_rec_bins = Py_None;
         }
 
+        // The key is borrowed from the list of keys, and PyTuple_SetItem steals it.
+        Py_INCREF(py_key);
         py_rec = PyTuple_New(3);
         PyTuple_SetItem(py_rec, 0, py_key);
         PyTuple_SetItem(py_rec, 1, py_rec_meta);
         PyTuple_SetItem(py_rec, 2, py_rec_bins);
 
         PyList_Append(data->py_results, py_rec);
+        Py_DECREF(py_rec);
     }
 
     PyGILState_Release(gstate);
@@ -167,7 +172,7 @@ static PyObject *AerospikeClient_Batch_GetOps_Invoke(AerospikeClient *self,
 
     for (int i = 0; i < keys_size; i++) {
         PyObject *py_key = PyList_GetItem(py_keys, i);
-        if (!PyTuple_Check(py_key)) {
+        if (!PyTuple_Check(py_key) && !AerospikeKey_Check(py_key)) {
             as_error_update(err, AEROSPIKE_ERR_PARAM, "Key should be a tuple.");
             goto CLEANUP;
         }
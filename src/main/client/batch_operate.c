@@ -32,6 +32,8 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
+#include "key.h"
 
 // Struct for Python User-Data for the Callback
 typedef struct {
@@ -39,6 +41,7 @@ typedef struct {
     PyObject *batch_records_module;
     PyObject *func_name;
     AerospikeClient *client;
+    profile_call *call;
 } LocalData;
 
 static bool batch_operate_cb(const as_batch_result *results, uint32_t n,
@@ -55,6 +58,7 @@ static bool batch_operate_cb(const as_batch_result *results, uint32_t n,
     // Lock Python State
     PyGILState_STATE gstate;
     gstate = PyGILState_Ensure();
+    uint64_t profile_start_ns = profile_nested_start(data->call);
 
     for (uint32_t i = 0; i < n; i++) {
 
@@ -93,6 +97,7 @@ static bool batch_operate_cb(const as_batch_result *results, uint32_t n,
         Py_DECREF(py_batch_record);
     }
 
+    profile_nested_end(data->call, PROFILE_RESULT, profile_start_ns);
     PyGILState_Release(gstate);
     return success;
 }
@@ -108,11 +113,13 @@ static bool batch_operate_cb(const as_batch_result *results, uint32_t n,
  * @param py_ops                    The list containing op dictionaries.
  * @param py_policy_batch      		Python dict used to populate policy_batch.
  * @param py_policy_batch_write     Python dict used to populate policy_batch_write.
+ * @param call                      The timings of the call, if profiled.
  *******************************************************************************************************
  */
 static PyObject *AerospikeClient_Batch_Operate_Invoke(
     AerospikeClient *self, as_error *err, PyObject *py_keys, PyObject *py_ops,
-    PyObject *py_policy_batch, PyObject *py_policy_batch_write)
+    PyObject *py_policy_batch, PyObject *py_policy_batch_write,
+    profile_call *call)
 {
     long operation;
     long return_type = -1;
@@ -184,7 +191,7 @@ static PyObject *AerospikeClient_Batch_Operate_Invoke(
         PyObject *py_key = PyList_GetItem(py_keys, i);
         as_key *tmp_key = (as_key *)as_vector_get(&tmp_keys, i);
 
-        if (!PyTuple_Check(py_key)) {
+        if (!PyTuple_Check(py_key) && !AerospikeKey_Check(py_key)) {
             as_error_update(err, AEROSPIKE_ERR_PARAM,
                             "key should be an aerospike key tuple");
             goto CLEANUP;
@@ -203,6 +210,7 @@ static PyObject *AerospikeClient_Batch_Operate_Invoke(
     as_batch_init(&batch, processed_key_count);
     memcpy(batch.keys.entries, tmp_keys.list,
            sizeof(as_key) * processed_key_count);
+    profile_mark(call, PROFILE_ARGS);
 
     if (py_policy_batch) {
         if (pyobject_to_policy_batch(
@@ -241,6 +249,7 @@ static PyObject *AerospikeClient_Batch_Operate_Invoke(
         }
         Py_XDECREF(py_ttl);
     }
+    profile_mark(call, PROFILE_POLICY);
 
     // import batch_records helper
     PyObject *br_module = NULL;
@@ -283,9 +292,11 @@ static PyObject *AerospikeClient_Batch_Operate_Invoke(
     data.func_name = PyUnicode_FromString("BatchRecord");
     data.py_results = PyObject_GetAttrString(br_instance, "batch_records");
     data.batch_records_module = br_module;
+    data.call = call;
 
     as_error batch_apply_err;
     as_error_init(&batch_apply_err);
+    profile_mark(call, PROFILE_RESULT);
 
     Py_BEGIN_ALLOW_THREADS
 
@@ -294,6 +305,9 @@ static PyObject *AerospikeClient_Batch_Operate_Invoke(
                             batch_operate_cb, &data);
 
     Py_END_ALLOW_THREADS
+    // Building the BatchRecord objects in the callback counts as result
+    // conversion, not network time.
+    profile_mark(call, PROFILE_NETWORK);
 
     Py_DECREF(data.py_results);
     Py_DECREF(data.func_name);
@@ -358,12 +372,16 @@ PyObject *AerospikeClient_Batch_Operate(AerospikeClient *self, PyObject *args,
 
     as_error_init(&err);
 
+    profile_call call;
+    profile_start(&call, "batch_operate", &self->slow_log, self->metrics);
+
     // Python Function Keyword Arguments
     static char *kwlist[] = {"keys", "ops", "policy_batch",
                              "policy_batch_write", NULL};
     if (PyArg_ParseTupleAndKeywords(args, kwds, "OO|OO:batch_Operate", kwlist,
                                     &py_keys, &py_ops, &py_policy_batch,
                                     &py_policy_batch_write) == false) {
+        profile_end(&call);
         return NULL;
     }
 
@@ -382,8 +400,10 @@ PyObject *AerospikeClient_Batch_Operate(AerospikeClient *self, PyObject *args,
     }
 
     py_results = AerospikeClient_Batch_Operate_Invoke(
-        self, &err, py_keys, py_ops, py_policy_batch, py_policy_batch_write);
+        self, &err, py_keys, py_ops, py_policy_batch, py_policy_batch_write,
+        &call);
 
+    profile_end(&call);
     return py_results;
 
 ERROR:
@@ -392,5 +412,6 @@ ERROR:
         raise_exception(&err);
     }
 
+    profile_end(&call);
     return NULL;
 }
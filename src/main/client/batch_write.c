@@ -30,9 +30,11 @@
 #include "serializer.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
 #include "cdt_operation_utils.h"
 #include "geo.h"
 #include "cdt_types.h"
+#include "key.h"
 
 #define GET_BATCH_POLICY_FROM_PYOBJECT(__policy, __policy_type,                \
                                        __conversion_func, __batch_type)        \
@@ -117,7 +119,8 @@ void garbage_destroy(garbage *garb)
 static PyObject *AerospikeClient_BatchWriteInvoke(AerospikeClient *self,
                                                   as_error *err,
                                                   PyObject *py_policy,
-                                                  PyObject *py_obj)
+                                                  PyObject *py_obj,
+                                                  profile_call *call)
 {
     Py_ssize_t py_batch_records_size = 0;
     as_batch_records batch_records;
@@ -157,6 +160,7 @@ static PyObject *AerospikeClient_BatchWriteInvoke(AerospikeClient *self,
         goto CLEANUP4;
     }
 
+    profile_mark(call, PROFILE_ARGS);
     if (py_policy != NULL) {
         if (pyobject_to_policy_batch(self, err, py_policy, &batch_policy,
                                      &batch_policy_p,
@@ -165,6 +169,7 @@ static PyObject *AerospikeClient_BatchWriteInvoke(AerospikeClient *self,
             goto CLEANUP4;
         }
     }
+    profile_mark(call, PROFILE_POLICY);
 
     // TODO check that py_object is an instance of class
 
@@ -202,7 +207,8 @@ static PyObject *AerospikeClient_BatchWriteInvoke(AerospikeClient *self,
         // extract as_batch_base_record fields
         // all batch_records classes should have these
         py_key = PyObject_GetAttrString(py_batch_record, FIELD_NAME_BATCH_KEY);
-        if (py_key == NULL || !PyTuple_Check(py_key)) {
+        if (py_key == NULL ||
+            (!PyTuple_Check(py_key) && !AerospikeKey_Check(py_key))) {
             as_error_update(err, AEROSPIKE_ERR_PARAM,
                             "py_key is NULL or not a tuple, %s must be a "
                             "aerospike key tuple",
@@ -439,11 +445,14 @@ static PyObject *AerospikeClient_BatchWriteInvoke(AerospikeClient *self,
         Py_XDECREF(py_ops_list);
     }
 
+    profile_mark(call, PROFILE_ARGS);
+
     Py_BEGIN_ALLOW_THREADS
 
     aerospike_batch_write(self->as, err, batch_policy_p, &batch_records);
 
     Py_END_ALLOW_THREADS
+    profile_mark(call, PROFILE_NETWORK);
 
     PyObject *py_bw_res = PyLong_FromLong((long)err->code);
     if (PyObject_HasAttrString(py_obj, FIELD_NAME_BATCH_RESULT)) {
@@ -562,17 +571,25 @@ PyObject *AerospikeClient_BatchWrite(AerospikeClient *self, PyObject *args,
 {
     PyObject *py_policy = NULL;
     PyObject *py_batch_recs = NULL;
+    PyObject *py_result = NULL;
 
     as_error err;
     as_error_init(&err);
 
+    profile_call call;
+    profile_start(&call, "batch_write", &self->slow_log, self->metrics);
+
     static char *kwlist[] = {"batch_records", "policy_batch", NULL};
 
     if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O:batch_write", kwlist,
                                     &py_batch_recs, &py_policy) == false) {
+        profile_end(&call);
         return NULL;
     }
 
-    return AerospikeClient_BatchWriteInvoke(self, &err, py_policy,
-                                            py_batch_recs);
+    py_result = AerospikeClient_BatchWriteInvoke(self, &err, py_policy,
+                                                 py_batch_recs, &call);
+
+    profile_end(&call);
+    return py_result;
 }
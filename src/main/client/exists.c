@@ -26,6 +26,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
 
 /**
  *******************************************************************************************************
@@ -34,13 +35,15 @@
  * @param self                  AerospikeClient object
  * @param py_key                The key under which the record is stored.
  * @param py_policy             The dictionary of policies
+ * @param call                  The timings of the call, if profiled.
  *
  * Returns a tuple of record having key and meta sequentially.
  *******************************************************************************************************
  */
 extern PyObject *AerospikeClient_Exists_Invoke(AerospikeClient *self,
                                                PyObject *py_key,
-                                               PyObject *py_policy)
+                                               PyObject *py_policy,
+                                               profile_call *call)
 {
     // Python Return Value
     PyObject *py_result = NULL;
@@ -80,6 +83,8 @@ extern PyObject *AerospikeClient_Exists_Invoke(AerospikeClient *self,
     }
     // key is initialised successfully
     key_initialised = true;
+    profile_set_key(call, &key);
+    profile_mark(call, PROFILE_ARGS);
 
     // Convert python policy object to as_policy_exists
     pyobject_to_policy_read(self, &err, py_policy, &read_policy, &read_policy_p,
@@ -89,10 +94,13 @@ extern PyObject *AerospikeClient_Exists_Invoke(AerospikeClient *self,
         goto CLEANUP;
     }
 
+    profile_mark(call, PROFILE_POLICY);
+
     // Invoke operation
     Py_BEGIN_ALLOW_THREADS
     aerospike_key_exists(self->as, &err, read_policy_p, &key, &rec);
     Py_END_ALLOW_THREADS
+    profile_mark(call, PROFILE_NETWORK);
 
     if (err.code == AEROSPIKE_OK) {
         PyObject *py_result_key = NULL;
@@ -107,6 +115,7 @@ extern PyObject *AerospikeClient_Exists_Invoke(AerospikeClient *self,
     }
     else if (err.code == AEROSPIKE_ERR_RECORD_NOT_FOUND) {
         as_error_reset(&err);
+        profile_set_status(call, AEROSPIKE_ERR_RECORD_NOT_FOUND);
 
         PyObject *py_result_key = NULL;
         PyObject *py_result_meta = Py_None;
@@ -139,17 +148,7 @@ CLEANUP:
     }
 
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "key")) {
-            PyObject_SetAttrString(exception_type, "key", py_key);
-        }
-        if (PyObject_HasAttrString(exception_type, "bin")) {
-            PyObject_SetAttrString(exception_type, "bin", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, py_key, Py_None, NULL, NULL, NULL);
     }
 
     return py_result;
@@ -174,6 +173,10 @@ PyObject *AerospikeClient_Exists(AerospikeClient *self, PyObject *args,
     // Python Function Arguments
     PyObject *py_key = NULL;
     PyObject *py_policy = NULL;
+    PyObject *py_result = NULL;
+
+    profile_call call;
+    profile_start(&call, "exists", &self->slow_log, self->metrics);
 
     // Python Function Keyword Arguments
     static char *kwlist[] = {"key", "policy", NULL};
@@ -181,9 +184,13 @@ PyObject *AerospikeClient_Exists(AerospikeClient *self, PyObject *args,
     // Python Function Argument Parsing
     if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O:exists", kwlist, &py_key,
                                     &py_policy) == false) {
+        profile_end(&call);
         return NULL;
     }
 
     // Invoke Operation
-    return AerospikeClient_Exists_Invoke(self, py_key, py_policy);
+    py_result = AerospikeClient_Exists_Invoke(self, py_key, py_policy, &call);
+
+    profile_end(&call);
+    return py_result;
 }
@@ -28,12 +28,19 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "key.h"
 
 typedef struct _exists_many_cb_data {
     PyObject *py_recs;
     as_error *cb_err;
 } exists_many_cb_data;
 
+typedef struct _exists_many_compact_data {
+    uint8_t *bitmap;
+    unsigned int *generations;
+    unsigned int *ttls;
+} exists_many_compact_data;
+
 static void make_batch_safe_to_free(as_batch *batch, int size);
 /**
  *******************************************************************************************************
@@ -117,6 +124,168 @@ static bool batch_exists_cb(const as_batch_read *results, uint32_t n,
     return true;
 }
 
+/**
+ *******************************************************************************************************
+ * This callback will be called with the results of aerospike_batch_exists(),
+ * to fill the buffers of a compact result. It makes no Python objects, so
+ * it does not need the GIL.
+ *
+ * @param results               An array of n as_batch_read entries, in the
+ *                              order of the keys
+ * @param n                     The number of results from the batch request
+ * @param udata                 The exists_many_compact_data to fill
+ *
+ * Returns true, to continue.
+ *******************************************************************************************************
+ */
+static bool batch_exists_compact_cb(const as_batch_read *results, uint32_t n,
+                                    void *udata)
+{
+    exists_many_compact_data *data = (exists_many_compact_data *)udata;
+
+    for (uint32_t i = 0; i < n; i++) {
+        if (results[i].result != AEROSPIKE_OK) {
+            continue;
+        }
+        if (data->bitmap) {
+            data->bitmap[i >> 3] |= (uint8_t)(1 << (i & 7));
+        }
+        if (data->generations) {
+            data->generations[i] = results[i].record.gen;
+        }
+        if (data->ttls) {
+            data->ttls[i] = results[i].record.ttl;
+        }
+    }
+    return true;
+}
+
+/**
+ *******************************************************************************************************
+ * Makes an array.array('I') of n zeros, and gets its buffer to fill.
+ *
+ * @param n                     The length of the array
+ * @param values                The buffer of the array, to be released with
+ *                              PyBuffer_Release()
+ *
+ * Returns the array, or NULL with a Python exception set.
+ *******************************************************************************************************
+ */
+static PyObject *new_uint_array(uint32_t n, Py_buffer *values)
+{
+    PyObject *py_array = NULL;
+    PyObject *py_module = PyImport_ImportModule("array");
+    PyObject *py_zeros =
+        PyBytes_FromStringAndSize(NULL, (Py_ssize_t)n * sizeof(unsigned int));
+
+    if (py_module && py_zeros) {
+        memset(PyBytes_AS_STRING(py_zeros), 0, PyBytes_GET_SIZE(py_zeros));
+        py_array = PyObject_CallMethod(py_module, "array", "sO", "I", py_zeros);
+    }
+    Py_XDECREF(py_module);
+    Py_XDECREF(py_zeros);
+
+    if (py_array && PyObject_GetBuffer(py_array, values, PyBUF_WRITABLE) != 0) {
+        Py_CLEAR(py_array);
+    }
+    return py_array;
+}
+
+/**
+ *******************************************************************************************************
+ * Checks which records of a batch exist, and makes a compact result of the
+ * parts asked for.
+ *
+ * @param err                   as_error object
+ * @param self                  AerospikeClient object
+ * @param batch_policy_p        as_policy_batch object
+ * @param batch                 The batch of keys
+ * @param py_bitmap             If not NULL, set to a bytearray with bit
+ *                              i & 7 of byte i >> 3 set if record i exists
+ * @param py_generations        If not NULL, set to an array('I') of the
+ *                              generations of the records, 0 if not found
+ * @param py_ttls               If not NULL, set to an array('I') of the
+ *                              ttls of the records, 0 if not found
+ *
+ * Returns the status. On error, the results are NULL.
+ *******************************************************************************************************
+ */
+static as_status batch_exists_compact(as_error *err, AerospikeClient *self,
+                                      as_policy_batch *batch_policy_p,
+                                      as_batch *batch, PyObject **py_bitmap,
+                                      PyObject **py_generations,
+                                      PyObject **py_ttls)
+{
+    uint32_t n = batch->keys.size;
+    exists_many_compact_data data = {NULL, NULL, NULL};
+    Py_buffer generations;
+    Py_buffer ttls;
+
+    PyObject **py_results[] = {py_bitmap, py_generations, py_ttls};
+    for (size_t i = 0; i < sizeof(py_results) / sizeof(py_results[0]); i++) {
+        if (py_results[i]) {
+            *py_results[i] = NULL;
+        }
+    }
+
+    if (py_bitmap) {
+        *py_bitmap = PyByteArray_FromStringAndSize(NULL, (n + 7) / 8);
+        if (!*py_bitmap) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Failed to allocate return bitmap");
+            goto CLEANUP;
+        }
+        data.bitmap = (uint8_t *)PyByteArray_AS_STRING(*py_bitmap);
+        memset(data.bitmap, 0, (n + 7) / 8);
+    }
+
+    if (py_generations) {
+        *py_generations = new_uint_array(n, &generations);
+        if (!*py_generations) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Failed to allocate return generations");
+            goto CLEANUP;
+        }
+        data.generations = (unsigned int *)generations.buf;
+    }
+
+    if (py_ttls) {
+        *py_ttls = new_uint_array(n, &ttls);
+        if (!*py_ttls) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Failed to allocate return ttls");
+            goto CLEANUP;
+        }
+        data.ttls = (unsigned int *)ttls.buf;
+    }
+
+    if (n) {
+        // Invoke C-client API
+        Py_BEGIN_ALLOW_THREADS
+        aerospike_batch_exists(self->as, err, batch_policy_p, batch,
+                               batch_exists_compact_cb, &data);
+        Py_END_ALLOW_THREADS
+    }
+
+CLEANUP:
+    if (data.generations) {
+        PyBuffer_Release(&generations);
+    }
+    if (data.ttls) {
+        PyBuffer_Release(&ttls);
+    }
+
+    if (err->code != AEROSPIKE_OK) {
+        for (size_t i = 0; i < sizeof(py_results) / sizeof(py_results[0]);
+             i++) {
+            if (py_results[i]) {
+                Py_CLEAR(*py_results[i]);
+            }
+        }
+    }
+    return err->code;
+}
+
 /**
  *******************************************************************************************************
  * This function will get a batch of records from the Aeropike DB.
@@ -125,14 +294,15 @@ static bool batch_exists_cb(const as_batch_read *results, uint32_t n,
  * @param self                  AerospikeClient object
  * @param py_keys               The list of keys
  * @param batch_policy_p        as_policy_batch object
+ * @param compact               Whether to return a (bitmap, generations, ttls)
+ *                              tuple instead of a list of (key, meta) tuples
  *
  * Returns the record if key exists otherwise NULL.
  *******************************************************************************************************
  */
-static PyObject *
-batch_exists_aerospike_batch_exists(as_error *err, AerospikeClient *self,
-                                    PyObject *py_keys,
-                                    as_policy_batch *batch_policy_p)
+static PyObject *batch_exists_aerospike_batch_exists(
+    as_error *err, AerospikeClient *self, PyObject *py_keys,
+    as_policy_batch *batch_policy_p, bool compact)
 {
 
     as_batch batch;
@@ -151,8 +321,8 @@ batch_exists_aerospike_batch_exists(as_error *err, AerospikeClient *self,
         as_batch_init(&batch, size);
         make_batch_safe_to_free(&batch, size);
 
-        cb_data.py_recs = PyList_New(size);
-        if (!cb_data.py_recs) {
+        cb_data.py_recs = compact ? NULL : PyList_New(size);
+        if (!compact && !cb_data.py_recs) {
             as_error_update(err, AEROSPIKE_ERR_PARAM,
                             "Failed to allocate return record");
             goto CLEANUP;
@@ -164,7 +334,7 @@ batch_exists_aerospike_batch_exists(as_error *err, AerospikeClient *self,
 
             PyObject *py_key = PyList_GetItem(py_keys, i);
 
-            if (!PyTuple_Check(py_key)) {
+            if (!PyTuple_Check(py_key) && !AerospikeKey_Check(py_key)) {
                 as_error_update(err, AEROSPIKE_ERR_PARAM,
                                 "Key should be a tuple.");
                 goto CLEANUP;
@@ -183,6 +353,19 @@ batch_exists_aerospike_batch_exists(as_error *err, AerospikeClient *self,
         goto CLEANUP;
     }
 
+    if (compact) {
+        // The compact result is returned in place of the records.
+        PyObject *py_bitmap = NULL;
+        PyObject *py_generations = NULL;
+        PyObject *py_ttls = NULL;
+        if (batch_exists_compact(err, self, batch_policy_p, &batch, &py_bitmap,
+                                 &py_generations, &py_ttls) == AEROSPIKE_OK) {
+            cb_data.py_recs =
+                Py_BuildValue("(NNN)", py_bitmap, py_generations, py_ttls);
+        }
+        goto CLEANUP;
+    }
+
     // Invoke C-client API
     Py_BEGIN_ALLOW_THREADS
     aerospike_batch_exists(self->as, err, batch_policy_p, &batch,
@@ -215,13 +398,15 @@ CLEANUP:
  * @param self                  AerospikeClient object
  * @param py_keys               The list of keys
  * @param py_policy             The dictionary of policies
+ * @param compact               Whether to return a compact result
  *
  * Returns the metadata of a record if key exists otherwise NULL.
  *******************************************************************************************************
  */
 static PyObject *AerospikeClient_Exists_Many_Invoke(AerospikeClient *self,
                                                     PyObject *py_keys,
-                                                    PyObject *py_policy)
+                                                    PyObject *py_policy,
+                                                    bool compact)
 {
     // Python Return Value
     PyObject *py_recs = NULL;
@@ -258,7 +443,7 @@ static PyObject *AerospikeClient_Exists_Many_Invoke(AerospikeClient *self,
     }
 
     py_recs = batch_exists_aerospike_batch_exists(&err, self, py_keys,
-                                                  batch_policy_p);
+                                                  batch_policy_p, compact);
 
 CLEANUP:
 
@@ -268,17 +453,7 @@ CLEANUP:
     }
 
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "key")) {
-            PyObject_SetAttrString(exception_type, "key", py_keys);
-        }
-        if (PyObject_HasAttrString(exception_type, "bin")) {
-            PyObject_SetAttrString(exception_type, "bin", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, py_keys, Py_None, NULL, NULL, NULL);
         return NULL;
     }
 
@@ -305,18 +480,164 @@ PyObject *AerospikeClient_Exists_Many(AerospikeClient *self, PyObject *args,
     // Python Function Arguments
     PyObject *py_keys = NULL;
     PyObject *py_policy = NULL;
+    int compact = false;
+
+    // Python Function Keyword Arguments
+    static char *kwlist[] = {"keys", "policy", "compact", NULL};
+
+    // Python Function Argument Parsing
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|Op:exists_many", kwlist,
+                                    &py_keys, &py_policy, &compact) == false) {
+        return NULL;
+    }
+
+    // Invoke Operation
+    return AerospikeClient_Exists_Many_Invoke(self, py_keys, py_policy,
+                                              compact);
+}
+
+/**
+ *******************************************************************************************************
+ * Checks which of a batch of records exist, by their digests.
+ *
+ * @param self                  AerospikeClient object
+ * @param ns                    The namespace of the records
+ * @param set                   The set of the records, or NULL
+ * @param py_digests            The packed digests of the records
+ * @param py_policy             The dictionary of policies
+ * @param generations           Whether to return the generations of the
+ *                              records instead of a bitmap
+ *
+ * Returns a bytearray bitmap of the records that exist, or an array.array('I')
+ * of their generations, in the order of the digests.
+ *******************************************************************************************************
+ */
+static PyObject *AerospikeClient_Exists_Many_Digests_Invoke(
+    AerospikeClient *self, const char *ns, const char *set,
+    PyObject *py_digests, PyObject *py_policy, bool generations)
+{
+    // Python Return Value
+    PyObject *py_result = NULL;
+
+    // Aerospike Client Arguments
+    as_error err;
+    as_policy_batch policy;
+    as_policy_batch *batch_policy_p = NULL;
+    as_batch batch;
+    Py_buffer digests;
+    uint32_t n_digests = 0;
+
+    // Initialisation flags
+    bool digests_initialised = false;
+    bool batch_initialised = false;
+
+    // For converting expressions.
+    as_exp exp_list;
+    as_exp *exp_list_p = NULL;
+
+    // Initialize error
+    as_error_init(&err);
+
+    if (!self || !self->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
+    }
+
+    if (!self->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    if (pyobject_to_digests(&err, py_digests, &digests, &n_digests) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+    digests_initialised = true;
+
+    // Convert python policy object to as_policy_batch
+    pyobject_to_policy_batch(self, &err, py_policy, &policy, &batch_policy_p,
+                             &self->as->config.policies.batch, &exp_list,
+                             &exp_list_p);
+    if (err.code != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
+    as_batch_init(&batch, n_digests);
+    make_batch_safe_to_free(&batch, n_digests);
+    batch_initialised = true;
+
+    const uint8_t *digest = (const uint8_t *)digests.buf;
+    for (uint32_t i = 0; i < n_digests; i++) {
+        if (!as_key_init_digest(as_batch_keyat(&batch, i), ns, set,
+                                digest + i * AS_DIGEST_VALUE_SIZE)) {
+            as_error_update(&err, AEROSPIKE_ERR_PARAM, "key is invalid");
+            goto CLEANUP;
+        }
+    }
+
+    batch_exists_compact(&err, self, batch_policy_p, &batch,
+                         generations ? NULL : &py_result,
+                         generations ? &py_result : NULL, NULL);
+
+CLEANUP:
+    if (batch_initialised) {
+        as_batch_destroy(&batch);
+    }
+
+    if (digests_initialised) {
+        PyBuffer_Release(&digests);
+    }
+
+    if (exp_list_p) {
+        as_exp_destroy(exp_list_p);
+    }
+
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception(&err);
+        return NULL;
+    }
+
+    return py_result;
+}
+
+/**
+ *******************************************************************************************************
+ * Checks which of a batch of records exist, by their digests.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a bitmap or an array of generations.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_Exists_Many_Digests(AerospikeClient *self,
+                                              PyObject *args, PyObject *kwds)
+{
+    // Python Function Arguments
+    const char *ns = NULL;
+    const char *set = NULL;
+    PyObject *py_digests = NULL;
+    PyObject *py_policy = NULL;
+    int generations = false;
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"keys", "policy", NULL};
+    static char *kwlist[] = {"ns",     "set",         "digests",
+                             "policy", "generations", NULL};
 
     // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O:exists_many", kwlist,
-                                    &py_keys, &py_policy) == false) {
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "szO|Op:exists_many_digests",
+                                    kwlist, &ns, &set, &py_digests, &py_policy,
+                                    &generations) == false) {
         return NULL;
     }
 
     // Invoke Operation
-    return AerospikeClient_Exists_Many_Invoke(self, py_keys, py_policy);
+    return AerospikeClient_Exists_Many_Digests_Invoke(self, ns, set, py_digests,
+                                                      py_policy, generations);
 }
 
 /*
@@ -26,6 +26,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
 
 /**
  *******************************************************************************************************
@@ -35,13 +36,16 @@
  * @param py_key                The key under which to store the record.
  * @param py_policy             The dictionary of policies to be given while
  *                              reading a record.
+ * @param missing_ok            Return None instead of raising RecordNotFound.
+ * @param call                  The timings of the call, if profiled.
  *
  * Returns the record on success.
  * In case of error,appropriate exceptions will be raised.
  *******************************************************************************************************
  */
 PyObject *AerospikeClient_Get_Invoke(AerospikeClient *self, PyObject *py_key,
-                                     PyObject *py_policy)
+                                     PyObject *py_policy, bool missing_ok,
+                                     profile_call *call)
 {
     // Python Return Value
     PyObject *py_rec = NULL;
@@ -82,6 +86,8 @@ PyObject *AerospikeClient_Get_Invoke(AerospikeClient *self, PyObject *py_key,
     }
     // Key is successfully initialised.
     key_initialised = true;
+    profile_set_key(call, &key);
+    profile_mark(call, PROFILE_ARGS);
 
     // Convert python policy object to as_policy_exists
     pyobject_to_policy_read(self, &err, py_policy, &read_policy, &read_policy_p,
@@ -90,11 +96,14 @@ PyObject *AerospikeClient_Get_Invoke(AerospikeClient *self, PyObject *py_key,
     if (err.code != AEROSPIKE_OK) {
         goto CLEANUP;
     }
+    profile_mark(call, PROFILE_POLICY);
 
     // Invoke operation
     Py_BEGIN_ALLOW_THREADS
     aerospike_key_get(self->as, &err, read_policy_p, &key, &rec);
     Py_END_ALLOW_THREADS
+    profile_mark(call, PROFILE_NETWORK);
+    profile_set_payload(call, &key, NULL, NULL, rec);
     if (err.code == AEROSPIKE_OK) {
         record_initialised = true;
 
@@ -136,17 +145,12 @@ CLEANUP:
     }
 
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "key")) {
-            PyObject_SetAttrString(exception_type, "key", py_key);
+        if (missing_ok && err.code == AEROSPIKE_ERR_RECORD_NOT_FOUND) {
+            // A miss is not an error, so don't build an exception for it.
+            profile_set_status(call, err.code);
+            Py_RETURN_NONE;
         }
-        if (PyObject_HasAttrString(exception_type, "bin")) {
-            PyObject_SetAttrString(exception_type, "bin", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, py_key, Py_None, NULL, NULL, NULL);
         return NULL;
     }
 
@@ -172,16 +176,26 @@ PyObject *AerospikeClient_Get(AerospikeClient *self, PyObject *args,
     // Python Function Arguments
     PyObject *py_key = NULL;
     PyObject *py_policy = NULL;
+    PyObject *py_rec = NULL;
+    int missing_ok = false;
+
+    profile_call call;
+    profile_start(&call, "get", &self->slow_log, self->metrics);
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"key", "policy", NULL};
+    static char *kwlist[] = {"key", "policy", "missing_ok", NULL};
 
     // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O:get", kwlist, &py_key,
-                                    &py_policy) == false) {
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|Op:get", kwlist, &py_key,
+                                    &py_policy, &missing_ok) == false) {
+        profile_end(&call);
         return NULL;
     }
 
     // Invoke Operation
-    return AerospikeClient_Get_Invoke(self, py_key, py_policy);
+    py_rec =
+        AerospikeClient_Get_Invoke(self, py_key, py_policy, missing_ok, &call);
+
+    profile_end(&call);
+    return py_rec;
 }
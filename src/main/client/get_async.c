@@ -95,17 +95,23 @@ void read_async_callback_helper(as_error *cmd_error, as_record *record,
     }
 
     if (error->code != AEROSPIKE_OK) {
-        py_exception = raise_exception_old(error);
-        if (PyObject_HasAttrString(py_exception, "key")) {
-            PyObject_SetAttrString(py_exception, "key", py_key);
-        }
-        if (PyObject_HasAttrString(py_exception, "bin")) {
-            PyObject_SetAttrString(py_exception, "bin", Py_None);
-        }
+        // Each error gets its own instance, so concurrent errors don't share
+        // the key and bin attributes.
+        py_exception =
+            create_exception(error, py_key, Py_None, NULL, NULL, NULL);
         if (!cb) {
-            PyErr_SetObject(py_exception, py_err);
+            if (py_exception) {
+                PyErr_SetObject((PyObject *)Py_TYPE(py_exception),
+                                py_exception);
+                Py_DECREF(py_exception);
+                py_exception = NULL;
+            }
             Py_DECREF(py_err);
         }
+        else if (!py_exception) {
+            // The callback gets None rather than a half-built exception.
+            PyErr_Clear();
+        }
     }
 
     if (cb) {
@@ -197,11 +203,7 @@ PyObject *AerospikeClient_Get_Async(AerospikeClient *self, PyObject *args,
         as_error_update(
             &err, AEROSPIKE_ERR,
             "Support for async is disabled, build software with async option");
-        PyObject *py_err = NULL, *exception_type = NULL;
-        error_to_pyobject(&err, &py_err);
-        exception_type = raise_exception_old(&err);
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception(&err);
         return NULL;
     }
 
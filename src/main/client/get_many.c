@@ -28,6 +28,8 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
+#include "key.h"
 
 #define MAX_STACK_ALLOCATION 4000
 
@@ -39,6 +41,7 @@
  * @param self                  AerospikeClient object
  * @param py_keys               The list of keys
  * @param batch_policy_p        as_policy_batch object
+ * @param call                  The timings of the call, if profiled.
  *
  * Returns the record if key exists otherwise NULL.
  *******************************************************************************************************
@@ -46,7 +49,8 @@
 static PyObject *batch_get_aerospike_batch_read(as_error *err,
                                                 AerospikeClient *self,
                                                 PyObject *py_keys,
-                                                as_policy_batch *batch_policy_p)
+                                                as_policy_batch *batch_policy_p,
+                                                profile_call *call)
 {
     PyObject *py_recs = NULL;
 
@@ -75,7 +79,7 @@ static PyObject *batch_get_aerospike_batch_read(as_error *err,
 
             PyObject *py_key = PyList_GetItem(py_keys, i);
 
-            if (!PyTuple_Check(py_key)) {
+            if (!PyTuple_Check(py_key) && !AerospikeKey_Check(py_key)) {
                 as_error_update(err, AEROSPIKE_ERR_PARAM,
                                 "Key should be a tuple.");
                 goto CLEANUP;
@@ -97,10 +101,13 @@ static PyObject *batch_get_aerospike_batch_read(as_error *err,
         goto CLEANUP;
     }
 
+    profile_mark(call, PROFILE_ARGS);
+
     // Invoke C-client API
     Py_BEGIN_ALLOW_THREADS
     aerospike_batch_read(self->as, err, batch_policy_p, &records);
     Py_END_ALLOW_THREADS
+    profile_mark(call, PROFILE_NETWORK);
     if (err->code != AEROSPIKE_OK) {
         goto CLEANUP;
     }
@@ -130,13 +137,15 @@ CLEANUP:
  * @param self                  AerospikeClient object
  * @param py_keys               The list of keys
  * @param py_policy             The dictionary of policies
+ * @param call                  The timings of the call, if profiled.
  *
  * Returns the record if key exists otherwise NULL.
  *******************************************************************************************************
  */
 static PyObject *AerospikeClient_Get_Many_Invoke(AerospikeClient *self,
                                                  PyObject *py_keys,
-                                                 PyObject *py_policy)
+                                                 PyObject *py_policy,
+                                                 profile_call *call)
 {
     // Python Return Value
     PyObject *py_recs = NULL;
@@ -163,6 +172,8 @@ static PyObject *AerospikeClient_Get_Many_Invoke(AerospikeClient *self,
         goto CLEANUP;
     }
 
+    profile_mark(call, PROFILE_ARGS);
+
     // Convert python policy object to as_policy_batch
     pyobject_to_policy_batch(self, &err, py_policy, &policy, &batch_policy_p,
                              &self->as->config.policies.batch, &exp_list,
@@ -171,9 +182,10 @@ static PyObject *AerospikeClient_Get_Many_Invoke(AerospikeClient *self,
     if (err.code != AEROSPIKE_OK) {
         goto CLEANUP;
     }
+    profile_mark(call, PROFILE_POLICY);
 
-    py_recs =
-        batch_get_aerospike_batch_read(&err, self, py_keys, batch_policy_p);
+    py_recs = batch_get_aerospike_batch_read(&err, self, py_keys,
+                                             batch_policy_p, call);
 
 CLEANUP:
 
@@ -182,17 +194,7 @@ CLEANUP:
     }
 
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "key")) {
-            PyObject_SetAttrString(exception_type, "key", py_keys);
-        }
-        if (PyObject_HasAttrString(exception_type, "bin")) {
-            PyObject_SetAttrString(exception_type, "bin", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, py_keys, Py_None, NULL, NULL, NULL);
         return NULL;
     }
 
@@ -219,6 +221,10 @@ PyObject *AerospikeClient_Get_Many(AerospikeClient *self, PyObject *args,
     // Python Function Arguments
     PyObject *py_keys = NULL;
     PyObject *py_policy = NULL;
+    PyObject *py_recs = NULL;
+
+    profile_call call;
+    profile_start(&call, "get_many", &self->slow_log, self->metrics);
 
     // Python Function Keyword Arguments
     static char *kwlist[] = {"keys", "policy", NULL};
@@ -226,9 +232,273 @@ PyObject *AerospikeClient_Get_Many(AerospikeClient *self, PyObject *args,
     // Python Function Argument Parsing
     if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O:get_many", kwlist,
                                     &py_keys, &py_policy) == false) {
+        profile_end(&call);
+        return NULL;
+    }
+
+    // Invoke Operation
+    py_recs = AerospikeClient_Get_Many_Invoke(self, py_keys, py_policy, &call);
+
+    profile_end(&call);
+    return py_recs;
+}
+
+/**
+ *******************************************************************************************************
+ * Converts the records read by get_many_digests() to a list of (meta, bins)
+ * tuples, with None for each record that was not read.
+ *
+ * @param self                  AerospikeClient object
+ * @param err                   as_error object
+ * @param records               The records read
+ *
+ * Returns the list, or NULL with err set.
+ *******************************************************************************************************
+ */
+static PyObject *digest_records_to_pyobject(AerospikeClient *self,
+                                            as_error *err,
+                                            as_batch_read_records *records)
+{
+    as_vector *list = &records->list;
+    PyObject *py_recs = PyList_New(list->size);
+    if (!py_recs) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Failed to allocate return list of records");
+        return NULL;
+    }
+
+    for (uint32_t i = 0; i < list->size; i++) {
+        as_batch_read_record *batch = as_vector_get(list, i);
+        PyObject *py_rec = Py_None;
+
+        if (batch->result == AEROSPIKE_OK) {
+            PyObject *py_meta = NULL;
+            PyObject *py_bins = NULL;
+            if (metadata_to_pyobject(err, &batch->record, &py_meta) ==
+                AEROSPIKE_OK) {
+                bins_to_pyobject(self, err, &batch->record, &py_bins, false);
+            }
+            if (err->code != AEROSPIKE_OK) {
+                Py_XDECREF(py_meta);
+                Py_DECREF(py_recs);
+                return NULL;
+            }
+            py_rec = Py_BuildValue("(NN)", py_meta, py_bins);
+            if (!py_rec) {
+                as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                                "Failed to create a record tuple");
+                Py_DECREF(py_recs);
+                return NULL;
+            }
+        }
+        else {
+            Py_INCREF(py_rec);
+        }
+        PyList_SET_ITEM(py_recs, i, py_rec);
+    }
+    return py_recs;
+}
+
+/**
+ *******************************************************************************************************
+ * Reads a batch of records by their digests.
+ *
+ * @param self                  AerospikeClient object
+ * @param ns                    The namespace of the records
+ * @param set                   The set of the records, or NULL
+ * @param py_digests            The packed digests of the records
+ * @param py_bins               The list of bins to read, or NULL for all bins
+ * @param py_policy             The dictionary of policies
+ * @param call                  The timings of the call, if profiled.
+ *
+ * Returns a list with an entry for each digest, in the same order.
+ *******************************************************************************************************
+ */
+static PyObject *
+AerospikeClient_Get_Many_Digests_Invoke(AerospikeClient *self, const char *ns,
+                                        const char *set, PyObject *py_digests,
+                                        PyObject *py_bins, PyObject *py_policy,
+                                        profile_call *call)
+{
+    // Python Return Value
+    PyObject *py_recs = NULL;
+
+    // Aerospike Client Arguments
+    as_error err;
+    as_policy_batch policy;
+    as_policy_batch *batch_policy_p = NULL;
+    as_batch_read_records records;
+    Py_buffer digests;
+    uint32_t n_digests = 0;
+    char **bins = NULL;
+    Py_ssize_t n_bins = 0;
+
+    // Initialisation flags
+    bool digests_initialised = false;
+    bool batch_initialised = false;
+
+    // For converting expressions.
+    as_exp exp_list;
+    as_exp *exp_list_p = NULL;
+
+    // Initialize error
+    as_error_init(&err);
+
+    if (!self || !self->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
+    }
+
+    if (!self->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    if (pyobject_to_digests(&err, py_digests, &digests, &n_digests) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+    digests_initialised = true;
+
+    if (py_bins && py_bins != Py_None) {
+        if (!PyList_Check(py_bins)) {
+            as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                            "Bins should be specified as a list.");
+            goto CLEANUP;
+        }
+        n_bins = PyList_Size(py_bins);
+        bins = (char **)malloc(sizeof(char *) * n_bins);
+        for (Py_ssize_t i = 0; i < n_bins; i++) {
+            PyObject *py_bin = PyList_GetItem(py_bins, i);
+            bins[i] = PyUnicode_Check(py_bin) ? (char *)PyUnicode_AsUTF8(py_bin)
+                                              : NULL;
+            if (!bins[i]) {
+                PyErr_Clear();
+                as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                                "Bin name should be a string.");
+                goto CLEANUP;
+            }
+        }
+    }
+
+    profile_mark(call, PROFILE_ARGS);
+
+    // Convert python policy object to as_policy_batch
+    pyobject_to_policy_batch(self, &err, py_policy, &policy, &batch_policy_p,
+                             &self->as->config.policies.batch, &exp_list,
+                             &exp_list_p);
+    if (err.code != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+    profile_mark(call, PROFILE_POLICY);
+
+    if (n_digests > MAX_STACK_ALLOCATION) {
+        as_batch_read_init(&records, n_digests);
+    }
+    else {
+        as_batch_read_inita(&records, n_digests);
+    }
+    batch_initialised = true;
+
+    const uint8_t *digest = (const uint8_t *)digests.buf;
+    for (uint32_t i = 0; i < n_digests; i++) {
+        as_batch_read_record *record = as_batch_read_reserve(&records);
+        if (!as_key_init_digest(&record->key, ns, set,
+                                digest + i * AS_DIGEST_VALUE_SIZE)) {
+            as_error_update(&err, AEROSPIKE_ERR_PARAM, "key is invalid");
+            goto CLEANUP;
+        }
+        if (n_bins) {
+            record->bin_names = bins;
+            record->n_bin_names = (uint32_t)n_bins;
+        }
+        else {
+            record->read_all_bins = true;
+        }
+    }
+
+    if (n_digests) {
+        // Invoke C-client API
+        Py_BEGIN_ALLOW_THREADS
+        aerospike_batch_read(self->as, &err, batch_policy_p, &records);
+        Py_END_ALLOW_THREADS
+    }
+    profile_mark(call, PROFILE_NETWORK);
+    if (err.code != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
+    py_recs = digest_records_to_pyobject(self, &err, &records);
+
+CLEANUP:
+    if (batch_initialised) {
+        as_batch_read_destroy(&records);
+    }
+
+    if (digests_initialised) {
+        PyBuffer_Release(&digests);
+    }
+
+    if (bins) {
+        free(bins);
+    }
+
+    if (exp_list_p) {
+        as_exp_destroy(exp_list_p);
+    }
+
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception(&err);
+        return NULL;
+    }
+
+    return py_recs;
+}
+
+/**
+ *******************************************************************************************************
+ * Gets a batch of records from the Aerospike DB by their digests.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a list of (meta, bins) tuples, with None for records that were not
+ * found, in the order of the digests.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_Get_Many_Digests(AerospikeClient *self,
+                                           PyObject *args, PyObject *kwds)
+{
+    // Python Function Arguments
+    const char *ns = NULL;
+    const char *set = NULL;
+    PyObject *py_digests = NULL;
+    PyObject *py_bins = NULL;
+    PyObject *py_policy = NULL;
+    PyObject *py_recs = NULL;
+
+    profile_call call;
+    profile_start(&call, "get_many_digests", &self->slow_log, self->metrics);
+
+    // Python Function Keyword Arguments
+    static char *kwlist[] = {"ns", "set", "digests", "bins", "policy", NULL};
+
+    // Python Function Argument Parsing
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "szO|OO:get_many_digests",
+                                    kwlist, &ns, &set, &py_digests, &py_bins,
+                                    &py_policy) == false) {
+        profile_end(&call);
         return NULL;
     }
 
     // Invoke Operation
-    return AerospikeClient_Get_Many_Invoke(self, py_keys, py_policy);
+    py_recs = AerospikeClient_Get_Many_Digests_Invoke(
+        self, ns, set, py_digests, py_bins, py_policy, &call);
+
+    profile_end(&call);
+    return py_recs;
 }
@@ -0,0 +1,261 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include <aerospike/as_cluster.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_node.h>
+#include <aerospike/as_partition.h>
+
+#include "client.h"
+#include "conversions.h"
+#include "exceptions.h"
+
+#define FNV_OFFSET_BASIS 0xcbf29ce484222325ULL
+#define FNV_PRIME 0x100000001b3ULL
+
+static uint64_t fnv_add(uint64_t hash, const void *data, size_t size)
+{
+    const uint8_t *bytes = data;
+    for (size_t i = 0; i < size; i++) {
+        hash = (hash ^ bytes[i]) * FNV_PRIME;
+    }
+    return hash;
+}
+
+/*
+ * Returns the version of the partition maps of the cluster. It is a hash of
+ * the nodes and the partition generation the client last read from each, so
+ * it changes whenever the client updates a partition map.
+ */
+static uint64_t partition_map_version(as_nodes *nodes)
+{
+    uint64_t hash = FNV_OFFSET_BASIS;
+    for (uint32_t i = 0; i < nodes->size; i++) {
+        as_node *node = nodes->array[i];
+        uint32_t generation = node->partition_generation;
+        hash = fnv_add(hash, node->name, strlen(node->name) + 1);
+        hash = fnv_add(hash, &generation, sizeof(generation));
+    }
+    return hash;
+}
+
+/*
+ * Makes an array.array('h') of n entries of -1, and gets its buffer to fill.
+ * Returns the array, or NULL with a Python exception set.
+ */
+static PyObject *new_node_index_array(uint32_t n, Py_buffer *values)
+{
+    PyObject *py_array = NULL;
+    PyObject *py_module = PyImport_ImportModule("array");
+    PyObject *py_none =
+        PyBytes_FromStringAndSize(NULL, (Py_ssize_t)n * sizeof(short));
+
+    if (py_module && py_none) {
+        // All the bits set is -1, for no node.
+        memset(PyBytes_AS_STRING(py_none), 0xff, PyBytes_GET_SIZE(py_none));
+        py_array = PyObject_CallMethod(py_module, "array", "sO", "h", py_none);
+    }
+    Py_XDECREF(py_module);
+    Py_XDECREF(py_none);
+
+    if (py_array && PyObject_GetBuffer(py_array, values, PyBUF_WRITABLE) != 0) {
+        Py_CLEAR(py_array);
+    }
+    return py_array;
+}
+
+/*
+ * Converts the nodes of the cluster, in the order of their indices in the map.
+ */
+static PyObject *map_nodes_to_pyobject(as_nodes *nodes)
+{
+    PyObject *py_nodes = PyList_New(0);
+    if (!py_nodes) {
+        return NULL;
+    }
+
+    for (uint32_t i = 0; i < nodes->size; i++) {
+        as_node *node = nodes->array[i];
+        PyObject *py_node =
+            Py_BuildValue("{s:s,s:s,s:I}", "node_name", node->name, "address",
+                          as_node_get_address_string(node),
+                          "partition_generation", node->partition_generation);
+        if (!py_node || PyList_Append(py_nodes, py_node) != 0) {
+            Py_XDECREF(py_node);
+            Py_DECREF(py_nodes);
+            return NULL;
+        }
+        Py_DECREF(py_node);
+    }
+    return py_nodes;
+}
+
+/*
+ * Converts the partition map of a namespace. Entry replica * size + partition
+ * ID of the map is the index in nodes of the node that has that replica of the
+ * partition, or -1 if no node has it.
+ */
+static PyObject *partition_map_to_pyobject(as_partition_table *table,
+                                           as_nodes *nodes, uint64_t version)
+{
+    Py_buffer values;
+    PyObject *py_map = NULL;
+    PyObject *py_nodes = NULL;
+    PyObject *py_result = NULL;
+
+    uint32_t replicas = table->replica_size;
+    if (replicas > AS_MAX_REPLICATION_FACTOR) {
+        replicas = AS_MAX_REPLICATION_FACTOR;
+    }
+
+    py_map = new_node_index_array(replicas * table->size, &values);
+    if (!py_map) {
+        return NULL;
+    }
+
+    short *indices = values.buf;
+    for (uint32_t pid = 0; pid < table->size; pid++) {
+        as_partition *partition = &table->partitions[pid];
+        for (uint32_t replica = 0; replica < replicas; replica++) {
+            as_node *node = as_node_load(&partition->nodes[replica]);
+            // Nodes that are no longer in the cluster are left as -1.
+            for (uint32_t i = 0; node && i < nodes->size; i++) {
+                if (nodes->array[i] == node) {
+                    indices[replica * table->size + pid] = (short)i;
+                    break;
+                }
+            }
+        }
+    }
+    PyBuffer_Release(&values);
+
+    py_nodes = map_nodes_to_pyobject(nodes);
+    if (py_nodes) {
+        py_result = Py_BuildValue(
+            "{s:s,s:K,s:I,s:O,s:O,s:O}", "namespace", table->ns, "version",
+            (unsigned long long)version, "replicas", replicas, "sc_mode",
+            table->sc_mode ? Py_True : Py_False, "nodes", py_nodes, "map",
+            py_map);
+    }
+
+    Py_XDECREF(py_nodes);
+    Py_DECREF(py_map);
+    return py_result;
+}
+
+/**
+ ******************************************************************************************************
+ * Returns the partition map the client keeps for a namespace.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a dictionary with the map, the nodes and the version of the map, or
+ * None if since is the current version.
+ ********************************************************************************************************/
+PyObject *AerospikeClient_GetPartitionMap(AerospikeClient *self, PyObject *args,
+                                          PyObject *kwds)
+{
+    char *ns = NULL;
+    PyObject *py_since = NULL;
+    PyObject *py_map = NULL;
+    as_nodes *nodes = NULL;
+
+    as_error err;
+    as_error_init(&err);
+
+    static char *kwlist[] = {"ns", "since", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "s|O:get_partition_map", kwlist,
+                                    &ns, &py_since) == false) {
+        return NULL;
+    }
+
+    if (!self || !self->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
+    }
+
+    if (!self->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    as_cluster *cluster = self->as->cluster;
+    if (!cluster) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "invalid aerospike cluster");
+        goto CLEANUP;
+    }
+
+    uint64_t since = 0;
+    if (py_since && py_since != Py_None) {
+        if (!PyLong_Check(py_since)) {
+            as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                            "since must be an int version");
+            goto CLEANUP;
+        }
+        since = PyLong_AsUnsignedLongLong(py_since);
+        if (PyErr_Occurred()) {
+            as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                            "since must be an int version");
+            goto CLEANUP;
+        }
+    }
+
+    nodes = as_nodes_reserve(cluster);
+
+    as_partition_table *table =
+        as_partition_tables_get(&cluster->partition_tables, ns);
+    if (!table) {
+        as_error_update(&err, AEROSPIKE_ERR_NAMESPACE_NOT_FOUND,
+                        "Namespace %s not found in the partition map", ns);
+        goto CLEANUP;
+    }
+
+    uint64_t version = partition_map_version(nodes);
+    if (py_since && py_since != Py_None && since == version) {
+        // The caller already has this version of the map.
+        Py_INCREF(Py_None);
+        py_map = Py_None;
+        goto CLEANUP;
+    }
+
+    py_map = partition_map_to_pyobject(table, nodes, version);
+    if (!py_map) {
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                        "Failed to convert the partition map");
+    }
+
+CLEANUP:
+    if (nodes) {
+        as_nodes_release(nodes);
+    }
+
+    if (err.code != AEROSPIKE_OK) {
+        // A Python error set while converting is replaced by the client error.
+        PyErr_Clear();
+        raise_exception(&err);
+        return NULL;
+    }
+
+    return py_map;
+}
@@ -0,0 +1,47 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include "client.h"
+#include "profile.h"
+
+/**
+ ******************************************************************************************************
+ * Returns the calls logged for being slower than the client's
+ * slow_command_threshold_ms.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a list of dictionaries, oldest first.
+ ********************************************************************************************************/
+PyObject *AerospikeClient_GetSlowCommands(AerospikeClient *self, PyObject *args,
+                                          PyObject *kwds)
+{
+    int clear = false;
+
+    static char *kwlist[] = {"clear", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "|p:get_slow_commands", kwlist,
+                                    &clear) == false) {
+        return NULL;
+    }
+
+    return profile_slow_log_entries(&self->slow_log, clear);
+}
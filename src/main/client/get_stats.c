@@ -0,0 +1,240 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include <aerospike/aerospike_stats.h>
+#include <aerospike/as_cluster.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_node.h>
+
+#include "client.h"
+#include "conversions.h"
+#include "exceptions.h"
+
+/*
+ * Sets name to an int in py_dict. Returns false if it could not be set.
+ */
+static bool set_uint_item(PyObject *py_dict, const char *name, uint64_t value)
+{
+    PyObject *py_value = PyLong_FromUnsignedLongLong(value);
+    if (!py_value) {
+        return false;
+    }
+    int rc = PyDict_SetItemString(py_dict, name, py_value);
+    Py_DECREF(py_value);
+    return rc == 0;
+}
+
+/*
+ * Converts the connection counts of one pool type of a node.
+ */
+static PyObject *conn_stats_to_pyobject(as_conn_stats *stats)
+{
+    PyObject *py_stats = PyDict_New();
+    if (!py_stats) {
+        return NULL;
+    }
+
+    if (!set_uint_item(py_stats, "open", stats->in_pool + stats->in_use) ||
+        !set_uint_item(py_stats, "in_use", stats->in_use) ||
+        !set_uint_item(py_stats, "idle", stats->in_pool) ||
+        !set_uint_item(py_stats, "opened", stats->opened) ||
+        !set_uint_item(py_stats, "closed", stats->closed)) {
+        Py_DECREF(py_stats);
+        return NULL;
+    }
+    return py_stats;
+}
+
+/*
+ * Converts the statistics of one node.
+ */
+static PyObject *node_stats_to_pyobject(as_cluster *cluster,
+                                        as_node_stats *stats)
+{
+    PyObject *py_stats = PyDict_New();
+    if (!py_stats) {
+        return NULL;
+    }
+
+    as_node *node = stats->node;
+    PyObject *py_name = PyUnicode_FromString(node->name);
+    PyObject *py_address =
+        PyUnicode_FromString(as_node_get_address_string(node));
+    PyObject *py_sync = conn_stats_to_pyobject(&stats->sync);
+    PyObject *py_async = conn_stats_to_pyobject(&stats->async);
+    PyObject *py_pipeline = conn_stats_to_pyobject(&stats->pipeline);
+    // Commands to the node fail with MaxErrorRateExceeded until the window
+    // ends once the count is over max_error_rate.
+    PyObject *py_exceeded =
+        PyBool_FromLong(cluster->max_error_rate > 0 &&
+                        stats->error_count > cluster->max_error_rate);
+
+    bool success =
+        py_name && py_address && py_sync && py_async && py_pipeline &&
+        PyDict_SetItemString(py_stats, "node_name", py_name) == 0 &&
+        PyDict_SetItemString(py_stats, "address", py_address) == 0 &&
+        PyDict_SetItemString(py_stats, "sync", py_sync) == 0 &&
+        PyDict_SetItemString(py_stats, "async", py_async) == 0 &&
+        PyDict_SetItemString(py_stats, "pipeline", py_pipeline) == 0 &&
+        set_uint_item(py_stats, "error_count", stats->error_count) &&
+        PyDict_SetItemString(py_stats, "error_rate_exceeded", py_exceeded) == 0;
+
+    Py_XDECREF(py_name);
+    Py_XDECREF(py_address);
+    Py_XDECREF(py_sync);
+    Py_XDECREF(py_async);
+    Py_XDECREF(py_pipeline);
+    Py_DECREF(py_exceeded);
+
+    if (!success) {
+        Py_DECREF(py_stats);
+        return NULL;
+    }
+    return py_stats;
+}
+
+/*
+ * Converts the statistics of the cluster, its nodes and event loops.
+ */
+static PyObject *cluster_stats_to_pyobject(as_cluster *cluster,
+                                           as_cluster_stats *stats)
+{
+    PyObject *py_stats = PyDict_New();
+    PyObject *py_nodes = PyList_New(0);
+    PyObject *py_event_loops = PyList_New(0);
+    PyObject *py_item = NULL;
+
+    if (!py_stats || !py_nodes || !py_event_loops) {
+        goto ERROR;
+    }
+
+    for (uint32_t i = 0; i < stats->nodes_size; i++) {
+        py_item = node_stats_to_pyobject(cluster, &stats->nodes[i]);
+        if (!py_item || PyList_Append(py_nodes, py_item) != 0) {
+            goto ERROR;
+        }
+        Py_CLEAR(py_item);
+    }
+
+    for (uint32_t i = 0; i < stats->event_loops_size; i++) {
+        as_event_loop_stats *loop = &stats->event_loops[i];
+        py_item = PyDict_New();
+        if (!py_item ||
+            !set_uint_item(py_item, "in_process",
+                           loop->process_size > 0 ? loop->process_size : 0) ||
+            !set_uint_item(py_item, "queued", loop->queue_size) ||
+            PyList_Append(py_event_loops, py_item) != 0) {
+            goto ERROR;
+        }
+        Py_CLEAR(py_item);
+    }
+
+    if (PyDict_SetItemString(py_stats, "nodes", py_nodes) != 0 ||
+        PyDict_SetItemString(py_stats, "event_loops", py_event_loops) != 0 ||
+        !set_uint_item(py_stats, "thread_pool_queued_tasks",
+                       stats->thread_pool_queued_tasks) ||
+        !set_uint_item(py_stats, "tend_count", cluster->tend_count) ||
+        !set_uint_item(py_stats, "invalid_node_count",
+                       cluster->invalid_node_count)) {
+        goto ERROR;
+    }
+
+    Py_DECREF(py_nodes);
+    Py_DECREF(py_event_loops);
+    return py_stats;
+
+ERROR:
+    Py_XDECREF(py_item);
+    Py_XDECREF(py_stats);
+    Py_XDECREF(py_nodes);
+    Py_XDECREF(py_event_loops);
+    return NULL;
+}
+
+/**
+ ******************************************************************************************************
+ * Returns the connection pool, error rate and tend statistics of the cluster.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a dictionary of statistics.
+ ********************************************************************************************************/
+PyObject *AerospikeClient_GetStats(AerospikeClient *self, PyObject *args,
+                                   PyObject *kwds)
+{
+    PyObject *py_stats = NULL;
+    as_cluster_stats stats;
+    bool stats_initialised = false;
+
+    as_error err;
+    as_error_init(&err);
+
+    static char *kwlist[] = {NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, ":get_stats", kwlist) ==
+        false) {
+        return NULL;
+    }
+
+    if (!self || !self->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
+    }
+
+    if (!self->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    as_cluster *cluster = self->as->cluster;
+    if (!cluster) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "invalid aerospike cluster");
+        goto CLEANUP;
+    }
+
+    // Counting the pooled connections takes each pool's lock.
+    Py_BEGIN_ALLOW_THREADS
+    aerospike_stats(self->as, &stats);
+    Py_END_ALLOW_THREADS
+    stats_initialised = true;
+
+    py_stats = cluster_stats_to_pyobject(cluster, &stats);
+    if (!py_stats) {
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                        "Failed to convert the cluster statistics");
+    }
+
+CLEANUP:
+    if (stats_initialised) {
+        aerospike_stats_destroy(&stats);
+    }
+
+    if (err.code != AEROSPIKE_OK) {
+        // A Python error set while converting is replaced by the client error.
+        PyErr_Clear();
+        raise_exception(&err);
+        return NULL;
+    }
+
+    return py_stats;
+}
@@ -205,20 +205,12 @@ CLEANUP:
         Py_DECREF(py_ustr);
     }
     if (udata_ptr->error.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&udata_ptr->error, &py_err);
-        PyObject *exception_type = raise_exception_old(&udata_ptr->error);
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&udata_ptr->error, NULL, NULL, NULL, NULL, NULL);
         PyGILState_Release(gil_state);
         return NULL;
     }
     if (err->code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(err, &py_err);
-        PyObject *exception_type = raise_exception_old(err);
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(err, NULL, NULL, NULL, NULL, NULL);
         PyGILState_Release(gil_state);
         return NULL;
     }
@@ -285,20 +277,12 @@ CLEANUP:
         Py_DECREF(py_ustr);
     }
     if (udata_ptr->error.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&udata_ptr->error, &py_err);
-        PyObject *exception_type = raise_exception_old(&udata_ptr->error);
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&udata_ptr->error, NULL, NULL, NULL, NULL, NULL);
         PyGILState_Release(gil_state);
         return false;
     }
     if (err->code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(err, &py_err);
-        PyObject *exception_type = raise_exception_old(err);
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(err, NULL, NULL, NULL, NULL, NULL);
         PyGILState_Release(gil_state);
         return false;
     }
@@ -392,12 +376,8 @@ CLEANUP:
         Py_DECREF(py_ustr);
     }
     if (info_callback_udata.error.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&info_callback_udata.error, &py_err);
-        PyObject *exception_type =
-            raise_exception_old(&info_callback_udata.error);
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&info_callback_udata.error, NULL, NULL, NULL, NULL,
+                             NULL);
         if (py_nodes) {
             Py_DECREF(py_nodes);
         }
@@ -508,12 +488,8 @@ CLEANUP:
         Py_DECREF(py_ustr);
     }
     if (info_callback_udata.error.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&info_callback_udata.error, &py_err);
-        PyObject *exception_type =
-            raise_exception_old(&info_callback_udata.error);
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&info_callback_udata.error, NULL, NULL, NULL, NULL,
+                             NULL);
         if (py_nodes) {
             Py_DECREF(py_nodes);
         }
@@ -0,0 +1,77 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include "client.h"
+#include "profile.h"
+
+/**
+ ******************************************************************************************************
+ * Starts counting the client's calls from zero, with latency buckets of the
+ * given upper bounds in seconds.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns None.
+ ********************************************************************************************************/
+PyObject *AerospikeClient_EnableMetrics(AerospikeClient *self, PyObject *args,
+                                        PyObject *kwds)
+{
+    PyObject *py_buckets = NULL;
+
+    static char *kwlist[] = {"buckets", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O:_enable_metrics", kwlist,
+                                    &py_buckets) == false) {
+        return NULL;
+    }
+
+    if (!profile_metrics_enable(&self->metrics, py_buckets)) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+/**
+ ******************************************************************************************************
+ * Stops counting the client's calls. The counts are kept.
+ *
+ * @param self                  AerospikeClient object
+ *
+ * Returns None.
+ ********************************************************************************************************/
+PyObject *AerospikeClient_DisableMetrics(AerospikeClient *self)
+{
+    profile_metrics_disable(self->metrics);
+    Py_RETURN_NONE;
+}
+
+/**
+ ******************************************************************************************************
+ * Returns the counts of the client's calls.
+ *
+ * @param self                  AerospikeClient object
+ *
+ * Returns a dict of the bucket bounds, the series and the calls not counted.
+ ********************************************************************************************************/
+PyObject *AerospikeClient_GetMetrics(AerospikeClient *self)
+{
+    return profile_metrics_snapshot(self->metrics);
+}
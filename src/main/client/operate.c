@@ -29,6 +29,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
 #include "serializer.h"
 #include "geo.h"
 #include "cdt_list_operations.h"
@@ -76,17 +77,7 @@ static inline bool isExprOp(int op);
 
 #define EXCEPTION_ON_ERROR()                                                   \
     if (err.code != AEROSPIKE_OK) {                                            \
-        PyObject *py_err = NULL;                                               \
-        error_to_pyobject(&err, &py_err);                                      \
-        PyObject *exception_type = raise_exception_old(&err);                  \
-        if (PyObject_HasAttrString(exception_type, "key")) {                   \
-            PyObject_SetAttrString(exception_type, "key", py_key);             \
-        }                                                                      \
-        if (PyObject_HasAttrString(exception_type, "bin")) {                   \
-            PyObject_SetAttrString(exception_type, "bin", py_bin);             \
-        }                                                                      \
-        PyErr_SetObject(exception_type, py_err);                               \
-        Py_DECREF(py_err);                                                     \
+        raise_exception_base(&err, py_key, py_bin, NULL, NULL, NULL);          \
         return NULL;                                                           \
     }
 
@@ -154,7 +145,10 @@ PyObject *create_pylist(PyObject *py_list, long operation, PyObject *py_bin,
     if (operation != AS_OPERATOR_TOUCH) {
         PyDict_SetItemString(dict, "bin", py_bin);
     }
-    PyDict_SetItemString(dict, "val", py_value);
+    // touch() can be called without a ttl value.
+    if (py_value) {
+        PyDict_SetItemString(dict, "val", py_value);
+    }
 
     PyList_Append(py_list, dict);
     Py_DECREF(dict);
@@ -820,13 +814,12 @@ CLEANUP:
  * @param py_list               The list containing op, bin and value.
  * @param py_meta               The metadata for the operation.
  * @param py_policy      		Python dict used to populate the operate_policy or map_policy.
+ * @param call                  The timings of the call, if profiled.
  *******************************************************************************************************
  */
-static PyObject *AerospikeClient_Operate_Invoke(AerospikeClient *self,
-                                                as_error *err, as_key *key,
-                                                PyObject *py_list,
-                                                PyObject *py_meta,
-                                                PyObject *py_policy)
+static PyObject *AerospikeClient_Operate_Invoke(
+    AerospikeClient *self, as_error *err, as_key *key, PyObject *py_list,
+    PyObject *py_meta, PyObject *py_policy, profile_call *call)
 {
     int i = 0;
     long operation;
@@ -846,6 +839,7 @@ static PyObject *AerospikeClient_Operate_Invoke(AerospikeClient *self,
     as_operations ops;
     Py_ssize_t size = PyList_Size(py_list);
     as_operations_inita(&ops, size);
+    profile_mark(call, PROFILE_ARGS);
 
     if (py_policy) {
         if (pyobject_to_policy_operate(
@@ -855,6 +849,7 @@ static PyObject *AerospikeClient_Operate_Invoke(AerospikeClient *self,
             goto CLEANUP;
         }
     }
+    profile_mark(call, PROFILE_POLICY);
 
     as_static_pool static_pool;
     memset(&static_pool, 0, sizeof(static_pool));
@@ -880,10 +875,13 @@ static PyObject *AerospikeClient_Operate_Invoke(AerospikeClient *self,
         as_error_update(err, err->code, NULL);
         goto CLEANUP;
     }
+    profile_mark(call, PROFILE_ARGS);
 
     Py_BEGIN_ALLOW_THREADS
     aerospike_key_operate(self->as, err, operate_policy_p, key, &ops, &rec);
     Py_END_ALLOW_THREADS
+    profile_mark(call, PROFILE_NETWORK);
+    profile_set_payload(call, key, NULL, &ops, rec);
 
     if (err->code != AEROSPIKE_OK) {
         as_error_update(err, err->code, NULL);
@@ -949,11 +947,15 @@ PyObject *AerospikeClient_Operate(AerospikeClient *self, PyObject *args,
     PyObject *py_list = NULL;
     PyObject *py_bin = NULL;
 
+    profile_call call;
+    profile_start(&call, "operate", &self->slow_log, self->metrics);
+
     // Python Function Keyword Arguments
     static char *kwlist[] = {"key", "list", "meta", "policy", NULL};
     if (PyArg_ParseTupleAndKeywords(args, kwds, "OO|OO:operate", kwlist,
                                     &py_key, &py_list, &py_meta,
                                     &py_policy) == false) {
+        profile_end(&call);
         return NULL;
     }
 
@@ -962,10 +964,11 @@ PyObject *AerospikeClient_Operate(AerospikeClient *self, PyObject *args,
     if (pyobject_to_key(&err, py_key, &key) != AEROSPIKE_OK) {
         goto CLEANUP;
     }
+    profile_set_key(&call, &key);
 
     if (py_list && PyList_Check(py_list)) {
         py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                                   py_meta, py_policy);
+                                                   py_meta, py_policy, &call);
     }
     else {
         as_error_update(&err, AEROSPIKE_ERR_PARAM,
@@ -973,8 +976,14 @@ PyObject *AerospikeClient_Operate(AerospikeClient *self, PyObject *args,
     }
 
 CLEANUP:
-    EXCEPTION_ON_ERROR();
+    // Raise first, so the profile sees the error of the call.
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception_base(&err, py_key, py_bin, NULL, NULL, NULL);
+        profile_end(&call);
+        return NULL;
+    }
 
+    profile_end(&call);
     return py_result;
 }
 
@@ -1201,14 +1210,7 @@ PyObject *AerospikeClient_OperateOrdered(AerospikeClient *self, PyObject *args,
 
 CLEANUP:
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "key")) {
-            PyObject_SetAttrString(exception_type, "key", py_key);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, py_key, NULL, NULL, NULL, NULL);
         return NULL;
     }
     return py_result;
@@ -1251,7 +1253,7 @@ PyObject *AerospikeClient_Append(AerospikeClient *self, PyObject *args,
     PyObject *py_list = NULL;
     py_list = create_pylist(py_list, AS_OPERATOR_APPEND, py_bin, py_append_str);
     py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                               py_meta, py_policy);
+                                               py_meta, py_policy, NULL);
 
     DECREF_LIST_AND_RESULT();
 
@@ -1299,7 +1301,7 @@ PyObject *AerospikeClient_Prepend(AerospikeClient *self, PyObject *args,
     py_list =
         create_pylist(py_list, AS_OPERATOR_PREPEND, py_bin, py_prepend_str);
     py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                               py_meta, py_policy);
+                                               py_meta, py_policy, NULL);
 
     DECREF_LIST_AND_RESULT();
 
@@ -1346,7 +1348,7 @@ PyObject *AerospikeClient_Increment(AerospikeClient *self, PyObject *args,
     PyObject *py_list = NULL;
     py_list = create_pylist(py_list, AS_OPERATOR_INCR, py_bin, py_offset_value);
     py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                               py_meta, py_policy);
+                                               py_meta, py_policy, NULL);
 
     DECREF_LIST_AND_RESULT();
 
@@ -1393,7 +1395,7 @@ PyObject *AerospikeClient_Touch(AerospikeClient *self, PyObject *args,
     PyObject *py_list = NULL;
     py_list = create_pylist(py_list, AS_OPERATOR_TOUCH, NULL, py_touchvalue);
     py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                               py_meta, py_policy);
+                                               py_meta, py_policy, NULL);
 
     DECREF_LIST_AND_RESULT();
 
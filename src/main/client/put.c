@@ -26,6 +26,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
 
 /**
  *******************************************************************************************************
@@ -37,6 +38,8 @@
  * @param py_meta               The meatadata for the record.
  * @param py_policy             The dictionary of policies to be given while
  *                              reading a record.
+ * @param serializer_option     The serializer to use for the bins.
+ * @param call                  The timings of the call, if profiled.
  *
  * Returns an integer status. 0(Zero) is success value.
  * In case of error,appropriate exceptions will be raised.
@@ -45,7 +48,7 @@
 PyObject *AerospikeClient_Put_Invoke(AerospikeClient *self, PyObject *py_key,
                                      PyObject *py_bins, PyObject *py_meta,
                                      PyObject *py_policy,
-                                     long serializer_option)
+                                     long serializer_option, profile_call *call)
 {
     // Aerospike Client Arguments
     as_error err;
@@ -90,6 +93,7 @@ PyObject *AerospikeClient_Put_Invoke(AerospikeClient *self, PyObject *py_key,
     }
     // Key is initialised successfully.
     key_initialised = true;
+    profile_set_key(call, &key);
 
     // Convert python bins and metadata objects to as_record
     pyobject_to_record(self, &err, py_bins, py_meta, &rec, serializer_option,
@@ -97,6 +101,7 @@ PyObject *AerospikeClient_Put_Invoke(AerospikeClient *self, PyObject *py_key,
     if (err.code != AEROSPIKE_OK) {
         goto CLEANUP;
     }
+    profile_mark(call, PROFILE_ARGS);
 
     // Convert python policy object to as_policy_write
     pyobject_to_policy_write(self, &err, py_policy, &write_policy,
@@ -106,11 +111,14 @@ PyObject *AerospikeClient_Put_Invoke(AerospikeClient *self, PyObject *py_key,
     if (err.code != AEROSPIKE_OK) {
         goto CLEANUP;
     }
+    profile_mark(call, PROFILE_POLICY);
 
     // Invoke operation
     Py_BEGIN_ALLOW_THREADS
     aerospike_key_put(self->as, &err, write_policy_p, &key, &rec);
     Py_END_ALLOW_THREADS
+    profile_mark(call, PROFILE_NETWORK);
+    profile_set_payload(call, &key, &rec, NULL, NULL);
     if (err.code != AEROSPIKE_OK) {
         as_error_update(&err, err.code, NULL);
     }
@@ -133,17 +141,7 @@ CLEANUP:
 
     // If an error occurred, tell Python.
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "key")) {
-            PyObject_SetAttrString(exception_type, "key", py_key);
-        }
-        if (PyObject_HasAttrString(exception_type, "bin")) {
-            PyObject_SetAttrString(exception_type, "bin", py_bins);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, py_key, py_bins, NULL, NULL, NULL);
         return NULL;
     }
 
@@ -173,6 +171,10 @@ PyObject *AerospikeClient_Put(AerospikeClient *self, PyObject *args,
     PyObject *py_policy = NULL;
     PyObject *py_serializer_option = NULL;
     long serializer_option = SERIALIZER_PYTHON;
+    PyObject *py_result = NULL;
+
+    profile_call call;
+    profile_start(&call, "put", &self->slow_log, self->metrics);
 
     // Python Function Keyword Arguments
     static char *kwlist[] = {"key",    "bins",       "meta",
@@ -182,6 +184,7 @@ PyObject *AerospikeClient_Put(AerospikeClient *self, PyObject *args,
     if (PyArg_ParseTupleAndKeywords(args, kwds, "OO|OOO:put", kwlist, &py_key,
                                     &py_bins, &py_meta, &py_policy,
                                     &py_serializer_option) == false) {
+        profile_end(&call);
         return NULL;
     }
 
@@ -196,6 +199,9 @@ PyObject *AerospikeClient_Put(AerospikeClient *self, PyObject *args,
         self->is_client_put_serializer = false;
     }
     // Invoke Operation
-    return AerospikeClient_Put_Invoke(self, py_key, py_bins, py_meta, py_policy,
-                                      serializer_option);
+    py_result = AerospikeClient_Put_Invoke(self, py_key, py_bins, py_meta,
+                                           py_policy, serializer_option, &call);
+
+    profile_end(&call);
+    return py_result;
 }
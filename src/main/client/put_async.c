@@ -69,17 +69,23 @@ void write_async_callback_helper(as_error *cmd_error, void *udata,
     key_to_pyobject(&temp_error, &data->key, &py_key);
 
     if (error->code != AEROSPIKE_OK) {
-        py_exception = raise_exception_old(error);
-        if (PyObject_HasAttrString(py_exception, "key")) {
-            PyObject_SetAttrString(py_exception, "key", py_key);
-        }
-        if (PyObject_HasAttrString(py_exception, "bin")) {
-            PyObject_SetAttrString(py_exception, "bin", Py_None);
-        }
+        // Each error gets its own instance, so concurrent errors don't share
+        // the key and bin attributes.
+        py_exception =
+            create_exception(error, py_key, Py_None, NULL, NULL, NULL);
         if (!cb) {
-            PyErr_SetObject(py_exception, py_err);
+            if (py_exception) {
+                PyErr_SetObject((PyObject *)Py_TYPE(py_exception),
+                                py_exception);
+                Py_DECREF(py_exception);
+                py_exception = NULL;
+            }
             Py_DECREF(py_err);
         }
+        else if (!py_exception) {
+            // The callback gets None rather than a half-built exception.
+            PyErr_Clear();
+        }
     }
 
     if (cb) {
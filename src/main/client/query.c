@@ -320,7 +320,9 @@ static PyObject *AerospikeClient_QueryApply_Invoke(
         goto CLEANUP;
     }
 
-    if (!PyList_Check(py_args)) {
+    // An omitted args runs the function with no arguments, but None is not a
+    // list.
+    if (py_args && !PyList_Check(py_args)) {
         as_error_update(&err, AEROSPIKE_ERR_PARAM,
                         "Arguments should be a list");
         goto CLEANUP;
@@ -381,10 +383,12 @@ static PyObject *AerospikeClient_QueryApply_Invoke(
         goto CLEANUP;
     }
 
-    pyobject_to_list(self, &err, py_args, &arglist, &static_pool,
-                     SERIALIZER_PYTHON);
-    if (err.code != AEROSPIKE_OK) {
-        goto CLEANUP;
+    if (py_args) {
+        pyobject_to_list(self, &err, py_args, &arglist, &static_pool,
+                         SERIALIZER_PYTHON);
+        if (err.code != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
     }
 
     as_query *query_ptr = &query;
@@ -493,7 +497,7 @@ CLEANUP:
         return NULL;
     }
 
-    return PyLong_FromLong(query_id);
+    return job_id_to_pyobject(self, query_id, "query");
 }
 
 /**
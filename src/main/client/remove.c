@@ -26,6 +26,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
 
 /**
  *******************************************************************************************************
@@ -35,13 +36,15 @@
  * @param py_key                The key under which to store the record
  * @param generation            The generation value
  * @param py_policy             The optional policy parameters
+ * @param call                  The timings of the call, if profiled.
  *
  * Returns 0 on success.
  * In case of error,appropriate exceptions will be raised.
  *******************************************************************************************************
  */
 PyObject *AerospikeClient_Remove_Invoke(AerospikeClient *self, PyObject *py_key,
-                                        PyObject *py_meta, PyObject *py_policy)
+                                        PyObject *py_meta, PyObject *py_policy,
+                                        profile_call *call)
 {
 
     // Aerospike Client Arguments
@@ -78,6 +81,8 @@ PyObject *AerospikeClient_Remove_Invoke(AerospikeClient *self, PyObject *py_key,
     }
     // Key is initialised successfully
     key_initialised = true;
+    profile_set_key(call, &key);
+    profile_mark(call, PROFILE_ARGS);
 
     // Convert python policy object to as_policy_exists
     if (py_policy) {
@@ -116,10 +121,13 @@ PyObject *AerospikeClient_Remove_Invoke(AerospikeClient *self, PyObject *py_key,
         }
     }
 
+    profile_mark(call, PROFILE_POLICY);
+
     // Invoke operation
     Py_BEGIN_ALLOW_THREADS
     aerospike_key_remove(self->as, &err, remove_policy_p, &key);
     Py_END_ALLOW_THREADS
+    profile_mark(call, PROFILE_NETWORK);
     if (err.code != AEROSPIKE_OK) {
         as_error_update(&err, err.code, NULL);
     }
@@ -136,17 +144,7 @@ CLEANUP:
     }
 
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "key")) {
-            PyObject_SetAttrString(exception_type, "key", py_key);
-        }
-        if (PyObject_HasAttrString(exception_type, "bin")) {
-            PyObject_SetAttrString(exception_type, "bin", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, py_key, Py_None, NULL, NULL, NULL);
         return NULL;
     }
 
@@ -173,6 +171,10 @@ PyObject *AerospikeClient_Remove(AerospikeClient *self, PyObject *args,
     PyObject *py_key = NULL;
     PyObject *py_policy = NULL;
     PyObject *py_meta = NULL;
+    PyObject *py_result = NULL;
+
+    profile_call call;
+    profile_start(&call, "remove", &self->slow_log, self->metrics);
 
     // Python Function Keyword Arguments
     static char *kwlist[] = {"key", "meta", "policy", NULL};
@@ -180,9 +182,14 @@ PyObject *AerospikeClient_Remove(AerospikeClient *self, PyObject *args,
     // Python Function Argument Parsing
     if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OO:remove", kwlist, &py_key,
                                     &py_meta, &py_policy) == false) {
+        profile_end(&call);
         return NULL;
     }
 
     // Invoke Operation
-    return AerospikeClient_Remove_Invoke(self, py_key, py_meta, py_policy);
+    py_result =
+        AerospikeClient_Remove_Invoke(self, py_key, py_meta, py_policy, &call);
+
+    profile_end(&call);
+    return py_result;
 }
@@ -248,7 +248,7 @@ CLEANUP:
         return NULL;
     }
 
-    return PyLong_FromLong(scan_id);
+    return job_id_to_pyobject(self, scan_id, "scan");
 }
 
 /**
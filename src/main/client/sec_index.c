@@ -33,15 +33,18 @@
 static bool getTypeFromPyObject(PyObject *py_datatype, int *idx_datatype,
                                 as_error *err);
 
-static PyObject *createIndexWithCollectionType(
-    AerospikeClient *self, PyObject *py_policy, PyObject *py_ns,
-    PyObject *py_set, PyObject *py_bin, PyObject *py_name,
-    PyObject *py_datatype, as_index_type index_type, as_cdt_ctx *ctx);
+static PyObject *
+createIndexWithCollectionType(AerospikeClient *self, PyObject *py_policy,
+                              PyObject *py_ns, PyObject *py_set,
+                              PyObject *py_bin, PyObject *py_name,
+                              PyObject *py_datatype, as_index_type index_type,
+                              as_cdt_ctx *ctx, bool wait);
 
 static PyObject *createIndexWithDataAndCollectionType(
     AerospikeClient *self, PyObject *py_policy, PyObject *py_ns,
     PyObject *py_set, PyObject *py_bin, PyObject *py_name,
-    as_index_type index_type, as_index_datatype data_type, as_cdt_ctx *ctx);
+    as_index_type index_type, as_index_datatype data_type, as_cdt_ctx *ctx,
+    bool wait);
 
 /**
  *******************************************************************************************************
@@ -65,24 +68,26 @@ PyObject *AerospikeClient_Index_Integer_Create(AerospikeClient *self,
 
     // Python Function Arguments
     PyObject *py_policy = NULL;
+    int wait = 1;
     PyObject *py_ns = NULL;
     PyObject *py_set = NULL;
     PyObject *py_bin = NULL;
     PyObject *py_name = NULL;
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"ns", "set", "bin", "name", "policy", NULL};
+    static char *kwlist[] = {"ns",     "set",  "bin", "name",
+                             "policy", "wait", NULL};
 
     // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "OOOO|O:index_integer_create",
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "OOOO|O$p:index_integer_create",
                                     kwlist, &py_ns, &py_set, &py_bin, &py_name,
-                                    &py_policy) == false) {
+                                    &py_policy, &wait) == false) {
         return NULL;
     }
 
     return createIndexWithDataAndCollectionType(
         self, py_policy, py_ns, py_set, py_bin, py_name, AS_INDEX_TYPE_DEFAULT,
-        AS_INDEX_NUMERIC, NULL);
+        AS_INDEX_NUMERIC, NULL, wait);
 }
 
 /**
@@ -107,24 +112,26 @@ PyObject *AerospikeClient_Index_String_Create(AerospikeClient *self,
 
     // Python Function Arguments
     PyObject *py_policy = NULL;
+    int wait = 1;
     PyObject *py_ns = NULL;
     PyObject *py_set = NULL;
     PyObject *py_bin = NULL;
     PyObject *py_name = NULL;
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"ns", "set", "bin", "name", "policy", NULL};
+    static char *kwlist[] = {"ns",     "set",  "bin", "name",
+                             "policy", "wait", NULL};
 
     // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "OOOO|O:index_string_create",
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "OOOO|O$p:index_string_create",
                                     kwlist, &py_ns, &py_set, &py_bin, &py_name,
-                                    &py_policy) == false) {
+                                    &py_policy, &wait) == false) {
         return NULL;
     }
 
     return createIndexWithDataAndCollectionType(
         self, py_policy, py_ns, py_set, py_bin, py_name, AS_INDEX_TYPE_DEFAULT,
-        AS_INDEX_STRING, NULL);
+        AS_INDEX_STRING, NULL, wait);
 }
 
 /**
@@ -149,6 +156,7 @@ PyObject *AerospikeClient_Index_Cdt_Create(AerospikeClient *self,
 
     // Python Function Arguments
     PyObject *py_policy = NULL;
+    int wait = 1;
     PyObject *py_ns = NULL;
     PyObject *py_set = NULL;
     PyObject *py_bin = NULL;
@@ -165,13 +173,13 @@ PyObject *AerospikeClient_Index_Cdt_Create(AerospikeClient *self,
     // Python Function Keyword Arguments
     static char *kwlist[] = {
         "ns",   "set", "bin",    "index_type", "index_datatype",
-        "name", "ctx", "policy", NULL};
+        "name", "ctx", "policy", "wait",       NULL};
 
     // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "OOOOOOO|O:index_list_create",
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "OOOOOOO|O$p:index_list_create",
                                     kwlist, &py_ns, &py_set, &py_bin,
                                     &py_indextype, &py_datatype, &py_name,
-                                    &py_ctx, &py_policy) == false) {
+                                    &py_ctx, &py_policy, &wait) == false) {
         return NULL;
     }
 
@@ -194,9 +202,9 @@ PyObject *AerospikeClient_Index_Cdt_Create(AerospikeClient *self,
         goto CLEANUP;
     }
 
-    py_obj = createIndexWithDataAndCollectionType(self, py_policy, py_ns,
-                                                  py_set, py_bin, py_name,
-                                                  index_type, data_type, &ctx);
+    py_obj = createIndexWithDataAndCollectionType(
+        self, py_policy, py_ns, py_set, py_bin, py_name, index_type, data_type,
+        &ctx, wait);
 
     as_cdt_ctx_destroy(&ctx);
 
@@ -204,14 +212,7 @@ PyObject *AerospikeClient_Index_Cdt_Create(AerospikeClient *self,
 
 CLEANUP:
     if (py_obj == NULL) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "name")) {
-            PyObject_SetAttrString(exception_type, "name", py_name);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, NULL, NULL, NULL, NULL, py_name);
         return NULL;
     }
 
@@ -312,14 +313,7 @@ CLEANUP:
         Py_DECREF(py_ustr_name);
     }
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "name")) {
-            PyObject_SetAttrString(exception_type, "name", py_name);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, NULL, NULL, NULL, NULL, py_name);
         return NULL;
     }
 
@@ -335,6 +329,7 @@ PyObject *AerospikeClient_Index_List_Create(AerospikeClient *self,
 
     // Python Function Arguments
     PyObject *py_policy = NULL;
+    int wait = 1;
     PyObject *py_ns = NULL;
     PyObject *py_set = NULL;
     PyObject *py_bin = NULL;
@@ -342,19 +337,19 @@ PyObject *AerospikeClient_Index_List_Create(AerospikeClient *self,
     PyObject *py_datatype = NULL;
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"ns",   "set",    "bin", "index_datatype",
-                             "name", "policy", NULL};
+    static char *kwlist[] = {"ns",   "set",    "bin",  "index_datatype",
+                             "name", "policy", "wait", NULL};
 
     // Python Function Argument Parsing
     if (PyArg_ParseTupleAndKeywords(
-            args, kwds, "OOOOO|O:index_list_create", kwlist, &py_ns, &py_set,
-            &py_bin, &py_datatype, &py_name, &py_policy) == false) {
+            args, kwds, "OOOOO|O$p:index_list_create", kwlist, &py_ns, &py_set,
+            &py_bin, &py_datatype, &py_name, &py_policy, &wait) == false) {
         return NULL;
     }
 
     return createIndexWithCollectionType(self, py_policy, py_ns, py_set, py_bin,
                                          py_name, py_datatype,
-                                         AS_INDEX_TYPE_LIST, NULL);
+                                         AS_INDEX_TYPE_LIST, NULL, wait);
 }
 
 PyObject *AerospikeClient_Index_Map_Keys_Create(AerospikeClient *self,
@@ -366,6 +361,7 @@ PyObject *AerospikeClient_Index_Map_Keys_Create(AerospikeClient *self,
 
     // Python Function Arguments
     PyObject *py_policy = NULL;
+    int wait = 1;
     PyObject *py_ns = NULL;
     PyObject *py_set = NULL;
     PyObject *py_bin = NULL;
@@ -373,19 +369,20 @@ PyObject *AerospikeClient_Index_Map_Keys_Create(AerospikeClient *self,
     PyObject *py_datatype = NULL;
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"ns",   "set",    "bin", "index_datatype",
-                             "name", "policy", NULL};
+    static char *kwlist[] = {"ns",   "set",    "bin",  "index_datatype",
+                             "name", "policy", "wait", NULL};
 
     // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(
-            args, kwds, "OOOOO|O:index_map_keys_create", kwlist, &py_ns,
-            &py_set, &py_bin, &py_datatype, &py_name, &py_policy) == false) {
+    if (PyArg_ParseTupleAndKeywords(args, kwds,
+                                    "OOOOO|O$p:index_map_keys_create", kwlist,
+                                    &py_ns, &py_set, &py_bin, &py_datatype,
+                                    &py_name, &py_policy, &wait) == false) {
         return NULL;
     }
 
     return createIndexWithCollectionType(self, py_policy, py_ns, py_set, py_bin,
                                          py_name, py_datatype,
-                                         AS_INDEX_TYPE_MAPKEYS, NULL);
+                                         AS_INDEX_TYPE_MAPKEYS, NULL, wait);
 }
 
 PyObject *AerospikeClient_Index_Map_Values_Create(AerospikeClient *self,
@@ -398,6 +395,7 @@ PyObject *AerospikeClient_Index_Map_Values_Create(AerospikeClient *self,
 
     // Python Function Arguments
     PyObject *py_policy = NULL;
+    int wait = 1;
     PyObject *py_ns = NULL;
     PyObject *py_set = NULL;
     PyObject *py_bin = NULL;
@@ -405,19 +403,20 @@ PyObject *AerospikeClient_Index_Map_Values_Create(AerospikeClient *self,
     PyObject *py_datatype = NULL;
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"ns",   "set",    "bin", "index_datatype",
-                             "name", "policy", NULL};
+    static char *kwlist[] = {"ns",   "set",    "bin",  "index_datatype",
+                             "name", "policy", "wait", NULL};
 
     // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(
-            args, kwds, "OOOOO|O:index_map_values_create", kwlist, &py_ns,
-            &py_set, &py_bin, &py_datatype, &py_name, &py_policy) == false) {
+    if (PyArg_ParseTupleAndKeywords(args, kwds,
+                                    "OOOOO|O$p:index_map_values_create", kwlist,
+                                    &py_ns, &py_set, &py_bin, &py_datatype,
+                                    &py_name, &py_policy, &wait) == false) {
         return NULL;
     }
 
     return createIndexWithCollectionType(self, py_policy, py_ns, py_set, py_bin,
                                          py_name, py_datatype,
-                                         AS_INDEX_TYPE_MAPVALUES, NULL);
+                                         AS_INDEX_TYPE_MAPVALUES, NULL, wait);
 }
 
 PyObject *AerospikeClient_Index_2dsphere_Create(AerospikeClient *self,
@@ -429,24 +428,26 @@ PyObject *AerospikeClient_Index_2dsphere_Create(AerospikeClient *self,
 
     // Python Function Arguments
     PyObject *py_policy = NULL;
+    int wait = 1;
     PyObject *py_ns = NULL;
     PyObject *py_set = NULL;
     PyObject *py_bin = NULL;
     PyObject *py_name = NULL;
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"ns", "set", "bin", "name", "policy", NULL};
+    static char *kwlist[] = {"ns",     "set",  "bin", "name",
+                             "policy", "wait", NULL};
 
     // Python Function Argument Parsing
     if (PyArg_ParseTupleAndKeywords(
-            args, kwds, "OOOO|O:index_geo2dsphere_create", kwlist, &py_ns,
-            &py_set, &py_bin, &py_name, &py_policy) == false) {
+            args, kwds, "OOOO|O$p:index_geo2dsphere_create", kwlist, &py_ns,
+            &py_set, &py_bin, &py_name, &py_policy, &wait) == false) {
         return NULL;
     }
 
     return createIndexWithDataAndCollectionType(
         self, py_policy, py_ns, py_set, py_bin, py_name, AS_INDEX_TYPE_DEFAULT,
-        AS_INDEX_GEO2DSPHERE, NULL);
+        AS_INDEX_GEO2DSPHERE, NULL, wait);
 }
 
 /*
@@ -492,7 +493,7 @@ CLEANUP:
 static PyObject *createIndexWithCollectionType(
     AerospikeClient *self, PyObject *py_policy, PyObject *py_ns,
     PyObject *py_set, PyObject *py_bin, PyObject *py_name,
-    PyObject *py_datatype, as_index_type index_type, as_cdt_ctx *ctx)
+    PyObject *py_datatype, as_index_type index_type, as_cdt_ctx *ctx, bool wait)
 {
 
     as_index_datatype data_type = AS_INDEX_STRING;
@@ -506,18 +507,112 @@ static PyObject *createIndexWithCollectionType(
 
     return createIndexWithDataAndCollectionType(self, py_policy, py_ns, py_set,
                                                 py_bin, py_name, index_type,
-                                                data_type, ctx);
+                                                data_type, ctx, wait);
 }
 
 /*
- * Create a complex index on the specified ns/set/bin with the given name and index and data_type. Return PyObject(0) on success
- * else return NULL with an error raised.
+ * Import aerospike_helpers.index_task. Return NULL with err set if it cannot be imported.
+ */
+static PyObject *import_index_task_module(as_error *err)
+{
+    PyObject *it_module = NULL;
+    PyObject *sys_modules = PyImport_GetModuleDict();
+
+    if (PyMapping_HasKeyString(sys_modules, "aerospike_helpers.index_task")) {
+        it_module = PyMapping_GetItemString(sys_modules,
+                                            "aerospike_helpers.index_task");
+    }
+    else {
+        it_module = PyImport_ImportModule("aerospike_helpers.index_task");
+    }
+
+    if (!it_module) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to load index_task module");
+    }
+    return it_module;
+}
+
+/*
+ * Create an aerospike_helpers.index_task.IndexTask for an index that is still being built.
+ * Return NULL with err set if the task cannot be created.
+ */
+static PyObject *index_task_new(as_error *err, AerospikeClient *self,
+                                PyObject *py_ns, PyObject *py_name,
+                                PyObject *py_policy)
+{
+    PyObject *it_module = import_index_task_module(err);
+    if (!it_module) {
+        return NULL;
+    }
+
+    PyObject *py_task =
+        PyObject_CallMethod(it_module, "IndexTask", "OOOO", (PyObject *)self,
+                            py_ns, py_name, py_policy ? py_policy : Py_None);
+    Py_DECREF(it_module);
+    if (!py_task) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to create the index task");
+    }
+    return py_task;
+}
+
+/**
+ *******************************************************************************************************
+ * Creates many indexes in the Aerospike DB at once.
+ * See aerospike_helpers.index_task.index_create_many.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a list of IndexTask for the indexes that were created.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_Index_Create_Many(AerospikeClient *self,
+                                            PyObject *args, PyObject *kwds)
+{
+    return call_helper_function((PyObject *)self,
+                                "aerospike_helpers.index_task",
+                                "index_create_many", args, kwds);
+}
+
+/**
+ *******************************************************************************************************
+ * Removes many indexes in the Aerospike DB at once.
+ * See aerospike_helpers.index_task.index_remove_many.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a list of the names of the indexes that were removed.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_Index_Remove_Many(AerospikeClient *self,
+                                            PyObject *args, PyObject *kwds)
+{
+    return call_helper_function((PyObject *)self,
+                                "aerospike_helpers.index_task",
+                                "index_remove_many", args, kwds);
+}
+
+/*
+ * Create a complex index on the specified ns/set/bin with the given name and index and data_type. Return PyObject(0) on success,
+ * or an IndexTask if wait is false, else return NULL with an error raised.
  */
 
 static PyObject *createIndexWithDataAndCollectionType(
     AerospikeClient *self, PyObject *py_policy, PyObject *py_ns,
     PyObject *py_set, PyObject *py_bin, PyObject *py_name,
-    as_index_type index_type, as_index_datatype data_type, as_cdt_ctx *ctx)
+    as_index_type index_type, as_index_datatype data_type, as_cdt_ctx *ctx,
+    bool wait)
 {
 
     // Initialize error
@@ -531,6 +626,7 @@ static PyObject *createIndexWithDataAndCollectionType(
     as_policy_info info_policy;
     as_policy_info *info_policy_p = NULL;
     as_index_task task;
+    PyObject *py_task = NULL;
 
     if (!self || !self->as) {
         as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
@@ -616,11 +712,14 @@ static PyObject *createIndexWithDataAndCollectionType(
         as_error_update(&err, err.code, NULL);
         goto CLEANUP;
     }
-    else {
+    else if (wait) {
         Py_BEGIN_ALLOW_THREADS
         aerospike_index_create_wait(&err, &task, 2000);
         Py_END_ALLOW_THREADS
     }
+    else {
+        py_task = index_task_new(&err, self, py_ns, py_name, py_policy);
+    }
 
 CLEANUP:
     if (py_ustr_set) {
@@ -633,9 +732,13 @@ CLEANUP:
         Py_DECREF(py_ustr_name);
     }
     if (err.code != AEROSPIKE_OK) {
+        Py_XDECREF(py_task);
         raise_exception(&err);
         return NULL;
     }
 
+    if (py_task) {
+        return py_task;
+    }
     return PyLong_FromLong(0);
 }
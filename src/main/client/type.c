@@ -48,7 +48,8 @@ enum {
     INIT_DESERIALIZE_ERR,
     INIT_COMPRESSION_ERR,
     INIT_POLICY_PARAM_ERR,
-    INIT_INVALID_AUTHMODE_ERR
+    INIT_INVALID_AUTHMODE_ERR,
+    INIT_SLOW_COMMAND_ERR
 };
 
 /*******************************************************************************
@@ -65,9 +66,10 @@ PyDoc_STRVAR(exists_doc, "exists(key[, policy]) -> (key, meta)\n\
 Check if a record with a given key exists in the cluster and return the record \
 as a tuple() consisting of key and meta. If the record does not exist the meta data will be None.");
 
-PyDoc_STRVAR(get_doc, "get(key[, policy]) -> (key, meta, bins)\n\
+PyDoc_STRVAR(get_doc, "get(key[, policy[, missing_ok]]) -> (key, meta, bins)\n\
 \n\
-Read a record with a given key, and return the record as a tuple() consisting of key, meta and bins.");
+Read a record with a given key, and return the record as a tuple() consisting of key, meta and bins. \
+With missing_ok, return None if the record does not exist.");
 
 PyDoc_STRVAR(get_async_doc,
              "get_async(get_callback, key[, policy]) -> (key, meta, bins)\n\
@@ -375,7 +377,7 @@ This is different than the meaning of a None set in a scan.");
 
 PyDoc_STRVAR(
     query_apply_doc,
-    "query_apply(ns, set, predicate, module, function[, args[, policy]]) -> int\n\
+    "query_apply(ns, set, predicate, module, function[, args[, policy]]) -> Job\n\
 \n\
 Initiate a background query and apply a record UDF to each record matched by the query.");
 
@@ -390,7 +392,7 @@ Return a `aerospike.Scan` object to be used for executing scans over a specified
 
 PyDoc_STRVAR(
     scan_apply_doc,
-    "scan_apply(ns, set, module, function[, args[, policy[, options,[ block]]]]) -> int\n\
+    "scan_apply(ns, set, module, function[, args[, policy[, options,[ block]]]]) -> Job\n\
 \n\
 Initiate a background scan and apply a record UDF to each record matched by the scan.");
 
@@ -441,9 +443,28 @@ PyDoc_STRVAR(get_node_names_doc, "get_node_names() -> []\n\
 \n\
 Return the list of hosts, including node names, present in a connected cluster.");
 
-PyDoc_STRVAR(udf_put_doc, "udf_put(filename[, udf_type[, policy]])\n\
+PyDoc_STRVAR(get_partition_map_doc, "get_partition_map(ns[, since]) -> {}\n\
 \n\
-Register a UDF module with the cluster.");
+Return the partition map the client keeps for a namespace, with the nodes and the version of the map.");
+
+PyDoc_STRVAR(get_stats_doc, "get_stats() -> {}\n\
+\n\
+Return the connection pool, error rate and tend statistics of the cluster.");
+
+PyDoc_STRVAR(get_slow_commands_doc, "get_slow_commands([clear]) -> []\n\
+\n\
+Return the calls slower than the slow_command_threshold_ms of the client config, oldest first.");
+
+PyDoc_STRVAR(udf_put_doc,
+             "udf_put(filename[, udf_type[, policy[, if_changed]]])\n\
+\n\
+Register a UDF module with the cluster. If if_changed is True, the module is not registered when the cluster \
+already has it with the same content.");
+
+PyDoc_STRVAR(udf_sync_doc, "udf_sync(directory[, policy]) -> []\n\
+\n\
+Register the UDF modules in a directory which the cluster does not have with the same content. \
+Return the names of the modules that were registered.");
 
 PyDoc_STRVAR(udf_remove_doc, "udf_remove(module[, policy])\n\
 \n\
@@ -457,19 +478,21 @@ PyDoc_STRVAR(udf_get_doc, "udf_get(module[, language[, policy]]) -> str\n\
 \n\
 Return the content of a UDF module which is registered with the cluster.");
 
-PyDoc_STRVAR(index_integer_create_doc,
-             "index_integer_create(ns, set, bin, index_name[, policy])\n\
+PyDoc_STRVAR(
+    index_integer_create_doc,
+    "index_integer_create(ns, set, bin, index_name[, policy], wait=True)\n\
 \n\
 Create an integer index with index_name on the bin in the specified ns, set.");
 
-PyDoc_STRVAR(index_string_create_doc,
-             "index_string_create(ns, set, bin, index_name[, policy])\n\
+PyDoc_STRVAR(
+    index_string_create_doc,
+    "index_string_create(ns, set, bin, index_name[, policy], wait=True)\n\
 \n\
 Create a string index with index_name on the bin in the specified ns, set.");
 
 PyDoc_STRVAR(
     index_cdt_create_doc,
-    "index_cdt_create(ns, set, bin,  index_type, index_datatype, index_name, ctx, [, policy])\n\
+    "index_cdt_create(ns, set, bin,  index_type, index_datatype, index_name, ctx, [, policy], wait=True)\n\
 \n\
 Create an cdt index named index_name for list, map keys or map values (as defined by index_type) and for \
 numeric, string or GeoJSON values (as defined by index_datatype) \
@@ -484,29 +507,43 @@ PyDoc_STRVAR(index_remove_doc, "index_remove(ns, index_name[, policy])\n\
 \n\
 Remove the index with index_name from the namespace.");
 
+PyDoc_STRVAR(
+    index_create_many_doc,
+    "index_create_many(specs[, policy], wait=True, timeout=None, max_concurrent=16) -> []\n\
+\n\
+Create the indexes described by specs at once, skipping the ones the cluster already has. \
+Return an IndexTask for each index that was created.");
+
+PyDoc_STRVAR(index_remove_many_doc,
+             "index_remove_many(ns, names[, policy], max_concurrent=16) -> []\n\
+\n\
+Remove the indexes with the names from the namespace at once. \
+Return the names of the indexes that were removed.");
+
 PyDoc_STRVAR(
     index_list_create_doc,
-    "index_list_create(ns, set, bin, index_datatype, index_name[, policy])\n\
+    "index_list_create(ns, set, bin, index_datatype, index_name[, policy], wait=True)\n\
 \n\
 Create an index named index_name for numeric, string or GeoJSON values (as defined by index_datatype) \
 on records of the specified ns, set whose bin is a list.");
 
 PyDoc_STRVAR(
     index_map_keys_create_doc,
-    "index_map_keys_create(ns, set, bin, index_datatype, index_name[, policy])\n\
+    "index_map_keys_create(ns, set, bin, index_datatype, index_name[, policy], wait=True)\n\
 \n\
 Create an index named index_name for numeric, string or GeoJSON values (as defined by index_datatype) \
 on records of the specified ns, set whose bin is a map. The index will include the keys of the map.");
 
 PyDoc_STRVAR(
     index_map_values_create_doc,
-    "index_map_values_create(ns, set, bin, index_datatype, index_name[, policy])\n\
+    "index_map_values_create(ns, set, bin, index_datatype, index_name[, policy], wait=True)\n\
 \n\
 Create an index named index_name for numeric, string or GeoJSON values (as defined by index_datatype) \
 on records of the specified ns, set whose bin is a map. The index will include the values of the map.");
 
-PyDoc_STRVAR(index_geo2dsphere_create_doc,
-             "index_geo2dsphere_create(ns, set, bin, index_name[, policy])\n\
+PyDoc_STRVAR(
+    index_geo2dsphere_create_doc,
+    "index_geo2dsphere_create(ns, set, bin, index_name[, policy], wait=True)\n\
 \n\
 Create a geospatial 2D spherical index with index_name on the bin in the specified ns, set.");
 
@@ -515,6 +552,14 @@ PyDoc_STRVAR(get_many_doc, "get_many(keys[, policy]) -> [ (key, meta, bins)]\n\
 Batch-read multiple records with applying list of operations and returns them as a list. \
 Any record that does not exist will have a None value for metadata and status in the record tuple.");
 
+PyDoc_STRVAR(
+    get_many_digests_doc,
+    "get_many_digests(ns, set, digests[, bins[, policy]]) -> [ (meta, bins)]\n\
+\n\
+Batch-read the records with the given digests, packed into a bytes-like object of 20 bytes each, \
+and return them as a list in the same order. Only the given bins are read, if bins is a list of bin names. \
+Any record that does not exist is None in the list.");
+
 PyDoc_STRVAR(batch_get_ops_doc,
              "batch_get_ops(keys, ops, meta, policy) -> [ (key, meta, bins)]\n\
 \n\
@@ -528,10 +573,21 @@ Batch-read multiple records, and return them as a list. \
 Any record that does not exist will have a None value for metadata and bins in the record tuple. \
 The bins will be filtered as specified.");
 
-PyDoc_STRVAR(exists_many_doc, "exists_many(keys[, policy]) -> [ (key, meta)]\n\
+PyDoc_STRVAR(exists_many_doc,
+             "exists_many(keys[, policy[, compact]]) -> [ (key, meta)]\n\
 \n\
 Batch-read metadata for multiple keys, and return it as a list. \
-Any record that does not exist will have a None value for metadata in the result tuple.");
+Any record that does not exist will have a None value for metadata in the result tuple. \
+If compact is True, return a (bitmap, generations, ttls) tuple instead, of a bytearray with bit i & 7 of byte i >> 3 \
+set if record i exists, and two array('I') with the generation and ttl of each record, which are 0 if it does not exist.");
+
+PyDoc_STRVAR(
+    exists_many_digests_doc,
+    "exists_many_digests(ns, set, digests[, policy[, generations]]) -> bytearray\n\
+\n\
+Check which of the records with the given digests exist, where the digests are packed into a bytes-like \
+object of 20 bytes each. Return a bitmap with bit i & 7 of byte i >> 3 set if record i exists, or \
+if generations is True, an array('I') with the generation of each record, which is 0 if it does not exist.");
 
 PyDoc_STRVAR(get_key_digest_doc, "get_key_digest(ns, set, key) -> bytearray\n\
 \n\
@@ -648,6 +704,9 @@ static PyMethodDef AerospikeClient_Type_Methods[] = {
      "Set read and write quotas for a user defined role."},
     {"admin_set_whitelist", (PyCFunction)AerospikeClient_Admin_Set_Whitelist,
      METH_VARARGS | METH_KEYWORDS, "Set IP whitelist for a user defined role."},
+    {"admin_sync", (PyCFunction)AerospikeClient_Admin_Sync,
+     METH_VARARGS | METH_KEYWORDS,
+     "Create, change and drop users and roles to match a desired state."},
 
     // KVS OPERATIONS
 
@@ -817,10 +876,24 @@ static PyMethodDef AerospikeClient_Type_Methods[] = {
      METH_VARARGS | METH_KEYWORDS, get_nodes_doc},
     {"get_node_names", (PyCFunction)AerospikeClient_GetNodeNames,
      METH_VARARGS | METH_KEYWORDS, get_node_names_doc},
+    {"get_partition_map", (PyCFunction)AerospikeClient_GetPartitionMap,
+     METH_VARARGS | METH_KEYWORDS, get_partition_map_doc},
+    {"get_stats", (PyCFunction)AerospikeClient_GetStats,
+     METH_VARARGS | METH_KEYWORDS, get_stats_doc},
+    {"get_slow_commands", (PyCFunction)AerospikeClient_GetSlowCommands,
+     METH_VARARGS | METH_KEYWORDS, get_slow_commands_doc},
+    {"_enable_metrics", (PyCFunction)AerospikeClient_EnableMetrics,
+     METH_VARARGS | METH_KEYWORDS, NULL},
+    {"_disable_metrics", (PyCFunction)AerospikeClient_DisableMetrics,
+     METH_NOARGS, NULL},
+    {"_get_metrics", (PyCFunction)AerospikeClient_GetMetrics, METH_NOARGS,
+     NULL},
     // UDF OPERATIONS
 
     {"udf_put", (PyCFunction)AerospikeClient_UDF_Put,
      METH_VARARGS | METH_KEYWORDS, udf_put_doc},
+    {"udf_sync", (PyCFunction)AerospikeClient_UDF_Sync,
+     METH_VARARGS | METH_KEYWORDS, udf_sync_doc},
     {"udf_remove", (PyCFunction)AerospikeClient_UDF_Remove,
      METH_VARARGS | METH_KEYWORDS, udf_remove_doc},
     {"udf_list", (PyCFunction)AerospikeClient_UDF_List,
@@ -840,6 +913,10 @@ static PyMethodDef AerospikeClient_Type_Methods[] = {
      METH_VARARGS | METH_KEYWORDS, get_cdtctx_base64_doc},
     {"index_remove", (PyCFunction)AerospikeClient_Index_Remove,
      METH_VARARGS | METH_KEYWORDS, index_remove_doc},
+    {"index_create_many", (PyCFunction)AerospikeClient_Index_Create_Many,
+     METH_VARARGS | METH_KEYWORDS, index_create_many_doc},
+    {"index_remove_many", (PyCFunction)AerospikeClient_Index_Remove_Many,
+     METH_VARARGS | METH_KEYWORDS, index_remove_many_doc},
     {"index_list_create", (PyCFunction)AerospikeClient_Index_List_Create,
      METH_VARARGS | METH_KEYWORDS, index_list_create_doc},
     {"index_map_keys_create",
@@ -856,12 +933,16 @@ static PyMethodDef AerospikeClient_Type_Methods[] = {
 
     {"get_many", (PyCFunction)AerospikeClient_Get_Many,
      METH_VARARGS | METH_KEYWORDS, get_many_doc},
+    {"get_many_digests", (PyCFunction)AerospikeClient_Get_Many_Digests,
+     METH_VARARGS | METH_KEYWORDS, get_many_digests_doc},
     {"batch_get_ops", (PyCFunction)AerospikeClient_Batch_GetOps,
      METH_VARARGS | METH_KEYWORDS, batch_get_ops_doc},
     {"select_many", (PyCFunction)AerospikeClient_Select_Many,
      METH_VARARGS | METH_KEYWORDS, select_many_doc},
     {"exists_many", (PyCFunction)AerospikeClient_Exists_Many,
      METH_VARARGS | METH_KEYWORDS, exists_many_doc},
+    {"exists_many_digests", (PyCFunction)AerospikeClient_Exists_Many_Digests,
+     METH_VARARGS | METH_KEYWORDS, exists_many_digests_doc},
     {"get_key_digest", (PyCFunction)AerospikeClient_Get_Key_Digest,
      METH_VARARGS | METH_KEYWORDS, get_key_digest_doc},
     {"batch_write", (PyCFunction)AerospikeClient_BatchWrite,
@@ -1390,6 +1471,11 @@ static int AerospikeClient_Type_Init(AerospikeClient *self, PyObject *args,
                                    strdup(PyString_AsString(py_cluster_name)));
     }
 
+    if (!profile_slow_log_init(&self->slow_log, py_config)) {
+        error_code = INIT_SLOW_COMMAND_ERR;
+        goto CONSTRUCTOR_ERROR;
+    }
+
     //strict_types check
     self->strict_types = true;
     PyObject *py_strict_types = PyDict_GetItemString(py_config, "strict_types");
@@ -1509,6 +1595,11 @@ CONSTRUCTOR_ERROR:
                         "Specify valid auth_mode");
         break;
     }
+    case INIT_SLOW_COMMAND_ERR: {
+        as_error_update(&constructor_err, AEROSPIKE_ERR_PARAM,
+                        "Invalid slow command setting value");
+        break;
+    }
     default:
         // If a generic error was caught during init, use this message
         as_error_update(&constructor_err, AEROSPIKE_ERR_PARAM,
@@ -1618,6 +1709,8 @@ static void AerospikeClient_Type_Dealloc(PyObject *self)
             }
         }
     }
+    profile_slow_log_destroy(&client->slow_log);
+    profile_metrics_destroy(client->metrics);
     self->ob_type->tp_free((PyObject *)self);
 }
 
@@ -19,7 +19,9 @@
 #define SCRIPT_LEN_MAX 1048576
 
 #include <Python.h>
+#include <dirent.h>
 #include <stdbool.h>
+#include <sys/stat.h>
 
 #include <aerospike/aerospike.h>
 #include <aerospike/aerospike_udf.h>
@@ -27,6 +29,7 @@
 #include <aerospike/as_error.h>
 #include <aerospike/as_policy.h>
 #include <aerospike/as_udf.h>
+#include <citrusleaf/cf_crypto.h>
 
 #include "client.h"
 #include "conversions.h"
@@ -35,86 +38,97 @@
 
 /**
  *******************************************************************************************************
- * Registers a UDF module with the Aerospike DB.
- * @param self                  AerospikeClient object
- * @param args                  The args is a tuple object containing an argument
- *                              list passed from Python to a C function
- * @param kwds                  Dictionary of keywords
+ * Checks whether a file has the given content.
  *
- * Returns an integer status. 0(Zero) is success value.
- * In case of error,appropriate exceptions will be raised.
+ * @param path                  The path of the file
+ * @param bytes                 The content to compare with
+ * @param size                  The size of the content
+ *
+ * Returns true if the file exists and has the same content.
  *******************************************************************************************************
  */
-PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
-                                  PyObject *kwds)
+static bool udf_file_has_content(const char *path, const uint8_t *bytes,
+                                 long size)
 {
-    // Initialize error
-    as_error err;
-    as_error_init(&err);
-
-    // Python Function Arguments
-    PyObject *py_filename = NULL;
-    long language = 0;
-    PyObject *py_udf_type = NULL;
-    PyObject *py_policy = NULL;
-    PyObject *py_ustr = NULL;
-    // This lets each component be 255 characters, and allows a '/'' in between them
-    uint32_t max_copy_path_length = AS_CONFIG_PATH_MAX_SIZE * 2 - 1;
-    uint32_t filename_length = 0;
-    uint8_t *bytes = NULL;
-    as_policy_info info_policy;
-    as_policy_info *info_policy_p = NULL;
-    FILE *file_p = NULL;
-    FILE *copy_file_p = NULL;
-    // Python Function Keyword Arguments
-    static char *kwlist[] = {"filename", "udf_type", "policy", NULL};
-
-    // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|lO:udf_put", kwlist,
-                                    &py_filename, &language,
-                                    &py_policy) == false) {
-        return NULL;
+    FILE *file_p = fopen(path, "r");
+    if (!file_p) {
+        return false;
     }
 
-    if (language != AS_UDF_TYPE_LUA) {
-        as_error_update(&err, AEROSPIKE_ERR_CLIENT, "Invalid UDF language");
-        goto CLEANUP;
+    bool same = false;
+    uint8_t *file_bytes = (uint8_t *)malloc(size + 1);
+    if (file_bytes) {
+        // Read one byte more than the content, so a longer file is not the same
+        size_t read = fread(file_bytes, 1, size + 1, file_p);
+        same = read == (size_t)size && memcmp(file_bytes, bytes, size) == 0;
+        free(file_bytes);
     }
-    py_udf_type = PyLong_FromLong(language);
+    fclose(file_p);
+    return same;
+}
 
-    if (!self || !self->as) {
-        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
-        goto CLEANUP;
-    }
+/**
+ *******************************************************************************************************
+ * Checks whether the cluster has a UDF module with the given content.
+ *
+ * @param files                 The UDF modules registered with the cluster
+ * @param module                The name of the UDF module
+ * @param bytes                 The content of the UDF module
+ * @param size                  The size of the content
+ *
+ * Returns true if a module of the same name has the same content hash.
+ *******************************************************************************************************
+ */
+static bool udf_files_have_content(as_udf_files *files, const char *module,
+                                   const uint8_t *bytes, long size)
+{
+    uint8_t hash[CF_SHA_DIGEST_LENGTH];
+    char hash_hex[AS_UDF_FILE_HASH_SIZE + 1];
 
-    if (!self->is_conn_16) {
-        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
-                        "No connection to aerospike cluster");
-        goto CLEANUP;
+    cf_SHA1(bytes, size, hash);
+    for (uint32_t i = 0; i < CF_SHA_DIGEST_LENGTH; i++) {
+        sprintf(hash_hex + i * 2, "%02x", hash[i]);
     }
 
-    // Convert PyObject into a filename string
-    char *filename = NULL;
-    if (PyUnicode_Check(py_filename)) {
-        py_ustr = PyUnicode_AsUTF8String(py_filename);
-        filename = PyBytes_AsString(py_ustr);
-    }
-    else if (PyString_Check(py_filename)) {
-        filename = PyString_AsString(py_filename);
-    }
-    else {
-        as_error_update(&err, AEROSPIKE_ERR_PARAM,
-                        "Filename should be a string");
-        goto CLEANUP;
+    for (uint32_t i = 0; i < files->size; i++) {
+        as_udf_file *file = &files->entries[i];
+        if (strcmp(file->name, module) == 0) {
+            return strcmp((char *)file->hash, hash_hex) == 0;
+        }
     }
+    return false;
+}
 
-    // Convert python object to policy_info
-    pyobject_to_policy_info(&err, py_policy, &info_policy, &info_policy_p,
-                            &self->as->config.policies.info);
-    if (err.code != AEROSPIKE_OK) {
-        goto CLEANUP;
-    }
-    as_udf_type udf_type = (as_udf_type)PyInt_AsLong(py_udf_type);
+/**
+ *******************************************************************************************************
+ * Copies a UDF module to the Lua user path and registers it with the cluster.
+ * This does not wait for the cluster to load the module.
+ *
+ * @param self                  AerospikeClient object
+ * @param err                   as_error object
+ * @param info_policy_p         The info policy, or NULL for the default
+ * @param filename              The path of the UDF module
+ * @param udf_type              The UDF language
+ * @param files                 The UDF modules registered with the cluster, or
+ *                              NULL to register the module even if it is unchanged
+ * @param registered            Set to whether the module was registered
+ *
+ * Returns AEROSPIKE_OK on success. Otherwise an error occurred.
+ *******************************************************************************************************
+ */
+static as_status udf_put_file(AerospikeClient *self, as_error *err,
+                              as_policy_info *info_policy_p,
+                              const char *filename, as_udf_type udf_type,
+                              as_udf_files *files, bool *registered)
+{
+    // This lets each component be 255 characters, and allows a '/'' in between them
+    uint32_t max_copy_path_length = AS_CONFIG_PATH_MAX_SIZE * 2 - 1;
+    uint32_t filename_length = 0;
+    uint8_t *bytes = NULL;
+    FILE *file_p = NULL;
+    FILE *copy_file_p = NULL;
+
+    *registered = false;
 
     // Convert lua file to content
     as_bytes content;
@@ -134,11 +148,11 @@ PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
         filename_length = strlen(extracted_filename) -
                           1; // Length of the filename after the last '/'
         if (!filename_length) {
-            as_error_update(&err, AEROSPIKE_ERR_PARAM, "Empty udf filename");
+            as_error_update(err, AEROSPIKE_ERR_PARAM, "Empty udf filename");
             goto CLEANUP;
         }
         if (user_path_len + filename_length > max_copy_path_length) {
-            as_error_update(&err, AEROSPIKE_ERR_PARAM,
+            as_error_update(err, AEROSPIKE_ERR_PARAM,
                             "Lua file pathname too long");
             goto CLEANUP;
         }
@@ -149,11 +163,11 @@ PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
     else {
         filename_length = strlen(filename);
         if (!filename_length) {
-            as_error_update(&err, AEROSPIKE_ERR_PARAM, "Empty udf filename");
+            as_error_update(err, AEROSPIKE_ERR_PARAM, "Empty udf filename");
             goto CLEANUP;
         }
         if (user_path_len + filename_length > max_copy_path_length) {
-            as_error_update(&err, AEROSPIKE_ERR_PARAM,
+            as_error_update(err, AEROSPIKE_ERR_PARAM,
                             "Lua file pathname too long");
             goto CLEANUP;
         }
@@ -162,7 +176,7 @@ PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
     }
 
     if (!file_p) {
-        as_error_update(&err, AEROSPIKE_ERR_LUA_FILE_NOT_FOUND,
+        as_error_update(err, AEROSPIKE_ERR_LUA_FILE_NOT_FOUND,
                         "cannot open script file");
         goto CLEANUP;
     }
@@ -171,36 +185,40 @@ PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
     int fileSize = ftell(file_p);
     fseek(file_p, 0, SEEK_SET);
     if (fileSize <= 0) {
-        as_error_update(&err, AEROSPIKE_ERR_LUA_FILE_NOT_FOUND,
+        as_error_update(err, AEROSPIKE_ERR_LUA_FILE_NOT_FOUND,
                         "Script file is empty");
-        fclose(file_p);
-        file_p = NULL;
         goto CLEANUP;
     }
 
     if (fileSize >= SCRIPT_LEN_MAX) {
-        as_error_update(&err, AEROSPIKE_ERR_LUA_FILE_NOT_FOUND,
+        as_error_update(err, AEROSPIKE_ERR_LUA_FILE_NOT_FOUND,
                         "Script File is too large");
-        fclose(file_p);
-        file_p = NULL;
         goto CLEANUP;
     }
 
     bytes = (uint8_t *)malloc(SCRIPT_LEN_MAX);
     if (!bytes) {
-        as_error_update(&err, errno, "malloc failed");
+        as_error_update(err, errno, "malloc failed");
         goto CLEANUP;
     }
 
-    uint8_t *buff = bytes;
+    // Copy lua script to buffer so we can send it to server
+    int numBytesRead = fread(bytes, 1, fileSize, file_p);
+    if (numBytesRead != fileSize) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to send lua file to server");
+        goto CLEANUP;
+    }
 
-    // Don't need to copy lua script to user path if it already exists there
+    // Don't need to copy lua script to user path if it already exists there,
+    // or if the copy there has the same content
     bool same_lua_script_at_user_path = false;
     if (access(copy_filepath, F_OK) == 0) {
         struct stat original_fstat, copied_fstat;
         stat(filename, &original_fstat);
         stat(copy_filepath, &copied_fstat);
-        if (original_fstat.st_ino == copied_fstat.st_ino) {
+        if (original_fstat.st_ino == copied_fstat.st_ino ||
+            udf_file_has_content(copy_filepath, bytes, fileSize)) {
             same_lua_script_at_user_path = true;
         }
     }
@@ -209,29 +227,21 @@ PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
         // Copy lua script to user path
         copy_file_p = fopen(copy_filepath, "w+");
         if (copy_file_p == NULL) {
-            as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
                             "No permissions to write lua file to user path");
             goto CLEANUP;
         }
 
-        int ch;
-        while ((ch = fgetc(file_p)) != EOF) {
-            int retVal = fputc(ch, copy_file_p);
-            if (retVal == EOF) {
-                as_error_update(&err, AEROSPIKE_ERR_CLIENT,
-                                "Write of lua file to user path failed");
-                goto CLEANUP;
-            }
+        if (fwrite(bytes, 1, fileSize, copy_file_p) != (size_t)fileSize) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Write of lua file to user path failed");
+            goto CLEANUP;
         }
-        // Reset source fd so we can copy lua script to buffer
-        fseek(file_p, 0, SEEK_SET);
     }
 
-    // Copy lua script to buffer so we can send it to server
-    int numBytesRead = fread(buff, 1, fileSize, file_p);
-    if (numBytesRead != fileSize) {
-        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
-                        "Unable to send lua file to server");
+    // Don't register the module if the cluster already has the same content
+    if (files && udf_files_have_content(files, as_basename(NULL, filename),
+                                        bytes, fileSize)) {
         goto CLEANUP;
     }
 
@@ -239,49 +249,365 @@ PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
 
     // Invoke operation
     Py_BEGIN_ALLOW_THREADS
-    aerospike_udf_put(self->as, &err, info_policy_p, filename, udf_type,
+    aerospike_udf_put(self->as, err, info_policy_p, filename, udf_type,
                       &content);
     Py_END_ALLOW_THREADS
-    if (err.code != AEROSPIKE_OK) {
+    if (err->code == AEROSPIKE_OK) {
+        *registered = true;
+    }
+
+CLEANUP:
+    if (bytes) {
+        free(bytes);
+    }
+
+    if (file_p) {
+        fclose(file_p);
+    }
+    if (copy_file_p) {
+        fclose(copy_file_p);
+    }
+
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Gets the UDF modules registered with the cluster.
+ *
+ * @param self                  AerospikeClient object
+ * @param err                   as_error object
+ * @param info_policy_p         The info policy, or NULL for the default
+ * @param files                 An initialized as_udf_files to fill in
+ *
+ * Returns AEROSPIKE_OK on success. Otherwise an error occurred.
+ *******************************************************************************************************
+ */
+static as_status udf_list_files(AerospikeClient *self, as_error *err,
+                                as_policy_info *info_policy_p,
+                                as_udf_files *files)
+{
+    Py_BEGIN_ALLOW_THREADS
+    aerospike_udf_list(self->as, err, info_policy_p, files);
+    Py_END_ALLOW_THREADS
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Registers a UDF module with the Aerospike DB.
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns an integer status. 0(Zero) is success value.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_UDF_Put(AerospikeClient *self, PyObject *args,
+                                  PyObject *kwds)
+{
+    // Initialize error
+    as_error err;
+    as_error_init(&err);
+
+    // Python Function Arguments
+    PyObject *py_filename = NULL;
+    long language = 0;
+    PyObject *py_udf_type = NULL;
+    PyObject *py_policy = NULL;
+    PyObject *py_ustr = NULL;
+    int if_changed = 0;
+    as_policy_info info_policy;
+    as_policy_info *info_policy_p = NULL;
+    as_udf_files files;
+    bool init_udf_files = false;
+    bool registered = false;
+    // Python Function Keyword Arguments
+    static char *kwlist[] = {"filename", "udf_type", "policy", "if_changed",
+                             NULL};
+
+    // Python Function Argument Parsing
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|lO$p:udf_put", kwlist,
+                                    &py_filename, &language, &py_policy,
+                                    &if_changed) == false) {
+        return NULL;
+    }
+
+    if (language != AS_UDF_TYPE_LUA) {
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT, "Invalid UDF language");
+        goto CLEANUP;
+    }
+    py_udf_type = PyLong_FromLong(language);
+
+    if (!self || !self->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
         goto CLEANUP;
     }
+
+    if (!self->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    // Convert PyObject into a filename string
+    char *filename = NULL;
+    if (PyUnicode_Check(py_filename)) {
+        py_ustr = PyUnicode_AsUTF8String(py_filename);
+        filename = PyBytes_AsString(py_ustr);
+    }
+    else if (PyString_Check(py_filename)) {
+        filename = PyString_AsString(py_filename);
+    }
     else {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "Filename should be a string");
+        goto CLEANUP;
+    }
+
+    // Convert python object to policy_info
+    pyobject_to_policy_info(&err, py_policy, &info_policy, &info_policy_p,
+                            &self->as->config.policies.info);
+    if (err.code != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+    as_udf_type udf_type = (as_udf_type)PyInt_AsLong(py_udf_type);
+
+    if (if_changed) {
+        // The hashes in the module list are compared with the file's content
+        as_udf_files_init(&files, 0);
+        init_udf_files = true;
+        if (udf_list_files(self, &err, info_policy_p, &files) != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
+    }
+
+    if (udf_put_file(self, &err, info_policy_p, filename, udf_type,
+                     init_udf_files ? &files : NULL,
+                     &registered) != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
+    if (registered) {
+        Py_BEGIN_ALLOW_THREADS
         aerospike_udf_put_wait(self->as, &err, info_policy_p,
                                as_basename(NULL, filename), 2000);
+        Py_END_ALLOW_THREADS
     }
 
 CLEANUP:
-    if (bytes) {
-        free(bytes);
+    if (init_udf_files) {
+        as_udf_files_destroy(&files);
     }
 
+    Py_XDECREF(py_udf_type);
+
     if (py_ustr) {
         Py_DECREF(py_ustr);
     }
 
-    if (file_p) {
-        fclose(file_p);
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception_base(&err, NULL, NULL, Py_None, Py_None, NULL);
+        return NULL;
     }
-    if (copy_file_p) {
-        fclose(copy_file_p);
+
+    return PyLong_FromLong(0);
+}
+
+static int compare_filenames(const void *a, const void *b)
+{
+    return strcmp(*(char *const *)a, *(char *const *)b);
+}
+
+/**
+ *******************************************************************************************************
+ * Registers the UDF modules in a directory which the cluster does not have,
+ * or has with different content.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a list of the names of the modules that were registered.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_UDF_Sync(AerospikeClient *self, PyObject *args,
+                                   PyObject *kwds)
+{
+    // Initialize error
+    as_error err;
+    as_error_init(&err);
+
+    // Python Function Arguments
+    PyObject *py_directory = NULL;
+    PyObject *py_policy = NULL;
+    PyObject *py_registered = NULL;
+    as_policy_info info_policy;
+    as_policy_info *info_policy_p = NULL;
+    as_udf_files files;
+    bool init_udf_files = false;
+    DIR *dir_p = NULL;
+    char **names = NULL;
+    uint32_t n_names = 0;
+    uint32_t max_names = 0;
+    char path[AS_CONFIG_PATH_MAX_SIZE * 2];
+
+    // Python Function Keyword Arguments
+    static char *kwlist[] = {"directory", "policy", NULL};
+
+    // Python Function Argument Parsing
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O:udf_sync", kwlist,
+                                    &py_directory, &py_policy) == false) {
+        return NULL;
+    }
+
+    if (!self || !self->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
     }
 
+    if (!self->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    if (!PyUnicode_Check(py_directory)) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "Directory should be a string");
+        goto CLEANUP;
+    }
+    const char *directory = PyUnicode_AsUTF8(py_directory);
+    if (!directory) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "Directory should be a string");
+        goto CLEANUP;
+    }
+
+    // Convert python object to policy_info
+    pyobject_to_policy_info(&err, py_policy, &info_policy, &info_policy_p,
+                            &self->as->config.policies.info);
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "module")) {
-            PyObject_SetAttrString(exception_type, "module", Py_None);
+        goto CLEANUP;
+    }
+
+    dir_p = opendir(directory);
+    if (!dir_p) {
+        as_error_update(&err, AEROSPIKE_ERR_LUA_FILE_NOT_FOUND,
+                        "cannot open directory %s", directory);
+        goto CLEANUP;
+    }
+
+    // Sort the module names, so they are registered in the same order every time
+    struct dirent *entry;
+    while ((entry = readdir(dir_p)) != NULL) {
+        size_t name_length = strlen(entry->d_name);
+        if (name_length <= 4 ||
+            strcmp(entry->d_name + name_length - 4, ".lua") != 0) {
+            continue;
+        }
+        if (snprintf(path, sizeof(path), "%s/%s", directory, entry->d_name) >=
+            (int)sizeof(path)) {
+            as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                            "Lua file pathname too long");
+            goto CLEANUP;
+        }
+        struct stat file_stat;
+        if (stat(path, &file_stat) != 0 || !S_ISREG(file_stat.st_mode)) {
+            continue;
         }
-        if (PyObject_HasAttrString(exception_type, "func")) {
-            PyObject_SetAttrString(exception_type, "func", Py_None);
+        if (n_names == max_names) {
+            max_names = max_names ? max_names * 2 : 16;
+            char **new_names =
+                (char **)realloc(names, max_names * sizeof(char *));
+            if (!new_names) {
+                as_error_update(&err, AEROSPIKE_ERR_CLIENT, "realloc failed");
+                goto CLEANUP;
+            }
+            names = new_names;
         }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        names[n_names] = strdup(entry->d_name);
+        if (!names[n_names]) {
+            as_error_update(&err, AEROSPIKE_ERR_CLIENT, "strdup failed");
+            goto CLEANUP;
+        }
+        n_names++;
+    }
+    if (n_names) {
+        qsort(names, n_names, sizeof(char *), compare_filenames);
+    }
+
+    // One module list is compared with all the modules
+    as_udf_files_init(&files, 0);
+    init_udf_files = true;
+    if (udf_list_files(self, &err, info_policy_p, &files) != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
+    py_registered = PyList_New(0);
+    if (!py_registered) {
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to create list of modules");
+        goto CLEANUP;
+    }
+
+    for (uint32_t i = 0; i < n_names; i++) {
+        bool registered = false;
+        snprintf(path, sizeof(path), "%s/%s", directory, names[i]);
+        if (udf_put_file(self, &err, info_policy_p, path, AS_UDF_TYPE_LUA,
+                         &files, &registered) != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
+        if (registered) {
+            PyObject *py_name = PyUnicode_FromString(names[i]);
+            if (!py_name || PyList_Append(py_registered, py_name) != 0) {
+                Py_XDECREF(py_name);
+                as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                                "Unable to create list of modules");
+                goto CLEANUP;
+            }
+            Py_DECREF(py_name);
+        }
+    }
+
+    // Wait for the cluster to load the modules after registering all of them,
+    // so the waits overlap
+    Py_ssize_t n_registered = PyList_Size(py_registered);
+    for (Py_ssize_t i = 0; i < n_registered; i++) {
+        const char *name = PyUnicode_AsUTF8(PyList_GetItem(py_registered, i));
+        Py_BEGIN_ALLOW_THREADS
+        aerospike_udf_put_wait(self->as, &err, info_policy_p, name, 2000);
+        Py_END_ALLOW_THREADS
+        if (err.code != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
+    }
+
+CLEANUP:
+    if (init_udf_files) {
+        as_udf_files_destroy(&files);
+    }
+
+    if (dir_p) {
+        closedir(dir_p);
+    }
+
+    for (uint32_t i = 0; i < n_names; i++) {
+        free(names[i]);
+    }
+    free(names);
+
+    if (err.code != AEROSPIKE_OK) {
+        Py_XDECREF(py_registered);
+        raise_exception_base(&err, NULL, NULL, Py_None, Py_None, NULL);
         return NULL;
     }
 
-    return PyLong_FromLong(0);
+    return py_registered;
 }
 
 /**
@@ -370,17 +696,7 @@ CLEANUP:
         Py_DECREF(py_ustr);
     }
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "module")) {
-            PyObject_SetAttrString(exception_type, "module", py_filename);
-        }
-        if (PyObject_HasAttrString(exception_type, "func")) {
-            PyObject_SetAttrString(exception_type, "func", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, NULL, NULL, py_filename, Py_None, NULL);
         return NULL;
     }
 
@@ -468,17 +784,7 @@ CLEANUP:
     }
 
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "module")) {
-            PyObject_SetAttrString(exception_type, "module", Py_None);
-        }
-        if (PyObject_HasAttrString(exception_type, "func")) {
-            PyObject_SetAttrString(exception_type, "func", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, NULL, NULL, Py_None, Py_None, NULL);
         return NULL;
     }
 
@@ -584,17 +890,7 @@ CLEANUP:
         as_udf_file_destroy(&file);
     }
     if (err.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        error_to_pyobject(&err, &py_err);
-        PyObject *exception_type = raise_exception_old(&err);
-        if (PyObject_HasAttrString(exception_type, "module")) {
-            PyObject_SetAttrString(exception_type, "module", py_module);
-        }
-        if (PyObject_HasAttrString(exception_type, "func")) {
-            PyObject_SetAttrString(exception_type, "func", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        raise_exception_base(&err, NULL, NULL, py_module, Py_None, NULL);
         return NULL;
     }
 
@@ -46,6 +46,7 @@
 #include "cdt_types.h"
 #include "cdt_operation_utils.h"
 #include "key_ordered_dict.h"
+#include "key.h"
 
 #define PY_KEYT_NAMESPACE 0
 #define PY_KEYT_SET 1
@@ -436,6 +437,7 @@ as_status as_partitions_status_to_pyobject(
             goto END;
         }
         Py_DECREF(py_id);
+        Py_DECREF(new_py_tuple);
     }
 
     *py_dict = new_dict;
@@ -1256,6 +1258,11 @@ as_status pyobject_to_key(as_error *err, PyObject *py_keytuple, as_key *key)
         // this should never happen, but if it did...
         return as_error_update(err, AEROSPIKE_ERR_PARAM, "key is null");
     }
+    else if (AerospikeKey_Check(py_keytuple)) {
+        // Already parsed, with its digest set.
+        AerospikeKey_Borrow(py_keytuple, key);
+        return err->code;
+    }
     else if (PyTuple_Check(py_keytuple)) {
         size = PyTuple_Size(py_keytuple);
 
@@ -1405,6 +1412,29 @@ as_status pyobject_to_key(as_error *err, PyObject *py_keytuple, as_key *key)
     return err->code;
 }
 
+as_status pyobject_to_digests(as_error *err, PyObject *py_digests,
+                              Py_buffer *digests, uint32_t *n_digests)
+{
+    as_error_reset(err);
+
+    if (PyObject_GetBuffer(py_digests, digests, PyBUF_SIMPLE) != 0) {
+        PyErr_Clear();
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "digests must be a bytes-like object");
+    }
+
+    if (digests->len % AS_DIGEST_VALUE_SIZE ||
+        digests->len / AS_DIGEST_VALUE_SIZE > UINT32_MAX) {
+        PyBuffer_Release(digests);
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "digests must be packed %d byte digests",
+                               AS_DIGEST_VALUE_SIZE);
+    }
+
+    *n_digests = (uint32_t)(digests->len / AS_DIGEST_VALUE_SIZE);
+    return err->code;
+}
+
 typedef struct {
     as_error *err;
     uint32_t count;
@@ -2784,3 +2814,119 @@ as_status as_batch_result_to_BatchRecord(AerospikeClient *self, as_error *err,
 
     return err->code;
 }
+
+/*
+ * Return an aerospike_helpers.job.Job for a job started in the background.
+ * The job is running whatever happens here, so fall back to its plain job ID
+ * if the Job cannot be created.
+ */
+PyObject *job_id_to_pyobject(AerospikeClient *self, uint64_t job_id,
+                             const char *module)
+{
+    PyObject *py_job = NULL;
+    PyObject *job_module = NULL;
+    PyObject *sys_modules = PyImport_GetModuleDict();
+
+    if (PyMapping_HasKeyString(sys_modules, "aerospike_helpers.job")) {
+        job_module =
+            PyMapping_GetItemString(sys_modules, "aerospike_helpers.job");
+    }
+    else {
+        job_module = PyImport_ImportModule("aerospike_helpers.job");
+    }
+
+    if (job_module) {
+        py_job = PyObject_CallMethod(job_module, "Job", "KOs",
+                                     (unsigned long long)job_id,
+                                     (PyObject *)self, module);
+        Py_DECREF(job_module);
+    }
+
+    if (!py_job) {
+        PyErr_Clear();
+        py_job = PyLong_FromUnsignedLongLong(job_id);
+    }
+    return py_job;
+}
+
+/*
+ * Check the page_size, prefetch and max_buffered_records of pages() of a query
+ * or scan. Return true, or false with an error raised.
+ */
+bool pages_args_valid(Py_ssize_t page_size, Py_ssize_t prefetch,
+                      PyObject *py_max_buffered_records)
+{
+    if (page_size < 1) {
+        PyErr_SetString(PyExc_ValueError, "page_size must be at least 1");
+        return false;
+    }
+    if (prefetch < 0) {
+        PyErr_SetString(PyExc_ValueError, "prefetch must not be negative");
+        return false;
+    }
+    if (py_max_buffered_records != Py_None) {
+        if (!PyLong_Check(py_max_buffered_records)) {
+            PyErr_SetString(PyExc_TypeError,
+                            "max_buffered_records must be an int");
+            return false;
+        }
+        int overflow = 0;
+        long long max_buffered_records =
+            PyLong_AsLongLongAndOverflow(py_max_buffered_records, &overflow);
+        if (overflow < 0 || (overflow == 0 && max_buffered_records < 1)) {
+            PyErr_SetString(PyExc_ValueError,
+                            "max_buffered_records must be at least 1");
+            return false;
+        }
+    }
+    return true;
+}
+
+/*
+ * Call a function of a helper module with py_self, then args and kwds.
+ * Return the result, or NULL with an error raised.
+ */
+PyObject *call_helper_function(PyObject *py_self, const char *module_name,
+                               const char *function_name, PyObject *args,
+                               PyObject *kwds)
+{
+    PyObject *helper_module = NULL;
+    PyObject *sys_modules = PyImport_GetModuleDict();
+
+    if (PyMapping_HasKeyString(sys_modules, module_name)) {
+        helper_module = PyMapping_GetItemString(sys_modules, module_name);
+    }
+    else {
+        helper_module = PyImport_ImportModule(module_name);
+    }
+
+    if (!helper_module) {
+        as_error err;
+        as_error_init(&err);
+        PyErr_Clear();
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT, "Unable to load %s module",
+                        module_name);
+        raise_exception(&err);
+        return NULL;
+    }
+
+    PyObject *py_result = NULL;
+    PyObject *py_function =
+        PyObject_GetAttrString(helper_module, function_name);
+    PyObject *py_args = PyTuple_New(PyTuple_Size(args) + 1);
+    if (py_function && py_args) {
+        Py_INCREF(py_self);
+        PyTuple_SET_ITEM(py_args, 0, py_self);
+        for (Py_ssize_t i = 0; i < PyTuple_Size(args); i++) {
+            PyObject *py_arg = PyTuple_GET_ITEM(args, i);
+            Py_INCREF(py_arg);
+            PyTuple_SET_ITEM(py_args, i + 1, py_arg);
+        }
+        py_result = PyObject_Call(py_function, py_args, kwds);
+    }
+
+    Py_XDECREF(py_args);
+    Py_XDECREF(py_function);
+    Py_DECREF(helper_module);
+    return py_result;
+}
@@ -33,6 +33,7 @@
 #include "geo.h"
 #include "cdt_types.h"
 #include "key_ordered_dict.h"
+#include "profile.h"
 
 // EXPR OPS
 enum expr_ops {
@@ -203,6 +204,9 @@ add_expr_macros(AerospikeClient *self, as_static_pool *static_pool,
 static bool free_temp_expr(intermediate_expr *temp_expr, as_error *err,
                            bool is_ctx_initialized);
 
+static as_status build_exp_list(AerospikeClient *self, PyObject *py_exp_list,
+                                as_exp **exp_list, as_error *err);
+
 /*
 * get_expr_size 
 * Sets `size_to_alloc` to the byte count required to fit the array of as_exp_entry that will be allocated
@@ -1492,12 +1496,29 @@ add_expr_macros(AerospikeClient *self, as_static_pool *static_pool,
 
 /*
 * convert_exp_list
+* Converts and builds the expressions, counting the time taken as expression
+* conversion if the call is profiled.
+*/
+as_status convert_exp_list(AerospikeClient *self, PyObject *py_exp_list,
+                           as_exp **exp_list, as_error *err)
+{
+    profile_call *call = profile_current();
+    uint64_t start_ns = profile_nested_start(call);
+
+    build_exp_list(self, py_exp_list, exp_list, err);
+
+    profile_nested_end(call, PROFILE_EXPRESSIONS, start_ns);
+    return err->code;
+}
+
+/*
+* build_exp_list
 * Converts expressions from python into intermediate_expr structs.
 * Initiates the conversion from intermediate_expr structs to expressions.
 * builds the expressions.
 */
-as_status convert_exp_list(AerospikeClient *self, PyObject *py_exp_list,
-                           as_exp **exp_list, as_error *err)
+static as_status build_exp_list(AerospikeClient *self, PyObject *py_exp_list,
+                                as_exp **exp_list, as_error *err)
 {
     int bottom = 0;
 
@@ -0,0 +1,306 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+#include <string.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_key.h>
+#include <aerospike/as_record.h>
+#include <aerospike/as_val.h>
+
+#include "client.h"
+#include "conversions.h"
+#include "exceptions.h"
+#include "module_functions.h"
+#include "policy.h"
+#include "serializer.h"
+
+/**
+ *******************************************************************************************************
+ * Convert a Python key tuple to an as_key and back.
+ *******************************************************************************************************
+ */
+static as_status roundtrip_key(AerospikeClient *self, as_error *err,
+                               PyObject *py_value, PyObject **py_result)
+{
+    as_key key;
+
+    if (pyobject_to_key(err, py_value, &key) != AEROSPIKE_OK) {
+        return err->code;
+    }
+    key_to_pyobject(err, &key, py_result);
+    as_key_destroy(&key);
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Convert a Python bins dictionary to an as_record and back.
+ *******************************************************************************************************
+ */
+static as_status roundtrip_record(AerospikeClient *self, as_error *err,
+                                  PyObject *py_value, PyObject **py_result)
+{
+    as_record rec;
+    as_static_pool static_pool;
+    memset(&static_pool, 0, sizeof(static_pool));
+
+    as_record_init(&rec, 0);
+    if (pyobject_to_record(self, err, py_value, NULL, &rec, SERIALIZER_PYTHON,
+                           &static_pool) == AEROSPIKE_OK) {
+        bins_to_pyobject(self, err, &rec, py_result, false);
+    }
+
+    POOL_DESTROY(&static_pool);
+    as_record_destroy(&rec);
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Convert a Python value to an as_val and back.
+ *******************************************************************************************************
+ */
+static as_status roundtrip_val(AerospikeClient *self, as_error *err,
+                               PyObject *py_value, PyObject **py_result)
+{
+    as_val *val = NULL;
+    as_static_pool static_pool;
+    memset(&static_pool, 0, sizeof(static_pool));
+
+    if (pyobject_to_val(self, err, py_value, &val, &static_pool,
+                        SERIALIZER_PYTHON) == AEROSPIKE_OK) {
+        val_to_pyobject(self, err, val, py_result);
+    }
+
+    if (val) {
+        as_val_destroy(val);
+    }
+    POOL_DESTROY(&static_pool);
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Serialize a Python value to as_bytes and deserialize it back, using the
+ * client's serializer if one is set and pickle otherwise.
+ *******************************************************************************************************
+ */
+static as_status roundtrip_serializer(AerospikeClient *self, as_error *err,
+                                      PyObject *py_value, PyObject **py_result)
+{
+    as_bytes *bytes = NULL;
+    as_static_pool static_pool;
+    memset(&static_pool, 0, sizeof(static_pool));
+
+    GET_BYTES_POOL(bytes, &static_pool, err);
+    if (err->code == AEROSPIKE_OK &&
+        serialize_based_on_serializer_policy(self, SERIALIZER_PYTHON, &bytes,
+                                             py_value, err) == AEROSPIKE_OK) {
+        deserialize_based_on_as_bytes_type(self, bytes, py_result, err);
+    }
+
+    POOL_DESTROY(&static_pool);
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Convert a compiled Python expression to an as_exp.
+ *******************************************************************************************************
+ */
+static as_status convert_expressions(AerospikeClient *self, as_error *err,
+                                     PyObject *py_value, PyObject **py_result)
+{
+    as_exp *exp_list_p = NULL;
+
+    if (!PyList_Check(py_value)) {
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "expressions must be a compiled expression");
+    }
+    if (convert_exp_list(self, py_value, &exp_list_p, err) == AEROSPIKE_OK) {
+        as_exp_destroy(exp_list_p);
+    }
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Convert a Python read policy dictionary, including its expressions, to an as_policy_read.
+ *******************************************************************************************************
+ */
+static as_status convert_policy_read(AerospikeClient *self, as_error *err,
+                                     PyObject *py_value, PyObject **py_result)
+{
+    as_policy_read policy;
+    as_policy_read *policy_p = NULL;
+    as_exp exp_list;
+    as_exp *exp_list_p = NULL;
+
+    pyobject_to_policy_read(self, err, py_value, &policy, &policy_p,
+                            &self->as->config.policies.read, &exp_list,
+                            &exp_list_p);
+    if (exp_list_p) {
+        as_exp_destroy(exp_list_p);
+    }
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Convert a Python write policy dictionary, including its expressions, to an as_policy_write.
+ *******************************************************************************************************
+ */
+static as_status convert_policy_write(AerospikeClient *self, as_error *err,
+                                      PyObject *py_value, PyObject **py_result)
+{
+    as_policy_write policy;
+    as_policy_write *policy_p = NULL;
+    as_exp exp_list;
+    as_exp *exp_list_p = NULL;
+
+    pyobject_to_policy_write(self, err, py_value, &policy, &policy_p,
+                             &self->as->config.policies.write, &exp_list,
+                             &exp_list_p);
+    if (exp_list_p) {
+        as_exp_destroy(exp_list_p);
+    }
+    return err->code;
+}
+
+/**
+ *******************************************************************************************************
+ * Convert a Python query policy dictionary, including its expressions, to an as_policy_query.
+ *******************************************************************************************************
+ */
+static as_status convert_policy_query(AerospikeClient *self, as_error *err,
+                                      PyObject *py_value, PyObject **py_result)
+{
+    as_policy_query policy;
+    as_policy_query *policy_p = NULL;
+    as_exp exp_list;
+    as_exp *exp_list_p = NULL;
+
+    pyobject_to_policy_query(self, err, py_value, &policy, &policy_p,
+                             &self->as->config.policies.query, &exp_list,
+                             &exp_list_p);
+    if (exp_list_p) {
+        as_exp_destroy(exp_list_p);
+    }
+    return err->code;
+}
+
+typedef as_status (*roundtrip_fn)(AerospikeClient *self, as_error *err,
+                                  PyObject *py_value, PyObject **py_result);
+
+static const struct {
+    const char *kind;
+    roundtrip_fn fn;
+} roundtrip_kinds[] = {{"key", roundtrip_key},
+                       {"record", roundtrip_record},
+                       {"val", roundtrip_val},
+                       {"serializer", roundtrip_serializer},
+                       {"expressions", convert_expressions},
+                       {"policy_read", convert_policy_read},
+                       {"policy_write", convert_policy_write},
+                       {"policy_query", convert_policy_query}};
+
+#define ROUNDTRIP_KINDS_SIZE                                                   \
+    (sizeof(roundtrip_kinds) / sizeof(roundtrip_kinds[0]))
+
+/**
+ *******************************************************************************************************
+ * Run one of the client's Python <-> C conversions in a loop without any I/O.
+ * This is a test only entry point used by the conversion benchmarks. The
+ * conversions run against a client that is never connected, so no cluster is
+ * needed.
+ *
+ * @param self                  The aerospike module
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns the value converted back to Python by the last iteration, or None
+ * for conversions that only go from Python to C.
+ * In case of error, appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *Aerospike_Convert_Roundtrip(PyObject *self, PyObject *args,
+                                      PyObject *kwds)
+{
+    // function args
+    char *kind = NULL;
+    PyObject *py_value = NULL;
+    unsigned long iterations = 1;
+
+    // utility vars
+    roundtrip_fn fn = NULL;
+    PyObject *py_result = NULL;
+    AerospikeClient client;
+    as_config config;
+
+    as_error err;
+    as_error_init(&err);
+
+    static char *kwlist[] = {"kind", "value", "iterations", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "sO|k:_convert_roundtrip",
+                                    kwlist, &kind, &py_value,
+                                    &iterations) == false) {
+        return NULL;
+    }
+
+    for (size_t i = 0; i < ROUNDTRIP_KINDS_SIZE; i++) {
+        if (strcmp(kind, roundtrip_kinds[i].kind) == 0) {
+            fn = roundtrip_kinds[i].fn;
+            break;
+        }
+    }
+    if (!fn) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Unknown conversion kind %s",
+                        kind);
+        raise_exception(&err);
+        return NULL;
+    }
+
+    // An unconnected client with the default config and no user serializers.
+    memset(&client, 0, sizeof(client));
+    as_config_init(&config);
+    client.as = aerospike_new(&config);
+    client.send_bool_as = SEND_BOOL_AS_AS_BOOL;
+
+    for (unsigned long i = 0; i < iterations; i++) {
+        // Only the result of the last iteration is returned.
+        Py_CLEAR(py_result);
+        if (fn(&client, &err, py_value, &py_result) != AEROSPIKE_OK) {
+            break;
+        }
+    }
+
+    aerospike_destroy(client.as);
+
+    if (err.code != AEROSPIKE_OK) {
+        Py_XDECREF(py_result);
+        raise_exception(&err);
+        return NULL;
+    }
+
+    if (!py_result) {
+        Py_RETURN_NONE;
+    }
+    return py_result;
+}
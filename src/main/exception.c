@@ -28,6 +28,86 @@
 
 static PyObject *module;
 
+// Exception class of each error code, built once the module is created.
+static PyObject *py_exception_classes = NULL;
+static PyObject *py_aerospike_error = NULL;
+
+/*
+ * AerospikeError.__init__(self, *args). Exceptions raised by the client have
+ * (code, msg, file, line, in_doubt) as args, which are also set as attributes
+ * of the instance. Bound as a method, so self is the first of args.
+ */
+static PyObject *AerospikeError_Init(PyObject *unused, PyObject *args)
+{
+    PyObject *py_self = PyTuple_GetItem(args, 0);
+    if (!py_self) {
+        return NULL;
+    }
+
+    static const char *names[] = {"code", "msg", "file", "line", "in_doubt"};
+    Py_ssize_t count = sizeof(names) / sizeof(names[0]);
+    if (PyTuple_GET_SIZE(args) == count + 1) {
+        for (Py_ssize_t i = 0; i < count; i++) {
+            if (PyObject_SetAttrString(py_self, names[i],
+                                       PyTuple_GET_ITEM(args, i + 1)) == -1) {
+                return NULL;
+            }
+        }
+    }
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef AerospikeError_Init_Def = {
+    "__init__", (PyCFunction)AerospikeError_Init, METH_VARARGS, NULL};
+
+/*
+ * Maps each error code to the first exception class of the module with that
+ * code, as the module's attributes are ordered.
+ */
+static PyObject *build_exception_classes()
+{
+    PyObject *py_classes = PyDict_New();
+    if (!py_classes) {
+        return NULL;
+    }
+
+    PyObject *py_key = NULL, *py_value = NULL;
+    Py_ssize_t pos = 0;
+    PyObject *py_module_dict = PyModule_GetDict(module);
+    while (PyDict_Next(py_module_dict, &pos, &py_key, &py_value)) {
+        if (!PyExceptionClass_Check(py_value)) {
+            continue;
+        }
+        PyObject *py_code = PyObject_GetAttrString(py_value, "code");
+        if (!py_code) {
+            PyErr_Clear();
+            continue;
+        }
+        if (PyLong_Check(py_code) &&
+            !PyDict_SetDefault(py_classes, py_code, py_value)) {
+            Py_DECREF(py_code);
+            Py_DECREF(py_classes);
+            return NULL;
+        }
+        Py_DECREF(py_code);
+    }
+    return py_classes;
+}
+
+/*
+ * Returns the exception class of an error code, borrowed.
+ */
+static PyObject *exception_class(as_status code)
+{
+    PyObject *py_code = py_exception_classes ? PyLong_FromLong(code) : NULL;
+    PyObject *py_class = NULL;
+    if (py_code) {
+        py_class = PyDict_GetItem(py_exception_classes, py_code);
+        Py_DECREF(py_code);
+    }
+    return py_class ? py_class : py_aerospike_error;
+}
+
 PyObject *AerospikeException_New(void)
 {
     MOD_DEF(module, "aerospike.exception", "Exception objects", -1, NULL, NULL);
@@ -157,6 +237,11 @@ PyObject *AerospikeException_New(void)
     PyDict_SetItemString(py_dict, "file", Py_None);
     PyDict_SetItemString(py_dict, "msg", Py_None);
     PyDict_SetItemString(py_dict, "line", Py_None);
+    PyObject *py_init = PyCFunction_New(&AerospikeError_Init_Def, NULL);
+    PyObject *py_init_method = PyInstanceMethod_New(py_init);
+    PyDict_SetItemString(py_dict, "__init__", py_init_method);
+    Py_DECREF(py_init_method);
+    Py_DECREF(py_init);
 
     exceptions_array.AerospikeError =
         PyErr_NewException("exception.AerospikeError", NULL, py_dict);
@@ -543,6 +628,14 @@ PyObject *AerospikeException_New(void)
     PyObject_SetAttrString(exceptions_array.QueryTimeout, "code", py_code);
     Py_DECREF(py_code);
 
+    Py_XDECREF(py_exception_classes);
+    py_exception_classes = build_exception_classes();
+    if (!py_exception_classes) {
+        // Every error is raised as an AerospikeError.
+        PyErr_Clear();
+    }
+    py_aerospike_error = exceptions_array.AerospikeError;
+
     return module;
 }
 
@@ -559,129 +652,59 @@ void remove_exception(as_error *err)
 
 void raise_exception(as_error *err)
 {
-    PyObject *py_key = NULL, *py_value = NULL;
-    Py_ssize_t pos = 0;
-    PyObject *py_module_dict = PyModule_GetDict(module);
-    bool found = false;
-
-    while (PyDict_Next(py_module_dict, &pos, &py_key, &py_value)) {
-        if (PyObject_HasAttrString(py_value, "code")) {
-            PyObject *py_code = PyObject_GetAttrString(py_value, "code");
-            if (py_code == Py_None) {
-                continue;
-            }
-            if (err->code == PyInt_AsLong(py_code)) {
-                found = true;
-                PyObject *py_attr = NULL;
-                py_attr = PyString_FromString(err->message);
-                PyObject_SetAttrString(py_value, "msg", py_attr);
-                Py_DECREF(py_attr);
-
-                // as_error.file is a char* so this may be null
-                if (err->file) {
-                    py_attr = PyString_FromString(err->file);
-                    PyObject_SetAttrString(py_value, "file", py_attr);
-                    Py_DECREF(py_attr);
-                }
-                else {
-                    PyObject_SetAttrString(py_value, "file", Py_None);
-                }
-                // If the line is 0, set it as None
-                if (err->line > 0) {
-                    py_attr = PyInt_FromLong(err->line);
-                    PyObject_SetAttrString(py_value, "line", py_attr);
-                    Py_DECREF(py_attr);
-                }
-                else {
-                    PyObject_SetAttrString(py_value, "line", Py_None);
-                }
-
-                py_attr = PyBool_FromLong(err->in_doubt);
-                PyObject_SetAttrString(py_value, "in_doubt", py_attr);
-                Py_DECREF(py_attr);
-
-                break;
-            }
-            Py_DECREF(py_code);
-        }
-    }
-    // We haven't found the right exception, just use AerospikeError
-    if (!found) {
-        PyObject *base_exception =
-            PyDict_GetItemString(py_module_dict, "AerospikeError");
-        if (base_exception) {
-            py_value = base_exception;
-        }
-    }
+    raise_exception_base(err, NULL, NULL, NULL, NULL, NULL);
+}
 
-    // Convert borrowed reference of exception class to strong reference
-    Py_INCREF(py_value);
+PyObject *create_exception(as_error *err, PyObject *py_key, PyObject *py_bin,
+                           PyObject *py_module, PyObject *py_func,
+                           PyObject *py_name)
+{
+    PyObject *py_class = exception_class(err->code);
 
     // Convert C error to Python exception
     PyObject *py_err = NULL;
     error_to_pyobject(err, &py_err);
+    PyObject *py_exception = PyObject_Call(py_class, py_err, NULL);
+    Py_DECREF(py_err);
+    if (!py_exception) {
+        return NULL;
+    }
 
-    // Raise exception
-    PyErr_SetObject(py_value, py_err);
+    const char *names[] = {"key", "bin", "module", "func", "name"};
+    PyObject *values[] = {py_key, py_bin, py_module, py_func, py_name};
+    for (size_t i = 0; i < sizeof(names) / sizeof(names[0]); i++) {
+        if (values[i] && PyObject_HasAttrString(py_class, names[i])) {
+            PyObject_SetAttrString(py_exception, names[i], values[i]);
+        }
+    }
+    return py_exception;
+}
 
-    Py_DECREF(py_value);
-    Py_DECREF(py_err);
+void raise_exception_base(as_error *err, PyObject *py_key, PyObject *py_bin,
+                          PyObject *py_module, PyObject *py_func,
+                          PyObject *py_name)
+{
+    // An exception may already be set, which this one replaces as with
+    // PyErr_SetObject, but which can't be set while creating this one.
+    PyObject *py_type, *py_value, *py_traceback;
+    PyErr_Fetch(&py_type, &py_value, &py_traceback);
+
+    PyObject *py_exception =
+        create_exception(err, py_key, py_bin, py_module, py_func, py_name);
+    if (!py_exception) {
+        Py_XDECREF(py_type);
+        Py_XDECREF(py_value);
+        Py_XDECREF(py_traceback);
+        return;
+    }
+
+    // Raise exception
+    PyErr_Restore(py_type, py_value, py_traceback);
+    PyErr_SetObject((PyObject *)Py_TYPE(py_exception), py_exception);
+    Py_DECREF(py_exception);
 }
 
 PyObject *raise_exception_old(as_error *err)
 {
-    PyObject *py_key = NULL, *py_value = NULL;
-    Py_ssize_t pos = 0;
-    PyObject *py_module_dict = PyModule_GetDict(module);
-    bool found = false;
-
-    while (PyDict_Next(py_module_dict, &pos, &py_key, &py_value)) {
-        if (PyObject_HasAttrString(py_value, "code")) {
-            PyObject *py_code = PyObject_GetAttrString(py_value, "code");
-            if (py_code == Py_None) {
-                continue;
-            }
-            if (err->code == PyInt_AsLong(py_code)) {
-                found = true;
-                PyObject *py_attr = NULL;
-                py_attr = PyString_FromString(err->message);
-                PyObject_SetAttrString(py_value, "msg", py_attr);
-                Py_DECREF(py_attr);
-
-                // as_error.file is a char* so this may be null
-                if (err->file) {
-                    py_attr = PyString_FromString(err->file);
-                    PyObject_SetAttrString(py_value, "file", py_attr);
-                    Py_DECREF(py_attr);
-                }
-                else {
-                    PyObject_SetAttrString(py_value, "file", Py_None);
-                }
-                // If the line is 0, set it as None
-                if (err->line > 0) {
-                    py_attr = PyInt_FromLong(err->line);
-                    PyObject_SetAttrString(py_value, "line", py_attr);
-                    Py_DECREF(py_attr);
-                }
-                else {
-                    PyObject_SetAttrString(py_value, "line", Py_None);
-                }
-
-                PyObject_SetAttrString(py_value, "in_doubt",
-                                       PyBool_FromLong(err->in_doubt));
-
-                break;
-            }
-            Py_DECREF(py_code);
-        }
-    }
-    // We haven't found the right exception, just use AerospikeError
-    if (!found) {
-        PyObject *base_exception =
-            PyDict_GetItemString(py_module_dict, "AerospikeError");
-        if (base_exception) {
-            py_value = base_exception;
-        }
-    }
-    return py_value;
+    return exception_class(err->code);
 }
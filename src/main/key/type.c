@@ -0,0 +1,374 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+#include <string.h>
+
+#include <aerospike/as_bytes.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_integer.h>
+#include <aerospike/as_key.h>
+#include <aerospike/as_partition.h>
+#include <aerospike/as_string.h>
+
+#include "conversions.h"
+#include "exceptions.h"
+#include "key.h"
+
+// Used by aerospike.get_partition_id() too. Servers always have 4096.
+#define KEY_PARTITIONS 4096
+
+static PyTypeObject AerospikeKey_Type;
+
+/*******************************************************************************
+ * PYTHON TYPE HOOKS
+ ******************************************************************************/
+
+/*
+ * Initializes dst with a copy of the value in src, which dst owns, so that it
+ * does not depend on the Python objects src was made from.
+ */
+static as_key *copy_key(as_key *dst, as_key *src)
+{
+    as_val *val = (as_val *)src->valuep;
+    if (!val) {
+        return as_key_init_digest(dst, src->ns, src->set, src->digest.value);
+    }
+
+    switch (as_val_type(val)) {
+    case AS_INTEGER:
+        return as_key_init_int64(dst, src->ns, src->set,
+                                 as_integer_get((as_integer *)val));
+    case AS_STRING:
+        return as_key_init_strp(dst, src->ns, src->set,
+                                strdup(as_string_get((as_string *)val)), true);
+    case AS_BYTES: {
+        uint32_t size = as_bytes_size((as_bytes *)val);
+        uint8_t *bytes = (uint8_t *)malloc(size);
+        memcpy(bytes, as_bytes_get((as_bytes *)val), size);
+        return as_key_init_rawp(dst, src->ns, src->set, bytes, size, true);
+    }
+    default:
+        return NULL;
+    }
+}
+
+static PyObject *AerospikeKey_Type_New(PyTypeObject *type, PyObject *args,
+                                       PyObject *kwds)
+{
+    PyObject *py_ns = NULL;
+    PyObject *py_set = NULL;
+    PyObject *py_key = Py_None;
+    PyObject *py_digest = Py_None;
+
+    static char *kwlist[] = {"namespace", "set", "key", "digest", NULL};
+
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "OO|OO:Key", kwlist, &py_ns,
+                                    &py_set, &py_key, &py_digest) == false) {
+        return NULL;
+    }
+
+    as_error err;
+    as_error_init(&err);
+
+    as_key key;
+    bool key_initialised = false;
+    AerospikeKey *self = NULL;
+
+    // Parse the key as a key tuple would be.
+    PyObject *py_keytuple = PyTuple_Pack(4, py_ns, py_set, py_key, py_digest);
+    if (!py_keytuple) {
+        return NULL;
+    }
+    if (pyobject_to_key(&err, py_keytuple, &key) != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+    key_initialised = true;
+
+    self = (AerospikeKey *)type->tp_alloc(type, 0);
+    if (!self) {
+        goto CLEANUP;
+    }
+    if (!copy_key(&self->key, &key)) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "key is invalid");
+        goto CLEANUP;
+    }
+    // Setting py_key marks the key as initialised, for dealloc.
+    if (!key.valuep) {
+        py_key = Py_None;
+        Py_INCREF(py_key);
+    }
+    else if (PyByteArray_Check(py_key)) {
+        // Keep a copy, as the digest would not change with the bytearray.
+        py_key = PyByteArray_FromObject(py_key);
+    }
+    else {
+        Py_INCREF(py_key);
+    }
+    self->py_key = py_key;
+    if (!py_key) {
+        as_key_destroy(&self->key);
+        goto CLEANUP;
+    }
+
+    if (as_key_set_digest(&err, &self->key) != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+    self->partition_id =
+        as_partition_getid(self->key.digest.value, KEY_PARTITIONS);
+
+CLEANUP:
+    if (key_initialised) {
+        as_key_destroy(&key);
+    }
+    Py_DECREF(py_keytuple);
+
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception(&err);
+    }
+    if (err.code != AEROSPIKE_OK || PyErr_Occurred()) {
+        Py_XDECREF(self);
+        return NULL;
+    }
+    return (PyObject *)self;
+}
+
+static void AerospikeKey_Type_Dealloc(AerospikeKey *self)
+{
+    if (self->py_key) {
+        as_key_destroy(&self->key);
+    }
+    Py_XDECREF(self->py_key);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *AerospikeKey_Get_Namespace(AerospikeKey *self, void *closure)
+{
+    return PyUnicode_FromString(self->key.ns);
+}
+
+static PyObject *AerospikeKey_Get_Set(AerospikeKey *self, void *closure)
+{
+    if (!self->key.set[0]) {
+        Py_RETURN_NONE;
+    }
+    return PyUnicode_FromString(self->key.set);
+}
+
+static PyObject *AerospikeKey_Get_Key(AerospikeKey *self, void *closure)
+{
+    Py_INCREF(self->py_key);
+    return self->py_key;
+}
+
+static PyObject *AerospikeKey_Get_Digest(AerospikeKey *self, void *closure)
+{
+    return PyByteArray_FromStringAndSize((const char *)self->key.digest.value,
+                                         AS_DIGEST_VALUE_SIZE);
+}
+
+static PyObject *AerospikeKey_Get_Partition_Id(AerospikeKey *self,
+                                               void *closure)
+{
+    return PyLong_FromUnsignedLong(self->partition_id);
+}
+
+static Py_ssize_t AerospikeKey_Type_Length(AerospikeKey *self) { return 4; }
+
+static PyObject *AerospikeKey_Type_Item(AerospikeKey *self, Py_ssize_t i)
+{
+    switch (i) {
+    case 0:
+        return AerospikeKey_Get_Namespace(self, NULL);
+    case 1:
+        return AerospikeKey_Get_Set(self, NULL);
+    case 2:
+        return AerospikeKey_Get_Key(self, NULL);
+    case 3:
+        return AerospikeKey_Get_Digest(self, NULL);
+    default:
+        PyErr_SetString(PyExc_IndexError, "key index out of range");
+        return NULL;
+    }
+}
+
+static Py_hash_t AerospikeKey_Type_Hash(AerospikeKey *self)
+{
+    // The digest is already a hash of the set and key.
+    Py_hash_t hash;
+    memcpy(&hash, self->key.digest.value, sizeof(hash));
+    return hash == -1 ? -2 : hash;
+}
+
+static PyObject *AerospikeKey_Type_RichCompare(PyObject *py_self,
+                                               PyObject *py_other, int op)
+{
+    if (!AerospikeKey_Check(py_other) || (op != Py_EQ && op != Py_NE)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    as_key *key = &((AerospikeKey *)py_self)->key;
+    as_key *other = &((AerospikeKey *)py_other)->key;
+    bool equal =
+        !strcmp(key->ns, other->ns) &&
+        !memcmp(key->digest.value, other->digest.value, AS_DIGEST_VALUE_SIZE);
+
+    return PyBool_FromLong(op == Py_EQ ? equal : !equal);
+}
+
+static PyObject *AerospikeKey_Type_Repr(AerospikeKey *self)
+{
+    PyObject *py_ns = AerospikeKey_Get_Namespace(self, NULL);
+    PyObject *py_set = AerospikeKey_Get_Set(self, NULL);
+    PyObject *py_digest = AerospikeKey_Get_Digest(self, NULL);
+    PyObject *py_repr = NULL;
+
+    if (py_ns && py_set && py_digest) {
+        if (self->py_key != Py_None) {
+            py_repr = PyUnicode_FromFormat("aerospike.Key(%R, %R, %R)", py_ns,
+                                           py_set, self->py_key);
+        }
+        else {
+            py_repr = PyUnicode_FromFormat("aerospike.Key(%R, %R, None, %R)",
+                                           py_ns, py_set, py_digest);
+        }
+    }
+
+    Py_XDECREF(py_ns);
+    Py_XDECREF(py_set);
+    Py_XDECREF(py_digest);
+    return py_repr;
+}
+
+static PyObject *AerospikeKey_Reduce(AerospikeKey *self,
+                                     PyObject *Py_UNUSED(ignored))
+{
+    PyObject *py_args = PySequence_Tuple((PyObject *)self);
+    if (!py_args) {
+        return NULL;
+    }
+    return Py_BuildValue("(ON)", Py_TYPE(self), py_args);
+}
+
+/*******************************************************************************
+ * PYTHON TYPE DESCRIPTOR
+ ******************************************************************************/
+
+static PyGetSetDef AerospikeKey_Type_GetSet[] = {
+    {"namespace", (getter)AerospikeKey_Get_Namespace, NULL,
+     "The namespace of the key.", NULL},
+    {"set", (getter)AerospikeKey_Get_Set, NULL, "The set of the key, or None.",
+     NULL},
+    {"key", (getter)AerospikeKey_Get_Key, NULL,
+     "The primary key, or None if the key was made from a digest.", NULL},
+    {"digest", (getter)AerospikeKey_Get_Digest, NULL,
+     "The digest of the key, as a bytearray.", NULL},
+    {"partition_id", (getter)AerospikeKey_Get_Partition_Id, NULL,
+     "The partition the key belongs to.", NULL},
+    {NULL}};
+
+static PyMethodDef AerospikeKey_Type_Methods[] = {
+    {"__reduce__", (PyCFunction)AerospikeKey_Reduce, METH_NOARGS, NULL},
+    {NULL}};
+
+static PySequenceMethods AerospikeKey_Type_Sequence = {
+    (lenfunc)AerospikeKey_Type_Length,    // sq_length
+    0,                                    // sq_concat
+    0,                                    // sq_repeat
+    (ssizeargfunc)AerospikeKey_Type_Item, // sq_item
+};
+
+static PyTypeObject AerospikeKey_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0) "aerospike.Key", // tp_name
+    sizeof(AerospikeKey),                           // tp_basicsize
+    0,                                              // tp_itemsize
+    (destructor)AerospikeKey_Type_Dealloc,
+    // tp_dealloc
+    0,                                // tp_print
+    0,                                // tp_getattr
+    0,                                // tp_setattr
+    0,                                // tp_compare
+    (reprfunc)AerospikeKey_Type_Repr, // tp_repr
+    0,                                // tp_as_number
+    &AerospikeKey_Type_Sequence,      // tp_as_sequence
+    0,                                // tp_as_mapping
+    (hashfunc)AerospikeKey_Type_Hash, // tp_hash
+    0,                                // tp_call
+    0,                                // tp_str
+    0,                                // tp_getattro
+    0,                                // tp_setattro
+    0,                                // tp_as_buffer
+    Py_TPFLAGS_DEFAULT,
+    // tp_flags
+    "An immutable record key, with its digest and partition id computed\n"
+    "once. It can be used wherever a key tuple is accepted.\n",
+    // tp_doc
+    0,                             // tp_traverse
+    0,                             // tp_clear
+    AerospikeKey_Type_RichCompare, // tp_richcompare
+    0,                             // tp_weaklistoffset
+    0,                             // tp_iter
+    0,                             // tp_iternext
+    AerospikeKey_Type_Methods,     // tp_methods
+    0,                             // tp_members
+    AerospikeKey_Type_GetSet,      // tp_getset
+    0,                             // tp_base
+    0,                             // tp_dict
+    0,                             // tp_descr_get
+    0,                             // tp_descr_set
+    0,                             // tp_dictoffset
+    0,                             // tp_init
+    0,                             // tp_alloc
+    AerospikeKey_Type_New,         // tp_new
+    0,                             // tp_free
+    0,                             // tp_is_gc
+    0                              // tp_bases
+};
+
+/*******************************************************************************
+ * PUBLIC FUNCTIONS
+ ******************************************************************************/
+
+PyTypeObject *AerospikeKey_Ready()
+{
+    return PyType_Ready(&AerospikeKey_Type) == 0 ? &AerospikeKey_Type : NULL;
+}
+
+bool AerospikeKey_Check(PyObject *py_obj)
+{
+    return Py_TYPE(py_obj) == &AerospikeKey_Type;
+}
+
+void AerospikeKey_Borrow(PyObject *py_obj, as_key *key)
+{
+    AerospikeKey *self = (AerospikeKey *)py_obj;
+
+    *key = self->key;
+    if (!self->key.valuep) {
+        return;
+    }
+
+    // The value stays owned by the aerospike.Key.
+    key->valuep = &key->value;
+    as_val *val = (as_val *)key->valuep;
+    if (as_val_type(val) == AS_STRING) {
+        ((as_string *)val)->free = false;
+    }
+    else if (as_val_type(val) == AS_BYTES) {
+        ((as_bytes *)val)->free = false;
+    }
+}
@@ -0,0 +1,914 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <pythread.h>
+#include <stdbool.h>
+#include <string.h>
+#include <time.h>
+
+#include <aerospike/as_atomic.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_log_macros.h>
+#include <aerospike/as_msgpack.h>
+#include <aerospike/as_random.h>
+#include <aerospike/as_string.h>
+#include <citrusleaf/alloc.h>
+#include <citrusleaf/cf_clock.h>
+
+#include "exceptions.h"
+#include "profile.h"
+
+// NULL while profiling is disabled, which is all the calls check.
+static PyObject *py_profile_hook = NULL;
+
+// NULL while tracing is disabled. A call is traced if a random 32 bit number
+// is below the bound, so a bound of 2^32 traces every call.
+static PyObject *py_trace_hook = NULL;
+static uint64_t trace_sample_bound = 0;
+
+// The call profiled by each thread, so expression conversion deep inside the
+// policy conversion can be counted separately.
+static Py_tss_t current_call = Py_tss_NEEDS_INIT;
+
+static const char *segment_names[PROFILE_SEGMENTS] = {
+    "args", "policy", "expressions", "network", "result"};
+
+/*
+ * Sets name to a string in py_dict, or None if the string is empty.
+ */
+static void set_str_item(PyObject *py_dict, const char *name, const char *value)
+{
+    PyObject *py_value = NULL;
+    if (value[0]) {
+        py_value = PyUnicode_FromString(value);
+    }
+    else {
+        Py_INCREF(Py_None);
+        py_value = Py_None;
+    }
+    PyDict_SetItemString(py_dict, name, py_value);
+    Py_DECREF(py_value);
+}
+
+/*
+ * Returns the code of an AerospikeError, the call's status if there is no
+ * exception, or None for other exceptions.
+ */
+static PyObject *result_code(profile_call *call, PyObject **py_type,
+                             PyObject **py_value, PyObject **py_traceback)
+{
+    if (!*py_type) {
+        return PyLong_FromLong(call->status);
+    }
+
+    // The client raises most errors with an args tuple as the value.
+    PyErr_NormalizeException(py_type, py_value, py_traceback);
+    PyObject *py_code = NULL;
+    if (*py_value && PyObject_HasAttrString(*py_value, "code")) {
+        py_code = PyObject_GetAttrString(*py_value, "code");
+    }
+    if (!py_code || !PyLong_Check(py_code)) {
+        PyErr_Clear();
+        Py_XDECREF(py_code);
+        Py_INCREF(Py_None);
+        py_code = Py_None;
+    }
+    return py_code;
+}
+
+/*
+ * Returns the number of memory blocks allocated by the interpreter, or -1.
+ */
+static Py_ssize_t allocated_blocks()
+{
+    PyObject *py_func = PySys_GetObject("getallocatedblocks");
+    if (!py_func) {
+        return -1;
+    }
+    PyObject *py_blocks = PyObject_CallObject(py_func, NULL);
+    if (!py_blocks) {
+        PyErr_Clear();
+        return -1;
+    }
+    Py_ssize_t blocks = PyLong_AsSsize_t(py_blocks);
+    Py_DECREF(py_blocks);
+    return blocks;
+}
+
+/*
+ * Returns the wall clock time, in nanoseconds since the epoch.
+ */
+static uint64_t wall_clock_ns()
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_REALTIME, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+
+void profile_start(profile_call *call, const char *method,
+                   profile_slow_log *slow_log, profile_metrics *metrics)
+{
+    call->profiled = py_profile_hook != NULL;
+    call->traced = py_trace_hook != NULL &&
+                   (uint64_t)as_random_get_uint32() < trace_sample_bound;
+    call->slow_log = slow_log && slow_log->threshold_ns ? slow_log : NULL;
+    call->metrics =
+        metrics && as_load_uint32(&metrics->enabled) ? metrics : NULL;
+    call->enabled =
+        call->profiled || call->traced || call->slow_log || call->metrics;
+    if (!call->enabled) {
+        return;
+    }
+
+    memset(call->segment_ns, 0, sizeof(call->segment_ns));
+    memset(call->nested_ns, 0, sizeof(call->nested_ns));
+    call->method = method;
+    call->ns[0] = '\0';
+    call->set[0] = '\0';
+    call->status = AEROSPIKE_OK;
+    call->has_digest = false;
+    call->request_bytes = -1;
+    call->response_bytes = -1;
+    // Only the profile hook is given the allocated blocks, which are slow to
+    // count compared to a sampled call.
+    call->allocated_blocks = call->profiled ? allocated_blocks() : -1;
+    call->previous = PyThread_tss_get(&current_call);
+    PyThread_tss_set(&current_call, call);
+    // Counting a call for the metrics needs no wall clock time.
+    call->start_time_ns =
+        call->profiled || call->traced || call->slow_log ? wall_clock_ns() : 0;
+    call->start_ns = cf_getns();
+    call->last_ns = call->start_ns;
+}
+
+void profile_set_key(profile_call *call, as_key *key)
+{
+    if (!call || !call->enabled) {
+        return;
+    }
+    profile_set_namespace(call, key->ns, key->set);
+}
+
+void profile_set_namespace(profile_call *call, const char *ns, const char *set)
+{
+    if (!call || !call->enabled) {
+        return;
+    }
+    as_strncpy(call->ns, ns, sizeof(call->ns));
+    as_strncpy(call->set, set, sizeof(call->set));
+}
+
+void profile_set_status(profile_call *call, as_status status)
+{
+    if (!call || !call->enabled) {
+        return;
+    }
+    call->status = status;
+}
+
+/*
+ * Returns the size of the bin values, as the client would pack them in
+ * lists and maps.
+ */
+static int64_t bins_size(as_serializer *ser, as_bin *bins, uint32_t n,
+                         size_t stride)
+{
+    int64_t size = 0;
+    for (uint32_t i = 0; i < n; i++) {
+        as_bin *bin = (as_bin *)((char *)bins + i * stride);
+        if (bin->valuep) {
+            size += as_serializer_serialize_getsize(ser, (as_val *)bin->valuep);
+        }
+    }
+    return size;
+}
+
+void profile_set_payload(profile_call *call, as_key *key, as_record *request,
+                         as_operations *ops, as_record *response)
+{
+    if (!call || !call->enabled) {
+        return;
+    }
+    bool slow = call->slow_log &&
+                cf_getns() - call->start_ns >= call->slow_log->threshold_ns;
+    if (!call->profiled && !call->traced && !slow) {
+        return;
+    }
+
+    if (key) {
+        as_digest *digest = as_key_digest(key);
+        if (digest) {
+            memcpy(call->digest, digest->value, AS_DIGEST_VALUE_SIZE);
+            call->has_digest = true;
+        }
+    }
+
+    as_serializer ser;
+    as_msgpack_init(&ser);
+    if (request) {
+        call->request_bytes = bins_size(&ser, request->bins.entries,
+                                        request->bins.size, sizeof(as_bin));
+    }
+    else if (ops) {
+        call->request_bytes = bins_size(&ser, &ops->binops.entries[0].bin,
+                                        ops->binops.size, sizeof(as_binop));
+    }
+    if (response) {
+        call->response_bytes = bins_size(&ser, response->bins.entries,
+                                         response->bins.size, sizeof(as_bin));
+    }
+    as_serializer_destroy(&ser);
+}
+
+void profile_mark(profile_call *call, profile_segment segment)
+{
+    if (!call || !call->enabled) {
+        return;
+    }
+
+    uint64_t now = cf_getns();
+    uint64_t elapsed = now - call->last_ns;
+    for (int i = 0; i < PROFILE_SEGMENTS; i++) {
+        uint64_t nested = call->nested_ns[i];
+        if (!nested) {
+            continue;
+        }
+        elapsed -= nested < elapsed ? nested : elapsed;
+        call->segment_ns[i] += nested;
+        call->nested_ns[i] = 0;
+    }
+    call->segment_ns[segment] += elapsed;
+    call->last_ns = now;
+}
+
+uint64_t profile_nested_start(profile_call *call)
+{
+    if (!call || !call->enabled) {
+        return 0;
+    }
+    return cf_getns();
+}
+
+void profile_nested_end(profile_call *call, profile_segment segment,
+                        uint64_t start_ns)
+{
+    if (!call || !call->enabled || !start_ns) {
+        return;
+    }
+    call->nested_ns[segment] += cf_getns() - start_ns;
+}
+
+profile_call *profile_current()
+{
+    if (!PyThread_tss_is_created(&current_call)) {
+        return NULL;
+    }
+    return (profile_call *)PyThread_tss_get(&current_call);
+}
+
+/*
+ * Adds a copy of the timings of a slow call, with its details, to the
+ * client's slow log, replacing the oldest entry once it is full.
+ */
+static void slow_log_add(profile_call *call, PyObject *py_timings)
+{
+    profile_slow_log *slow_log = call->slow_log;
+    PyObject *py_entry = PyDict_Copy(py_timings);
+    if (!py_entry) {
+        PyErr_Clear();
+        return;
+    }
+
+    PyObject *py_field = PyFloat_FromDouble(cf_clock_getabsolute() / 1e3);
+    PyDict_SetItemString(py_entry, "time", py_field);
+    Py_DECREF(py_field);
+    if (call->has_digest) {
+        py_field = PyByteArray_FromStringAndSize((char *)call->digest,
+                                                 AS_DIGEST_VALUE_SIZE);
+    }
+    else {
+        Py_INCREF(Py_None);
+        py_field = Py_None;
+    }
+    PyDict_SetItemString(py_entry, "digest", py_field);
+    Py_DECREF(py_field);
+
+    PyObject *py_entries = slow_log->py_entries;
+    if (PyList_GET_SIZE(py_entries) < slow_log->max_entries) {
+        PyList_Append(py_entries, py_entry);
+        Py_DECREF(py_entry);
+    }
+    else {
+        // Steals the reference to the entry.
+        PyList_SetItem(py_entries, slow_log->next, py_entry);
+    }
+    slow_log->next = (slow_log->next + 1) % slow_log->max_entries;
+
+    if (slow_log->log) {
+        PyObject *py_code = PyDict_GetItemString(py_timings, "result_code");
+        as_log_warn("Slow command %s %s/%s: %.3f ms, network %.3f ms, "
+                    "request %lld bytes, response %lld bytes, result %ld",
+                    call->method, call->ns, call->set,
+                    (call->last_ns - call->start_ns) / 1e6,
+                    call->segment_ns[PROFILE_NETWORK] / 1e6,
+                    (long long)call->request_bytes,
+                    (long long)call->response_bytes,
+                    PyLong_Check(py_code) ? PyLong_AsLong(py_code) : -1L);
+    }
+}
+
+/*
+ * Returns the series of the call, adding it if it is new, or NULL if there
+ * are too many series.
+ */
+static profile_series *metrics_series(profile_metrics *metrics,
+                                      profile_call *call, bool has_result_code,
+                                      as_status result_code)
+{
+    uint32_t start = 0;
+    uint32_t end = as_load_uint32_acq(&metrics->n_series);
+    bool locked = false;
+    profile_series *series = NULL;
+    while (true) {
+        for (uint32_t i = start; i < end; i++) {
+            profile_series *candidate = metrics->series[i];
+            if (candidate->has_result_code == has_result_code &&
+                candidate->result_code == result_code &&
+                !strcmp(candidate->method, call->method) &&
+                !strcmp(candidate->ns, call->ns) &&
+                !strcmp(candidate->set, call->set)) {
+                series = candidate;
+                break;
+            }
+        }
+        if (series || locked) {
+            break;
+        }
+        // Look again under the lock, at the series added in the meantime.
+        pthread_mutex_lock(&metrics->lock);
+        locked = true;
+        start = end;
+        end = metrics->n_series;
+    }
+
+    if (!series && end < PROFILE_METRICS_MAX_SERIES) {
+        series = cf_calloc(1, sizeof(profile_series));
+        if (series) {
+            as_strncpy(series->method, call->method, sizeof(series->method));
+            as_strncpy(series->ns, call->ns, sizeof(series->ns));
+            as_strncpy(series->set, call->set, sizeof(series->set));
+            series->has_result_code = has_result_code;
+            series->result_code = result_code;
+            metrics->series[end] = series;
+            as_store_uint32_rls(&metrics->n_series, end + 1);
+        }
+    }
+    if (locked) {
+        pthread_mutex_unlock(&metrics->lock);
+    }
+    return series;
+}
+
+/*
+ * Counts the call in the client's counters. Only atomic operations, so it
+ * never runs Python code or waits on a scrape.
+ */
+static void metrics_add(profile_call *call, PyObject *py_code,
+                        uint64_t total_ns)
+{
+    profile_metrics *metrics = call->metrics;
+    bool has_result_code = PyLong_Check(py_code);
+    as_status code =
+        has_result_code ? (as_status)PyLong_AsLong(py_code) : AEROSPIKE_OK;
+    profile_series *series =
+        metrics_series(metrics, call, has_result_code, code);
+    if (!series) {
+        as_incr_uint64(&metrics->dropped);
+        return;
+    }
+
+    as_incr_uint64(&series->count);
+    as_add_uint64(&series->total_ns, total_ns);
+    for (int i = 0; i < PROFILE_SEGMENTS; i++) {
+        as_add_uint64(&series->segment_ns[i], call->segment_ns[i]);
+    }
+    uint32_t bucket = 0;
+    uint32_t n_buckets = as_load_uint32(&metrics->n_buckets);
+    while (bucket < n_buckets && total_ns > metrics->bucket_ns[bucket]) {
+        bucket++;
+    }
+    as_incr_uint64(&series->buckets[bucket]);
+}
+
+/*
+ * Calls a hook with the timings, if it is still set. The hook may have been
+ * unset while the call was running.
+ */
+static void call_hook(PyObject *py_hook, PyObject *py_timings)
+{
+    if (!py_hook) {
+        return;
+    }
+    Py_INCREF(py_hook);
+    PyObject *py_result =
+        PyObject_CallFunctionObjArgs(py_hook, py_timings, NULL);
+    if (py_result) {
+        Py_DECREF(py_result);
+    }
+    else {
+        // An error in the hook must not change the outcome of the call.
+        PyErr_WriteUnraisable(py_hook);
+    }
+    Py_DECREF(py_hook);
+}
+
+void profile_end(profile_call *call)
+{
+    if (!call->enabled) {
+        return;
+    }
+
+    profile_mark(call, PROFILE_RESULT);
+    uint64_t total_ns = call->last_ns - call->start_ns;
+    PyThread_tss_set(&current_call, call->previous);
+
+    bool slow = call->slow_log && total_ns >= call->slow_log->threshold_ns;
+    bool hooked = (call->profiled && py_profile_hook) ||
+                  (call->traced && py_trace_hook) || slow;
+    if (!hooked && !call->metrics) {
+        return;
+    }
+
+    // Keep the call's own exception, if any, out of the hooks' way.
+    PyObject *py_type, *py_value, *py_traceback;
+    PyErr_Fetch(&py_type, &py_value, &py_traceback);
+    PyObject *py_code = result_code(call, &py_type, &py_value, &py_traceback);
+
+    if (call->metrics) {
+        metrics_add(call, py_code, total_ns);
+    }
+    if (!hooked) {
+        Py_DECREF(py_code);
+        PyErr_Restore(py_type, py_value, py_traceback);
+        return;
+    }
+
+    Py_ssize_t blocks = call->profiled ? allocated_blocks() : -1;
+
+    PyObject *py_timings = PyDict_New();
+    PyObject *py_field = PyUnicode_FromString(call->method);
+    PyDict_SetItemString(py_timings, "method", py_field);
+    Py_DECREF(py_field);
+    set_str_item(py_timings, "namespace", call->ns);
+    set_str_item(py_timings, "set", call->set);
+    PyDict_SetItemString(py_timings, "result_code", py_code);
+    Py_DECREF(py_code);
+    PyDict_SetItemString(py_timings, "raised", py_type ? Py_True : Py_False);
+    for (int i = 0; i < PROFILE_SEGMENTS; i++) {
+        py_field = PyFloat_FromDouble(call->segment_ns[i] / 1e9);
+        PyDict_SetItemString(py_timings, segment_names[i], py_field);
+        Py_DECREF(py_field);
+    }
+    py_field = PyFloat_FromDouble(total_ns / 1e9);
+    PyDict_SetItemString(py_timings, "total", py_field);
+    Py_DECREF(py_field);
+    if (blocks >= 0 && call->allocated_blocks >= 0) {
+        py_field = PyLong_FromSsize_t(blocks - call->allocated_blocks);
+    }
+    else {
+        Py_INCREF(Py_None);
+        py_field = Py_None;
+    }
+    PyDict_SetItemString(py_timings, "allocated_blocks", py_field);
+    Py_DECREF(py_field);
+    py_field = PyLong_FromUnsignedLongLong(call->start_time_ns);
+    PyDict_SetItemString(py_timings, "start_time_ns", py_field);
+    Py_DECREF(py_field);
+    const char *size_names[] = {"request_bytes", "response_bytes"};
+    int64_t sizes[] = {call->request_bytes, call->response_bytes};
+    for (int i = 0; i < 2; i++) {
+        if (sizes[i] >= 0) {
+            py_field = PyLong_FromLongLong(sizes[i]);
+        }
+        else {
+            Py_INCREF(Py_None);
+            py_field = Py_None;
+        }
+        PyDict_SetItemString(py_timings, size_names[i], py_field);
+        Py_DECREF(py_field);
+    }
+
+    if (slow) {
+        slow_log_add(call, py_timings);
+    }
+    if (call->profiled) {
+        call_hook(py_profile_hook, py_timings);
+    }
+    if (call->traced) {
+        call_hook(py_trace_hook, py_timings);
+    }
+    Py_DECREF(py_timings);
+
+    PyErr_Restore(py_type, py_value, py_traceback);
+}
+
+/**
+ ******************************************************************************************************
+ * Set a function to be called with the timings of each profiled client call
+ *
+ * @param parent                Aerospike module
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns the previous hook, or None.
+ *******************************************************************************************************
+ */
+PyObject *Aerospike_Set_Profile_Hook(PyObject *parent, PyObject *args,
+                                     PyObject *kwds)
+{
+    // Python Function Arguments
+    PyObject *py_hook = NULL;
+
+    // Python Function Keyword Arguments
+    static char *kwlist[] = {"hook", NULL};
+    as_error err;
+    as_error_init(&err);
+
+    // Python Function Argument Parsing
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O:set_profile_hook", kwlist,
+                                    &py_hook) == false) {
+        return NULL;
+    }
+
+    if (py_hook == Py_None) {
+        py_hook = NULL;
+    }
+    else if (!PyCallable_Check(py_hook)) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "Parameter must be a callable or None");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    if (!PyThread_tss_is_created(&current_call) &&
+        PyThread_tss_create(&current_call) != 0) {
+        return PyErr_NoMemory();
+    }
+
+    PyObject *py_previous = py_profile_hook;
+    Py_XINCREF(py_hook);
+    py_profile_hook = py_hook;
+
+    if (!py_previous) {
+        Py_RETURN_NONE;
+    }
+    return py_previous;
+}
+
+/**
+ ******************************************************************************************************
+ * Set a function to be called with the timings of a sample of the client calls
+ *
+ * @param parent                Aerospike module
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns the previous hook, or None.
+ *******************************************************************************************************
+ */
+PyObject *Aerospike_Set_Trace_Hook(PyObject *parent, PyObject *args,
+                                   PyObject *kwds)
+{
+    // Python Function Arguments
+    PyObject *py_hook = NULL;
+    double sample_rate = 1.0;
+
+    // Python Function Keyword Arguments
+    static char *kwlist[] = {"hook", "sample_rate", NULL};
+    as_error err;
+    as_error_init(&err);
+
+    // Python Function Argument Parsing
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|d:set_trace_hook", kwlist,
+                                    &py_hook, &sample_rate) == false) {
+        return NULL;
+    }
+
+    if (py_hook == Py_None) {
+        py_hook = NULL;
+    }
+    else if (!PyCallable_Check(py_hook)) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "Parameter must be a callable or None");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    if (!(sample_rate >= 0.0 && sample_rate <= 1.0)) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "sample_rate must be between 0.0 and 1.0");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    if (!PyThread_tss_is_created(&current_call) &&
+        PyThread_tss_create(&current_call) != 0) {
+        return PyErr_NoMemory();
+    }
+
+    PyObject *py_previous = py_trace_hook;
+    Py_XINCREF(py_hook);
+    py_trace_hook = py_hook;
+    trace_sample_bound = (uint64_t)(sample_rate * 4294967296.0);
+
+    if (!py_previous) {
+        Py_RETURN_NONE;
+    }
+    return py_previous;
+}
+
+bool profile_slow_log_init(profile_slow_log *slow_log, PyObject *py_config)
+{
+    profile_slow_log_destroy(slow_log);
+    slow_log->threshold_ns = 0;
+    slow_log->max_entries = 100;
+    slow_log->next = 0;
+    slow_log->log = false;
+
+    PyObject *py_threshold =
+        PyDict_GetItemString(py_config, "slow_command_threshold_ms");
+    if (!py_threshold) {
+        return true;
+    }
+    double threshold_ms = PyFloat_AsDouble(py_threshold);
+    if (PyErr_Occurred()) {
+        PyErr_Clear();
+        return false;
+    }
+    if (!(threshold_ms >= 0.0)) {
+        return false;
+    }
+
+    PyObject *py_max_entries =
+        PyDict_GetItemString(py_config, "slow_command_max_entries");
+    if (py_max_entries) {
+        long max_entries =
+            PyLong_Check(py_max_entries) ? PyLong_AsLong(py_max_entries) : -1;
+        if (max_entries <= 0 || max_entries > UINT32_MAX) {
+            PyErr_Clear();
+            return false;
+        }
+        slow_log->max_entries = (uint32_t)max_entries;
+    }
+
+    PyObject *py_log = PyDict_GetItemString(py_config, "slow_command_log");
+    if (py_log) {
+        slow_log->log = PyObject_IsTrue(py_log);
+    }
+
+    // Slow calls are timed whether or not a hook is set.
+    if (!PyThread_tss_is_created(&current_call) &&
+        PyThread_tss_create(&current_call) != 0) {
+        return false;
+    }
+
+    slow_log->py_entries = PyList_New(0);
+    if (!slow_log->py_entries) {
+        PyErr_Clear();
+        return false;
+    }
+    // A threshold of 0 logs every call, but must still be non zero here.
+    slow_log->threshold_ns = (uint64_t)(threshold_ms * 1e6);
+    if (!slow_log->threshold_ns) {
+        slow_log->threshold_ns = 1;
+    }
+    return true;
+}
+
+void profile_slow_log_destroy(profile_slow_log *slow_log)
+{
+    slow_log->threshold_ns = 0;
+    Py_CLEAR(slow_log->py_entries);
+}
+
+PyObject *profile_slow_log_entries(profile_slow_log *slow_log, bool clear)
+{
+    if (!slow_log->py_entries) {
+        return PyList_New(0);
+    }
+    PyObject *py_entries = slow_log->py_entries;
+    Py_ssize_t size = PyList_GET_SIZE(py_entries);
+    PyObject *py_result = NULL;
+    if (size < slow_log->max_entries) {
+        py_result = PyList_GetSlice(py_entries, 0, size);
+    }
+    else {
+        PyObject *py_newest = PyList_GetSlice(py_entries, 0, slow_log->next);
+        PyObject *py_oldest = PyList_GetSlice(py_entries, slow_log->next, size);
+        if (py_newest && py_oldest) {
+            py_result = PySequence_Concat(py_oldest, py_newest);
+        }
+        Py_XDECREF(py_newest);
+        Py_XDECREF(py_oldest);
+    }
+
+    if (py_result && clear) {
+        PyList_SetSlice(py_entries, 0, size, NULL);
+        slow_log->next = 0;
+    }
+    return py_result;
+}
+
+bool profile_metrics_enable(profile_metrics **metrics, PyObject *py_buckets)
+{
+    as_error err;
+    as_error_init(&err);
+
+    PyObject *py_seq =
+        PySequence_Fast(py_buckets, "buckets must be a sequence of numbers");
+    if (!py_seq) {
+        return false;
+    }
+    Py_ssize_t n_buckets = PySequence_Fast_GET_SIZE(py_seq);
+    uint64_t bucket_ns[PROFILE_METRICS_MAX_BUCKETS];
+    if (n_buckets > PROFILE_METRICS_MAX_BUCKETS) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "There can be at most %d buckets",
+                        PROFILE_METRICS_MAX_BUCKETS);
+    }
+    for (Py_ssize_t i = 0; i < n_buckets && err.code == AEROSPIKE_OK; i++) {
+        double seconds = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(py_seq, i));
+        if (PyErr_Occurred()) {
+            Py_DECREF(py_seq);
+            return false;
+        }
+        bucket_ns[i] = (uint64_t)(seconds * 1e9);
+        if (!(seconds > 0.0) || (i > 0 && bucket_ns[i] <= bucket_ns[i - 1])) {
+            as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                            "buckets must be positive and increasing");
+        }
+    }
+    Py_DECREF(py_seq);
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception(&err);
+        return false;
+    }
+
+    // Counted calls are timed whether or not a hook is set.
+    if (!PyThread_tss_is_created(&current_call) &&
+        PyThread_tss_create(&current_call) != 0) {
+        PyErr_NoMemory();
+        return false;
+    }
+
+    if (!*metrics) {
+        *metrics = cf_calloc(1, sizeof(profile_metrics));
+        if (!*metrics) {
+            PyErr_NoMemory();
+            return false;
+        }
+        pthread_mutex_init(&(*metrics)->lock, NULL);
+    }
+
+    // Calls still running may count in the old buckets, which is harmless.
+    profile_metrics *m = *metrics;
+    as_store_uint32(&m->enabled, 0);
+    memcpy(m->bucket_ns, bucket_ns, n_buckets * sizeof(uint64_t));
+    as_store_uint32(&m->n_buckets, (uint32_t)n_buckets);
+    uint32_t n_series = as_load_uint32_acq(&m->n_series);
+    for (uint32_t i = 0; i < n_series; i++) {
+        profile_series *series = m->series[i];
+        as_store_uint64(&series->count, 0);
+        as_store_uint64(&series->total_ns, 0);
+        for (int j = 0; j < PROFILE_SEGMENTS; j++) {
+            as_store_uint64(&series->segment_ns[j], 0);
+        }
+        for (int j = 0; j <= PROFILE_METRICS_MAX_BUCKETS; j++) {
+            as_store_uint64(&series->buckets[j], 0);
+        }
+    }
+    as_store_uint64(&m->dropped, 0);
+    as_store_uint32(&m->enabled, 1);
+    return true;
+}
+
+void profile_metrics_disable(profile_metrics *metrics)
+{
+    if (metrics) {
+        as_store_uint32(&metrics->enabled, 0);
+    }
+}
+
+void profile_metrics_destroy(profile_metrics *metrics)
+{
+    if (!metrics) {
+        return;
+    }
+    for (uint32_t i = 0; i < metrics->n_series; i++) {
+        cf_free(metrics->series[i]);
+    }
+    pthread_mutex_destroy(&metrics->lock);
+    cf_free(metrics);
+}
+
+/*
+ * Returns a string, or None if it is empty.
+ */
+static PyObject *str_or_none(const char *value)
+{
+    if (value[0]) {
+        return PyUnicode_FromString(value);
+    }
+    Py_RETURN_NONE;
+}
+
+/*
+ * Returns the counts of a series as a tuple of (method, namespace, set,
+ * result_code, count, [calls per bucket...], total seconds,
+ * (seconds per segment...)).
+ */
+static PyObject *series_to_pyobject(profile_series *series, uint32_t n_buckets)
+{
+    PyObject *py_buckets = PyList_New(n_buckets + 1);
+    PyObject *py_segments = PyTuple_New(PROFILE_SEGMENTS);
+    if (!py_buckets || !py_segments) {
+        Py_XDECREF(py_buckets);
+        Py_XDECREF(py_segments);
+        return NULL;
+    }
+    for (uint32_t i = 0; i <= n_buckets; i++) {
+        PyList_SET_ITEM(
+            py_buckets, i,
+            PyLong_FromUnsignedLongLong(as_load_uint64(&series->buckets[i])));
+    }
+    for (int i = 0; i < PROFILE_SEGMENTS; i++) {
+        PyTuple_SET_ITEM(
+            py_segments, i,
+            PyFloat_FromDouble(as_load_uint64(&series->segment_ns[i]) / 1e9));
+    }
+
+    PyObject *py_code = NULL;
+    if (series->has_result_code) {
+        py_code = PyLong_FromLong(series->result_code);
+    }
+    else {
+        Py_INCREF(Py_None);
+        py_code = Py_None;
+    }
+    return Py_BuildValue("(sNNNKNdN)", series->method, str_or_none(series->ns),
+                         str_or_none(series->set), py_code,
+                         (unsigned long long)as_load_uint64(&series->count),
+                         py_buckets, as_load_uint64(&series->total_ns) / 1e9,
+                         py_segments);
+}
+
+PyObject *profile_metrics_snapshot(profile_metrics *metrics)
+{
+    PyObject *py_series = PyList_New(0);
+    PyObject *py_bounds = PyTuple_New(metrics ? metrics->n_buckets : 0);
+    if (!py_series || !py_bounds) {
+        Py_XDECREF(py_series);
+        Py_XDECREF(py_bounds);
+        return NULL;
+    }
+    if (!metrics) {
+        return Py_BuildValue("{s:N,s:N,s:i}", "buckets", py_bounds, "series",
+                             py_series, "dropped", 0);
+    }
+
+    uint32_t n_buckets = as_load_uint32(&metrics->n_buckets);
+    for (uint32_t i = 0; i < n_buckets; i++) {
+        PyTuple_SET_ITEM(py_bounds, i,
+                         PyFloat_FromDouble(metrics->bucket_ns[i] / 1e9));
+    }
+    uint32_t n_series = as_load_uint32_acq(&metrics->n_series);
+    for (uint32_t i = 0; i < n_series; i++) {
+        PyObject *py_item = series_to_pyobject(metrics->series[i], n_buckets);
+        if (!py_item || PyList_Append(py_series, py_item) != 0) {
+            Py_XDECREF(py_item);
+            Py_DECREF(py_series);
+            Py_DECREF(py_bounds);
+            return NULL;
+        }
+        Py_DECREF(py_item);
+    }
+    return Py_BuildValue("{s:N,s:N,s:K}", "buckets", py_bounds, "series",
+                         py_series, "dropped",
+                         (unsigned long long)as_load_uint64(&metrics->dropped));
+}
@@ -86,5 +86,5 @@ CLEANUP:
         return NULL;
     }
 
-    return PyLong_FromUnsignedLongLong(query_id);
+    return job_id_to_pyobject(self->client, query_id, "query");
 }
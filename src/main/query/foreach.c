@@ -27,6 +27,7 @@
 #include "exceptions.h"
 #include "query.h"
 #include "policy.h"
+#include "profile.h"
 
 // Struct for Python User-Data for the Callback
 typedef struct {
@@ -134,11 +135,17 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
     // Python Function Keyword Arguments
     static char *kwlist[] = {"callback", "policy", "options", NULL};
 
+    profile_call call;
+    profile_start(&call, "query.foreach", &self->client->slow_log,
+                  self->client->metrics);
+    profile_set_namespace(&call, self->query.ns, self->query.set);
+
     // Python Function Argument Parsing
     if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OO:foreach", kwlist,
                                     &py_callback, &py_policy,
                                     &py_options) == false) {
         as_query_destroy(&self->query);
+        profile_end(&call);
         return NULL;
     }
 
@@ -200,10 +207,12 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
             }
         }
     }
+    profile_mark(&call, PROFILE_POLICY);
 
     if (set_query_options(&err, py_options, &self->query) != AEROSPIKE_OK) {
         goto CLEANUP;
     }
+    profile_mark(&call, PROFILE_ARGS);
 
     Py_BEGIN_ALLOW_THREADS
 
@@ -227,6 +236,7 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
     }
 
     Py_END_ALLOW_THREADS
+    profile_mark(&call, PROFILE_NETWORK);
 
     if (data.error.code != AEROSPIKE_OK) {
         as_error_update(&data.error, data.error.code, NULL);
@@ -244,24 +254,14 @@ CLEANUP:
     self->query.apply.arglist = NULL;
 
     if (err.code != AEROSPIKE_OK || data.error.code != AEROSPIKE_OK) {
-        PyObject *py_err = NULL;
-        PyObject *exception_type = NULL;
-        if (err.code != AEROSPIKE_OK) {
-            error_to_pyobject(&err, &py_err);
-            exception_type = raise_exception_old(&err);
-        }
-        if (data.error.code != AEROSPIKE_OK) {
-            error_to_pyobject(&data.error, &py_err);
-            exception_type = raise_exception_old(&data.error);
-        }
-        if (PyObject_HasAttrString(exception_type, "name")) {
-            PyObject_SetAttrString(exception_type, "name", Py_None);
-        }
-        PyErr_SetObject(exception_type, py_err);
-        Py_DECREF(py_err);
+        // An error in the callback takes precedence.
+        as_error *error = data.error.code != AEROSPIKE_OK ? &data.error : &err;
+        raise_exception_base(error, NULL, NULL, NULL, NULL, Py_None);
+        profile_end(&call);
         return NULL;
     }
 
+    profile_end(&call);
     Py_INCREF(Py_None);
     return Py_None;
 }
@@ -28,6 +28,7 @@
 #include "exceptions.h"
 #include "query.h"
 #include "policy.h"
+#include "profile.h"
 
 #undef TRACE
 #define TRACE()
@@ -76,8 +77,14 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
     LocalData data;
     data.client = self->client;
 
+    profile_call call;
+    profile_start(&call, "query.results", &self->client->slow_log,
+                  self->client->metrics);
+    profile_set_namespace(&call, self->query.ns, self->query.set);
+
     if (PyArg_ParseTupleAndKeywords(args, kwds, "|OO:results", kwlist,
                                     &py_policy, &py_options) == false) {
+        profile_end(&call);
         return NULL;
     }
 
@@ -117,6 +124,7 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
     if (set_query_options(&err, py_options, &self->query) != AEROSPIKE_OK) {
         goto CLEANUP;
     }
+    profile_mark(&call, PROFILE_ARGS);
 
     if (py_policy) {
         PyObject *py_partition_filter =
@@ -133,6 +141,7 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
         }
     }
     as_error_reset(&err);
+    profile_mark(&call, PROFILE_POLICY);
 
     py_results = PyList_New(0);
     data.py_results = py_results;
@@ -158,6 +167,7 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
     }
 
     Py_END_ALLOW_THREADS
+    profile_mark(&call, PROFILE_NETWORK);
 
 CLEANUP: /*??trace()*/
     if (exp_list_p) {
@@ -167,6 +177,7 @@ CLEANUP: /*??trace()*/
     if (err.code != AEROSPIKE_OK) {
         Py_XDECREF(py_results);
         raise_exception(&err);
+        profile_end(&call);
         return NULL;
     }
 
@@ -175,5 +186,206 @@ CLEANUP: /*??trace()*/
     }
     self->query.apply.arglist = NULL;
 
+    profile_end(&call);
+    return py_results;
+}
+
+/*
+ * Free what pages() converted for the pages of the query.
+ */
+void AerospikeQuery_Clear_Pages(AerospikeQuery *self)
+{
+    if (self->page_exp_p) {
+        as_exp_destroy(self->page_exp_p);
+        self->page_exp_p = NULL;
+    }
+    if (self->page_ps) {
+        as_partitions_status_release(self->page_ps);
+        self->page_ps = NULL;
+    }
+    memset(&self->page_filter, 0, sizeof(self->page_filter));
+    self->page_filter_pending = false;
+    self->page_policy_p = NULL;
+}
+
+PyObject *AerospikeQuery_Pages(AerospikeQuery *self, PyObject *args,
+                               PyObject *kwds)
+{
+    Py_ssize_t page_size = 0;
+    PyObject *py_policy = NULL;
+    PyObject *py_options = NULL;
+    int columnar = 0;
+    Py_ssize_t prefetch = 0;
+    PyObject *py_max_buffered_records = Py_None;
+    PyObject *py_args = NULL;
+    PyObject *py_pages = NULL;
+
+    static char *kwlist[] = {"page_size", "policy",   "options",
+                             "columnar",  "prefetch", "max_buffered_records",
+                             NULL};
+
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "n|OOpnO:pages", kwlist,
+                                    &page_size, &py_policy, &py_options,
+                                    &columnar, &prefetch,
+                                    &py_max_buffered_records) == false) {
+        return NULL;
+    }
+
+    if (!pages_args_valid(page_size, prefetch, py_max_buffered_records)) {
+        return NULL;
+    }
+
+    as_error err;
+    as_error_init(&err);
+
+    if (!self || !self->client->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
+    }
+
+    if (!self->client->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    // The page state can't be freed while a page is fetched with it.
+    if (self->page_busy) {
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                        "A page of this query is being fetched");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    AerospikeQuery_Clear_Pages(self);
+
+    // Convert the policy once, and keep it and its expressions for every page.
+    as_exp exp_list;
+    pyobject_to_policy_query(
+        self->client, &err, py_policy, &self->page_policy, &self->page_policy_p,
+        &self->client->as->config.policies.query, &exp_list, &self->page_exp_p);
+    if (err.code != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
+    if (set_query_options(&err, py_options, &self->query) != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
+    if (py_policy && py_policy != Py_None) {
+        PyObject *py_partition_filter =
+            PyDict_GetItemString(py_policy, "partition_filter");
+        if (py_partition_filter) {
+            if (convert_partition_filter(self->client, py_partition_filter,
+                                         &self->page_filter, &self->page_ps,
+                                         &err) != AEROSPIKE_OK) {
+                goto CLEANUP;
+            }
+            if (self->page_ps) {
+                as_partition_filter_set_partitions(&self->page_filter,
+                                                   self->page_ps);
+            }
+            // Only the first page uses the filter. The query then keeps the
+            // partition status for the next pages.
+            self->page_filter_pending = true;
+        }
+    }
+
+    self->query.max_records = page_size;
+    as_query_set_paginate(&self->query, true);
+
+    py_args = Py_BuildValue("(OnO)", columnar ? Py_True : Py_False, prefetch,
+                            py_max_buffered_records);
+    if (py_args) {
+        py_pages = call_helper_function((PyObject *)self,
+                                        "aerospike_helpers.pagination",
+                                        "_pages", py_args, NULL);
+        Py_DECREF(py_args);
+    }
+
+CLEANUP:
+    if (err.code != AEROSPIKE_OK) {
+        AerospikeQuery_Clear_Pages(self);
+        raise_exception(&err);
+        return NULL;
+    }
+
+    return py_pages;
+}
+
+PyObject *AerospikeQuery_Next_Page(AerospikeQuery *self)
+{
+    PyObject *py_results = NULL;
+
+    LocalData data;
+    data.client = self->client;
+
+    profile_call call;
+    profile_start(&call, "query.pages", &self->client->slow_log,
+                  self->client->metrics);
+    profile_set_namespace(&call, self->query.ns, self->query.set);
+
+    as_error err;
+    as_error_init(&err);
+
+    if (!self || !self->client->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
+    }
+
+    if (!self->client->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    if (!self->page_policy_p) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "pages() must be called before the next page");
+        goto CLEANUP;
+    }
+
+    if (self->page_busy) {
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                        "A page of this query is being fetched");
+        goto CLEANUP;
+    }
+
+    profile_mark(&call, PROFILE_POLICY);
+
+    py_results = PyList_New(0);
+    data.py_results = py_results;
+    bool use_filter = self->page_filter_pending;
+    self->page_busy = true;
+
+    Py_BEGIN_ALLOW_THREADS
+
+    if (use_filter) {
+        aerospike_query_partitions(self->client->as, &err, self->page_policy_p,
+                                   &self->query, &self->page_filter,
+                                   each_result, &data);
+    }
+    else {
+        aerospike_query_foreach(self->client->as, &err, self->page_policy_p,
+                                &self->query, each_result, &data);
+    }
+
+    Py_END_ALLOW_THREADS
+    profile_mark(&call, PROFILE_NETWORK);
+
+    self->page_busy = false;
+    if (use_filter && err.code == AEROSPIKE_OK) {
+        self->page_filter_pending = false;
+    }
+
+CLEANUP:
+    if (err.code != AEROSPIKE_OK) {
+        Py_XDECREF(py_results);
+        raise_exception(&err);
+        profile_end(&call);
+        return NULL;
+    }
+
+    profile_end(&call);
     return py_results;
 }
@@ -63,10 +63,9 @@ Set a where predicate for the query, without which the query will behave similar
 The predicate is produced by one of the aerospike.predicates methods equals() and between(). \
 The list cdt_ctx is produced by one of the aerospike_helpers.cdt_ctx methods");
 
-PyDoc_STRVAR(execute_background_doc,
-             "execute_background([policy]) -> list of (key, meta, bins)\n\
+PyDoc_STRVAR(execute_background_doc, "execute_background([policy]) -> Job\n\
 \n\
-Buffer the records resulting from the query, and return them as a list of records.");
+Apply the query's UDF or write operations to the matched records in the background.");
 
 PyDoc_STRVAR(paginate_doc, "paginate()\n\
 \n\
@@ -77,6 +76,13 @@ PyDoc_STRVAR(is_done_doc, "is_done() -> bool\n\
 If using query pagination, did the previous paginated query with this query instance \
 return all records?");
 
+PyDoc_STRVAR(
+    pages_doc,
+    "pages(page_size[, policy[, options]], columnar=False, prefetch=0, max_buffered_records=None) -> generator\n\
+\n\
+Paginate the query and return a generator that yields its records one page at a time. \
+The policy is converted once and used for every page.");
+
 PyDoc_STRVAR(get_parts_doc,
              "get_parts() -> {int: (int, bool, bool, bytearray[20]), ...}\n\
 \n\
@@ -117,6 +123,11 @@ static PyMethodDef AerospikeQuery_Type_Methods[] = {
     {"get_partitions_status", (PyCFunction)AerospikeQuery_Get_Partitions_status,
      METH_NOARGS, get_parts_doc},
 
+    {"pages", (PyCFunction)AerospikeQuery_Pages, METH_VARARGS | METH_KEYWORDS,
+     pages_doc},
+
+    {"_next_page", (PyCFunction)AerospikeQuery_Next_Page, METH_NOARGS, NULL},
+
     {NULL}};
 
 /*******************************************************************************
@@ -236,6 +247,7 @@ static void AerospikeQuery_Type_Dealloc(AerospikeQuery *self)
         Py_XDECREF(self->u_objs.ob[i]);
     }
 
+    AerospikeQuery_Clear_Pages(self);
     as_query_destroy(&self->query);
 
     if (self->unicodeStrVector != NULL) {
@@ -86,5 +86,5 @@ CLEANUP:
         return NULL;
     }
 
-    return PyLong_FromUnsignedLongLong(scan_id);
+    return job_id_to_pyobject(self->client, scan_id, "scan");
 }
@@ -27,6 +27,7 @@
 #include "exceptions.h"
 #include "scan.h"
 #include "policy.h"
+#include "profile.h"
 
 // Struct for Python User-Data for the Callback
 typedef struct {
@@ -146,10 +147,16 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
     // Python Function Keyword Arguments
     static char *kwlist[] = {"callback", "policy", "options", "nodename", NULL};
 
+    profile_call call;
+    profile_start(&call, "scan.foreach", &self->client->slow_log,
+                  self->client->metrics);
+    profile_set_namespace(&call, self->scan.ns, self->scan.set);
+
     // Python Function Argument Parsing
     if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OOO:foreach", kwlist,
                                     &py_callback, &py_policy, &py_options,
                                     &py_nodename) == false) {
+        profile_end(&call);
         return NULL;
     }
 
@@ -195,6 +202,7 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
         }
     }
     as_error_reset(&data.error);
+    profile_mark(&call, PROFILE_POLICY);
 
     if (py_options && PyDict_Check(py_options)) {
         set_scan_options(&data.error, &self->scan, py_options);
@@ -222,6 +230,7 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
             goto CLEANUP;
         }
     }
+    profile_mark(&call, PROFILE_ARGS);
 
     // We are spawning multiple threads
     Py_BEGIN_ALLOW_THREADS
@@ -247,6 +256,7 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
     }
     // We are done using multiple threads
     Py_END_ALLOW_THREADS
+    profile_mark(&call, PROFILE_NETWORK);
 
     if (data.error.code != AEROSPIKE_OK) {
         goto CLEANUP;
@@ -263,9 +273,11 @@ CLEANUP:
 
     if (data.error.code != AEROSPIKE_OK) {
         raise_exception(&data.error);
+        profile_end(&call);
         return NULL;
     }
 
+    profile_end(&call);
     Py_INCREF(Py_None);
     return Py_None;
 }
@@ -27,6 +27,7 @@
 #include "conversions.h"
 #include "exceptions.h"
 #include "policy.h"
+#include "profile.h"
 #include "scan.h"
 
 #undef TRACE
@@ -92,8 +93,14 @@ PyObject *AerospikeScan_Results(AerospikeScan *self, PyObject *args,
     as_partition_filter *partition_filter_p = NULL;
     as_partitions_status *ps = NULL;
 
+    profile_call call;
+    profile_start(&call, "scan.results", &self->client->slow_log,
+                  self->client->metrics);
+    profile_set_namespace(&call, self->scan.ns, self->scan.set);
+
     if (PyArg_ParseTupleAndKeywords(args, kwds, "|OO:results", kwlist,
                                     &py_policy, &py_nodename) == false) {
+        profile_end(&call);
         return NULL;
     }
 
@@ -131,6 +138,7 @@ PyObject *AerospikeScan_Results(AerospikeScan *self, PyObject *args,
         }
     }
     as_error_reset(&err);
+    profile_mark(&call, PROFILE_POLICY);
 
     /*
 	 * If the user specified a nodename, validate and convert it to a char*
@@ -155,6 +163,7 @@ PyObject *AerospikeScan_Results(AerospikeScan *self, PyObject *args,
             goto CLEANUP;
         }
     }
+    profile_mark(&call, PROFILE_ARGS);
 
     py_results = PyList_New(0);
     data.py_results = py_results;
@@ -182,6 +191,7 @@ PyObject *AerospikeScan_Results(AerospikeScan *self, PyObject *args,
     }
 
     Py_END_ALLOW_THREADS
+    profile_mark(&call, PROFILE_NETWORK);
 
 CLEANUP:
 
@@ -194,8 +204,204 @@ CLEANUP:
     if (err.code != AEROSPIKE_OK) {
         Py_XDECREF(py_results);
         raise_exception(&err);
+        profile_end(&call);
+        return NULL;
+    }
+
+    profile_end(&call);
+    return py_results;
+}
+
+/*
+ * Free what pages() converted for the pages of the scan.
+ */
+void AerospikeScan_Clear_Pages(AerospikeScan *self)
+{
+    if (self->page_exp_p) {
+        as_exp_destroy(self->page_exp_p);
+        self->page_exp_p = NULL;
+    }
+    if (self->page_ps) {
+        as_partitions_status_release(self->page_ps);
+        self->page_ps = NULL;
+    }
+    memset(&self->page_filter, 0, sizeof(self->page_filter));
+    self->page_filter_pending = false;
+    self->page_policy_p = NULL;
+}
+
+PyObject *AerospikeScan_Pages(AerospikeScan *self, PyObject *args,
+                              PyObject *kwds)
+{
+    Py_ssize_t page_size = 0;
+    PyObject *py_policy = NULL;
+    int columnar = 0;
+    Py_ssize_t prefetch = 0;
+    PyObject *py_max_buffered_records = Py_None;
+    PyObject *py_args = NULL;
+    PyObject *py_pages = NULL;
+
+    static char *kwlist[] = {
+        "page_size", "policy", "columnar", "prefetch", "max_buffered_records",
+        NULL};
+
+    if (PyArg_ParseTupleAndKeywords(
+            args, kwds, "n|OpnO:pages", kwlist, &page_size, &py_policy,
+            &columnar, &prefetch, &py_max_buffered_records) == false) {
+        return NULL;
+    }
+
+    if (!pages_args_valid(page_size, prefetch, py_max_buffered_records)) {
+        return NULL;
+    }
+
+    as_error err;
+    as_error_init(&err);
+
+    if (!self || !self->client->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
+    }
+
+    if (!self->client->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    // The page state can't be freed while a page is fetched with it.
+    if (self->page_busy) {
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                        "A page of this scan is being fetched");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    AerospikeScan_Clear_Pages(self);
+
+    // Convert the policy once, and keep it and its expressions for every page.
+    as_exp exp_list;
+    pyobject_to_policy_scan(
+        self->client, &err, py_policy, &self->page_policy, &self->page_policy_p,
+        &self->client->as->config.policies.scan, &exp_list, &self->page_exp_p);
+    if (err.code != AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
+    if (py_policy && py_policy != Py_None) {
+        PyObject *py_partition_filter =
+            PyDict_GetItemString(py_policy, "partition_filter");
+        if (py_partition_filter) {
+            if (convert_partition_filter(self->client, py_partition_filter,
+                                         &self->page_filter, &self->page_ps,
+                                         &err) != AEROSPIKE_OK) {
+                goto CLEANUP;
+            }
+            if (self->page_ps) {
+                as_partition_filter_set_partitions(&self->page_filter,
+                                                   self->page_ps);
+            }
+            // Only the first page uses the filter. The scan then keeps the
+            // partition status for the next pages.
+            self->page_filter_pending = true;
+        }
+    }
+
+    self->page_policy_p->max_records = page_size;
+    as_scan_set_paginate(&self->scan, true);
+
+    py_args = Py_BuildValue("(OnO)", columnar ? Py_True : Py_False, prefetch,
+                            py_max_buffered_records);
+    if (py_args) {
+        py_pages = call_helper_function((PyObject *)self,
+                                        "aerospike_helpers.pagination",
+                                        "_pages", py_args, NULL);
+        Py_DECREF(py_args);
+    }
+
+CLEANUP:
+    if (err.code != AEROSPIKE_OK) {
+        AerospikeScan_Clear_Pages(self);
+        raise_exception(&err);
+        return NULL;
+    }
+
+    return py_pages;
+}
+
+PyObject *AerospikeScan_Next_Page(AerospikeScan *self)
+{
+    PyObject *py_results = NULL;
+
+    LocalData data;
+    data.client = self->client;
+
+    profile_call call;
+    profile_start(&call, "scan.pages", &self->client->slow_log,
+                  self->client->metrics);
+    profile_set_namespace(&call, self->scan.ns, self->scan.set);
+
+    as_error err;
+    as_error_init(&err);
+
+    if (!self || !self->client->as) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid aerospike object");
+        goto CLEANUP;
+    }
+
+    if (!self->client->is_conn_16) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+
+    if (!self->page_policy_p) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "pages() must be called before the next page");
+        goto CLEANUP;
+    }
+
+    if (self->page_busy) {
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                        "A page of this scan is being fetched");
+        goto CLEANUP;
+    }
+
+    profile_mark(&call, PROFILE_POLICY);
+
+    py_results = PyList_New(0);
+    data.py_results = py_results;
+    bool use_filter = self->page_filter_pending;
+    self->page_busy = true;
+
+    Py_BEGIN_ALLOW_THREADS
+
+    if (use_filter) {
+        aerospike_scan_partitions(self->client->as, &err, self->page_policy_p,
+                                  &self->scan, &self->page_filter, each_result,
+                                  &data);
+    }
+    else {
+        aerospike_scan_foreach(self->client->as, &err, self->page_policy_p,
+                               &self->scan, each_result, &data);
+    }
+
+    Py_END_ALLOW_THREADS
+    profile_mark(&call, PROFILE_NETWORK);
+
+    self->page_busy = false;
+    if (use_filter && err.code == AEROSPIKE_OK) {
+        self->page_filter_pending = false;
+    }
+
+CLEANUP:
+    if (err.code != AEROSPIKE_OK) {
+        Py_XDECREF(py_results);
+        raise_exception(&err);
+        profile_end(&call);
         return NULL;
     }
 
+    profile_end(&call);
     return py_results;
 }
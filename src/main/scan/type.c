@@ -58,6 +58,13 @@ PyDoc_STRVAR(is_done_doc, "is_done() -> bool\n\
 \n\
 Gets the status of scan");
 
+PyDoc_STRVAR(
+    pages_doc,
+    "pages(page_size[, policy], columnar=False, prefetch=0, max_buffered_records=None) -> generator\n\
+\n\
+Paginate the scan and return a generator that yields its records one page at a time. \
+The policy is converted once and used for every page.");
+
 PyDoc_STRVAR(get_parts_doc,
              "get_parts() -> {int: (int, bool, bool, bytearray[20]), ...}\n\
 \n\
@@ -97,6 +104,11 @@ static PyMethodDef AerospikeScan_Type_Methods[] = {
     {"get_partitions_status", (PyCFunction)AerospikeScan_Get_Partitions_status,
      METH_NOARGS, get_parts_doc},
 
+    {"pages", (PyCFunction)AerospikeScan_Pages, METH_VARARGS | METH_KEYWORDS,
+     pages_doc},
+
+    {"_next_page", (PyCFunction)AerospikeScan_Next_Page, METH_NOARGS, NULL},
+
     {NULL}};
 
 /*******************************************************************************
@@ -166,6 +178,7 @@ static int AerospikeScan_Type_Init(AerospikeScan *self, PyObject *args,
 
 static void AerospikeScan_Type_Dealloc(AerospikeScan *self)
 {
+    AerospikeScan_Clear_Pages(self);
     as_scan_destroy(&self->scan);
 
     if (self->unicodeStrVector != NULL) {
@@ -16,6 +16,7 @@ class AerospikeStatus(object):
     AEROSPIKE_ERR_RECORD_NOT_FOUND = 2
     AEROSPIKE_ERR_RECORD_GENERATION = 3
     AEROSPIKE_ERR_REQUEST_INVALID = 4
+    AEROSPIKE_ERR_RECORD_EXISTS = 5
     AEROSPIKE_CLUSTER_ERROR = 11
     AEROSPIKE_ERR_BIN_INCOMPATIBLE_TYPE = 12
     AEROSPIKE_ERR_NAMESPACE_NOT_FOUND = 20
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.admin_sync import admin_sync
+from .test_base_class import TestBaseClass
+
+
+class FakeClient(object):
+    """Keeps users and roles like a cluster would, and records the admin commands sent to it."""
+
+    def __init__(self, users, roles):
+        self.users = users
+        self.roles = roles
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def record(self, *call):
+        with self.lock:
+            self.calls.append(call)
+
+    def admin_query_users_info(self, policy=None):
+        self.record("admin_query_users_info", policy)
+        return {
+            name: {"roles": list(roles), "read_info": 0, "write_info": 0, "conns_in_use": 0}
+            for name, roles in self.users.items()
+        }
+
+    def admin_get_roles(self, policy=None):
+        self.record("admin_get_roles", policy)
+        return {name: dict(role) for name, role in self.roles.items()}
+
+    def __getattr__(self, name):
+        if not name.startswith("admin_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.record(name, *args, *sorted(kwargs.items()))
+
+
+def privilege(code, ns="", set_name=""):
+    return {"code": code, "ns": ns, "set": set_name}
+
+
+@pytest.fixture
+def client():
+    return FakeClient(
+        users={"admin": ["user-admin"], "alice": ["read"], "bob": ["reporting", "read"], "old": ["read"]},
+        roles={
+            "read": {
+                "privileges": [privilege(aerospike.PRIV_READ)],
+                "whitelist": [],
+                "read_quota": 0,
+                "write_quota": 0,
+            },
+            "reporting": {
+                "privileges": [privilege(aerospike.PRIV_READ, "test")],
+                "whitelist": ["10.0.0.0/8"],
+                "read_quota": 100,
+                "write_quota": 0,
+            },
+            "stale": {"privileges": [], "whitelist": [], "read_quota": 0, "write_quota": 0},
+        },
+    )
+
+
+STATE = {
+    "roles": {"reporting": {"privileges": [{"code": aerospike.PRIV_READ, "ns": "test"}], "whitelist": ["10.0.0.0/8"]}},
+    "users": {"alice": {"roles": ["read"]}, "bob": {"password": "secret", "roles": ["read", "reporting"]}},
+}
+
+
+class TestAdminSync(object):
+    def test_nothing_to_change_costs_two_reads(self, client):
+        changes = admin_sync(client, STATE)
+        assert client.calls == [("admin_query_users_info", None), ("admin_get_roles", None)]
+        assert changes == {
+            "roles_created": [],
+            "roles_updated": [],
+            "roles_dropped": [],
+            "users_created": [],
+            "users_updated": [],
+            "users_dropped": [],
+        }
+
+    def test_changes(self, client):
+        state = {
+            "roles": {
+                "reporting": {
+                    "privileges": [{"code": aerospike.PRIV_READ, "ns": "test", "set": "demo"}],
+                    "whitelist": [],
+                    "read_quota": 50,
+                },
+                "writer": {"privileges": [{"code": aerospike.PRIV_WRITE, "ns": "test"}], "write_quota": 10},
+            },
+            "users": {
+                "alice": {"roles": ["read", "writer"]},
+                "bob": {"roles": ["reporting"]},
+                "carol": {"password": "secret", "roles": ["writer"]},
+            },
+        }
+        changes = admin_sync(client, state)
+        assert changes["roles_created"] == ["writer"]
+        assert changes["roles_updated"] == ["reporting"]
+        assert changes["users_created"] == ["carol"]
+        assert changes["users_updated"] == ["alice", "bob"]
+        assert changes["users_dropped"] == changes["roles_dropped"] == []
+
+        commands = client.calls[2:]
+        # Roles are created and changed before the users are.
+        assert {call[0] for call in commands[:5]} <= {
+            "admin_create_role",
+            "admin_grant_privileges",
+            "admin_revoke_privileges",
+            "admin_set_whitelist",
+            "admin_set_quotas",
+        }
+        assert sorted(commands) == sorted(
+            [
+                ("admin_create_role", "writer", [privilege(aerospike.PRIV_WRITE, "test")], ("write_quota", 10)),
+                ("admin_grant_privileges", "reporting", [privilege(aerospike.PRIV_READ, "test", "demo")]),
+                ("admin_revoke_privileges", "reporting", [privilege(aerospike.PRIV_READ, "test")]),
+                ("admin_set_whitelist", "reporting", None),
+                ("admin_set_quotas", "reporting", 50, 0),
+                ("admin_grant_roles", "alice", ["writer"]),
+                ("admin_revoke_roles", "bob", ["read"]),
+                ("admin_create_user", "carol", "secret", ["writer"]),
+            ]
+        )
+
+    def test_drop(self, client):
+        changes = admin_sync(client, STATE, drop=True)
+        assert changes["users_dropped"] == ["old"]
+        # Predefined roles are never dropped.
+        assert changes["roles_dropped"] == ["stale"]
+        assert client.calls[2:] == [("admin_drop_user", "old"), ("admin_drop_role", "stale")]
+
+    def test_drop_keeps_the_current_and_builtin_users(self, client):
+        changes = admin_sync(client, STATE, drop=True, current_user="old")
+        assert changes["users_dropped"] == []
+        assert client.calls[2:] == [("admin_drop_role", "stale")]
+
+    def test_dry_run(self, client):
+        changes = admin_sync(client, {"users": {"dave": {"password": "secret", "roles": []}}}, dry_run=True)
+        assert changes["users_created"] == ["dave"]
+        assert len(client.calls) == 2
+
+    def test_policy(self, client):
+        policy = {"timeout": 1000}
+        admin_sync(client, {"users": {"alice": {"roles": []}}}, policy, max_concurrent=1)
+        assert client.calls == [
+            ("admin_query_users_info", policy),
+            ("admin_get_roles", policy),
+            ("admin_revoke_roles", "alice", ["read"], ("policy", policy)),
+        ]
+
+    def test_neg_new_user_without_password(self, client):
+        with pytest.raises(e.ParamError):
+            admin_sync(client, {"roles": {"new": {}}, "users": {"dave": {"roles": []}}})
+        assert len(client.calls) == 2
+
+    @pytest.mark.parametrize(
+        "state",
+        [
+            [],
+            {"groups": {}},
+            {"roles": []},
+            {"roles": {"read": {}}},
+            {"roles": {"new": {"quota": 1}}},
+            {"roles": {"new": {"privileges": [{"ns": "test"}]}}},
+            {"users": {"dave": {"password": "secret", "roles": "read"}}},
+            {"users": {"dave": ["read"]}},
+        ],
+    )
+    def test_neg_invalid_state(self, client, state):
+        with pytest.raises(e.ParamError):
+            admin_sync(client, state)
+        assert client.calls == []
+
+
+class TestAdminSyncCluster(TestBaseClass):
+
+    config = TestBaseClass.get_connection_config()
+
+    pytestmark = pytest.mark.skipif(
+        not TestBaseClass.auth_in_use(), reason="No user specified, may be not secured cluster."
+    )
+
+    def setup_method(self, method):
+        config = self.config
+        self.client = aerospike.client(config).connect(config["user"], config["password"])
+
+    def teardown_method(self, method):
+        try:
+            self.client.admin_drop_user("sync-test-user")
+        except Exception:
+            pass
+        try:
+            self.client.admin_drop_role("sync-test-role")
+        except Exception:
+            pass
+        self.client.close()
+
+    def test_admin_sync(self):
+        state = {
+            "roles": {"sync-test-role": {"privileges": [{"code": aerospike.PRIV_READ, "ns": "test"}]}},
+            "users": {"sync-test-user": {"password": "sync-test-password", "roles": ["sync-test-role"]}},
+        }
+        changes = self.client.admin_sync(state)
+        assert changes["roles_created"] == ["sync-test-role"]
+        assert changes["users_created"] == ["sync-test-user"]
+        time.sleep(1)
+
+        assert self.client.admin_query_user_info("sync-test-user")["roles"] == ["sync-test-role"]
+        assert not any(self.client.admin_sync(state).values())
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.batch.bulk_loader import BulkLoader, LoaderStats
+from .test_base_class import TestBaseClass
+from .as_status_codes import AerospikeStatus
+
+
+class BusyClient:
+    """Passes batch writes to a client, failing the first ``busy_count`` writes of each of ``busy_keys`` as busy."""
+
+    def __init__(self, client, busy_keys, busy_count):
+        self.client = client
+        self.busy_keys = busy_keys
+        self.busy_count = busy_count
+        # Key to the times it was written.
+        self.attempts = {key: [] for key in busy_keys}
+
+    def batch_write(self, batch_records, policy=None):
+        self.client.batch_write(batch_records, policy)
+        for record in batch_records.batch_records:
+            if record.key in self.attempts:
+                attempts = self.attempts[record.key]
+                attempts.append(time.monotonic())
+                if len(attempts) <= self.busy_count:
+                    record.result = e.RecordBusy.code
+
+
+class TestBulkLoader(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        if self.server_version < [6, 0]:
+            pytest.mark.xfail(reason="Servers older than 6.0 do not support batch writes.")
+            pytest.xfail()
+
+        self.record_count = 250
+        self.keys = [("test", "demo", i) for i in range(self.record_count)]
+
+        def teardown():
+            for key in self.keys:
+                try:
+                    as_connection.remove(key)
+                except e.RecordNotFound:
+                    pass
+
+        request.addfinalizer(teardown)
+
+    def test_load_user_keys(self):
+        loader = BulkLoader(self.as_connection, "test", "demo", batch_size=16, max_in_flight=3)
+        stats = loader.load((i, {"id": i, "name": "name%d" % i}) for i in range(self.record_count))
+
+        assert stats.submitted == self.record_count
+        assert stats.written == self.record_count
+        assert stats.failed == 0
+        assert stats.errors == {}
+
+        _, _, bins = self.as_connection.get(("test", "demo", 7))
+        assert bins == {"id": 7, "name": "name7"}
+
+    def test_load_full_key_tuples_with_meta(self):
+        loader = BulkLoader(self.as_connection, "test", "demo", batch_size=100, meta={"ttl": 1000})
+        stats = loader.load((key, {"id": key[2]}) for key in self.keys)
+
+        assert stats.written == self.record_count
+        _, meta = self.as_connection.exists(self.keys[0])
+        assert 0 < meta["ttl"] <= 1000
+
+    def test_load_reports_progress(self):
+        reports = []
+        loader = BulkLoader(
+            self.as_connection, "test", "demo", batch_size=50, report_interval=0, on_report=reports.append
+        )
+        stats = loader.load((i, {"id": i}) for i in range(self.record_count))
+
+        assert reports
+        assert all(isinstance(report, LoaderStats) for report in reports)
+        assert reports[-1].written == stats.written == self.record_count
+
+    def test_load_counts_failed_sub_records(self):
+        self.as_connection.put(self.keys[0], {"id": 0})
+        write_policy = {"exists": aerospike.POLICY_EXISTS_CREATE}
+        loader = BulkLoader(self.as_connection, "test", "demo", batch_size=10, write_policy=write_policy)
+        stats = loader.load((i, {"id": i}) for i in range(10))
+
+        assert stats.written == 9
+        assert stats.failed == 1
+        assert stats.retried == 0
+        assert stats.errors == {AerospikeStatus.AEROSPIKE_ERR_RECORD_EXISTS: 1}
+
+    def test_load_retries_busy_sub_records(self):
+        client = BusyClient(self.as_connection, [self.keys[3]], busy_count=2)
+        loader = BulkLoader(client, "test", "demo", batch_size=4, retry_delay=0.05)
+        stats = loader.load((i, {"id": i}) for i in range(10))
+
+        assert stats.submitted == 10
+        assert stats.written == 10
+        assert stats.failed == 0
+        assert stats.retried == 2
+        assert stats.errors == {e.RecordBusy.code: 2}
+        # Each retry waits longer than the one before it.
+        attempts = client.attempts[self.keys[3]]
+        assert len(attempts) == 3
+        assert attempts[1] - attempts[0] >= 0.05
+        assert attempts[2] - attempts[1] >= 0.1
+
+    def test_load_fails_sub_records_out_of_retries(self):
+        client = BusyClient(self.as_connection, [self.keys[3]], busy_count=10)
+        loader = BulkLoader(client, "test", "demo", batch_size=4, max_retries=2, retry_delay=0)
+        stats = loader.load((i, {"id": i}) for i in range(10))
+
+        assert stats.written == 9
+        assert stats.failed == 1
+        assert stats.retried == 2
+        assert stats.errors == {e.RecordBusy.code: 3}
+        assert len(client.attempts[self.keys[3]]) == 3
+
+    def test_load_stops_reading_while_retries_wait(self):
+        # Every record is busy once, and its retry waits a while, so unread input would pile up as retries.
+        client = BusyClient(self.as_connection, self.keys[:40], busy_count=1)
+        loader = BulkLoader(client, "test", "demo", batch_size=2, max_in_flight=1, retry_delay=0.02)
+        held = []
+
+        def records():
+            for i in range(40):
+                held.append(loader.stats.submitted - loader.stats.written - loader.stats.failed)
+                yield i, {"id": i}
+
+        stats = loader.load(records())
+
+        assert stats.written == 40
+        assert stats.retried == 40
+        assert max(held) <= (2 * 1 + 1) * 2
+
+    def test_load_empty_iterator(self):
+        stats = BulkLoader(self.as_connection, "test", "demo").load(iter(()))
+
+        assert stats.submitted == 0
+        assert stats.written == 0
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"batch_size": 0},
+            {"max_in_flight": 0},
+            {"max_retries": -1},
+            {"retry_delay": -1},
+            {"max_retry_delay": -1},
+        ],
+    )
+    def test_invalid_loader_options(self, kwargs):
+        with pytest.raises(ValueError):
+            BulkLoader(self.as_connection, "test", "demo", **kwargs)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.expressions import base as exp
+
+
+@pytest.mark.parametrize(
+    "kind, value",
+    [
+        ("key", ("test", "demo", "key")),
+        ("key", ("test", "demo", 1)),
+        ("record", {"i": 1, "s": "str", "f": 1.5, "l": [1, [2, 3]], "m": {"a": {"b": 1}}}),
+        ("record", {"blob": bytearray(b"\x00\x01" * 1000)}),
+        ("val", list(range(100))),
+        ("val", {"a": 1, 2: "b"}),
+        ("serializer", (1, "two")),
+    ],
+)
+def test_roundtrip_returns_equal_value(kind, value):
+    result = aerospike._convert_roundtrip(kind, value, 3)
+
+    if kind == "key":
+        assert result[:3] == value
+    else:
+        assert result == value
+
+
+@pytest.mark.parametrize(
+    "kind, value",
+    [
+        ("expressions", exp.Eq(exp.IntBin("a"), 1).compile()),
+        ("policy_read", {"total_timeout": 100}),
+        ("policy_write", {"expressions": exp.Eq(exp.IntBin("a"), 1).compile()}),
+        ("policy_query", {"short_query": True}),
+    ],
+)
+def test_one_way_conversions_return_none(kind, value):
+    assert aerospike._convert_roundtrip(kind, value, 3) is None
+
+
+@pytest.mark.parametrize(
+    "kind, value",
+    [
+        ("unknown", 1),
+        ("key", ("test",)),
+        ("policy_read", {"total_timeout": "100"}),
+    ],
+)
+def test_invalid_roundtrip(kind, value):
+    with pytest.raises(e.ParamError):
+        aerospike._convert_roundtrip(kind, value)
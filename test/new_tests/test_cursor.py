@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from aerospike import exception as e
+from aerospike_helpers import cursor
+from .test_base_class import TestBaseClass
+
+
+def make_partition_status(begin=0, count=4096, done=False):
+    partition_status = {"done": done, "retry": True}
+    for part_id in range(begin, begin + count):
+        started = part_id % 3 == 0
+        digest = bytearray([part_id % 256] * 20) if started else bytearray(20)
+        bval = part_id * 7 if started else 0
+        partition_status[part_id] = (part_id, started, part_id % 2 == 0, digest, bval)
+    return partition_status
+
+
+class TestCursorEncoding(object):
+    @pytest.mark.parametrize("begin, count", [(0, 4096), (1000, 4), (4095, 1)])
+    def test_round_trip(self, begin, count):
+        partition_status = make_partition_status(begin, count)
+        data = cursor.encode_cursor(partition_status)
+
+        assert isinstance(data, bytes)
+        assert cursor.decode_cursor(data) == partition_status
+
+    def test_load_cursor_builds_partition_filter(self):
+        partition_status = make_partition_status(1000, 4)
+        partition_filter = cursor.load_cursor(cursor.encode_cursor(partition_status))
+
+        assert partition_filter == {"begin": 1000, "count": 4, "partition_status": partition_status}
+
+    def test_cursor_is_smaller_than_status_tuples(self):
+        data = cursor.encode_cursor(make_partition_status())
+
+        # One flag byte per partition plus a resume point for the started third.
+        assert len(data) < 4096 * 11
+
+    @pytest.mark.parametrize("parts", [1, 2, 7, 4096])
+    def test_split_cursor_covers_every_partition(self, parts):
+        partition_status = make_partition_status()
+        sub_cursors = cursor.split_cursor(cursor.encode_cursor(partition_status), parts)
+
+        assert len(sub_cursors) == parts
+        merged = {}
+        for sub_cursor in sub_cursors:
+            merged.update(cursor.load_cursor(sub_cursor)["partition_status"])
+        for part_id in range(4096):
+            assert merged[part_id] == partition_status[part_id]
+
+    def test_is_done(self):
+        partition_status = make_partition_status(0, 2)
+        assert cursor.is_done(cursor.encode_cursor(partition_status)) is False
+
+        for part_id in range(2):
+            status = partition_status[part_id]
+            partition_status[part_id] = status[:2] + (False,) + status[3:]
+        assert cursor.is_done(cursor.encode_cursor(partition_status)) is True
+
+    @pytest.mark.parametrize(
+        "partition_status",
+        [
+            {},
+            {"done": False, "retry": True},
+            {**make_partition_status(0, 1), **make_partition_status(2, 1)},
+        ],
+    )
+    def test_encode_invalid_status(self, partition_status):
+        with pytest.raises(ValueError):
+            cursor.encode_cursor(partition_status)
+
+    def test_decode_corrupt_cursor(self):
+        data = bytearray(cursor.encode_cursor(make_partition_status(0, 8)))
+        data[10] ^= 0xFF
+
+        with pytest.raises(ValueError):
+            cursor.decode_cursor(data)
+
+    def test_decode_unknown_version(self):
+        data = cursor.encode_cursor(make_partition_status(0, 8))
+        body = bytearray(data[:-4])
+        body[4] = cursor.CURSOR_VERSION + 1
+        data = bytes(body) + cursor._CRC.pack(cursor.zlib.crc32(body))
+
+        with pytest.raises(ValueError):
+            cursor.decode_cursor(data)
+
+
+class TestCursorResume(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        if self.server_version < [6, 0]:
+            pytest.mark.xfail(reason="Servers older than 6.0 do not support partition scans.")
+            pytest.xfail()
+
+        self.record_count = 200
+        self.keys = [("test", "cursor", i) for i in range(self.record_count)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"id": i})
+
+        def teardown():
+            for key in self.keys:
+                try:
+                    as_connection.remove(key)
+                except e.RecordNotFound:
+                    pass
+
+        request.addfinalizer(teardown)
+
+    def test_resume_scan_from_saved_cursor(self):
+        scan = self.as_connection.scan("test", "cursor")
+        scan.paginate()
+        first_page = scan.results({"max_records": 50})
+        saved = cursor.save_cursor(scan)
+
+        resumed = self.as_connection.scan("test", "cursor")
+        resumed.paginate()
+        rest = resumed.results({"partition_filter": cursor.load_cursor(saved)})
+
+        ids = [bins["id"] for _, _, bins in first_page + rest]
+        assert sorted(ids) == list(range(self.record_count))
+        assert cursor.is_done(cursor.save_cursor(resumed))
+
+    def test_resume_split_cursor(self):
+        query = self.as_connection.query("test", "cursor")
+        query.max_records = 50
+        query.paginate()
+        first_page = query.results()
+        saved = cursor.save_cursor(query)
+
+        records = list(first_page)
+        for sub_cursor in cursor.split_cursor(saved, 3):
+            worker_query = self.as_connection.query("test", "cursor")
+            records.extend(worker_query.results({"partition_filter": cursor.load_cursor(sub_cursor)}))
+
+        assert sorted(bins["id"] for _, _, bins in records) == list(range(self.record_count))
+
+    def test_save_cursor_without_partition_tracking(self):
+        scan = self.as_connection.scan("test", "cursor")
+
+        with pytest.raises(ValueError):
+            cursor.save_cursor(scan)
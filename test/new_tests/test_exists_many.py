@@ -2,6 +2,7 @@
 
 import pytest
 import time
+from array import array
 
 try:
     from collections import Counter
@@ -194,6 +195,30 @@ class TestExistsMany:
         with pytest.raises(e.ParamError):
             self.as_connection.exists_many(self.keys, policies)
 
+    def test_pos_exists_many_compact(self, put_data):
+        keys = [("test", "demo", i) for i in range(10)]
+        for i in (1, 2, 9):
+            put_data(self.as_connection, keys[i], {"age": i}, {"ttl": 1000})
+        self.as_connection.put(keys[2], {"age": 3})
+
+        bitmap, generations, ttls = self.as_connection.exists_many(keys, compact=True)
+        records = self.as_connection.exists_many(keys)
+
+        assert isinstance(bitmap, bytearray)
+        assert [bitmap[i >> 3] >> (i & 7) & 1 for i in range(10)] == [0, 1, 1, 0, 0, 0, 0, 0, 0, 1]
+        assert generations == array("I", [meta["gen"] if meta else 0 for _, meta in records])
+        assert generations[2] == 2
+        assert ttls.typecode == "I"
+        for ttl, (_, meta) in zip(ttls, records):
+            assert abs(ttl - meta["ttl"]) <= 1 if meta else ttl == 0
+
+    def test_pos_exists_many_compact_with_no_keys(self):
+        assert self.as_connection.exists_many([], None, True) == (bytearray(), array("I"), array("I"))
+
+    def test_neg_exists_many_compact_with_invalid_keys(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.exists_many(("test", "demo", 1), compact=True)
+
     def test_neg_exists_many_with_proper_parameters_without_connection(self, put_data):
         self.keys = []
         rec_length = 5
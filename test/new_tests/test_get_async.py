@@ -241,6 +241,22 @@ class TestGet:
 
         await asyncio.gather(async_io(_input))
 
+    @pytest.mark.asyncio
+    async def test_neg_get_concurrent_errors_keep_their_keys(self):
+        """
+        Invoke get() for several missing records at once, each error keeping its own key.
+        """
+        keys = [("test", "demo", "missing_async_%d" % i) for i in range(10)]
+
+        async def async_io(key_input):
+            with pytest.raises(e.RecordNotFound) as exception:
+                await io.get(self.as_connection, key_input)
+            return exception.value
+
+        errors = await asyncio.gather(*(async_io(key) for key in keys))
+        assert [error.key[:3] for error in errors] == keys
+        assert len(set(map(id, errors))) == len(keys)
+
     @pytest.mark.asyncio
     async def test_neg_get_with_only_key_no_connection(self):
         """
@@ -56,6 +56,43 @@ class TestGetPut:
         with pytest.raises(e.RecordNotFound):
             self.as_connection.get(key)
 
+    def test_pos_get_missing_ok(self, put_data):
+        """
+        Invoke get with missing_ok, which returns None for a record which does not exist.
+        """
+        key = ("test", "demo", "get_missing_ok")
+        assert self.as_connection.get(("test", "demo", "non-existent-key-that-does-not-exist"), missing_ok=True) is None
+
+        put_data(self.as_connection, key, {"i": 1})
+        _, _, bins = self.as_connection.get(key, None, True)
+        assert bins == {"i": 1}
+
+    def test_neg_get_missing_ok_other_errors(self):
+        """
+        Errors other than a missing record are still raised with missing_ok.
+        """
+        with pytest.raises(e.NamespaceNotFound):
+            self.as_connection.get(("namespace", "demo", 1), missing_ok=True)
+
+    def test_neg_get_exception_attributes(self):
+        """
+        The attributes of an exception belong to it, not to its class.
+        """
+        first_key = ("test", "demo", "non-existent-key-1")
+        second_key = ("test", "demo", "non-existent-key-2")
+        with pytest.raises(e.RecordNotFound) as first:
+            self.as_connection.get(first_key)
+        with pytest.raises(e.RecordNotFound) as second:
+            self.as_connection.get(second_key)
+
+        assert first.value.key == first_key
+        assert second.value.key == second_key
+        assert first.value.code == 2
+        assert first.value.msg == second.value.msg
+        assert first.value.in_doubt is False
+        assert e.RecordNotFound.key is None
+        assert e.RecordNotFound.msg is None
+
     @pytest.mark.skip(reason="byte key not currently handled")
     def test_get_information_using_bytes_key(self):
         record = {"bytes": "are_cool"}
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import pytest
+from .test_base_class import TestBaseClass
+from aerospike import exception as e
+
+import aerospike
+
+
+@pytest.mark.usefixtures("as_connection")
+class TestGetStats(object):
+    """
+    Test Cases for aerospike.Client.get_stats
+    """
+
+    def test_pos_get_stats(self):
+        stats = self.as_connection.get_stats()
+
+        node_names = [node["node_name"] for node in self.as_connection.get_node_names()]
+        assert sorted(node["node_name"] for node in stats["nodes"]) == sorted(node_names)
+        for node in stats["nodes"]:
+            assert ":" in node["address"]
+            for pool in ("sync", "async", "pipeline"):
+                conns = node[pool]
+                assert set(conns) == {"open", "in_use", "idle", "opened", "closed"}
+                assert conns["open"] == conns["in_use"] + conns["idle"]
+            assert node["error_count"] >= 0
+            assert node["error_rate_exceeded"] is False
+        assert isinstance(stats["event_loops"], list)
+        assert stats["thread_pool_queued_tasks"] >= 0
+        assert stats["tend_count"] >= 1
+        assert stats["invalid_node_count"] >= 0
+
+    def test_pos_get_stats_counts_sync_connections(self):
+        key = ("test", "demo", "get_stats")
+        self.as_connection.put(key, {"i": 1})
+        self.as_connection.remove(key)
+
+        stats = self.as_connection.get_stats()
+        assert sum(node["sync"]["opened"] for node in stats["nodes"]) >= 1
+        assert sum(node["sync"]["idle"] for node in stats["nodes"]) >= 1
+
+    def test_neg_get_stats_with_argument(self):
+        with pytest.raises(TypeError):
+            self.as_connection.get_stats(1)
+
+    def test_neg_get_stats_without_connection(self):
+        config = TestBaseClass.get_connection_config()
+        unconnected_client = aerospike.client(config)
+        unconnected_client.close()
+
+        with pytest.raises(e.ClusterError):
+            unconnected_client.get_stats()
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers import cdt_ctx
+from aerospike_helpers.index_task import IndexTask, _listed_definition, parse_sindex_list, parse_sindex_stats
+from .test_standin_server import start_server
+
+
+@pytest.fixture(scope="module")
+def building_server():
+    # Each new index reports 0, 33 and 66 percent loaded before it is ready.
+    process, port = start_server("--index-build-polls", "3")
+    yield port
+    process.terminate()
+    process.wait()
+
+
+@pytest.fixture
+def client(building_server):
+    client = aerospike.client({"hosts": [("127.0.0.1", building_server)]}).connect()
+    yield client
+    for index in ("task_idx", "task_idx2") + tuple(spec["name"] for spec in SPECS):
+        try:
+            client.index_remove("test", index)
+        except e.IndexNotFound:
+            pass
+    client.close()
+
+
+SPECS = [
+    {"ns": "test", "set": "demo", "bin": "i", "name": "many_i", "index_datatype": aerospike.INDEX_NUMERIC},
+    {
+        "ns": "test",
+        "set": None,
+        "bin": "l",
+        "name": "many_l",
+        "index_datatype": aerospike.INDEX_STRING,
+        "index_type": aerospike.INDEX_TYPE_LIST,
+    },
+    {
+        "ns": "test",
+        "set": "demo",
+        "bin": "m",
+        "name": "many_m",
+        "index_datatype": aerospike.INDEX_NUMERIC,
+        "index_type": aerospike.INDEX_TYPE_MAPVALUES,
+        "ctx": [cdt_ctx.cdt_ctx_map_key("k")],
+    },
+]
+
+
+def index_names(client):
+    return sorted(index["indexname"] for index in parse_sindex_list(client.info_random_node("sindex-list:ns=test")))
+
+
+class TestIndexTask(object):
+    def test_progress(self, client):
+        task = client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+        assert isinstance(task, IndexTask)
+        assert (task.namespace, task.name) == ("test", "task_idx")
+        assert [task.progress() for _ in range(4)] == [0, 33, 66, 100]
+        assert task.done()
+
+    def test_stats(self, client):
+        task = client.index_string_create("test", "demo", "s", "task_idx", {"timeout": 1000}, wait=False)
+        stats = task.stats()
+        assert list(stats) == [node["node_name"] for node in client.get_node_names()]
+        assert list(stats.values()) == [{"load_pct": 0, "keys": 0, "entries": 0}]
+
+    def test_wait(self, client):
+        task = client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+        assert task.wait(interval=0.01) is None
+        assert task.progress() == 100
+
+    def test_wait_timeout(self, client):
+        task = client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+        with pytest.raises(e.TimeoutError):
+            task.wait(timeout=0.05, interval=0.1)
+
+    def test_wait_async(self, client):
+        tasks = [
+            client.index_integer_create("test", "demo", "i", "task_idx", wait=False),
+            client.index_string_create("test", "demo", "s", "task_idx2", wait=False),
+        ]
+
+        async def wait_all():
+            await asyncio.gather(*(task.wait_async(timeout=10, interval=0.01) for task in tasks))
+
+        asyncio.run(wait_all())
+        assert [task.progress() for task in tasks] == [100, 100]
+
+    def test_wait_async_timeout(self, client):
+        task = client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+        with pytest.raises(e.TimeoutError):
+            asyncio.run(task.wait_async(timeout=0.05, interval=0.1))
+
+    @pytest.mark.parametrize(
+        "create",
+        [
+            lambda c: c.index_geo2dsphere_create("test", "demo", "g", "task_idx", wait=False),
+            lambda c: c.index_list_create("test", "demo", "l", aerospike.INDEX_NUMERIC, "task_idx", wait=False),
+            lambda c: c.index_map_keys_create("test", "demo", "m", aerospike.INDEX_STRING, "task_idx", wait=False),
+            lambda c: c.index_map_values_create("test", "demo", "m", aerospike.INDEX_NUMERIC, "task_idx", wait=False),
+        ],
+    )
+    def test_all_index_types(self, client, create):
+        task = create(client)
+        assert repr(task) == "IndexTask('test', 'task_idx')"
+        task.wait(interval=0.01)
+
+    def test_index_not_on_a_node_yet(self, client):
+        # A node that has not received the index yet has loaded none of it.
+        task = IndexTask(client, "test", "task_idx")
+        assert task.stats() == {node["node_name"]: {} for node in client.get_node_names()}
+        assert task.progress() == 0
+        with pytest.raises(e.TimeoutError):
+            task.wait(timeout=0.05, interval=0.01)
+
+        client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+        task.wait(timeout=10, interval=0.01)
+
+    def test_wait_async_index_not_on_a_node_yet(self, client):
+        task = IndexTask(client, "test", "task_idx")
+
+        async def create_later():
+            await asyncio.sleep(0.05)
+            client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+
+        async def main():
+            await asyncio.gather(task.wait_async(timeout=10, interval=0.01), create_later())
+
+        asyncio.run(main())
+        assert task.progress() == 100
+
+    def test_neg_removed_index(self, client):
+        task = client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+        client.index_remove("test", "task_idx")
+        task.missing_grace = 0.05
+        with pytest.raises(e.IndexNotFound):
+            task.wait(interval=0.01)
+
+    def test_neg_wait_is_keyword_only(self, client):
+        with pytest.raises(TypeError):
+            client.index_integer_create("test", "demo", "i", "task_idx", {}, False)
+
+    def test_neg_create_error_is_raised(self, client):
+        client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+        with pytest.raises(e.IndexFoundError):
+            client.index_integer_create("test", "demo", "i", "task_idx", wait=False)
+
+
+class TestIndexCreateMany(object):
+    def test_create_many(self, client):
+        tasks = client.index_create_many(SPECS, {"timeout": 1000}, timeout=10)
+        assert [task.name for task in tasks] == ["many_i", "many_l", "many_m"]
+        assert [task.progress() for task in tasks] == [100] * 3
+        assert index_names(client) == ["many_i", "many_l", "many_m"]
+
+    def test_existing_indexes_are_skipped(self, client):
+        client.index_integer_create("test", "demo", "i", "many_i", wait=False)
+        tasks = client.index_create_many(SPECS + SPECS[1:2], wait=False)
+        assert [task.name for task in tasks] == ["many_l", "many_m"]
+        assert [task.progress() for task in tasks] == [0, 0]
+
+        assert client.index_create_many(SPECS) == []
+
+    def test_same_definition_with_another_name_is_skipped(self, client):
+        client.index_create_many(SPECS[:1], wait=False)
+        assert client.index_create_many([dict(SPECS[0], name="task_idx")]) == []
+
+    def test_timeout(self, client):
+        with pytest.raises(e.TimeoutError):
+            client.index_create_many(SPECS, timeout=0.0)
+        assert index_names(client) == ["many_i", "many_l", "many_m"]
+
+    def test_create_error_is_raised_after_all_commands(self, client):
+        client.index_string_create("test", "demo", "s", "many_l", wait=False)
+        with pytest.raises(e.IndexFoundError):
+            client.index_create_many(SPECS, wait=False)
+        assert index_names(client) == ["many_i", "many_l", "many_m"]
+
+    @pytest.mark.parametrize(
+        "specs",
+        [
+            "specs",
+            SPECS[:1] + [1],
+            SPECS[:1] + [{"ns": "test", "bin": "l", "name": "many_l"}],
+            SPECS[:1] + [dict(SPECS[1], index_datatype=100)],
+            SPECS[:1] + [dict(SPECS[1], index_type=100)],
+        ],
+    )
+    def test_neg_invalid_specs(self, client, specs):
+        with pytest.raises(e.ParamError):
+            client.index_create_many(specs)
+        assert index_names(client) == []
+
+    def test_remove_many(self, client):
+        client.index_create_many(SPECS, wait=False)
+        assert client.index_remove_many("test", ["many_i", "many_m", "many_missing", "many_i"]) == ["many_i", "many_m"]
+        assert index_names(client) == ["many_l"]
+
+    @pytest.mark.parametrize("names", ["many_i", [1], None])
+    def test_neg_remove_many_invalid_names(self, client, names):
+        with pytest.raises(e.ParamError):
+            client.index_remove_many("test", names)
+
+    def test_neg_keyword_only_args(self, client):
+        with pytest.raises(TypeError):
+            client.index_create_many(SPECS, None, False)
+
+
+def test_parse_sindex_list():
+    response = (
+        "sindex-list:ns=test\tns=test:indexname=a:set=NULL:bin=i:type=numeric:indextype=default;ns=test:indexname=b;"
+    )
+    assert parse_sindex_list(response) == [
+        {"ns": "test", "indexname": "a", "set": "NULL", "bin": "i", "type": "numeric", "indextype": "default"},
+        {"ns": "test", "indexname": "b"},
+    ]
+    assert parse_sindex_list("") == []
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        "ns=test:indexname=a:set=demo:bin=i:type=numeric:indextype=default:context=NULL:state=RW",
+        # Older servers report the default index type as NONE, and no context.
+        "ns=test:indexname=a:set=demo:bins=i:type=NUMERIC:indextype=NONE:path=i:state=RW",
+    ],
+)
+def test_listed_default_index_type(response):
+    (fields,) = parse_sindex_list(response)
+    assert _listed_definition(fields) == ("test", "demo", "i", "numeric", "default", None)
+
+
+@pytest.mark.parametrize(
+    "response, stats",
+    [
+        ("sindex/test/idx\tload_pct=42;keys=10;entries=12\n", {"load_pct": 42, "keys": 10, "entries": 12}),
+        ("load_pct=100;state=RW;histogram=false", {"load_pct": 100, "state": "RW", "histogram": "false"}),
+        ("si_mem_gc_sleep_ms=0.5;", {"si_mem_gc_sleep_ms": 0.5}),
+        ("", {}),
+    ],
+)
+def test_parse_sindex_stats(response, stats):
+    assert parse_sindex_stats(response) == stats
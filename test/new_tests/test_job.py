@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import pickle
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike import predicates as p
+from aerospike_helpers.job import Job, parse_job_response
+from aerospike_helpers.operations import operations as op
+from .test_standin_server import start_server
+
+
+@pytest.fixture(scope="module")
+def job_server():
+    # Each new job is shown at 0, 33 and 66 percent before it is done.
+    process, port = start_server("--job-polls", "3")
+    yield port
+    process.terminate()
+    process.wait()
+
+
+@pytest.fixture
+def client(job_server):
+    client = aerospike.client({"hosts": [("127.0.0.1", job_server)]}).connect()
+    for i in range(6):
+        client.put(("test", "demo", i), {"i": i})
+    client.put(("test", "other", 0), {"i": 0})
+    yield client
+    client.truncate("test", None, 0)
+    client.close()
+
+
+def background_scan(client):
+    scan = client.scan("test", "demo")
+    scan.add_ops([op.write("done", 1)])
+    return scan.execute_background()
+
+
+class TestJob(object):
+    def test_scan_execute_background(self, client):
+        job = background_scan(client)
+        assert isinstance(job, Job)
+        assert job.module == aerospike.JOB_SCAN
+        assert job == job.job_id and type(job.job_id) is int
+        assert [bins.get("done") for _, _, bins in client.scan("test", "demo").results()] == [1] * 6
+        assert client.get(("test", "other", 0))[2] == {"i": 0}
+
+    def test_query_execute_background(self, client):
+        client.index_integer_create("test", "demo", "i", "job_idx")
+        try:
+            query = client.query("test", "demo")
+            query.where(p.between("i", 2, 3))
+            query.add_ops([op.increment("i", 10)])
+            job = query.execute_background()
+            assert isinstance(job, Job)
+            assert job.module == aerospike.JOB_QUERY
+            job.wait(poll_interval=0.01)
+            assert sorted(bins["i"] for _, _, bins in client.scan("test", "demo").results()) == [0, 1, 4, 5, 12, 13]
+        finally:
+            client.index_remove("test", "job_idx")
+
+    def test_status_and_progress(self, client):
+        job = background_scan(client)
+        assert job.status() == {"status": aerospike.JOB_STATUS_INPROGRESS, "progress_pct": 0, "records_read": 0}
+        assert [job.progress_pct for _ in range(3)] == [33, 66, 100]
+        assert job.status(policy={"timeout": 1000})["records_read"] == 6
+        assert job.done()
+
+    def test_job_info_still_takes_the_job(self, client):
+        job = background_scan(client)
+        assert client.job_info(job, aerospike.JOB_SCAN)["status"] == aerospike.JOB_STATUS_INPROGRESS
+
+    def test_wait(self, client):
+        job = background_scan(client)
+        assert job.wait(poll_interval=0.01, timeout=5) is None
+        assert job.done()
+
+    def test_wait_timeout(self, client):
+        job = background_scan(client)
+        with pytest.raises(e.TimeoutError):
+            job.wait(poll_interval=0.2, timeout=0.3)
+
+    def test_wait_async(self, client):
+        job = background_scan(client)
+        asyncio.run(job.wait_async(poll_interval=0.01))
+        assert job.done()
+
+    def test_await(self, client):
+        job = background_scan(client)
+
+        async def main():
+            await job
+
+        asyncio.run(main())
+        assert job.progress_pct == 100
+
+    def test_wait_async_timeout(self, client):
+        job = background_scan(client)
+        with pytest.raises(e.TimeoutError):
+            asyncio.run(job.wait_async(poll_interval=0.2, timeout=0.3))
+
+    def test_cancel(self, client):
+        job = background_scan(client)
+        assert job.cancel()
+        assert job.done()
+        assert not job.cancel()
+
+    def test_unknown_job(self, client):
+        job = Job(12345, client, aerospike.JOB_QUERY)
+        assert job.done()
+        assert not job.cancel()
+        asyncio.run(job.wait_async())
+
+    def test_pickle(self, client):
+        job = background_scan(client)
+        assert pickle.loads(pickle.dumps(job)) == job
+
+    def test_neg_unsupported_query_apply(self, client):
+        with pytest.raises(e.AerospikeError):
+            client.query_apply("test", "demo", p.equals("i", 1), "module", "function")
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        (
+            "query-show:trid=1\ttrid=1:job-type=basic:status=active(ok):job-progress=42:recs-read=10\n",
+            {"status": aerospike.JOB_STATUS_INPROGRESS, "progress_pct": 42, "records_read": 10},
+        ),
+        (
+            "module=scan:trid=1:job_progress=100:status=DONE:recs_read=3",
+            {"status": aerospike.JOB_STATUS_COMPLETED, "progress_pct": 0, "records_read": 3},
+        ),
+        ("status=IN_PROGRESS", {"status": aerospike.JOB_STATUS_INPROGRESS, "progress_pct": 0, "records_read": 0}),
+        ("", {"status": aerospike.JOB_STATUS_UNDEF, "progress_pct": 0, "records_read": 0}),
+    ],
+)
+def test_parse_job_response(response, expected):
+    assert parse_job_response(response) == expected
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.batch.records import BatchRecords, Write
+from aerospike_helpers.operations import operations as op
+from .test_standin_server import standin_server  # noqa: F401
+
+
+@pytest.fixture
+def client(standin_server):  # noqa: F811
+    client = aerospike.client({"hosts": [("127.0.0.1", standin_server)]}).connect()
+    yield client
+    client.truncate("test", None, 0)
+    client.close()
+
+
+class TestKey(object):
+    @pytest.mark.parametrize("primary_key", [1, -1, "key", bytearray(b"key")])
+    def test_digest_and_partition_id(self, primary_key):
+        key = aerospike.Key("test", "demo", primary_key)
+        digest = aerospike.calc_digest("test", "demo", primary_key)
+        assert key.digest == digest
+        assert key.partition_id == int.from_bytes(digest[:2], "little") & 4095
+        assert tuple(key) == ("test", "demo", primary_key, digest)
+
+    def test_attributes(self):
+        key = aerospike.Key("test", None, key=1)
+        assert (key.namespace, key.set, key.key) == ("test", None, 1)
+        with pytest.raises(AttributeError):
+            key.key = 2
+
+    def test_from_digest(self):
+        digest = aerospike.calc_digest("test", "demo", 1)
+        key = aerospike.Key("test", "demo", digest=digest)
+        assert key.key is None
+        assert key == aerospike.Key("test", "demo", 1)
+        assert repr(key) == "aerospike.Key('test', 'demo', None, %r)" % digest
+
+    def test_hash_and_equality(self):
+        key = aerospike.Key("test", "demo", 1)
+        assert key == aerospike.Key("test", "demo", 1)
+        assert key != aerospike.Key("test", "demo", 2)
+        assert key != aerospike.Key("other", "demo", 1)
+        assert key != ("test", "demo", 1)
+        assert len({key, aerospike.Key("test", "demo", 1), aerospike.Key("test", "demo", 2)}) == 2
+
+    def test_pickle(self):
+        key = aerospike.Key("test", "demo", "key")
+        assert pickle.loads(pickle.dumps(key)) == key
+
+    def test_bytearray_is_copied(self):
+        primary_key = bytearray(b"key")
+        key = aerospike.Key("test", "demo", primary_key)
+        primary_key[0] = 0
+        assert key.key == bytearray(b"key")
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            (1, "demo", 1),
+            ("test", 1, 1),
+            ("test", "demo"),
+            ("test", "demo", [1]),
+            ("test", "demo", None, b"digest"),
+        ],
+    )
+    def test_neg_key(self, args):
+        with pytest.raises(e.ParamError):
+            aerospike.Key(*args)
+
+    def test_client_commands(self, client):
+        key = aerospike.Key("test", "demo", 1)
+        client.put(key, {"i": 1})
+        assert client.get(key)[2] == {"i": 1}
+        assert client.get(("test", "demo", 1))[2] == {"i": 1}
+        assert client.exists(key)[1] is not None
+        assert client.operate(key, [op.increment("i", 1), op.read("i")])[2] == {"i": 2}
+        client.remove(key)
+        assert client.get(key, missing_ok=True) is None
+
+    def test_batch_commands(self, client):
+        keys = [aerospike.Key("test", "demo", i) for i in range(3)]
+        client.batch_write(BatchRecords([Write(key, [op.write("i", i)]) for i, key in enumerate(keys)]))
+
+        records = client.get_many(keys + [aerospike.Key("test", "demo", digest=keys[0].digest)])
+        assert [bins for _, _, bins in records] == [{"i": 0}, {"i": 1}, {"i": 2}, {"i": 0}]
+        assert [meta is not None for _, meta in client.exists_many(keys)] == [True] * 3
+        assert [bins for _, _, bins in client.select_many(keys, ["i"])] == [{"i": 0}, {"i": 1}, {"i": 2}]
+        results = client.batch_operate(keys, [op.increment("i", 10)])
+        assert [record.result for record in results.batch_records] == [0] * 3
+        client.batch_remove(keys)
+        assert [meta for _, meta in client.exists_many(keys)] == [None] * 3
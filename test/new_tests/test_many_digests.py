@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from .test_standin_server import standin_server  # noqa: F401
+
+
+def pack(*primary_keys):
+    return b"".join(aerospike.calc_digest("test", "demo", i) for i in primary_keys)
+
+
+@pytest.fixture
+def client(standin_server):  # noqa: F811
+    client = aerospike.client({"hosts": [("127.0.0.1", standin_server)]}).connect()
+    for i in (1, 2, 4, 9):
+        client.put(("test", "demo", i), {"i": i, "s": str(i)})
+    yield client
+    client.truncate("test", None, 0)
+    client.close()
+
+
+class TestGetManyDigests(object):
+    def test_records_in_order(self, client):
+        records = client.get_many_digests("test", "demo", pack(0, 1, 2, 3, 4))
+        assert [record and record[1] for record in records] == [
+            None,
+            {"i": 1, "s": "1"},
+            {"i": 2, "s": "2"},
+            None,
+            {"i": 4, "s": "4"},
+        ]
+        assert records[1][0]["gen"] == 1
+
+    @pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+    def test_bytes_like_digests(self, client, wrap):
+        records = client.get_many_digests("test", "demo", wrap(pack(9, 1)), ["s"])
+        assert [bins for _, bins in records] == [{"s": "9"}, {"s": "1"}]
+
+    def test_no_digests(self, client):
+        assert client.get_many_digests("test", "demo", b"") == []
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ("test", "demo", pack(1)[:-1]),
+            ("test", "demo", [pack(1)]),
+            ("test", "demo", pack(1), "s"),
+            ("test", "demo", pack(1), [1]),
+        ],
+    )
+    def test_neg_args(self, client, args):
+        with pytest.raises(e.ParamError):
+            client.get_many_digests(*args)
+
+
+class TestExistsManyDigests(object):
+    def test_bitmap(self, client):
+        bitmap = client.exists_many_digests("test", "demo", pack(*range(10)))
+        assert bitmap == bytearray([0b00010110, 0b00000010])
+        assert [i for i in range(10) if bitmap[i >> 3] >> (i & 7) & 1] == [1, 2, 4, 9]
+
+    def test_generations(self, client):
+        client.put(("test", "demo", 2), {"i": 3})
+        generations = client.exists_many_digests("test", "demo", pack(0, 1, 2), generations=True)
+        assert generations == array("I", [0, 1, 2])
+
+    def test_no_digests(self, client):
+        assert client.exists_many_digests("test", "demo", b"") == bytearray()
+        assert client.exists_many_digests("test", "demo", b"", generations=True) == array("I")
+
+    def test_neg_digests(self, client):
+        with pytest.raises(e.ParamError):
+            client.exists_many_digests("test", "demo", b"\0" * 30)
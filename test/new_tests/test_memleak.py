@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+Memory growth checks for the client's methods.
+
+Each method is called TEST_MEMLEAK_CALLS times against a stand-in server, after a warm up, and the test
+fails if the process RSS, the memory traced by tracemalloc or sys.getallocatedblocks() grows by more than
+a small threshold per call. Calls that fail with an AerospikeError are still measured, so the error paths
+are checked too.
+
+These tests only run when TEST_MEMLEAK_METHODS=1. They can be run together with TEST_MEMLEAK=1, which
+reports the memory used by every test without failing them.
+"""
+
+import gc
+import os
+import resource
+import sys
+import tracemalloc
+import warnings
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike import predicates as p
+from aerospike_helpers import cdt_ctx
+from aerospike_helpers.batch.records import BatchRecords, Read, Write
+from aerospike_helpers.expressions import base as exp
+from aerospike_helpers.operations import list_operations as lop
+from aerospike_helpers.operations import map_operations as mop
+from aerospike_helpers.operations import operations as op
+from .test_standin_server import start_server
+
+test_memleak_methods = int(os.environ.get("TEST_MEMLEAK_METHODS", 0))
+if test_memleak_methods != 1:
+    pytestmark = pytest.mark.skip
+
+test_memleak_calls = int(os.environ.get("TEST_MEMLEAK_CALLS", 2000))
+
+# Growth allowed per call. One leaked Python object or C allocation per call is over all of them.
+MAX_BLOCKS_PER_CALL = 0.2
+MAX_TRACED_BYTES_PER_CALL = 8
+MAX_RSS_BYTES_PER_CALL = 128
+
+WARMUP_CALLS = 200
+MEASURED_ROUNDS = 3
+
+NS = "test"
+SET = "memleak"
+KEY = (NS, SET, 1)
+MISSING_KEY = (NS, SET, "missing")
+KEYS = [(NS, SET, i) for i in range(10)]
+DIGESTS = b"".join(aerospike.calc_digest(*key) for key in KEYS + [MISSING_KEY])
+BINS = {"i": 1, "s": "str", "f": 1.5, "b": bytearray(b"\x00\x01"), "l": [1, [2]], "m": {"a": {"b": 1}}}
+UDF_NAME = "sample.lua"
+UDF_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), UDF_NAME)
+FILTER = exp.GE(exp.IntBin("i"), 0).compile()
+CTX = [cdt_ctx.cdt_ctx_list_index(0)]
+INDEX = "memleak_i"
+
+
+def scan_results(client):
+    return client.scan(NS, SET).results()
+
+
+def paginated_query(client):
+    query = client.query(NS, SET)
+    query.max_records = 5
+    query.paginate()
+    while not query.is_done():
+        query.results()
+    return query.get_partitions_status()
+
+
+# Client method name to a call of it. A method can have several calls, named "<method>: <case>".
+CALLS = {
+    "put": lambda c: c.put(KEY, BINS),
+    "get": lambda c: c.get(KEY),
+    "get: missing record": lambda c: c.get(MISSING_KEY),
+    "get: expressions policy": lambda c: c.get(KEY, {"expressions": FILTER}),
+    "get: aerospike.Key": lambda c: c.get(aerospike.Key(NS, SET, "key")),
+    "select": lambda c: c.select(KEY, ["i", "s"]),
+    "exists": lambda c: c.exists(KEY),
+    "exists: missing record": lambda c: c.exists(MISSING_KEY),
+    "remove": lambda c: (c.put(MISSING_KEY, {"i": 1}), c.remove(MISSING_KEY)),
+    "remove_bin": lambda c: c.remove_bin(KEY, ["unused"]),
+    "append": lambda c: c.append(KEY, "a", "x"),
+    "prepend": lambda c: c.prepend(KEY, "a", "x"),
+    "increment": lambda c: c.increment(KEY, "n", 1),
+    "touch": lambda c: c.touch(KEY),
+    "operate": lambda c: c.operate(KEY, [op.increment("n", 1), op.read("n"), op.read("m")]),
+    "operate: list and map operations": lambda c: c.operate(
+        KEY, [lop.list_get_by_rank_range("l", -1, 1), mop.map_get_by_key("m", "a", aerospike.MAP_RETURN_VALUE)]
+    ),
+    "operate_ordered": lambda c: c.operate_ordered(KEY, [op.increment("n", 1), op.read("n")]),
+    "apply": lambda c: c.apply(KEY, "sample", "list_append", ["l", 1]),
+    "get_expression_base64": lambda c: c.get_expression_base64(FILTER),
+    "get_cdtctx_base64": lambda c: c.get_cdtctx_base64(CTX),
+    "get_key_digest": lambda c: c.get_key_digest(NS, SET, 1),
+    "get_key_partition_id": lambda c: c.get_key_partition_id(NS, SET, 1),
+    "get_many": lambda c: c.get_many(KEYS + [MISSING_KEY]),
+    "get_many: aerospike.Key": lambda c: c.get_many([aerospike.Key(*key) for key in KEYS]),
+    "get_many_digests": lambda c: c.get_many_digests(NS, SET, DIGESTS),
+    "select_many": lambda c: c.select_many(KEYS, ["i"]),
+    "exists_many": lambda c: c.exists_many(KEYS + [MISSING_KEY]),
+    "exists_many: compact": lambda c: c.exists_many(KEYS + [MISSING_KEY], compact=True),
+    "exists_many_digests": lambda c: c.exists_many_digests(NS, SET, DIGESTS),
+    "exists_many_digests: generations": lambda c: c.exists_many_digests(NS, SET, DIGESTS, generations=True),
+    "batch_get_ops": lambda c: c.batch_get_ops(KEYS, [op.read("i")]),
+    "batch_write": lambda c: c.batch_write(
+        BatchRecords([Write(KEYS[0], [op.write("w", 1)]), Read(KEYS[1], [op.read("i")])])
+    ),
+    "batch_operate": lambda c: c.batch_operate(KEYS, [op.increment("n", 1), op.read("n")]),
+    "batch_remove": lambda c: (c.put(MISSING_KEY, {"i": 1}), c.batch_remove([MISSING_KEY])),
+    "batch_apply": lambda c: c.batch_apply(KEYS, "sample", "list_append", ["l", 1]),
+    "scan": scan_results,
+    "scan: foreach": lambda c: c.scan(NS, SET).foreach(lambda record: None),
+    "scan_apply": lambda c: c.scan_apply(NS, SET, "sample", "list_append", ["l", 1]),
+    "scan_info": lambda c: c.scan_info(1),
+    "query": lambda c: c.query(NS, SET).results(),
+    "query: where": lambda c: c.query(NS, SET).where(p.between("i", 0, 5)).results(),
+    "query: paginate": paginated_query,
+    "query_apply": lambda c: c.query_apply(NS, SET, p.equals("i", 1), "sample", "list_append", ["l", 1]),
+    "job_info": lambda c: c.job_info(1, aerospike.JOB_SCAN),
+    "info": lambda c: c.info("namespaces"),
+    "info_all": lambda c: c.info_all("namespaces"),
+    "info_random_node": lambda c: c.info_random_node("namespaces"),
+    "info_single_node": lambda c: c.info_single_node("namespaces", c.get_node_names()[0]["node_name"]),
+    "info_node": lambda c: c.info_node("namespaces", c.get_nodes()[0]),
+    "get_nodes": lambda c: c.get_nodes(),
+    "get_partition_map": lambda c: c.get_partition_map("test"),
+    "get_stats": lambda c: c.get_stats(),
+    "get_slow_commands": lambda c: c.get_slow_commands(),
+    "get_node_names": lambda c: c.get_node_names(),
+    "is_connected": lambda c: c.is_connected(),
+    "shm_key": lambda c: c.shm_key(),
+    "truncate": lambda c: c.truncate(NS, "memleak_truncated", 0),
+    "set_xdr_filter": lambda c: c.set_xdr_filter("dc", NS, FILTER),
+    # Registering a module waits for the server to list it, so this fails on a file that does not exist.
+    "udf_put": lambda c: c.udf_put(UDF_PATH + ".missing"),
+    "udf_put: if_changed": lambda c: c.udf_put(UDF_PATH, if_changed=True),
+    "udf_remove": lambda c: c.udf_remove("missing.lua"),
+    # The test directory has an empty module, so this registers the modules before it and raises.
+    "udf_sync": lambda c: c.udf_sync(os.path.dirname(UDF_PATH)),
+    "udf_list": lambda c: c.udf_list(),
+    "udf_get": lambda c: c.udf_get(UDF_NAME),
+    # Creating an index waits for it to be built, so these create an index that already exists, which fails.
+    "index_integer_create": lambda c: c.index_integer_create(NS, SET, "i", INDEX),
+    "index_string_create": lambda c: c.index_string_create(NS, SET, "s", INDEX),
+    "index_geo2dsphere_create": lambda c: c.index_geo2dsphere_create(NS, SET, "g", INDEX),
+    "index_list_create": lambda c: c.index_list_create(NS, SET, "l", aerospike.INDEX_NUMERIC, INDEX),
+    "index_map_keys_create": lambda c: c.index_map_keys_create(NS, SET, "m", aerospike.INDEX_STRING, INDEX),
+    "index_map_values_create": lambda c: c.index_map_values_create(NS, SET, "m", aerospike.INDEX_NUMERIC, INDEX),
+    "index_cdt_create": lambda c: c.index_cdt_create(
+        NS, SET, "l", aerospike.INDEX_TYPE_LIST, aerospike.INDEX_NUMERIC, INDEX, {"ctx": CTX}
+    ),
+    "index_integer_create: wait=False": lambda c: (
+        c.index_integer_create(NS, SET, "w", "memleak_task", wait=False),
+        c.index_remove(NS, "memleak_task"),
+    ),
+    "index_remove": lambda c: c.index_remove(NS, "memleak_missing"),
+    "index_create_many": lambda c: c.index_create_many(
+        [{"ns": NS, "set": SET, "bin": "i", "name": INDEX, "index_datatype": aerospike.INDEX_NUMERIC}]
+    ),
+    "index_remove_many": lambda c: c.index_remove_many(NS, ["memleak_missing"]),
+    # The deprecated list_* and map_* methods wrap operate() with one operation.
+    "list_append": lambda c: c.list_append(KEY, "l", 1),
+    "list_get": lambda c: c.list_get(KEY, "l", 0),
+    "list_size": lambda c: c.list_size(KEY, "l"),
+    "map_put": lambda c: c.map_put(KEY, "m", "k", 1),
+    "map_get_by_key": lambda c: c.map_get_by_key(KEY, "m", "a", aerospike.MAP_RETURN_VALUE),
+    "map_size": lambda c: c.map_size(KEY, "m"),
+}
+
+# Calls that are slow against the stand-in server are made this many times fewer.
+FEWER_CALLS = {
+    "query: paginate": 10,
+}
+
+# Methods without a call above, and why.
+NOT_CALLED = {
+    "connect": "a new client per call is checked by test_connect",
+    "close": "a new client per call is checked by test_connect",
+    "get_async": "needs a client built with an event library",
+    "put_async": "needs a client built with an event library",
+}
+NOT_CALLED.update(
+    {
+        name: "wraps operate() like the list_* and map_* methods that are called"
+        for name in dir(aerospike.Client)
+        if name.startswith(("list_", "map_")) and name not in CALLS
+    }
+)
+NOT_CALLED.update(
+    {
+        name: "the stand-in server does not support the admin protocol"
+        for name in dir(aerospike.Client)
+        if name.startswith("admin_")
+    }
+)
+
+
+def memory_used():
+    used = {"traced_bytes": tracemalloc.get_traced_memory()[0], "blocks": sys.getallocatedblocks(), "rss_bytes": 0}
+    # The current RSS is only read on Linux.
+    if os.path.exists("/proc/self/statm"):
+        with open("/proc/self/statm") as statm:
+            used["rss_bytes"] = int(statm.read().split()[1]) * resource.getpagesize()
+    return used
+
+
+def measure_growth(call, calls):
+    """
+    Returns the growth per call of the process RSS, the memory traced by tracemalloc and the number of
+    allocated blocks, over *calls* calls of *call*.
+
+    The calls are made in MEASURED_ROUNDS rounds and the smallest growth of each is returned: a leak grows
+    in every round, while caches and memory pools filling up during the first calls do not.
+    """
+    # With TEST_MEMLEAK=1, conftest.py already traces all the tests.
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        for _ in range(WARMUP_CALLS):
+            call()
+
+        growth = None
+        for _ in range(MEASURED_ROUNDS):
+            gc.collect()
+            before = memory_used()
+            for _ in range(calls):
+                call()
+            gc.collect()
+            after = memory_used()
+            round_growth = {name: (after[name] - before[name]) / calls for name in after}
+            if growth is None:
+                growth = round_growth
+            else:
+                growth = {name: min(growth[name], round_growth[name]) for name in growth}
+        return growth
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+@pytest.fixture(scope="module")
+def standin_server():
+    process, port = start_server()
+    yield port
+    process.terminate()
+    process.wait()
+
+
+@pytest.fixture(scope="module")
+def client(standin_server):
+    config = {
+        "hosts": [("127.0.0.1", standin_server)],
+        "policies": {"total_timeout": 2000},
+    }
+    client = aerospike.client(config).connect()
+    for key in KEYS:
+        client.put(key, BINS)
+    client.index_integer_create(NS, SET, "i", INDEX)
+    client.udf_put(UDF_PATH)
+    yield client
+    client.close()
+
+
+def test_all_methods_covered():
+    methods = {name for name in dir(aerospike.Client) if not name.startswith("_")}
+    called = {name.split(":")[0] for name in CALLS}
+    assert methods - called - set(NOT_CALLED) == set()
+
+
+def assert_no_growth(growth):
+    assert growth["blocks"] <= MAX_BLOCKS_PER_CALL, growth
+    assert growth["traced_bytes"] <= MAX_TRACED_BYTES_PER_CALL, growth
+    assert growth["rss_bytes"] <= MAX_RSS_BYTES_PER_CALL, growth
+
+
+@pytest.mark.parametrize("name", sorted(CALLS))
+def test_method_memory(client, name):
+    method_call = CALLS[name]
+
+    def call():
+        try:
+            method_call(client)
+        except e.AerospikeError:
+            pass
+
+    with warnings.catch_warnings():
+        # Deprecation warnings are only stored once, but keep them out of the measurement.
+        warnings.simplefilter("ignore")
+        assert_no_growth(measure_growth(call, max(test_memleak_calls // FEWER_CALLS.get(name, 1), 1)))
+
+
+def test_connect(standin_server):
+    config = {"hosts": [("127.0.0.1", standin_server)]}
+
+    def call():
+        aerospike.client(config).connect().close()
+
+    # Connecting starts and stops the cluster tend thread, so fewer calls are made.
+    assert_no_growth(measure_growth(call, max(test_memleak_calls // 20, 1)))
+
+
+def test_slow_command_log(standin_server):
+    # Every call is logged, into a ring that is full after the warm up.
+    config = {"hosts": [("127.0.0.1", standin_server)], "slow_command_threshold_ms": 0, "slow_command_max_entries": 10}
+    client = aerospike.client(config).connect()
+
+    def call():
+        client.put(KEY, BINS)
+        client.get(KEY)
+        client.operate(KEY, [op.increment("n", 1), op.read("n")])
+        client.get_slow_commands()
+
+    try:
+        assert_no_growth(measure_growth(call, test_memleak_calls))
+    finally:
+        client.close()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import urllib.request
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.metrics import CONTENT_TYPE, MetricsCollector
+from .test_standin_server import standin_server  # noqa: F401
+
+
+@pytest.fixture
+def client(standin_server):  # noqa: F811
+    client = aerospike.client({"hosts": [("127.0.0.1", standin_server)]}).connect()
+    yield client
+    client.truncate("test", None, 0)
+    client.close()
+
+
+def samples(text):
+    """Return the samples of an OpenMetrics text as a dict of "name{labels}" to value."""
+    result = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            result[name] = float(value)
+    return result
+
+
+class TestMetricsCollector(object):
+    def test_command_metrics(self, client):
+        with MetricsCollector(client, buckets=(1.0,)) as collector:
+            client.put(("test", "demo", 1), {"i": 1})
+            client.get(("test", "demo", 1))
+            with pytest.raises(e.RecordNotFound):
+                client.get(("test", "demo", 2))
+            client.get_many([("test", "demo", 1)])
+
+        text = collector.render()
+        assert text.endswith("# EOF\n")
+        metrics = samples(text)
+        labels = 'method="get",namespace="test",set="demo"'
+        assert metrics['aerospike_client_commands_total{%s,result_code="0"}' % labels] == 1
+        assert metrics['aerospike_client_commands_total{%s,result_code="2"}' % labels] == 1
+        assert metrics['aerospike_client_commands_total{method="get_many",namespace="",set="",result_code="0"}'] == 1
+        assert metrics['aerospike_client_command_duration_seconds_bucket{%s,le="1.0"}' % labels] == 2
+        assert metrics['aerospike_client_command_duration_seconds_bucket{%s,le="+Inf"}' % labels] == 2
+        assert metrics['aerospike_client_command_duration_seconds_count{%s}' % labels] == 2
+        assert metrics['aerospike_client_command_segment_seconds_total{method="get",segment="network"}'] > 0
+        assert metrics["aerospike_client_commands_dropped_total"] == 0
+
+    def test_other_commands_are_counted(self, client):
+        key = ("test", "demo", 1)
+        client.put(key, {"i": 1})
+        with MetricsCollector(client) as collector:
+            client.exists(key)
+            client.exists(("test", "demo", 2))
+            # The stand-in server does not run UDFs, but the call is counted whatever its result.
+            with pytest.raises(e.AerospikeError):
+                client.apply(key, "module", "function", [])
+            client.query("test", "demo").results()
+            client.query("test", "demo").foreach(lambda record: None)
+            client.scan("test", "demo").results()
+            client.remove(key)
+
+        commands = collector.snapshot()["commands"]
+        assert commands[("exists", "test", "demo", 0)] == 1
+        assert commands[("exists", "test", "demo", e.RecordNotFound.code)] == 1
+        assert sum(count for (method, _, _, _), count in commands.items() if method == "apply") == 1
+        assert commands[("query.results", "test", "demo", 0)] == 1
+        assert commands[("query.foreach", "test", "demo", 0)] == 1
+        assert commands[("scan.results", "test", "demo", 0)] == 1
+        assert commands[("remove", "test", "demo", 0)] == 1
+
+    def test_stopped_collector_does_not_count(self, client):
+        collector = MetricsCollector(client)
+        collector.start()
+        collector.stop()
+        client.put(("test", "demo", 1), {"i": 1})
+
+        assert collector.snapshot()["commands"] == {}
+
+    def test_threads_are_added_together(self, client):
+        client.put(("test", "demo", 1), {"i": 1})
+
+        def get():
+            for _ in range(10):
+                client.get(("test", "demo", 1))
+
+        with MetricsCollector(client) as collector:
+            threads = [threading.Thread(target=get) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert collector.snapshot()["commands"] == {("get", "test", "demo", 0): 40}
+
+    def test_no_profile_hook_is_set(self, client):
+        with MetricsCollector(client) as collector:
+            assert aerospike.set_profile_hook(None) is None
+            client.put(("test", "demo", 1), {"i": 1})
+
+        assert collector.snapshot()["commands"] == {("put", "test", "demo", 0): 1}
+
+    def test_clients_are_counted_apart(self, client, standin_server):  # noqa: F811
+        other = aerospike.client({"hosts": [("127.0.0.1", standin_server)]}).connect()
+        try:
+            with MetricsCollector(client) as collector:
+                other.put(("test", "demo", 1), {"i": 1})
+        finally:
+            other.close()
+
+        assert collector.snapshot()["commands"] == {}
+
+    def test_neg_buckets_must_increase(self, client):
+        with pytest.raises(e.ParamError):
+            MetricsCollector(client, buckets=(1.0, 0.5)).start()
+
+    def test_pool_metrics_and_serve(self, client):
+        client.put(("test", "demo", 1), {"i": 1})
+        collector = MetricsCollector(client)
+        server = collector.serve(0, "127.0.0.1")
+        try:
+            response = urllib.request.urlopen("http://127.0.0.1:%d/metrics" % server.server_port)
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            metrics = samples(response.read().decode("utf-8"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        node_name = client.get_node_names()[0]["node_name"]
+        assert metrics['aerospike_client_connections{node="%s",pool="sync",state="idle"}' % node_name] >= 1
+        assert metrics['aerospike_client_connections_opened_total{node="%s",pool="sync"}' % node_name] >= 1
+        assert metrics['aerospike_client_node_error_rate_exceeded{node="%s"}' % node_name] == 0
+        assert metrics["aerospike_client_tends_total"] >= 1
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers import expressions as exp
+from aerospike_helpers.pagination import _prefetch_pages, pages, to_columns
+from .test_base_class import TestBaseClass
+from .test_standin_server import start_server
+
+
+class TestToColumns(object):
+    def test_fills_missing_bins(self):
+        records = [
+            (("test", "demo", 1, bytearray(20)), {"ttl": 1, "gen": 1}, {"a": 1}),
+            (("test", "demo", 2, bytearray(20)), {"ttl": 1, "gen": 2}, {"b": 2}),
+            (("test", "demo", 3, bytearray(20)), {"ttl": 1, "gen": 3}, {"a": 3, "b": 4}),
+        ]
+        page = to_columns(records)
+
+        assert page["keys"] == [record[0] for record in records]
+        assert page["metadata"] == [record[1] for record in records]
+        assert page["bins"] == {"a": [1, None, 3], "b": [None, 2, 4]}
+
+    def test_empty(self):
+        assert to_columns([]) == {"keys": [], "metadata": [], "bins": {}}
+
+
+class TestPrefetchPages(object):
+    def test_yields_pages_in_order(self):
+        source = [[i] * 3 for i in range(10)]
+
+        assert list(_prefetch_pages(iter(source), 2, None)) == source
+
+    def test_buffer_is_bounded(self):
+        fetched = []
+        cap_reached = threading.Event()
+        over_fetched = threading.Event()
+
+        def fetch_pages():
+            for i in range(10):
+                fetched.append(i)
+                if i == 2:
+                    cap_reached.set()
+                if i == 3:
+                    over_fetched.set()
+                yield [i] * 4
+
+        page_iter = _prefetch_pages(fetch_pages(), 5, 8)
+        assert next(page_iter) == [0] * 4
+        # Pages 1 and 2 fill the cap of eight records, so page 3 is not fetched until one is used.
+        assert cap_reached.wait(5)
+        assert not over_fetched.wait(0.2)
+        assert fetched == [0, 1, 2]
+        assert [page[0] for page in page_iter] == list(range(1, 10))
+
+    def test_thread_starts_on_first_next(self):
+        started = threading.Event()
+
+        def fetch_pages():
+            started.set()
+            yield [0]
+
+        page_iter = _prefetch_pages(fetch_pages(), 1, None)
+        assert not started.wait(0.2)
+        assert next(page_iter) == [0]
+        assert list(page_iter) == []
+
+    def test_error_raised_after_buffered_pages(self):
+        def fetch_pages():
+            yield [1]
+            raise e.TimeoutError()
+
+        page_iter = _prefetch_pages(fetch_pages(), 3, None)
+        assert next(page_iter) == [1]
+        with pytest.raises(e.TimeoutError):
+            next(page_iter)
+
+    def test_close_stops_background_thread(self):
+        stopped = threading.Event()
+
+        def fetch_pages():
+            try:
+                while True:
+                    yield [0]
+            finally:
+                stopped.set()
+
+        page_iter = _prefetch_pages(fetch_pages(), 1, None)
+        next(page_iter)
+        page_iter.close()
+        assert stopped.wait(5)
+
+
+@pytest.fixture(scope="module")
+def slow_client():
+    # Each page takes a while, so a call can be made while one is fetched.
+    process, port = start_server("--latency-ms", "300")
+    client = aerospike.client({"hosts": [("127.0.0.1", port)]}).connect()
+    yield client
+    client.close()
+    process.terminate()
+    process.wait()
+
+
+class TestPagesBusy(object):
+    @pytest.mark.parametrize("command", ["query", "scan"])
+    def test_neg_pages_while_a_page_is_fetched(self, slow_client, command):
+        command = getattr(slow_client, command)("test", "demo")
+        command.pages(10)
+        fetch = threading.Thread(target=command._next_page)
+        fetch.start()
+        time.sleep(0.1)
+        try:
+            # The page state is in use without the GIL, so it must not be freed or shared.
+            with pytest.raises(e.ClientError):
+                command.pages(10)
+            with pytest.raises(e.ClientError):
+                command._next_page()
+        finally:
+            fetch.join()
+
+        # Once the page is fetched, the state can be converted again.
+        command.pages(10)
+
+
+class TestPages(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        if self.server_version < [6, 0]:
+            pytest.mark.xfail(reason="Servers older than 6.0 do not support paginated queries.")
+            pytest.xfail()
+
+        self.record_count = 300
+        self.keys = [("test", "pages", i) for i in range(self.record_count)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"id": i})
+
+        def teardown():
+            for key in self.keys:
+                try:
+                    as_connection.remove(key)
+                except e.RecordNotFound:
+                    pass
+
+        request.addfinalizer(teardown)
+
+    def test_query_pages(self):
+        query = self.as_connection.query("test", "pages")
+        page_list = list(pages(query, 100))
+
+        assert len(page_list) > 1
+        assert all(len(page) <= 100 for page in page_list)
+        ids = [bins["id"] for page in page_list for _, _, bins in page]
+        assert sorted(ids) == list(range(self.record_count))
+        assert query.is_done()
+
+    def test_scan_pages_columnar(self):
+        scan = self.as_connection.scan("test", "pages")
+        ids = []
+        for page in pages(scan, 64, columnar=True):
+            assert len(page["keys"]) == len(page["bins"]["id"])
+            ids.extend(page["bins"]["id"])
+
+        assert sorted(ids) == list(range(self.record_count))
+
+    @pytest.mark.parametrize("prefetch, max_buffered_records", [(1, None), (3, None), (3, 50)])
+    def test_query_pages_prefetch(self, prefetch, max_buffered_records):
+        query = self.as_connection.query("test", "pages")
+        page_iter = pages(query, 40, prefetch=prefetch, max_buffered_records=max_buffered_records)
+        ids = [bins["id"] for page in page_iter for _, _, bins in page]
+
+        assert sorted(ids) == list(range(self.record_count))
+
+    def test_query_pages_method(self):
+        query = self.as_connection.query("test", "pages")
+        ids = [bins["id"] for page in query.pages(100) for _, _, bins in page]
+
+        assert sorted(ids) == list(range(self.record_count))
+        assert query.is_done()
+
+    def test_scan_pages_method_prefetch(self):
+        scan = self.as_connection.scan("test", "pages")
+        ids = [bins["id"] for page in scan.pages(40, prefetch=2) for _, _, bins in page]
+
+        assert sorted(ids) == list(range(self.record_count))
+
+    @pytest.mark.parametrize("command", ["query", "scan"])
+    def test_pages_keep_the_expressions(self, command):
+        # The expressions are converted once, and filter every page.
+        command = getattr(self.as_connection, command)("test", "pages")
+        policy = {"expressions": exp.LT(exp.IntBin("id"), 100).compile()}
+        page_list = list(command.pages(30, policy))
+
+        assert len(page_list) > 1
+        assert sorted(bins["id"] for page in page_list for _, _, bins in page) == list(range(100))
+
+    def test_scan_pages_resume_from_partition_filter(self):
+        scan = self.as_connection.scan("test", "pages")
+        scan.paginate()
+        first_page = scan.results({"max_records": 50})
+        partition_filter = {"begin": 0, "count": 4096, "partition_status": scan.get_partitions_status()}
+
+        resumed = self.as_connection.scan("test", "pages")
+        rest = [record for page in resumed.pages(100, {"partition_filter": partition_filter}) for record in page]
+
+        ids = [bins["id"] for _, _, bins in first_page + rest]
+        assert sorted(ids) == list(range(self.record_count))
+
+    @pytest.mark.parametrize("command", ["query", "scan"])
+    def test_neg_next_page_before_pages(self, command):
+        with pytest.raises(e.ParamError):
+            getattr(self.as_connection, command)("test", "pages")._next_page()
+
+    def test_pages_resume_from_partition_filter(self):
+        query = self.as_connection.query("test", "pages")
+        query.max_records = 50
+        query.paginate()
+        first_page = query.results()
+        partition_filter = {"begin": 0, "count": 4096, "partition_status": query.get_partitions_status()}
+
+        resumed = self.as_connection.query("test", "pages")
+        rest = [record for page in pages(resumed, 100, {"partition_filter": partition_filter}) for record in page]
+
+        ids = [bins["id"] for _, _, bins in first_page + rest]
+        assert sorted(ids) == list(range(self.record_count))
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"page_size": 0},
+            {"page_size": -1},
+            {"page_size": 10, "prefetch": -1},
+            {"page_size": 10, "prefetch": 1, "max_buffered_records": 0},
+        ],
+    )
+    def test_invalid_pages_options(self, kwargs):
+        with pytest.raises(ValueError):
+            pages(self.as_connection.query("test", "pages"), **kwargs)
+        with pytest.raises(ValueError):
+            self.as_connection.scan("test", "pages").pages(**kwargs)
+
+    def test_neg_invalid_pages_policy(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.query("test", "pages").pages(10, {"partition_filter": {"begin": -1}})
+
+    def test_scan_options_rejected(self):
+        with pytest.raises(ValueError):
+            pages(self.as_connection.scan("test", "pages"), 10, options={"nobins": True})
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from aerospike import exception as e
+from aerospike import predicates as p
+from aerospike_helpers.parallel import PARTITION_COUNT, parallel_results, partition_ranges
+from .test_base_class import TestBaseClass
+from .index_helpers import ensure_dropped_index
+
+
+def count_records(records):
+    return len(records)
+
+
+class TestPartitionRanges(object):
+    @pytest.mark.parametrize("workers", [1, 3, 7, 16, 4096])
+    def test_ranges_cover_all_partitions(self, workers):
+        ranges = partition_ranges(workers)
+
+        assert len(ranges) == workers
+        assert ranges[0][0] == 0
+        assert sum(count for _, count in ranges) == PARTITION_COUNT
+        for (begin, count), (next_begin, _) in zip(ranges, ranges[1:]):
+            assert begin + count == next_begin
+        assert max(count for _, count in ranges) - min(count for _, count in ranges) <= 1
+
+    def test_ranges_are_capped_by_partition_count(self):
+        assert partition_ranges(10, begin=100, count=4) == [(100, 1), (101, 1), (102, 1), (103, 1)]
+
+    @pytest.mark.parametrize("workers, begin, count", [(0, 0, 4096), (1, -1, 10), (1, 4000, 100), (1, 0, 0)])
+    def test_invalid_ranges(self, workers, begin, count):
+        with pytest.raises(ValueError):
+            partition_ranges(workers, begin, count)
+
+
+class TestParallelResults(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        if self.server_version < [6, 0]:
+            pytest.mark.xfail(reason="Servers older than 6.0 do not support partition scans.")
+            pytest.xfail()
+
+        self.record_count = 100
+        self.keys = [("test", "parallel", i) for i in range(self.record_count)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"id": i, "name": "name%d" % i})
+
+        def teardown():
+            for key in self.keys:
+                try:
+                    as_connection.remove(key)
+                except e.RecordNotFound:
+                    pass
+
+        request.addfinalizer(teardown)
+
+    @pytest.mark.parametrize("workers", [1, 4, 9])
+    def test_thread_mode_returns_every_record(self, workers):
+        records = parallel_results(self.as_connection, "test", "parallel", workers=workers)
+
+        assert sorted(bins["id"] for _, _, bins in records) == list(range(self.record_count))
+
+    def test_thread_mode_selects_bins(self):
+        records = parallel_results(self.as_connection, "test", "parallel", bins=["id"])
+
+        assert len(records) == self.record_count
+        assert all(list(bins.keys()) == ["id"] for _, _, bins in records)
+
+    def test_thread_mode_query_with_predicate(self):
+        self.as_connection.index_integer_create("test", "parallel", "id", "parallel_id_idx")
+        try:
+            records = parallel_results(self.as_connection, "test", "parallel", predicate=p.between("id", 10, 19))
+        finally:
+            ensure_dropped_index(self.as_connection, "test", "parallel_id_idx")
+
+        assert sorted(bins["id"] for _, _, bins in records) == list(range(10, 20))
+
+    def test_process_mode_with_map_fn(self):
+        config = TestBaseClass.get_connection_config()
+        counts = parallel_results(
+            self.as_connection, "test", "parallel", workers=2, mode="process", config=config, map_fn=count_records
+        )
+
+        assert len(counts) == 2
+        assert sum(counts) == self.record_count
+
+    def test_process_mode_requires_config(self):
+        with pytest.raises(ValueError):
+            parallel_results(self.as_connection, "test", "parallel", mode="process")
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            parallel_results(self.as_connection, "test", "parallel", mode="fiber")
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from .test_standin_server import load_standin_server, standin_server  # noqa: F401
+
+
+@pytest.fixture
+def client(standin_server):  # noqa: F811
+    client = aerospike.client({"hosts": [("127.0.0.1", standin_server)]}).connect()
+    yield client
+    client.close()
+
+
+class TestGetPartitionMap(object):
+    def test_map(self, client):
+        partition_map = client.get_partition_map("test")
+        assert partition_map["namespace"] == "test"
+        assert partition_map["replicas"] == 1
+        assert partition_map["sc_mode"] is False
+        assert partition_map["map"].typecode == "h"
+        assert len(partition_map["map"]) == 4096
+        # The stand-in is a single node with every partition.
+        assert set(partition_map["map"]) == {0}
+
+        nodes = client.get_node_names()
+        assert [node["node_name"] for node in partition_map["nodes"]] == [node["node_name"] for node in nodes]
+        assert partition_map["nodes"][0]["address"] == "%s:%d" % (nodes[0]["address"], nodes[0]["port"])
+        assert partition_map["nodes"][0]["partition_generation"] == 1
+
+    def test_node_of_key(self, client):
+        partition_map = client.get_partition_map("test")
+        key = aerospike.Key("test", "demo", 1)
+        node = partition_map["nodes"][partition_map["map"][key.partition_id]]
+        assert node["node_name"] == client.get_node_names()[0]["node_name"]
+
+    def test_since(self, client):
+        version = client.get_partition_map("test")["version"]
+        assert client.get_partition_map("test", since=version) is None
+        assert client.get_partition_map("test", None)["version"] == version
+        assert client.get_partition_map("test", version ^ 1)["version"] == version
+
+    def test_version_changes_with_the_map(self):
+        with load_standin_server() as server:
+            client = aerospike.client({"hosts": [("127.0.0.1", server.port)], "tend_interval": 50}).connect()
+            try:
+                version = client.get_partition_map("test")["version"]
+                server.partition_generation += 1
+                deadline = time.monotonic() + 5
+                while client.get_partition_map("test", since=version) is None and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                partition_map = client.get_partition_map("test")
+                assert partition_map["version"] != version
+                assert partition_map["nodes"][0]["partition_generation"] == 2
+            finally:
+                client.close()
+
+    def test_neg_namespace_not_found(self, client):
+        with pytest.raises(e.NamespaceNotFound):
+            client.get_partition_map("unknown")
+
+    @pytest.mark.parametrize("args", [(), (1,), ("test", "1"), ("test", -1)])
+    def test_neg_args(self, client, args):
+        with pytest.raises((TypeError, e.ParamError)):
+            client.get_partition_map(*args)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.batch.records import BatchRecords, Write
+from aerospike_helpers.expressions import base as exp
+from aerospike_helpers.operations import operations as op
+from .test_standin_server import standin_server  # noqa: F401
+
+SEGMENTS = ("args", "policy", "expressions", "network", "result")
+
+
+@pytest.fixture
+def client(standin_server):  # noqa: F811
+    client = aerospike.client({"hosts": [("127.0.0.1", standin_server)]}).connect()
+    client.put(("test", "demo", 1), {"i": 1})
+    yield client
+    client.truncate("test", None, 0)
+    client.close()
+
+
+@pytest.fixture
+def timings():
+    timings = []
+    aerospike.set_profile_hook(timings.append)
+    yield timings
+    aerospike.set_profile_hook(None)
+
+
+class TestProfileHook(object):
+    def test_data_methods(self, client, timings):
+        key = ("test", "demo", 1)
+        client.put(key, {"i": 2})
+        client.get(key)
+        client.operate(key, [op.increment("i", 1), op.read("i")])
+        client.get_many([key])
+        client.batch_operate([key], [op.read("i")])
+        client.batch_write(BatchRecords([Write(key, [op.write("i", 3)])]))
+
+        assert [timing["method"] for timing in timings] == [
+            "put",
+            "get",
+            "operate",
+            "get_many",
+            "batch_operate",
+            "batch_write",
+        ]
+        for timing in timings:
+            assert all(timing[segment] >= 0 for segment in SEGMENTS)
+            assert timing["network"] > 0
+            assert timing["total"] == pytest.approx(sum(timing[segment] for segment in SEGMENTS))
+            assert isinstance(timing["allocated_blocks"], int)
+            assert timing["result_code"] == 0
+        assert [(timing["namespace"], timing["set"]) for timing in timings[:3]] == [("test", "demo")] * 3
+        assert [(timing["namespace"], timing["set"]) for timing in timings[3:]] == [(None, None)] * 3
+
+    def test_expressions(self, client, timings):
+        expressions = exp.Eq(exp.IntBin("i"), 1).compile()
+        # The stand-in server does not support expressions, but they are converted before the request is sent.
+        with pytest.raises(e.UnsupportedFeature):
+            client.get(("test", "demo", 1), {"expressions": expressions})
+
+        assert timings[0]["expressions"] > 0
+
+    def test_error_is_kept(self, client, timings):
+        with pytest.raises(e.RecordNotFound):
+            client.get(("test", "demo", "missing"))
+        with pytest.raises(e.ParamError):
+            client.get(1)
+
+        assert [timing["method"] for timing in timings] == ["get", "get"]
+        assert [timing["result_code"] for timing in timings] == [e.RecordNotFound.code, e.ParamError.code]
+        assert [timing["raised"] for timing in timings] == [True, True]
+
+    def test_missing_ok_is_not_raised(self, client, timings):
+        assert client.get(("test", "demo", "missing"), missing_ok=True) is None
+        client.get(("test", "demo", 1))
+
+        assert [timing["result_code"] for timing in timings] == [e.RecordNotFound.code, 0]
+        assert [timing["raised"] for timing in timings] == [False, False]
+
+    @pytest.mark.parametrize(
+        "key, ops",
+        [
+            (1, [op.read("i")]),
+            (("test", "demo", 1), op.read("i")),
+        ],
+    )
+    def test_failed_operate_is_kept(self, client, timings, key, ops):
+        with pytest.raises(e.ParamError):
+            client.operate(key, ops)
+
+        assert [timing["method"] for timing in timings] == ["operate"]
+        assert timings[0]["result_code"] == e.ParamError.code
+
+    def test_python_error_has_no_result_code(self, client, timings):
+        with pytest.raises(TypeError):
+            client.get()
+
+        assert timings[0]["result_code"] is None
+
+    def test_hook_error_is_ignored(self, client, monkeypatch):
+        def hook(timing):
+            raise ValueError("hook failed")
+
+        unraisable = []
+        monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+        aerospike.set_profile_hook(hook)
+        try:
+            assert client.get(("test", "demo", 1))[2] == {"i": 1}
+        finally:
+            aerospike.set_profile_hook(None)
+
+        assert [type(error.exc_value) for error in unraisable] == [ValueError]
+
+    def test_set_returns_previous_hook(self, client):
+        timings = []
+        assert aerospike.set_profile_hook(timings.append) is None
+        assert aerospike.set_profile_hook(None) == timings.append
+
+        client.get(("test", "demo", 1))
+        assert timings == []
+
+    def test_not_callable(self):
+        with pytest.raises(e.ParamError):
+            aerospike.set_profile_hook(1)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.operations import operations as op
+from .test_standin_server import start_server
+
+
+@pytest.fixture(scope="module")
+def slow_server():
+    process, port = start_server("--latency-ms", "20")
+    yield port
+    process.terminate()
+    process.wait()
+
+
+def connect(port, **config):
+    config["hosts"] = [("127.0.0.1", port)]
+    return aerospike.client(config).connect()
+
+
+class TestSlowCommands(object):
+    def test_slow_commands_are_logged(self, slow_server):
+        client = connect(slow_server, slow_command_threshold_ms=10)
+        try:
+            key = ("test", "demo", 1)
+            client.put(key, {"s": "x" * 1000})
+            client.get(key)
+            client.operate(key, [op.write("i", 1), op.read("s")])
+            with pytest.raises(e.RecordNotFound):
+                client.get(("test", "demo", 2))
+            client.get_many([key])
+
+            slow = client.get_slow_commands()
+            assert [entry["method"] for entry in slow] == ["put", "get", "operate", "get", "get_many"]
+            for entry in slow:
+                assert entry["total"] >= 0.01
+                assert entry["network"] >= 0.01
+                assert entry["time"] > 0
+            put, get, operate, missing, get_many = slow
+            digest = aerospike.calc_digest(*key)
+            assert (put["namespace"], put["set"], put["digest"]) == ("test", "demo", digest)
+            assert put["request_bytes"] > 1000
+            assert put["response_bytes"] is None
+            assert get["request_bytes"] is None
+            assert get["response_bytes"] > 1000
+            assert operate["request_bytes"] > 0
+            assert operate["response_bytes"] > 1000
+            assert missing["result_code"] == 2
+            assert missing["response_bytes"] is None
+            assert get_many["digest"] is None
+        finally:
+            client.close()
+
+    def test_fast_commands_are_not_logged(self, slow_server):
+        client = connect(slow_server, slow_command_threshold_ms=1000)
+        try:
+            client.put(("test", "demo", 1), {"i": 1})
+            assert client.get_slow_commands() == []
+        finally:
+            client.close()
+
+    def test_ring_keeps_the_newest(self, slow_server):
+        client = connect(slow_server, slow_command_threshold_ms=0, slow_command_max_entries=3)
+        try:
+            for i in range(5):
+                client.put(("test", "demo", i), {"i": i})
+            slow = client.get_slow_commands(clear=True)
+            assert [entry["digest"] for entry in slow] == [aerospike.calc_digest("test", "demo", i) for i in (2, 3, 4)]
+            assert client.get_slow_commands() == []
+
+            client.put(("test", "demo", 5), {"i": 5})
+            assert len(client.get_slow_commands()) == 1
+        finally:
+            client.close()
+
+    def test_disabled_by_default(self, slow_server):
+        client = connect(slow_server)
+        try:
+            client.put(("test", "demo", 1), {"i": 1})
+            assert client.get_slow_commands() == []
+        finally:
+            client.close()
+
+    def test_log_handler(self, slow_server):
+        messages = []
+        aerospike.set_log_handler(lambda level, func, path, line, msg: messages.append((level, msg)))
+        aerospike.set_log_level(aerospike.LOG_LEVEL_WARN)
+        client = connect(slow_server, slow_command_threshold_ms=10, slow_command_log=True)
+        try:
+            client.put(("test", "demo", 1), {"i": 1})
+        finally:
+            client.close()
+            aerospike.set_log_handler(None)
+            aerospike.set_log_level(aerospike.LOG_LEVEL_ERROR)
+
+        slow = [msg for level, msg in messages if msg.startswith("Slow command put test/demo")]
+        assert len(slow) == 1
+        assert messages[0][0] == aerospike.LOG_LEVEL_WARN
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            {"slow_command_threshold_ms": -1},
+            {"slow_command_threshold_ms": "10"},
+            {"slow_command_threshold_ms": 10, "slow_command_max_entries": 0},
+            {"slow_command_threshold_ms": 10, "slow_command_max_entries": "10"},
+        ],
+    )
+    def test_neg_config(self, config):
+        config["hosts"] = [("127.0.0.1", 3000)]
+        with pytest.raises(e.ParamError):
+            aerospike.client(config)
+
+    def test_neg_get_slow_commands_args(self, slow_server):
+        client = connect(slow_server)
+        try:
+            with pytest.raises(TypeError):
+                client.get_slow_commands(1, 2)
+        finally:
+            client.close()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.batch.records import BatchRecords, Read, Remove, Write
+from aerospike_helpers.operations import list_operations as lop
+from aerospike_helpers.operations import operations as op
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "standin_server.py")
+
+
+def load_standin_server():
+    # The server runs in this process, so a test can change what it reports.
+    spec = importlib.util.spec_from_file_location("standin_server", SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.StandInServer()
+
+
+def start_server(*args):
+    process = subprocess.Popen(
+        [sys.executable, SERVER_PATH, "--port", "0"] + list(args), stdout=subprocess.PIPE, universal_newlines=True
+    )
+    # The server prints the port it is bound to once it is ready.
+    port = int(process.stdout.readline().rsplit(":", 1)[1])
+    return process, port
+
+
+@pytest.fixture(scope="module")
+def standin_server():
+    process, port = start_server()
+    yield port
+    process.terminate()
+    process.wait()
+
+
+@pytest.fixture
+def client(standin_server):
+    client = aerospike.client({"hosts": [("127.0.0.1", standin_server)]}).connect()
+    yield client
+    client.truncate("test", None, 0)
+    client.close()
+
+
+class TestStandInServer(object):
+    def test_put_get(self, client):
+        key = ("test", "demo", 1)
+        bins = {"i": 1, "s": "str", "f": 1.5, "b": bytearray(b"\x00\x01"), "l": [1, [2]], "m": {"a": {"b": 1}}}
+        client.put(key, bins)
+
+        _, meta, record = client.get(key)
+        assert record == bins
+        assert meta["gen"] == 1
+        assert client.exists(key)[1]["gen"] == 1
+        assert client.select(key, ["i", "s"])[2] == {"i": 1, "s": "str"}
+
+    def test_operate(self, client):
+        key = ("test", "demo", 1)
+        client.put(key, {"i": 1, "s": "b"})
+
+        ops = [op.increment("i", 2), op.append("s", "c"), op.prepend("s", "a"), op.touch(), op.read("i"), op.read("s")]
+        _, meta, record = client.operate(key, ops, meta={"ttl": 100})
+        assert record == {"i": 3, "s": "abc"}
+        assert meta["gen"] == 2
+        assert 0 < meta["ttl"] <= 100
+
+    def test_write_policies(self, client):
+        key = ("test", "demo", 1)
+        client.put(key, {"i": 1})
+
+        with pytest.raises(e.RecordExistsError):
+            client.put(key, {"i": 2}, policy={"exists": aerospike.POLICY_EXISTS_CREATE})
+        with pytest.raises(e.RecordGenerationError):
+            client.put(key, {"i": 2}, meta={"gen": 5}, policy={"gen": aerospike.POLICY_GEN_EQ})
+
+        client.remove(key)
+        with pytest.raises(e.RecordNotFound):
+            client.get(key)
+        with pytest.raises(e.RecordNotFound):
+            client.put(key, {"i": 2}, policy={"exists": aerospike.POLICY_EXISTS_UPDATE})
+
+    def test_batch(self, client):
+        keys = [("test", "demo", i) for i in range(20)]
+        for key in keys:
+            client.put(key, {"i": key[2]})
+        missing = ("test", "demo", "missing")
+
+        records = client.get_many(keys + [missing])
+        assert [record[2] for record in records] == [{"i": i} for i in range(20)] + [None]
+        assert client.exists_many([keys[0], missing])[1][1] is None
+
+        batch = client.batch_write(
+            BatchRecords(
+                [
+                    Write(("test", "demo", 100), [op.write("i", 100)]),
+                    Read(keys[0], [op.read("i")]),
+                    Remove(keys[1]),
+                ]
+            )
+        )
+        assert [record.result for record in batch.batch_records] == [0, 0, 0]
+        assert batch.batch_records[1].record[2] == {"i": 0}
+        assert client.get(("test", "demo", 100))[2] == {"i": 100}
+        assert client.exists(keys[1])[1] is None
+
+    def test_scan_and_paginated_query(self, client):
+        for i in range(100):
+            client.put(("test", "demo", i), {"i": i})
+        client.put(("test", "other", 0), {"i": -1})
+
+        assert sorted(bins["i"] for _, _, bins in client.scan("test", "demo").results()) == list(range(100))
+
+        query = client.query("test", "demo")
+        query.max_records = 30
+        query.paginate()
+        pages = []
+        while not query.is_done():
+            pages.append(query.results())
+        assert all(len(page) <= 30 for page in pages)
+        assert sorted(bins["i"] for page in pages for _, _, bins in page) == list(range(100))
+
+    def test_index_query(self, client):
+        for i in range(50):
+            client.put(("test", "demo", i), {"i": i, "s": "even" if i % 2 == 0 else "odd"})
+        query = client.query("test", "demo")
+        query.where(aerospike.predicates.between("i", 10, 19))
+
+        with pytest.raises(e.IndexNotFound):
+            query.results()
+
+        client.index_integer_create("test", "demo", "i", "standin_i")
+        client.index_string_create("test", "demo", "s", "standin_s")
+        try:
+            assert sorted(bins["i"] for _, _, bins in query.results()) == list(range(10, 20))
+
+            query = client.query("test", "demo")
+            query.where(aerospike.predicates.equals("s", "odd"))
+            assert len(query.results()) == 25
+        finally:
+            client.index_remove("test", "standin_i")
+            client.index_remove("test", "standin_s")
+
+    def test_udf_modules(self, client):
+        path = os.path.join(os.path.dirname(SERVER_PATH), "sample.lua")
+        with open(path, "rb") as udf_file:
+            content = udf_file.read()
+
+        client.udf_put(path)
+        try:
+            assert [udf["name"] for udf in client.udf_list()] == ["sample.lua"]
+            assert client.udf_get("sample.lua").encode("utf-8") == content
+            with pytest.raises(e.UnsupportedFeature):
+                client.apply(("test", "demo", 1), "sample", "list_append", ["l", 1])
+        finally:
+            client.udf_remove("sample.lua")
+        assert client.udf_list() == []
+
+    def test_unsupported_operation(self, client):
+        key = ("test", "demo", 1)
+        client.put(key, {"l": [1]})
+
+        with pytest.raises(e.UnsupportedFeature):
+            client.operate(key, [lop.list_append("l", 2)])
+
+    def test_latency(self):
+        process, port = start_server("--latency-ms", "50")
+        client = aerospike.client({"hosts": [("127.0.0.1", port)]}).connect()
+        try:
+            client.put(("test", "demo", 1), {"i": 1})
+            start = time.perf_counter()
+            client.get(("test", "demo", 1))
+            assert time.perf_counter() - start >= 0.05
+        finally:
+            client.close()
+            process.terminate()
+            process.wait()
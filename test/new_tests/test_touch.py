@@ -43,6 +43,15 @@ class TestTouch(object):
 
         assert response == AerospikeStatus.AEROSPIKE_OK
 
+    def test_touch_without_val(self):
+        """
+        Invoke touch() without a ttl value
+        """
+        key = ("test", "demo", 1)
+        response = self.as_connection.touch(key)
+
+        assert response == AerospikeStatus.AEROSPIKE_OK
+
     def test_touch_with_correct_policy(self):
         """
         Invoke touch() with correct policy
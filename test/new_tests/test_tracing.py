@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from .test_standin_server import standin_server  # noqa: F401
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from aerospike_helpers.tracing import CommandTracer
+
+    has_opentelemetry = True
+except ImportError:
+    has_opentelemetry = False
+
+
+@pytest.fixture
+def client(standin_server):  # noqa: F811
+    client = aerospike.client({"hosts": [("127.0.0.1", standin_server)]}).connect()
+    client.put(("test", "demo", 1), {"i": 1})
+    yield client
+    client.truncate("test", None, 0)
+    client.close()
+
+
+@pytest.fixture
+def traced():
+    traced = []
+    yield traced
+    aerospike.set_trace_hook(None)
+
+
+@pytest.fixture
+def exporter():
+    if not has_opentelemetry:
+        pytest.skip("opentelemetry-sdk is not installed")
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    yield provider, exporter
+
+
+class TestTraceHook(object):
+    def test_all_calls_are_traced(self, client, traced):
+        assert aerospike.set_trace_hook(traced.append) is None
+        client.get(("test", "demo", 1))
+        with pytest.raises(e.RecordNotFound):
+            client.get(("test", "demo", 2))
+
+        assert [(timing["method"], timing["result_code"]) for timing in traced] == [("get", 0), ("get", 2)]
+        # Allocated blocks are only counted for the profile hook.
+        assert traced[0]["allocated_blocks"] is None
+
+    def test_start_time_and_sizes(self, client, traced):
+        aerospike.set_trace_hook(traced.append)
+        before = time.time_ns()
+        client.put(("test", "demo", 1), {"s": "x" * 1000})
+        client.get(("test", "demo", 1))
+        client.get_many([("test", "demo", 1)])
+        after = time.time_ns()
+
+        put, get, get_many = traced
+        for timing in traced:
+            assert before <= timing["start_time_ns"] <= after
+        assert put["start_time_ns"] < get["start_time_ns"] < get_many["start_time_ns"]
+        assert put["request_bytes"] > 1000
+        assert put["response_bytes"] is None
+        assert get["request_bytes"] is None
+        assert get["response_bytes"] > 1000
+        # The sizes are not known for the batch methods.
+        assert (get_many["request_bytes"], get_many["response_bytes"]) == (None, None)
+
+    def test_sample_rate(self, client, traced):
+        aerospike.set_trace_hook(traced.append, 0.0)
+        for _ in range(20):
+            client.get(("test", "demo", 1))
+        assert traced == []
+
+        aerospike.set_trace_hook(traced.append, 0.5)
+        for _ in range(200):
+            client.get(("test", "demo", 1))
+        assert 40 < len(traced) < 160
+
+    def test_profile_and_trace_hooks(self, client, traced):
+        profiled = []
+        aerospike.set_profile_hook(profiled.append)
+        aerospike.set_trace_hook(traced.append, 0.0)
+        try:
+            client.get(("test", "demo", 1))
+        finally:
+            aerospike.set_profile_hook(None)
+
+        assert len(profiled) == 1
+        assert traced == []
+
+    def test_returns_previous_hook(self, traced):
+        aerospike.set_trace_hook(traced.append)
+        assert aerospike.set_trace_hook(None) == traced.append
+
+    @pytest.mark.parametrize("sample_rate", [-0.1, 1.5, float("nan")])
+    def test_neg_sample_rate(self, sample_rate):
+        with pytest.raises(e.ParamError):
+            aerospike.set_trace_hook(print, sample_rate)
+
+    def test_neg_hook_not_callable(self):
+        with pytest.raises(e.ParamError):
+            aerospike.set_trace_hook(1)
+
+
+class TestCommandTracer(object):
+    def test_spans(self, client, exporter):
+        provider, exporter = exporter
+        tracer = trace.get_tracer(__name__, tracer_provider=provider)
+
+        with tracer.start_as_current_span("parent") as parent:
+            with CommandTracer(provider):
+                before = time.time_ns()
+                client.put(("test", "demo", 1), {"i": 2})
+                with pytest.raises(e.RecordNotFound):
+                    client.get(("test", "demo", 2))
+                client.get_many([("test", "demo", 1)])
+                client.get(("test", "demo", 2), missing_ok=True)
+        client.get(("test", "demo", 1))
+
+        spans = exporter.get_finished_spans()
+        put, get, get_many, get_missing_ok = [span for span in spans if span.name != "parent"]
+        assert [put.name, get.name, get_many.name] == ["put", "get", "get_many"]
+        for span in (put, get, get_many):
+            assert span.kind == trace.SpanKind.CLIENT
+            assert span.parent.span_id == parent.get_span_context().span_id
+            assert span.attributes["db.system.name"] == "aerospike"
+            assert span.start_time <= span.end_time
+        assert put.attributes["db.namespace"] == "test"
+        assert put.attributes["db.collection.name"] == "demo"
+        assert put.attributes["aerospike.network_seconds"] > 0
+        assert put.attributes["aerospike.request_bytes"] > 0
+        assert "aerospike.response_bytes" not in put.attributes
+        assert "aerospike.response_bytes" not in get_missing_ok.attributes
+        assert before <= put.start_time < get.start_time
+        assert put.status.is_ok
+        assert get.attributes["db.response.status_code"] == "2"
+        assert get.status.status_code == trace.StatusCode.ERROR
+        assert "db.namespace" not in get_many.attributes
+        # The expected miss of missing_ok keeps its status code, but is not an error.
+        assert get_missing_ok.attributes["db.response.status_code"] == "2"
+        assert get_missing_ok.status.status_code == trace.StatusCode.UNSET
+
+    def test_unsampled(self, client, exporter):
+        provider, exporter = exporter
+        with CommandTracer(provider, sample_rate=0.0):
+            client.get(("test", "demo", 1))
+
+        assert exporter.get_finished_spans() == ()
@@ -4,6 +4,7 @@ import pytest
 from .as_status_codes import AerospikeStatus
 from .udf_helpers import wait_for_udf_removal, wait_for_udf_to_exist
 from .test_base_class import TestBaseClass
+from .test_standin_server import load_standin_server
 from aerospike import exception as e
 
 import aerospike
@@ -226,3 +227,39 @@ class TestUdfPut(TestBaseClass):
         policy = {}
         with pytest.raises(TypeError):
             self.as_connection.udf_put(self.udf_name, 1, policy, "extra_arg")
+
+    def test_udf_put_if_changed(self, tmp_path):
+        """
+        Test that udf_put with if_changed registers a module only if
+        the cluster does not have the same content
+        """
+        path = tmp_path / self.udf_name
+        path.write_text("function one(rec)\n    return 1\nend\n")
+
+        # The stand-in counts the modules uploaded to it.
+        with load_standin_server() as server:
+            client = aerospike.client({"hosts": [("127.0.0.1", server.port)]}).connect()
+            try:
+                assert client.udf_put(str(path), if_changed=True) == 0
+                wait_for_udf_to_exist(client, self.udf_name)
+                assert client.udf_get(self.udf_name) == path.read_text()
+                assert server.counters["udf-put"] == 1
+
+                assert client.udf_put(str(path), if_changed=True) == 0
+                assert client.udf_get(self.udf_name) == path.read_text()
+                assert server.counters["udf-put"] == 1
+
+                path.write_text("function one(rec)\n    return 2\nend\n")
+                assert client.udf_put(str(path), if_changed=True) == 0
+                assert client.udf_get(self.udf_name) == path.read_text()
+                assert server.counters["udf-put"] == 2
+            finally:
+                client.close()
+
+    def test_udf_put_if_changed_is_keyword_only(self):
+        with pytest.raises(TypeError):
+            self.as_connection.udf_put(self.udf_name, 0, {}, True)
+
+    def test_udf_put_if_changed_with_non_existent_filename(self):
+        with pytest.raises(e.LuaFileNotFound):
+            self.as_connection.udf_put("somefile_that_does_not_exist", if_changed=True)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from .udf_helpers import wait_for_udf_removal
+from aerospike import exception as e
+
+MODULES = {
+    "sync_one.lua": "function one(rec)\n    return 1\nend\n",
+    "sync_two.lua": "function two(rec)\n    return 2\nend\n",
+}
+
+
+@pytest.mark.usefixtures("as_connection")
+class TestUdfSync(object):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection, tmp_path):
+        self.directory = tmp_path
+        for name, content in MODULES.items():
+            (tmp_path / name).write_text(content)
+
+        def teardown():
+            names = [udf["name"] for udf in as_connection.udf_list()]
+            for name in MODULES:
+                if name in names:
+                    as_connection.udf_remove(name)
+                    wait_for_udf_removal(as_connection, name)
+
+        request.addfinalizer(teardown)
+
+    def test_udf_sync(self):
+        assert self.as_connection.udf_sync(str(self.directory)) == sorted(MODULES)
+        for name, content in MODULES.items():
+            assert self.as_connection.udf_get(name) == content
+
+        # The cluster has the same content, so nothing is registered
+        assert self.as_connection.udf_sync(str(self.directory), {"timeout": 1000}) == []
+
+    def test_udf_sync_changed_module(self):
+        self.as_connection.udf_sync(str(self.directory))
+
+        (self.directory / "sync_two.lua").write_text("function two(rec)\n    return 22\nend\n")
+        assert self.as_connection.udf_sync(str(self.directory)) == ["sync_two.lua"]
+        assert self.as_connection.udf_get("sync_two.lua") == (self.directory / "sync_two.lua").read_text()
+
+    def test_udf_sync_skips_other_files(self):
+        (self.directory / "notes.txt").write_text("not a module")
+        (self.directory / "dir.lua").mkdir()
+        assert self.as_connection.udf_sync(str(self.directory)) == sorted(MODULES)
+
+    def test_udf_sync_empty_directory(self, tmp_path_factory):
+        assert self.as_connection.udf_sync(str(tmp_path_factory.mktemp("empty"))) == []
+
+    def test_neg_udf_sync_with_empty_module(self):
+        (self.directory / "sync_empty.lua").write_text("")
+        with pytest.raises(e.LuaFileNotFound):
+            self.as_connection.udf_sync(str(self.directory))
+
+    def test_neg_udf_sync_with_non_existent_directory(self):
+        with pytest.raises(e.LuaFileNotFound):
+            self.as_connection.udf_sync(str(self.directory / "missing"))
+
+    @pytest.mark.parametrize("directory, policy", ((1, None), (None, None), (".", 5), (".", {"timeout": 0.1})))
+    def test_neg_udf_sync_invalid_arg_types(self, directory, policy):
+        with pytest.raises(e.ParamError):
+            self.as_connection.udf_sync(directory, policy)
@@ -0,0 +1,1016 @@
+# -*- coding: utf-8 -*-
+##########################################################################
+# Copyright 2013-2022 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+A local stand-in for a single Aerospike server node, for measuring the client's own cost per command
+without a cluster.
+
+It speaks enough of the info and message wire protocols for the client to connect and tend it, and to run
+single record reads, writes, touches, deletes and operate() with plain bin operations, batch reads and
+writes, and foreground scans and queries, including paginated ones. Background scans and queries with
+write operations run to completion before they are acknowledged, but can be shown as still running to the
+client for a number of polls. Records are kept in memory in a dict
+per partition and are lost when the process exits. A fixed latency, plus optional random jitter, can be
+added before each data command is answered.
+
+UDF modules can be registered, listed, read and removed, but not run. Anything else the client may send,
+such as UDF calls, filter expressions, list, map, bit and HLL operations and background UDF scans and
+queries, is answered with AEROSPIKE_ERR_UNSUPPORTED_FEATURE. Equality and range filters on integer and string bins
+are supported on bins with an index created by
+:meth:`~aerospike.Client.index_integer_create` or :meth:`~aerospike.Client.index_string_create`. Security,
+TLS and strong consistency are not supported.
+
+Run it in its own process for benchmarks, so it does not compete with the client for the GIL::
+
+    python standin_server.py --port 3100 --latency-ms 0.2
+
+Or start it on a background thread, for example in a test::
+
+    from standin_server import StandInServer
+
+    with StandInServer() as server:
+        client = aerospike.client({"hosts": [("127.0.0.1", server.port)]}).connect()
+"""
+
+import argparse
+import asyncio
+import base64
+import collections
+import hashlib
+import random
+import struct
+import threading
+import time
+import zlib
+
+PROTO_VERSION = 2
+PROTO_INFO = 1
+PROTO_MSG = 3
+PROTO_COMPRESSED = 4
+
+N_PARTITIONS = 4096
+CITRUSLEAF_EPOCH = 1262304000
+
+# Message header flags.
+INFO1_READ = 1
+INFO1_GET_ALL = 2
+INFO1_BATCH_INDEX = 8
+INFO1_GET_NOBINDATA = 32
+INFO1_COMPRESS_RESPONSE = 128
+
+INFO2_WRITE = 1
+INFO2_DELETE = 2
+INFO2_GENERATION = 4
+INFO2_GENERATION_GT = 8
+INFO2_CREATE_ONLY = 32
+INFO2_RESPOND_ALL_OPS = 128
+
+INFO3_LAST = 1
+INFO3_UPDATE_ONLY = 8
+INFO3_CREATE_OR_REPLACE = 16
+INFO3_REPLACE_ONLY = 32
+
+# Field types.
+FIELD_NAMESPACE = 0
+FIELD_SETNAME = 1
+FIELD_KEY = 2
+FIELD_DIGEST = 4
+FIELD_TASK_ID = 7
+FIELD_PID_ARRAY = 11
+FIELD_DIGEST_ARRAY = 12
+FIELD_MAX_RECORDS = 13
+FIELD_INDEX_RANGE = 22
+FIELD_INDEX_CONTEXT = 23
+FIELD_INDEX_TYPE = 26
+FIELD_UDF_PACKAGE_NAME = 30
+FIELD_UDF_OP = 33
+FIELD_QUERY_BINS = 40
+FIELD_BATCH_INDEX = 41
+FIELD_FILTER = 43
+
+UNSUPPORTED_FIELDS = (FIELD_INDEX_CONTEXT, FIELD_UDF_PACKAGE_NAME, FIELD_UDF_OP, FIELD_FILTER)
+
+# Operation types.
+OP_READ = 1
+OP_WRITE = 2
+OP_INCR = 5
+OP_APPEND = 9
+OP_PREPEND = 10
+OP_TOUCH = 11
+OP_DELETE = 14
+
+# Particle types.
+PARTICLE_NULL = 0
+PARTICLE_INTEGER = 1
+PARTICLE_FLOAT = 2
+PARTICLE_STRING = 3
+PARTICLE_BLOB = 4
+
+# Batch record types.
+BATCH_READ = 0x0
+BATCH_REPEAT = 0x1
+BATCH_INFO = 0x2
+BATCH_WRITE = 0xE
+
+# Result codes.
+OK = 0
+ERR_RECORD_NOT_FOUND = 2
+ERR_RECORD_GENERATION = 3
+ERR_REQUEST_INVALID = 4
+ERR_RECORD_EXISTS = 5
+ERR_BIN_INCOMPATIBLE_TYPE = 12
+ERR_UNSUPPORTED_FEATURE = 16
+ERR_NAMESPACE_NOT_FOUND = 20
+ERR_INDEX_NOT_FOUND = 201
+
+TTL_NEVER_EXPIRE = 0xFFFFFFFF
+TTL_DONT_UPDATE = 0xFFFFFFFE
+
+MSG_HEADER = struct.Struct(">BBBBBBIIIHH")
+FIELD_HEADER = struct.Struct(">IB")
+OP_HEADER = struct.Struct(">IBBBB")
+INT64 = struct.Struct(">q")
+FLOAT64 = struct.Struct(">d")
+
+# Scan and query records are sent in frames of about this many bytes.
+FRAME_SIZE = 128 * 1024
+
+FEATURES = "batch-any;pquery;pscans;peers;query-show;relaxed-sc;replicas;truncate-namespace"
+BUILD = "6.4.0.0"
+
+
+class Record(object):
+    __slots__ = ("set_name", "key", "bins", "generation", "void_time")
+
+    def __init__(self, set_name, key):
+        self.set_name = set_name
+        self.key = key
+        # Bin name to (particle type, value bytes), as they are sent on the wire.
+        self.bins = {}
+        self.generation = 0
+        self.void_time = 0
+
+
+def now_void_time():
+    return int(time.time()) - CITRUSLEAF_EPOCH
+
+
+def partition_id(digest):
+    return (digest[0] | digest[1] << 8) & (N_PARTITIONS - 1)
+
+
+def proto(proto_type, body):
+    return struct.pack(">Q", PROTO_VERSION << 56 | proto_type << 48 | len(body)) + body
+
+
+def compressed_proto(data):
+    return proto(PROTO_COMPRESSED, struct.pack(">Q", len(data)) + zlib.compress(data, 1))
+
+
+def parse_proto_header(data):
+    (word,) = struct.unpack(">Q", data)
+    return word >> 56, (word >> 48) & 0xFF, word & 0xFFFFFFFFFFFF
+
+
+def parse_fields(buf, offset, n_fields):
+    fields = {}
+    for _ in range(n_fields):
+        size, field_type = FIELD_HEADER.unpack_from(buf, offset)
+        fields[field_type] = bytes(buf[offset + 5:offset + 4 + size])
+        offset += 4 + size
+    return fields, offset
+
+
+def parse_ops(buf, offset, n_ops):
+    ops = []
+    for _ in range(n_ops):
+        size, op, particle_type, _, name_len = OP_HEADER.unpack_from(buf, offset)
+        name = bytes(buf[offset + 8:offset + 8 + name_len]).decode("utf-8")
+        value = bytes(buf[offset + 8 + name_len:offset + 4 + size])
+        ops.append((op, particle_type, name, value))
+        offset += 4 + size
+    return ops, offset
+
+
+def build_msg(result_code=OK, generation=0, void_time=0, batch_index=0, info3=0, fields=(), bins=()):
+    parts = [
+        MSG_HEADER.pack(
+            22, 0, 0, info3, 0, result_code, generation, void_time, batch_index, len(fields), len(bins)
+        )
+    ]
+    for field_type, data in fields:
+        parts.append(FIELD_HEADER.pack(len(data) + 1, field_type))
+        parts.append(data)
+    for name, (particle_type, value) in bins:
+        name = name.encode("utf-8")
+        parts.append(OP_HEADER.pack(len(value) + len(name) + 4, OP_READ, particle_type, 0, len(name)))
+        parts.append(name)
+        parts.append(value)
+    return b"".join(parts)
+
+
+class Command(object):
+    """One record command, from a single record message or from one row of a batch."""
+
+    __slots__ = ("info1", "info2", "info3", "generation", "ttl", "fields", "ops")
+
+    def __init__(self, info1, info2, info3, generation, ttl, fields, ops):
+        self.info1 = info1
+        self.info2 = info2
+        self.info3 = info3
+        self.generation = generation
+        self.ttl = ttl
+        self.fields = fields
+        self.ops = ops
+
+
+class StandInServer(object):
+    """An in-memory Aerospike node listening on *host*:*port*.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on. ``0`` picks a free port, which is available as :attr:`port`
+            once the server is started.
+        namespaces (list): Names of the namespaces the node has.
+        latency_ms (float): Milliseconds to wait before answering each data command.
+        jitter_ms (float): Up to this many more milliseconds, picked at random for each command, to wait
+            before answering.
+        node_name (str): The node name reported to the client.
+        cluster_name (str): The cluster name reported to the client, if any.
+        index_build_polls (int): Number of times the statistics of a new secondary index report it as still
+            loading, before reporting ``load_pct=100``.
+        job_polls (int): Number of times a new background scan or query is shown as still running, before it
+            is shown as done.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        namespaces=("test",),
+        latency_ms=0.0,
+        jitter_ms=0.0,
+        node_name="BB9000000000001",
+        cluster_name=None,
+        index_build_polls=0,
+        job_polls=0,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.node_name = node_name
+        self.cluster_name = cluster_name
+        self.index_build_polls = index_build_polls
+        self.job_polls = job_polls
+        # Bumped to make clients read the partition map again.
+        self.partition_generation = 1
+        self.namespaces = {ns: [dict() for _ in range(N_PARTITIONS)] for ns in namespaces}
+        self.indexes = {}
+        # UDF module file name to its content. Modules can be registered, but not run.
+        self.udfs = {}
+        # Background scans and queries, by job ID.
+        self.jobs = {}
+        # Number of requests handled, by kind: info, read, write, batch, scan and job, and of UDF modules uploaded.
+        self.counters = collections.Counter()
+        self._loop = None
+        self._thread = None
+        self._stopped = None
+        self._started = threading.Event()
+        # Task serving each open connection, to its stream writer.
+        self._connections = {}
+
+    ##########################################################################
+    # Running
+    ##########################################################################
+
+    def start(self):
+        """Start serving on a background thread and return once the port is bound.
+
+        The server needs the GIL to answer, so client calls that do not release it while waiting, such as
+        :meth:`~aerospike.Client.truncate`, time out against a server started in the same process.
+        """
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self):
+        """Stop a server started with :meth:`start`."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+
+    async def _serve(self):
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._started.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            # Closing the connections ends their tasks.
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                version, proto_type, size = parse_proto_header(await reader.readexactly(8))
+                body = await reader.readexactly(size)
+                if version != PROTO_VERSION:
+                    break
+
+                if proto_type == PROTO_COMPRESSED:
+                    data = zlib.decompress(body[8:])
+                    version, proto_type, size = parse_proto_header(data[:8])
+                    body = data[8:]
+
+                if proto_type == PROTO_INFO:
+                    self.counters["info"] += 1
+                    response = proto(PROTO_INFO, self.handle_info(body.decode("utf-8")).encode("utf-8"))
+                elif proto_type == PROTO_MSG:
+                    if self.latency or self.jitter:
+                        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+                    response = self.handle_message(body)
+                else:
+                    # Authentication and other admin commands are not supported.
+                    break
+
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            self._connections.pop(task, None)
+
+    ##########################################################################
+    # Info commands
+    ##########################################################################
+
+    def handle_info(self, request):
+        lines = []
+        for command in request.split("\n"):
+            if not command:
+                continue
+            value = self._info_value(command)
+            if value is not None:
+                lines.append("%s\t%s\n" % (command, value))
+        return "".join(lines)
+
+    def _info_value(self, command):
+        name, _, params = command.partition(":")
+        args = dict(param.partition("=")[::2] for param in params.split(";") if param)
+        simple = {
+            "node": self.node_name,
+            "build": BUILD,
+            "version": "Aerospike Community Edition build " + BUILD,
+            "edition": "Aerospike Community Edition",
+            "features": FEATURES,
+            "cluster-name": self.cluster_name or "null",
+            "partition-generation": str(self.partition_generation),
+            "peers-generation": "1",
+            "rebalance-generation": "1",
+            "partitions": str(N_PARTITIONS),
+            "namespaces": ";".join(self.namespaces),
+            "service": "%s:%d" % (self.host, self.port),
+            "services": "",
+            "services-alumni": "",
+        }
+        if command in simple:
+            return simple[command]
+        if command.startswith("peers-"):
+            return "1,%d,[]" % self.port
+        if command.startswith("service-"):
+            return "%s:%d" % (self.host, self.port)
+        if command == "replicas":
+            bitmap = base64.b64encode(b"\xff" * (N_PARTITIONS // 8)).decode("ascii")
+            return "".join("%s:0,1,%s;" % (ns, bitmap) for ns in self.namespaces)
+        if command == "rack-ids":
+            return "".join("%s:0;" % ns for ns in self.namespaces)
+        if command == "statistics":
+            return "objects=%d;%s" % (
+                sum(self._object_count(ns) for ns in self.namespaces),
+                ";".join("%s=%d" % item for item in sorted(self.counters.items())),
+            )
+        if command.startswith("namespace/"):
+            ns = command.split("/", 1)[1]
+            if ns not in self.namespaces:
+                return "ERROR::namespace not found"
+            return "objects=%d;replication-factor=1;default-ttl=0;storage-engine=memory" % self._object_count(ns)
+        if command == "sets" or command.startswith("sets/"):
+            return self._info_sets(command.split("/")[1:])
+        if name in ("truncate", "truncate-namespace"):
+            return self._info_truncate(args)
+        if name == "sindex-create":
+            return self._info_sindex_create(args)
+        if name == "sindex-delete":
+            return "OK" if self.indexes.pop((args.get("ns"), args.get("indexname")), None) else "FAIL:201:NO INDEX"
+        if command.startswith("sindex/"):
+            _, ns, index_name = command.split("/", 2)
+            if (ns, index_name) not in self.indexes:
+                return "FAIL:201:NO INDEX"
+            index = self.indexes[(ns, index_name)]
+            load_pct = 100
+            if index["polls"] < self.index_build_polls:
+                load_pct = 100 * index["polls"] // self.index_build_polls
+                index["polls"] += 1
+            return "load_pct=%d;keys=%d;entries=%d" % ((load_pct,) + (self._object_count(ns),) * 2)
+        if command in ("sindex", "sindex-list") or name == "sindex-list":
+            return "".join(
+                "ns=%s:indexname=%s:set=%s:bin=%s:type=%s:indextype=%s:context=%s:state=RW;"
+                % (
+                    ns,
+                    index_name,
+                    index["set"] or "NULL",
+                    index["bin"],
+                    index["type"],
+                    index["indextype"],
+                    index["context"] or "NULL",
+                )
+                for (ns, index_name), index in sorted(self.indexes.items())
+            )
+        if name == "udf-put":
+            self.counters["udf-put"] += 1
+            self.udfs[args.get("filename")] = base64.b64decode(args.get("content", ""))
+            return ""
+        if name == "udf-get":
+            if args.get("filename") not in self.udfs:
+                return "error=not_found"
+            content = self.udfs[args["filename"]]
+            return "gen=%s;type=LUA;content=%s;" % (
+                hashlib.sha1(content).hexdigest(),
+                base64.b64encode(content).decode("ascii"),
+            )
+        if name == "udf-remove":
+            return "ok" if self.udfs.pop(args.get("filename"), None) is not None else "error=file_not_found"
+        if name == "udf-list":
+            return "".join(
+                "filename=%s,hash=%s,type=LUA;" % (filename, hashlib.sha1(content).hexdigest())
+                for filename, content in sorted(self.udfs.items())
+            )
+        if name in ("query-show", "scan-show") or name == "jobs" and args.get("cmd") == "get-job":
+            return self._info_job_show(args)
+        if name in ("query-abort", "scan-abort") or name == "jobs" and args.get("cmd") == "kill-job":
+            return self._info_job_abort(args)
+        # Like a server, do not answer commands it does not know.
+        return None
+
+    def _object_count(self, ns, set_name=None):
+        return sum(
+            1
+            for partition in self.namespaces[ns]
+            for record in partition.values()
+            if set_name is None or record.set_name == set_name
+        )
+
+    def _info_sets(self, path):
+        counts = collections.Counter()
+        for ns in path[:1] or self.namespaces:
+            for partition in self.namespaces.get(ns, ()):
+                for record in partition.values():
+                    if record.set_name and (len(path) < 2 or record.set_name == path[1]):
+                        counts[(ns, record.set_name)] += 1
+        return "".join("ns=%s:set=%s:objects=%d;" % (ns, set_name, n) for (ns, set_name), n in sorted(counts.items()))
+
+    def _info_truncate(self, args):
+        ns = args.get("namespace")
+        if ns not in self.namespaces:
+            return "ERROR:20:namespace not found"
+        set_name = args.get("set")
+        for partition in self.namespaces[ns]:
+            for digest in [d for d, record in partition.items() if set_name is None or record.set_name == set_name]:
+                del partition[digest]
+        return "ok"
+
+    def _info_job_show(self, args):
+        job = self.jobs.get(int(args.get("trid", "0")))
+        if job is None:
+            return "ERROR:2:job not found"
+        if job["status"] == "active(ok)":
+            if job["polls"] < self.job_polls:
+                progress = 100 * job["polls"] // self.job_polls
+                job["polls"] += 1
+                return "trid=%s:job-type=basic:status=active(ok):job-progress=%d:recs-read=%d" % (
+                    args["trid"],
+                    progress,
+                    job["records"] * progress // 100,
+                )
+            job["status"] = "done(ok)"
+        return "trid=%s:job-type=basic:status=%s:job-progress=100:recs-read=%d" % (
+            args["trid"],
+            job["status"],
+            job["records"],
+        )
+
+    def _info_job_abort(self, args):
+        job = self.jobs.get(int(args.get("trid", "0")))
+        if job is None:
+            return "ERROR:2:job not found"
+        if job["status"] != "active(ok)" or job["polls"] >= self.job_polls:
+            return "ERROR:2:job not active"
+        job["status"] = "done(abandoned-user-aborted)"
+        return "OK"
+
+    def _info_sindex_create(self, args):
+        key = (args.get("ns"), args.get("indexname"))
+        if key[0] not in self.namespaces:
+            return "FAIL:20:namespace not found"
+        if key in self.indexes:
+            return "FAIL:200:Index with the same name already exists"
+        bin_name, _, data_type = args.get("indexdata", "").partition(",")
+        self.indexes[key] = {
+            "set": args.get("set"),
+            "bin": bin_name,
+            "type": data_type.upper(),
+            "indextype": args.get("indextype", "DEFAULT").upper(),
+            "context": args.get("context"),
+            "polls": 0,
+        }
+        return "OK"
+
+    ##########################################################################
+    # Data commands
+    ##########################################################################
+
+    def handle_message(self, body):
+        (_, info1, info2, info3, _, _, generation, ttl, _, n_fields, n_ops) = MSG_HEADER.unpack_from(body, 0)
+        fields, offset = parse_fields(body, 22, n_fields)
+        ops, _ = parse_ops(body, offset, n_ops)
+
+        if FIELD_BATCH_INDEX in fields:
+            self.counters["batch"] += 1
+            frames = [self._batch(fields)]
+        elif info2 & INFO2_WRITE and FIELD_TASK_ID in fields:
+            self.counters["job"] += 1
+            command = Command(info1, info2, info3, generation, ttl, fields, ops)
+            frames = [build_msg(self._start_job(command), info3=INFO3_LAST)]
+        elif FIELD_DIGEST in fields:
+            command = Command(info1, info2, info3, generation, ttl, fields, ops)
+            self.counters["write" if info2 & INFO2_WRITE else "read"] += 1
+            frames = [self._record_msg(self.execute(command), 0)]
+        else:
+            self.counters["scan"] += 1
+            frames = self._scan(info1, info2, fields, ops)
+
+        if info1 & INFO1_COMPRESS_RESPONSE:
+            return b"".join(compressed_proto(proto(PROTO_MSG, frame)) for frame in frames)
+        return b"".join(proto(PROTO_MSG, frame) for frame in frames)
+
+    def _record_msg(self, result, batch_index):
+        result_code, record, bins = result
+        if record is None:
+            return build_msg(result_code, batch_index=batch_index)
+        return build_msg(result_code, record.generation, record.void_time, batch_index, bins=bins)
+
+    def _partition(self, fields):
+        ns = fields.get(FIELD_NAMESPACE, b"").decode("utf-8")
+        partitions = self.namespaces.get(ns)
+        if partitions is None:
+            return None
+        return partitions[partition_id(fields[FIELD_DIGEST])]
+
+    def execute(self, command):
+        """Run one record command. Returns (result code, record or None, list of (bin name, bin) to send)."""
+        if any(field in command.fields for field in UNSUPPORTED_FIELDS):
+            return ERR_UNSUPPORTED_FEATURE, None, []
+
+        partition = self._partition(command.fields)
+        if partition is None:
+            return ERR_NAMESPACE_NOT_FOUND, None, []
+
+        digest = command.fields[FIELD_DIGEST]
+        record = partition.get(digest)
+        if record is not None and record.void_time and record.void_time <= now_void_time():
+            del partition[digest]
+            record = None
+
+        if command.info2 & INFO2_WRITE:
+            return self._write(command, partition, digest, record)
+        return self._read(command, record)
+
+    def _read(self, command, record):
+        if record is None:
+            return ERR_RECORD_NOT_FOUND, None, []
+        if command.info1 & INFO1_GET_NOBINDATA:
+            return OK, record, []
+        if command.info1 & INFO1_GET_ALL or not command.ops:
+            return OK, record, list(record.bins.items())
+
+        bins = []
+        for op, _, name, _ in command.ops:
+            if op != OP_READ:
+                return ERR_UNSUPPORTED_FEATURE, None, []
+            if name in record.bins:
+                bins.append((name, record.bins[name]))
+        return OK, record, bins
+
+    def _write(self, command, partition, digest, record):
+        info2 = command.info2
+        info3 = command.info3
+
+        if record is None and info3 & (INFO3_UPDATE_ONLY | INFO3_REPLACE_ONLY):
+            return ERR_RECORD_NOT_FOUND, None, []
+        if record is not None and info2 & INFO2_CREATE_ONLY:
+            return ERR_RECORD_EXISTS, None, []
+        if record is not None:
+            if info2 & INFO2_GENERATION and command.generation != record.generation:
+                return ERR_RECORD_GENERATION, None, []
+            if info2 & INFO2_GENERATION_GT and command.generation <= record.generation:
+                return ERR_RECORD_GENERATION, None, []
+
+        if info2 & INFO2_DELETE:
+            if record is None:
+                return ERR_RECORD_NOT_FOUND, None, []
+            del partition[digest]
+            return OK, None, []
+
+        set_name = command.fields.get(FIELD_SETNAME, b"").decode("utf-8")
+        updated = Record(set_name, command.fields.get(FIELD_KEY))
+        if record is not None:
+            updated.key = updated.key or record.key
+            updated.generation = record.generation
+            updated.void_time = record.void_time
+            if not info3 & (INFO3_CREATE_OR_REPLACE | INFO3_REPLACE_ONLY):
+                updated.bins = dict(record.bins)
+
+        bins = []
+        delete = False
+        for op, particle_type, name, value in command.ops:
+            if op == OP_READ:
+                if name in updated.bins:
+                    bins.append((name, updated.bins[name]))
+                continue
+            if op == OP_WRITE:
+                if particle_type == PARTICLE_NULL:
+                    updated.bins.pop(name, None)
+                else:
+                    updated.bins[name] = (particle_type, value)
+            elif op == OP_INCR:
+                result_code = self._incr(updated.bins, particle_type, name, value)
+                if result_code != OK:
+                    return result_code, None, []
+            elif op in (OP_APPEND, OP_PREPEND):
+                current = updated.bins.get(name)
+                if current is None:
+                    updated.bins[name] = (particle_type, value)
+                elif current[0] != particle_type or particle_type not in (PARTICLE_STRING, PARTICLE_BLOB):
+                    return ERR_BIN_INCOMPATIBLE_TYPE, None, []
+                elif op == OP_APPEND:
+                    updated.bins[name] = (particle_type, current[1] + value)
+                else:
+                    updated.bins[name] = (particle_type, value + current[1])
+            elif op == OP_TOUCH:
+                if record is None:
+                    return ERR_RECORD_NOT_FOUND, None, []
+            elif op == OP_DELETE:
+                delete = True
+                updated.bins = {}
+            else:
+                return ERR_UNSUPPORTED_FEATURE, None, []
+
+            if info2 & INFO2_RESPOND_ALL_OPS:
+                bins.append((name, (PARTICLE_NULL, b"")))
+
+        if command.info1 & INFO1_GET_ALL:
+            bins.extend(updated.bins.items())
+
+        updated.generation += 1
+        # The namespaces have no default TTL, so 0 means the record never expires.
+        if command.ttl in (0, TTL_NEVER_EXPIRE):
+            updated.void_time = 0
+        elif command.ttl != TTL_DONT_UPDATE:
+            updated.void_time = now_void_time() + command.ttl
+
+        if delete or not updated.bins:
+            # Like a server, a record with no bins left is removed.
+            partition.pop(digest, None)
+            if delete:
+                return OK, None, []
+        else:
+            partition[digest] = updated
+        return OK, updated, bins
+
+    def _incr(self, bins, particle_type, name, value):
+        current = bins.get(name)
+        if current is not None and current[0] != particle_type:
+            return ERR_BIN_INCOMPATIBLE_TYPE
+        if particle_type == PARTICLE_INTEGER:
+            total = INT64.unpack(value)[0] + (INT64.unpack(current[1])[0] if current else 0)
+            # Wrap around like a 64 bit signed integer.
+            total = (total + 2 ** 63) % 2 ** 64 - 2 ** 63
+            bins[name] = (PARTICLE_INTEGER, INT64.pack(total))
+        elif particle_type == PARTICLE_FLOAT:
+            total = FLOAT64.unpack(value)[0] + (FLOAT64.unpack(current[1])[0] if current else 0.0)
+            bins[name] = (PARTICLE_FLOAT, FLOAT64.pack(total))
+        else:
+            return ERR_BIN_INCOMPATIBLE_TYPE
+        return OK
+
+    def _batch(self, fields):
+        data = fields[FIELD_BATCH_INDEX]
+        (count,) = struct.unpack_from(">I", data, 0)
+        offset = 5
+        msgs = []
+        command = None
+
+        for _ in range(count):
+            index, digest, record_type = struct.unpack_from(">I20sB", data, offset)
+            offset += 25
+
+            if record_type == BATCH_REPEAT:
+                # Same command as the previous row, for this row's digest.
+                if command is None:
+                    return build_msg(ERR_REQUEST_INVALID, info3=INFO3_LAST)
+            else:
+                info2 = info3 = generation = ttl = 0
+                if record_type == BATCH_READ:
+                    (info1,) = struct.unpack_from(">B", data, offset)
+                    offset += 1
+                elif record_type == BATCH_INFO:
+                    info1, info2, info3 = struct.unpack_from(">BBB", data, offset)
+                    offset += 3
+                elif record_type == BATCH_WRITE:
+                    info1, info2, info3, generation, ttl = struct.unpack_from(">BBBHI", data, offset)
+                    offset += 9
+                else:
+                    return build_msg(ERR_REQUEST_INVALID, info3=INFO3_LAST)
+
+                n_fields, n_ops = struct.unpack_from(">HH", data, offset)
+                record_fields, offset = parse_fields(data, offset + 4, n_fields)
+                ops, offset = parse_ops(data, offset, n_ops)
+                command = Command(info1, info2, info3, generation, ttl, record_fields, ops)
+
+            command.fields[FIELD_DIGEST] = digest
+            msgs.append(self._record_msg(self.execute(command), index))
+
+        msgs.append(build_msg(info3=INFO3_LAST))
+        return b"".join(msgs)
+
+    def _start_job(self, command):
+        """Runs a background scan or query to completion, and keeps it to show as a job. Returns the result code."""
+        fields = command.fields
+        if any(field in fields for field in UNSUPPORTED_FIELDS):
+            return ERR_UNSUPPORTED_FEATURE
+        ns = fields.get(FIELD_NAMESPACE, b"").decode("utf-8")
+        if ns not in self.namespaces:
+            return ERR_NAMESPACE_NOT_FOUND
+        set_name = fields.get(FIELD_SETNAME, b"").decode("utf-8") or None
+
+        match = None
+        if FIELD_INDEX_RANGE in fields:
+            match = self._index_range(ns, set_name, fields)
+            if isinstance(match, int):
+                return match
+
+        now = now_void_time()
+        records = [
+            (digest, record)
+            for partition in self.namespaces[ns]
+            for digest, record in partition.items()
+            if (set_name is None or record.set_name == set_name)
+            and not (record.void_time and record.void_time <= now)
+            and (match is None or match(record))
+        ]
+        for digest, record in records:
+            record_fields = {
+                FIELD_NAMESPACE: fields[FIELD_NAMESPACE],
+                FIELD_SETNAME: record.set_name.encode("utf-8"),
+                FIELD_DIGEST: digest,
+            }
+            self.execute(
+                Command(command.info1, command.info2, command.info3, 0, command.ttl, record_fields, command.ops)
+            )
+
+        (job_id,) = struct.unpack(">Q", fields[FIELD_TASK_ID])
+        self.jobs[job_id] = {"records": len(records), "polls": 0, "status": "active(ok)"}
+        return OK
+
+    def _scan(self, info1, info2, fields, ops):
+        if info2 & INFO2_WRITE or any(field in fields for field in UNSUPPORTED_FIELDS):
+            return [build_msg(ERR_UNSUPPORTED_FEATURE, info3=INFO3_LAST)]
+
+        ns = fields.get(FIELD_NAMESPACE, b"").decode("utf-8")
+        if ns not in self.namespaces:
+            return [build_msg(ERR_NAMESPACE_NOT_FOUND, info3=INFO3_LAST)]
+        set_name = fields.get(FIELD_SETNAME, b"").decode("utf-8") or None
+
+        match = None
+        if FIELD_INDEX_RANGE in fields:
+            match = self._index_range(ns, set_name, fields)
+            if isinstance(match, int):
+                return [build_msg(match, info3=INFO3_LAST)]
+
+        if info1 & INFO1_GET_NOBINDATA:
+            bin_names = ()
+        elif FIELD_QUERY_BINS in fields:
+            bin_names = self._query_bin_names(fields[FIELD_QUERY_BINS])
+        elif ops:
+            bin_names = [name for _, _, name, _ in ops]
+        else:
+            bin_names = None
+
+        # Partitions to scan, each with the digest to resume after.
+        resume = {}
+        pid_array = fields.get(FIELD_PID_ARRAY, b"")
+        for i in range(0, len(pid_array), 2):
+            resume[struct.unpack_from("<H", pid_array, i)[0]] = None
+        digest_array = fields.get(FIELD_DIGEST_ARRAY, b"")
+        for i in range(0, len(digest_array), 20):
+            digest = digest_array[i:i + 20]
+            resume[partition_id(digest)] = digest
+        if not pid_array and not digest_array:
+            resume = dict.fromkeys(range(N_PARTITIONS))
+
+        max_records = struct.unpack(">Q", fields[FIELD_MAX_RECORDS])[0] if FIELD_MAX_RECORDS in fields else 0
+        partitions = self.namespaces[ns]
+        now = now_void_time()
+        frames = []
+        msgs = []
+        size = 0
+        sent = 0
+
+        for pid in sorted(resume):
+            partition = partitions[pid]
+            after = resume[pid]
+            for digest in sorted(partition):
+                if after is not None and digest <= after:
+                    continue
+                record = partition[digest]
+                if set_name is not None and record.set_name != set_name:
+                    continue
+                if record.void_time and record.void_time <= now:
+                    continue
+                if match is not None and not match(record):
+                    continue
+
+                msg = self._scan_record_msg(ns, digest, record, bin_names)
+                msgs.append(msg)
+                size += len(msg)
+                sent += 1
+                if size >= FRAME_SIZE:
+                    frames.append(b"".join(msgs))
+                    msgs = []
+                    size = 0
+                if max_records and sent >= max_records:
+                    break
+            if max_records and sent >= max_records:
+                break
+
+        msgs.append(build_msg(info3=INFO3_LAST))
+        frames.append(b"".join(msgs))
+        return frames
+
+    def _scan_record_msg(self, ns, digest, record, bin_names):
+        fields = [(FIELD_NAMESPACE, ns.encode("utf-8")), (FIELD_DIGEST, digest)]
+        if record.set_name:
+            fields.append((FIELD_SETNAME, record.set_name.encode("utf-8")))
+        if record.key is not None:
+            fields.append((FIELD_KEY, record.key))
+        if bin_names is None:
+            bins = list(record.bins.items())
+        else:
+            bins = [(name, record.bins[name]) for name in bin_names if name in record.bins]
+        return build_msg(OK, record.generation, record.void_time, fields=fields, bins=bins)
+
+    def _query_bin_names(self, data):
+        names = []
+        offset = 1
+        for _ in range(data[0]):
+            length = data[offset]
+            names.append(data[offset + 1:offset + 1 + length].decode("utf-8"))
+            offset += 1 + length
+        return names
+
+    def _index_range(self, ns, set_name, fields):
+        """Returns a predicate for the query's filter, or the result code to fail the query with."""
+        if fields.get(FIELD_INDEX_TYPE, b"\x00") != b"\x00":
+            return ERR_UNSUPPORTED_FEATURE
+
+        data = fields[FIELD_INDEX_RANGE]
+        name_len = data[1]
+        bin_name = data[2:2 + name_len].decode("utf-8")
+        offset = 2 + name_len
+        particle_type = data[offset]
+        (begin_len,) = struct.unpack_from(">I", data, offset + 1)
+        begin = data[offset + 5:offset + 5 + begin_len]
+        offset += 5 + begin_len
+        (end_len,) = struct.unpack_from(">I", data, offset)
+        end = data[offset + 4:offset + 4 + end_len]
+
+        data_type = {PARTICLE_INTEGER: "NUMERIC", PARTICLE_STRING: "STRING"}.get(particle_type)
+        if data_type is None:
+            return ERR_UNSUPPORTED_FEATURE
+        for (index_ns, _), index in self.indexes.items():
+            if (
+                index_ns == ns
+                and index["bin"] == bin_name
+                and index["type"] == data_type
+                and index["indextype"] == "DEFAULT"
+                and index["context"] is None
+                and index["set"] in (None, set_name)
+            ):
+                break
+        else:
+            return ERR_INDEX_NOT_FOUND
+
+        if particle_type == PARTICLE_INTEGER:
+            low = INT64.unpack(begin)[0]
+            high = INT64.unpack(end)[0]
+
+            def match(record):
+                value = record.bins.get(bin_name)
+                return value is not None and value[0] == PARTICLE_INTEGER and low <= INT64.unpack(value[1])[0] <= high
+
+        else:
+
+            def match(record):
+                value = record.bins.get(bin_name)
+                return value is not None and value[0] == PARTICLE_STRING and value[1] == begin
+
+        return match
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an in-memory stand-in for an Aerospike server node.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on. Default 127.0.0.1.")
+    parser.add_argument("-p", "--port", type=int, default=3000, help="Port to listen on. Default 3000.")
+    parser.add_argument(
+        "-n", "--namespace", action="append", help="Namespace to serve. Can be repeated. Default test."
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Milliseconds to wait before answering each data command."
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="Up to this many more milliseconds, picked at random."
+    )
+    parser.add_argument("--cluster-name", help="Cluster name to report to clients.")
+    parser.add_argument(
+        "--index-build-polls",
+        type=int,
+        default=0,
+        help="Times a new secondary index reports it is still loading. Default 0.",
+    )
+    parser.add_argument(
+        "--job-polls",
+        type=int,
+        default=0,
+        help="Times a new background scan or query is shown as still running. Default 0.",
+    )
+    args = parser.parse_args()
+
+    server = StandInServer(
+        args.host,
+        args.port,
+        args.namespace or ["test"],
+        args.latency_ms,
+        args.jitter_ms,
+        cluster_name=args.cluster_name,
+        index_build_polls=args.index_build_polls,
+        job_polls=args.job_polls,
+    )
+    server.start()
+    # Tests read the port from this line when they pass --port 0.
+    print("Serving %s on %s:%d" % (", ".join(server.namespaces), server.host, server.port), flush=True)
+    try:
+        while server._thread.is_alive():
+            server._thread.join(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()